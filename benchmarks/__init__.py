@@ -0,0 +1,5 @@
+"""
+Benchmarks and load-testing tools for the query preprocessing workflow.
+
+All tools here use the fake or replay LLM clients, so they make no API calls.
+"""
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Cold-start import time benchmarks for the entry points.
+
+Each target is imported in a fresh interpreter under `python -X importtime`.
+Its cost is the total of the top-level import times minus that of an empty
+interpreter, so interpreter startup is excluded. The median of several runs
+is reported.
+
+Besides timing, --check fails if a target imports a module on the lazy list:
+the Anthropic SDK (over a second on its own) and the prompt modules are only
+loaded when a client is constructed or a prompt is first used.
+
+Examples:
+  # Run and print results
+  python -m benchmarks.import_time
+
+  # Save the current results as the baseline
+  python -m benchmarks.import_time --save-baseline
+
+  # Compare against the baseline, exit non-zero on regression or eager imports
+  python -m benchmarks.import_time --check --tolerance 0.5
+"""
+
+import argparse
+import json
+import re
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from benchmarks.overhead import compare_to_baseline
+
+BASELINE_PATH = Path(__file__).parent / "baselines" / "import_time.json"
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Benchmark name -> module imported
+TARGETS: Dict[str, str] = {
+    "workflow": "src.workflows.query_preprocessing_workflow",
+    "service_cli": "src.service.cli",
+    "batch_cli": "src.batch.cli",
+    "worker_cli": "src.workers.cli",
+    "anthropic_client": "src.clients.llm_clients.anthropic_llm_client",
+    "eval_client_config": "evals.llm_client_config",
+}
+
+# Modules no target may import (prefix match)
+LAZY_MODULES: Tuple[str, ...] = (
+    "anthropic",
+    "src.prompts.category_normalisation_prompt",
+    "src.prompts.combined_first_stage_prompt",
+    "src.prompts.pii_extraction_prompt",
+    "src.prompts.processable_entity_extraction_prompt",
+    "src.prompts.query_characteristics_extraction_prompt",
+    "src.prompts.query_security_validation_prompt",
+    "src.prompts.unprocessable_entity_extraction_prompt",
+    "src.prompts.user_intent_validation_prompt",
+)
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def profile_import(statement: str) -> Tuple[int, Set[str]]:
+    """
+    Run a statement in a fresh interpreter under -X importtime.
+
+    Returns:
+        (total top-level import time in µs, names of all modules imported)
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    total = 0
+    modules: Set[str] = set()
+    for line in completed.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        cumulative, indent, name = int(match.group(2)), match.group(3), match.group(4)
+        modules.add(name)
+        if len(indent) == 1:
+            total += cumulative
+    return total, modules
+
+
+def eager_imports(modules: Set[str]) -> List[str]:
+    """Entries of LAZY_MODULES that were imported (a package counts if any of its submodules was)"""
+    return sorted(
+        lazy for lazy in LAZY_MODULES
+        if any(name == lazy or name.startswith(lazy + ".") or name.startswith(lazy + "_") for name in modules)
+    )
+
+
+def run_benchmarks(runs: int = 5, targets: Optional[Dict[str, str]] = None) -> Tuple[Dict[str, float], Dict[str, List[str]]]:
+    """
+    Measure the import time of each target.
+
+    Args:
+        runs: Fresh interpreters per target (the median is reported)
+        targets: Benchmark name -> module (default: TARGETS)
+
+    Returns:
+        (benchmark name -> µs, benchmark name -> modules that should be lazy)
+    """
+    targets = targets or TARGETS
+    interpreter = statistics.median(profile_import("pass")[0] for _ in range(runs))
+    results: Dict[str, float] = {}
+    eager: Dict[str, List[str]] = {}
+    for name, module in targets.items():
+        totals = []
+        for _ in range(runs):
+            total, modules = profile_import(f"import {module}")
+            totals.append(total)
+        results[name] = max(0.0, statistics.median(totals) - interpreter)
+        eager[name] = eager_imports(modules)
+    return results, eager
+
+
+def format_results(
+    results: Dict[str, float],
+    eager: Dict[str, List[str]],
+    baseline: Optional[Dict[str, float]] = None
+) -> str:
+    """Format results as a table (ms), with the change vs baseline if available"""
+    lines = [
+        "=" * 72,
+        "IMPORT TIME (ms, fresh interpreter, median)",
+        "=" * 72,
+    ]
+    for name, value in sorted(results.items()):
+        line = f"{name:<20} {TARGETS.get(name, ''):<44} {value / 1000:>8.1f}"
+        if baseline and baseline.get(name):
+            line += f"   {(value - baseline[name]) / baseline[name]:+.0%}"
+        lines.append(line)
+        if eager.get(name):
+            lines.append(f"    eager: {', '.join(eager[name])}")
+    lines.append("=" * 72)
+    return "\n".join(lines)
+
+
+def parse_arguments():
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description="Benchmark cold-start import time of the entry points")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per target (default: 5)")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH, help="Baseline file path")
+    parser.add_argument("--save-baseline", action="store_true", help="Save results as the new baseline")
+    parser.add_argument("--check", action="store_true",
+                        help="Exit non-zero if any target regressed or imports a lazy module")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="Allowed relative slowdown (default: 0.5)")
+    parser.add_argument("--min-delta-ms", type=float, default=20.0,
+                        help="Ignore slowdowns below this many ms (default: 20)")
+    return parser.parse_args()
+
+
+def main() -> int:
+    """Main entry point."""
+    args = parse_arguments()
+
+    results, eager = run_benchmarks(runs=args.runs)
+
+    baseline: Optional[Dict[str, float]] = None
+    if args.baseline.exists():
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+
+    print(format_results(results, eager, baseline))
+
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({"python": sys.version.split()[0], "results": results}, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"\n📁 Baseline saved to: {args.baseline}")
+
+    if args.check:
+        failed = False
+        eager_targets = {name: modules for name, modules in eager.items() if modules}
+        if eager_targets:
+            failed = True
+            print(f"\n❌ {len(eager_targets)} target(s) import modules that should load lazily:")
+            for name, modules in sorted(eager_targets.items()):
+                print(f"  - {name}: {', '.join(modules)}")
+        if baseline is None:
+            print(f"\n❌ No baseline found at {args.baseline}")
+            return 1
+        regressions = compare_to_baseline(results, baseline, args.tolerance, args.min_delta_ms * 1000)
+        if regressions:
+            failed = True
+            print(f"\n❌ {len(regressions)} target(s) regressed by more than {args.tolerance:.0%}:")
+            for regression in regressions:
+                print(f"  - {regression}")
+        if failed:
+            return 1
+        print(f"\n✅ No regressions beyond {args.tolerance:.0%} and no eager imports")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Load generator for QueryPreprocessingWorkflow using the fake LLM client.
+
+Drives the workflow either open-loop (fixed arrival rate) or closed-loop
+(fixed number of concurrent clients) and reports throughput, latency
+percentiles, outcome counts and event-loop lag.
+
+Examples:
+  # 2000 queries/second for 10 seconds with 800ms median LLM latency
+  python -m benchmarks.load_generator --rate 2000 --duration 10
+
+  # 500 concurrent clients, heavy tail and 1% rate limiting
+  python -m benchmarks.load_generator --concurrency 500 --tail-probability 0.02 --rate-limit-probability 0.01
+"""
+
+import argparse
+import asyncio
+import math
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from src.clients.llm_clients.fake_llm_client import FakeLLMClient, LatencyProfile, FakeRateLimitError
+from src.workflows.query_preprocessing_workflow import QueryPreprocessingWorkflow
+from src.workflows.exceptions import get_workflow_outcome
+
+
+DEFAULT_QUERIES = [
+    "Show me Tesco groceries over £50 last month",
+    "Netflix and Spotify subscriptions this year",
+    "Weekend spending on entertainment",
+    "Transactions between £20 and £100 at supermarkets",
+    "Carbon footprint from transport purchases",
+]
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """
+    Nearest-rank percentile of an already sorted list.
+
+    Args:
+        sorted_values: Values sorted in ascending order
+        q: Percentile in the range 0-100
+
+    Returns:
+        The percentile value, or 0.0 for an empty list
+    """
+    if not sorted_values:
+        return 0.0
+    # Smallest rank with at least q% of values at or below it; q * n / 100 is exact for whole q
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(q * len(sorted_values) / 100) - 1))
+    return sorted_values[rank]
+
+
+def classify_outcome(error: Optional[BaseException]) -> str:
+    """Map a workflow exception (or None) to an outcome label"""
+    if isinstance(error, FakeRateLimitError):
+        return "rate_limited"
+    return get_workflow_outcome(error)
+
+
+class EventLoopLagMonitor:
+    """
+    Measures event-loop lag by scheduling a periodic sleep and recording how
+    late each wake-up is. High lag means the loop is CPU-bound.
+    """
+
+    def __init__(self, interval_ms: float = 10.0):
+        self.interval_ms = interval_ms
+        self.lags_ms: List[float] = []
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self) -> None:
+        interval_s = self.interval_ms / 1000
+        while True:
+            expected = time.perf_counter() + interval_s
+            await asyncio.sleep(interval_s)
+            self.lags_ms.append(max(0.0, (time.perf_counter() - expected) * 1000))
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+
+@dataclass
+class LoadTestReport:
+    """Aggregated results of a load test run"""
+    duration_s: float
+    latencies_ms: List[float] = field(default_factory=list)
+    outcomes: Dict[str, int] = field(default_factory=dict)
+    loop_lags_ms: List[float] = field(default_factory=list)
+    peak_in_flight: int = 0
+
+    @property
+    def completed(self) -> int:
+        return len(self.latencies_ms)
+
+    @property
+    def throughput_qps(self) -> float:
+        return self.completed / self.duration_s if self.duration_s > 0 else 0.0
+
+    def format(self) -> str:
+        """Format the report as a readable string"""
+        latencies = sorted(self.latencies_ms)
+        lags = sorted(self.loop_lags_ms)
+        lines = [
+            "=" * 60,
+            "LOAD TEST REPORT",
+            "=" * 60,
+            f"Completed queries: {self.completed:,}",
+            f"Wall time: {self.duration_s:.2f}s",
+            f"Throughput: {self.throughput_qps:,.1f} queries/s",
+            f"Peak in-flight: {self.peak_in_flight:,}",
+            "-" * 60,
+            "Workflow latency:",
+            f"  p50: {percentile(latencies, 50):.1f}ms",
+            f"  p95: {percentile(latencies, 95):.1f}ms",
+            f"  p99: {percentile(latencies, 99):.1f}ms",
+            f"  max: {latencies[-1] if latencies else 0.0:.1f}ms",
+            "Event-loop lag:",
+            f"  p50: {percentile(lags, 50):.2f}ms",
+            f"  p99: {percentile(lags, 99):.2f}ms",
+            f"  max: {lags[-1] if lags else 0.0:.2f}ms",
+            "-" * 60,
+            "Outcomes:",
+        ]
+        for outcome, count in sorted(self.outcomes.items()):
+            lines.append(f"  {outcome}: {count:,}")
+        lines.append("=" * 60)
+        return "\n".join(lines)
+
+
+async def run_load_test(
+    workflow: QueryPreprocessingWorkflow,
+    queries: List[str],
+    duration_s: float,
+    rate: Optional[float] = None,
+    concurrency: Optional[int] = None
+) -> LoadTestReport:
+    """
+    Drive the workflow with synthetic load.
+
+    Exactly one of rate (open-loop, queries/second) or concurrency
+    (closed-loop, number of concurrent clients) must be given.
+
+    Args:
+        workflow: Workflow under test (should use a fake LLM client)
+        queries: Queries to cycle through
+        duration_s: How long to generate load for
+        rate: Target arrival rate in queries/second
+        concurrency: Number of concurrent closed-loop clients
+
+    Returns:
+        LoadTestReport with latency, outcome and loop-lag statistics
+    """
+    if (rate is None) == (concurrency is None):
+        raise ValueError("Specify exactly one of rate or concurrency")
+
+    report = LoadTestReport(duration_s=0.0)
+    in_flight = 0
+
+    async def one_query(query: str) -> None:
+        nonlocal in_flight
+        in_flight += 1
+        report.peak_in_flight = max(report.peak_in_flight, in_flight)
+        start = time.perf_counter()
+        error: Optional[BaseException] = None
+        try:
+            await workflow.process(query)
+        except Exception as e:
+            error = e
+        finally:
+            in_flight -= 1
+        report.latencies_ms.append((time.perf_counter() - start) * 1000)
+        outcome = classify_outcome(error)
+        report.outcomes[outcome] = report.outcomes.get(outcome, 0) + 1
+
+    monitor = EventLoopLagMonitor()
+    monitor.start()
+    start_time = time.perf_counter()
+    deadline = start_time + duration_s
+
+    if rate is not None:
+        # Open loop: fire queries on a fixed schedule regardless of completions
+        tasks = []
+        sent = 0
+        while True:
+            next_send = start_time + sent / rate
+            if next_send >= deadline:
+                break
+            delay = next_send - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(one_query(queries[sent % len(queries)])))
+            sent += 1
+        await asyncio.gather(*tasks)
+    else:
+        # Closed loop: each client sends its next query when the previous completes
+        async def client(client_id: int) -> None:
+            sent = client_id
+            while time.perf_counter() < deadline:
+                await one_query(queries[sent % len(queries)])
+                sent += concurrency
+
+        await asyncio.gather(*(client(i) for i in range(concurrency)))
+
+    report.duration_s = time.perf_counter() - start_time
+    await monitor.stop()
+    report.loop_lags_ms = monitor.lags_ms
+    return report
+
+
+def parse_arguments():
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Load test QueryPreprocessingWorkflow with a fake LLM client"
+    )
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--rate", type=float, help="Open-loop arrival rate in queries/second")
+    mode.add_argument("--concurrency", type=int, help="Number of closed-loop concurrent clients")
+    parser.add_argument("--duration", type=float, default=10.0, help="Load duration in seconds (default: 10)")
+    parser.add_argument("--median-ms", type=float, default=800.0, help="Median LLM latency in ms (default: 800)")
+    parser.add_argument("--sigma", type=float, default=0.35, help="Lognormal shape parameter (default: 0.35)")
+    parser.add_argument("--tail-probability", type=float, default=0.0, help="Probability of a heavy-tail stall")
+    parser.add_argument("--tail-multiplier", type=float, default=5.0, help="Latency multiplier for stalls")
+    parser.add_argument("--rate-limit-probability", type=float, default=0.0, help="Probability of an injected 429")
+    parser.add_argument("--error-probability", type=float, default=0.0, help="Probability of an injected error")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed for reproducible runs")
+    args = parser.parse_args()
+    if args.rate is not None and args.rate <= 0:
+        parser.error("--rate must be greater than 0")
+    if args.concurrency is not None and args.concurrency <= 0:
+        parser.error("--concurrency must be at least 1")
+    return args
+
+
+async def main() -> LoadTestReport:
+    """Main entry point."""
+    args = parse_arguments()
+
+    llm_client = FakeLLMClient(
+        latency_profile=LatencyProfile(
+            median_ms=args.median_ms,
+            sigma=args.sigma,
+            tail_probability=args.tail_probability,
+            tail_multiplier=args.tail_multiplier
+        ),
+        rate_limit_probability=args.rate_limit_probability,
+        error_probability=args.error_probability,
+        seed=args.seed
+    )
+    workflow = QueryPreprocessingWorkflow(llm_client=llm_client)
+
+    concurrency = args.concurrency
+    if args.rate is None and concurrency is None:
+        concurrency = 100
+
+    mode = f"open loop @ {args.rate:,.0f} q/s" if args.rate else f"closed loop x {concurrency} clients"
+    print(f"Running load test: {mode} for {args.duration:.0f}s")
+
+    report = await run_load_test(
+        workflow,
+        DEFAULT_QUERIES,
+        duration_s=args.duration,
+        rate=args.rate,
+        concurrency=concurrency
+    )
+    print(report.format())
+    print(f"LLM calls made: {llm_client.call_count:,}")
+    return report
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Orchestration overhead benchmarks for the query preprocessing workflow.
+
+Uses a zero-latency FakeLLMClient so every measured microsecond is our own
+Python: prompt formatting, regex parsing, Pydantic construction, timing and
+metrics assembly.
+
+Measures:
+- per-agent format_user_prompt, parse_response and process
+- full QueryPreprocessingWorkflow.process at several concurrency levels
+
+Examples:
+  # Run and print results
+  python -m benchmarks.overhead
+
+  # Save the current results as the baseline
+  python -m benchmarks.overhead --save-baseline
+
+  # Compare against the baseline, exit non-zero on regression
+  python -m benchmarks.overhead --check --tolerance 0.25
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.clients.llm_clients.fake_llm_client import (
+    FakeLLMClient,
+    LatencyProfile,
+    PROCESSABLE_ENTITY_RESPONSE,
+    QUERY_SECURITY_RESPONSE,
+    UNPROCESSABLE_ENTITY_RESPONSE,
+    USER_INTENT_RESPONSE,
+    CATEGORY_NORMALISATION_RESPONSE
+)
+from src.models.base_models import QueryInput
+from src.models.category_normalisation_models import CategoryNormalisationInput, CategoryEntity
+from src.workflows.query_preprocessing_workflow import QueryPreprocessingWorkflow
+from src.workflow_nodes.query_preprocessing.processable_entity_extraction_agent import ProcessableEntityExtractionAgent
+from src.workflow_nodes.query_preprocessing.unprocessable_entity_extraction_agent import UnprocessableEntityExtractionAgent
+from src.workflow_nodes.query_preprocessing.user_intent_validation_agent import UserIntentValidationAgent
+from src.workflow_nodes.query_preprocessing.query_security_validation_agent import QuerySecurityValidationAgent
+from src.workflow_nodes.query_preprocessing.category_normalisation_agent import CategoryNormalisationAgent
+
+
+BASELINE_PATH = Path(__file__).parent / "baselines" / "overhead.json"
+
+QUERY = "Show me Tesco groceries over £50 last month"
+
+CONCURRENCY_LEVELS = [1, 10, 100]
+
+
+def _agent_specs() -> List[Tuple[str, type, Any, str]]:
+    """(name, agent class, input, canned response) for each workflow agent"""
+    query_input = QueryInput(query=QUERY)
+    category_input = CategoryNormalisationInput(
+        query=QUERY,
+        entities=[CategoryEntity(type="category", value="groceries")]
+    )
+    return [
+        ("processable_extraction", ProcessableEntityExtractionAgent, query_input, PROCESSABLE_ENTITY_RESPONSE),
+        ("security_validation", QuerySecurityValidationAgent, query_input, QUERY_SECURITY_RESPONSE),
+        ("unprocessable_extraction", UnprocessableEntityExtractionAgent, query_input, UNPROCESSABLE_ENTITY_RESPONSE),
+        ("intent_validation", UserIntentValidationAgent, query_input, USER_INTENT_RESPONSE),
+        ("category_normalisation", CategoryNormalisationAgent, category_input, CATEGORY_NORMALISATION_RESPONSE),
+    ]
+
+
+def time_sync(func: Callable[[], Any], iterations: int) -> float:
+    """Best-of-three mean time per call in microseconds"""
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        best = min(best, (time.perf_counter() - start) / iterations)
+    return best * 1_000_000
+
+
+async def time_async(make_call: Callable[[], Any], iterations: int, concurrency: int = 1) -> float:
+    """Best-of-three mean wall time per call in microseconds, `concurrency` calls at a time"""
+    best = float("inf")
+    rounds = max(1, iterations // concurrency)
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            await asyncio.gather(*(make_call() for _ in range(concurrency)))
+        best = min(best, (time.perf_counter() - start) / (rounds * concurrency))
+    return best * 1_000_000
+
+
+async def run_benchmarks(iterations: int = 2000) -> Dict[str, float]:
+    """
+    Run all overhead benchmarks.
+
+    Args:
+        iterations: Number of calls per measurement
+
+    Returns:
+        Mapping of benchmark name -> microseconds per call
+    """
+    llm_client = FakeLLMClient(latency_profile=LatencyProfile.zero(), seed=0)
+    results: Dict[str, float] = {}
+
+    for name, agent_class, input_data, response in _agent_specs():
+        agent = agent_class(llm_client=llm_client)
+        results[f"{name}.format_user_prompt"] = time_sync(lambda: agent.format_user_prompt(input_data), iterations)
+        results[f"{name}.parse_response"] = time_sync(lambda: agent.parse_response(response), iterations)
+        results[f"{name}.process"] = await time_async(lambda: agent.process(input_data), iterations)
+
+    workflow = QueryPreprocessingWorkflow(llm_client=llm_client)
+    for concurrency in CONCURRENCY_LEVELS:
+        results[f"workflow.process.c{concurrency}"] = await time_async(
+            lambda: workflow.process(QUERY), iterations // 4, concurrency
+        )
+
+    return results
+
+
+def compare_to_baseline(
+    results: Dict[str, float],
+    baseline: Dict[str, float],
+    tolerance: float,
+    min_delta_us: float = 5.0
+) -> List[str]:
+    """
+    Find benchmarks that are slower than the baseline by more than the tolerance.
+
+    Args:
+        results: Current results (microseconds per call)
+        baseline: Baseline results (microseconds per call)
+        tolerance: Allowed relative slowdown (0.25 = 25%)
+        min_delta_us: Absolute slowdowns below this are treated as timer noise
+
+    Returns:
+        List of regression descriptions (empty if none)
+    """
+    regressions = []
+    for name, current in sorted(results.items()):
+        previous = baseline.get(name)
+        if previous is None or previous <= 0:
+            continue
+        change = (current - previous) / previous
+        if change > tolerance and current - previous >= min_delta_us:
+            regressions.append(f"{name}: {previous:.1f}µs -> {current:.1f}µs (+{change:.0%})")
+    return regressions
+
+
+def format_results(results: Dict[str, float], baseline: Optional[Dict[str, float]] = None) -> str:
+    """Format results as a table, with the change vs baseline if available"""
+    lines = [
+        "=" * 72,
+        "ORCHESTRATION OVERHEAD (µs per call, zero-latency LLM)",
+        "=" * 72,
+    ]
+    for name, value in sorted(results.items()):
+        line = f"{name:<48} {value:>10.1f}"
+        if baseline and baseline.get(name):
+            line += f"   {(value - baseline[name]) / baseline[name]:+.0%}"
+        lines.append(line)
+    lines.append("=" * 72)
+    return "\n".join(lines)
+
+
+def parse_arguments():
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description="Benchmark workflow orchestration overhead")
+    parser.add_argument("--iterations", type=int, default=2000, help="Calls per measurement (default: 2000)")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH, help="Baseline file path")
+    parser.add_argument("--save-baseline", action="store_true", help="Save results as the new baseline")
+    parser.add_argument("--check", action="store_true", help="Exit non-zero if any benchmark regressed")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative slowdown (default: 0.25)")
+    parser.add_argument("--min-delta-us", type=float, default=5.0, help="Ignore slowdowns below this many µs (default: 5)")
+    return parser.parse_args()
+
+
+async def main() -> int:
+    """Main entry point."""
+    args = parse_arguments()
+
+    results = await run_benchmarks(iterations=args.iterations)
+
+    baseline: Optional[Dict[str, float]] = None
+    if args.baseline.exists():
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+
+    print(format_results(results, baseline))
+
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({"python": sys.version.split()[0], "results": results}, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"\n📁 Baseline saved to: {args.baseline}")
+
+    if args.check:
+        if baseline is None:
+            print(f"\n❌ No baseline found at {args.baseline}")
+            return 1
+        regressions = compare_to_baseline(results, baseline, args.tolerance, args.min_delta_us)
+        if regressions:
+            print(f"\n❌ {len(regressions)} benchmark(s) regressed by more than {args.tolerance:.0%}:")
+            for regression in regressions:
+                print(f"  - {regression}")
+            return 1
+        print(f"\n✅ No regressions beyond {args.tolerance:.0%}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
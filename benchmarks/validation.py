@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Field validation benchmarks over every registered eval case.
+
+Each case's expected output is validated against its own field_validations,
+so the numbers cover only Evaluator work: resolving field paths, running the
+compiled checks and ListMatches matching. Criteria fields fail fast (no judge
+client is configured), so no LLM is involved.
+
+Measures, per pass over all cases:
+- compile: compiling every case's field_validations
+- validate.reference: the Evaluator's field validation from before rules were
+  compiled (reference_validate), as the comparison point
+- validate.single: a fresh Evaluator validating each case once, as in an eval
+  run (rules are checked as given, not compiled)
+- validate.compiled: validating again with every case's compiled rules kept for reuse
+
+Examples:
+  # Run and print results
+  python -m benchmarks.validation
+
+  # Save the current results as the baseline
+  python -m benchmarks.validation --save-baseline
+
+  # Compare against the baseline, exit non-zero on regression
+  python -m benchmarks.validation --check --tolerance 0.25
+"""
+
+import argparse
+import asyncio
+import importlib
+import json
+import pkgutil
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+from benchmarks.overhead import compare_to_baseline
+from evals.compiled_validators import compile_field_validations
+from evals.decorators import get_registry
+from evals.evaluator import Evaluator
+from evals.field_validators import AllOf, Contains, Criteria, Exact, ListMatches, OneOf, Substring
+from evals.list_matching import match_list
+
+BASELINE_PATH = Path(__file__).parent / "baselines" / "validation.json"
+
+
+def load_validation_cases() -> List[Tuple[BaseModel, Dict[str, Any]]]:
+    """(expected output, field_validations) of every registered case that has both"""
+    import evals.cases
+    for module in pkgutil.iter_modules(evals.cases.__path__):
+        importlib.import_module(f"evals.cases.{module.name}")
+
+    cases = []
+    for functions in get_registry().values():
+        for func in functions.values():
+            case_data = func()
+            expected = case_data.get("expected")
+            field_validations = case_data.get("field_validations")
+            if isinstance(expected, BaseModel) and field_validations:
+                cases.append((expected, field_validations))
+    return cases
+
+
+async def _reference_list_matches(
+    field_name: str,
+    actual_list: List[Any],
+    expected_specs: List[Dict[str, Any]],
+    allow_extras: bool
+) -> List[str]:
+    failures = []
+    result = match_list(actual_list, expected_specs)
+    for spec_idx in result.unmatched_specs:
+        spec_str = ", ".join(
+            f"{k}={v.value if isinstance(v, Exact) else v.value if isinstance(v, Substring) else v}"
+            for k, v in expected_specs[spec_idx].items()
+        )
+        if spec_idx in result.contested_specs:
+            failures.append(
+                f"Field '{field_name}': no item matching spec [{spec_str}] "
+                f"(matching items are matched by other specs)"
+            )
+        else:
+            failures.append(f"Field '{field_name}': no item matching spec [{spec_str}]")
+    if result.extras and not allow_extras:
+        failures.append(f"Field '{field_name}': unexpected items {[actual_list[i] for i in result.extras]}")
+    return failures
+
+
+async def reference_validate(actual: BaseModel, field_validations: Dict[str, Any]) -> Tuple[bool, Optional[str]]:
+    """
+    Field validation as the Evaluator did it before rules were compiled.
+
+    Every field goes through an isinstance dispatch on its validator, and
+    ListMatches specs go to match_list as given, on every call. Criteria
+    fields fail as they do without a judge client.
+
+    Returns:
+        Tuple of (passed, failure_reason), as Evaluator.validate
+    """
+    actual_dict = actual.model_dump()
+    failures = []
+
+    for field_name, validator in field_validations.items():
+        if '.' in field_name:
+            actual_value = actual_dict
+            for part in field_name.split('.'):
+                if isinstance(actual_value, dict) and part in actual_value:
+                    actual_value = actual_value[part]
+                else:
+                    failures.append(f"Field '{field_name}' not found in output")
+                    actual_value = None
+                    break
+            if actual_value is None:
+                continue
+        else:
+            if field_name not in actual_dict:
+                failures.append(f"Field '{field_name}' not found in output")
+                continue
+            actual_value = actual_dict[field_name]
+
+        if isinstance(validator, Exact):
+            if not validator.case_sensitive and isinstance(actual_value, str) and isinstance(validator.value, str):
+                match = actual_value.lower() == validator.value.lower()
+            else:
+                match = actual_value == validator.value
+            if not match:
+                failures.append(f"Field '{field_name}': expected {validator.value}, got {actual_value}")
+        elif isinstance(validator, OneOf):
+            if not validator.case_sensitive and isinstance(actual_value, str):
+                match = actual_value.lower() in [v.lower() if isinstance(v, str) else v for v in validator.values]
+            else:
+                match = actual_value in validator.values
+            if not match:
+                failures.append(f"Field '{field_name}': expected one of {validator.values}, got {actual_value}")
+        elif isinstance(validator, AllOf):
+            if not isinstance(actual_value, list):
+                failures.append(f"Field '{field_name}': expected list for AllOf validation, got {type(actual_value)}")
+            elif set(actual_value) != set(validator.values):
+                failures.append(f"Field '{field_name}': expected all of {validator.values}, got {actual_value}")
+        elif isinstance(validator, Contains):
+            if not isinstance(actual_value, list):
+                failures.append(f"Field '{field_name}': expected list for Contains validation, got {type(actual_value)}")
+            elif not set(validator.values).issubset(set(actual_value)):
+                failures.append(f"Field '{field_name}': missing required values {set(validator.values) - set(actual_value)}")
+        elif isinstance(validator, Criteria):
+            failures.append(f"Field '{field_name}': No judge client configured for criteria validation")
+        elif isinstance(validator, Substring):
+            if not isinstance(actual_value, str):
+                failures.append(
+                    f"Field '{field_name}': expected string for Substring validation, got {type(actual_value)}"
+                )
+            else:
+                if not validator.case_sensitive:
+                    match = validator.value.lower() in actual_value.lower()
+                else:
+                    match = validator.value in actual_value
+                if not match:
+                    failures.append(
+                        f"Field '{field_name}': expected to contain '{validator.value}', got '{actual_value}'"
+                    )
+        elif isinstance(validator, ListMatches):
+            if not isinstance(actual_value, list):
+                failures.append(
+                    f"Field '{field_name}': expected list for ListMatches validation, got {type(actual_value)}"
+                )
+            else:
+                failures.extend(await _reference_list_matches(
+                    field_name, actual_value, validator.items, validator.allow_extras
+                ))
+        else:
+            failures.append(f"Field '{field_name}': unknown validator type {type(validator)}")
+
+    if failures:
+        return False, "; ".join(failures)
+    return True, None
+
+
+async def time_pass(validate_all, passes: int) -> float:
+    """Best-of-three mean time per pass in milliseconds"""
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(passes):
+            await validate_all()
+        best = min(best, (time.perf_counter() - start) / passes)
+    return best * 1000
+
+
+async def run_benchmarks(passes: int = 20) -> Tuple[Dict[str, float], int]:
+    """
+    Run the validation benchmarks.
+
+    Args:
+        passes: Passes over all cases per measurement
+
+    Returns:
+        (benchmark name -> milliseconds per pass, number of cases)
+    """
+    cases = load_validation_cases()
+    evaluator = Evaluator()
+
+    async def compile_all():
+        for _, field_validations in cases:
+            compile_field_validations(field_validations)
+
+    async def validate_reference():
+        for expected, field_validations in cases:
+            await reference_validate(expected, field_validations)
+
+    async def validate_single():
+        single_evaluator = Evaluator()
+        for expected, field_validations in cases:
+            await single_evaluator.validate(expected, expected, field_validations)
+
+    async def validate_compiled():
+        for expected, field_validations in cases:
+            await evaluator.validate(expected, expected, field_validations)
+
+    # Each case is compiled on its second validation, so compile them all before timing reuse
+    await validate_compiled()
+    await validate_compiled()
+
+    results = {
+        "compile": await time_pass(compile_all, passes),
+        "validate.reference": await time_pass(validate_reference, passes),
+        "validate.single": await time_pass(validate_single, passes),
+        "validate.compiled": await time_pass(validate_compiled, passes),
+    }
+    return results, len(cases)
+
+
+def format_results(results: Dict[str, float], case_count: int, baseline: Optional[Dict[str, float]] = None) -> str:
+    """Format results as a table, with the change vs baseline if available"""
+    lines = [
+        "=" * 72,
+        f"FIELD VALIDATION (ms per pass over {case_count} cases)",
+        "=" * 72,
+    ]
+    for name, value in sorted(results.items()):
+        line = f"{name:<32} {value:>10.2f}   {value * 1000 / max(case_count, 1):>8.1f}µs/case"
+        if baseline and baseline.get(name):
+            line += f"   {(value - baseline[name]) / baseline[name]:+.0%}"
+        lines.append(line)
+    lines.append("=" * 72)
+    return "\n".join(lines)
+
+
+def parse_arguments():
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description="Benchmark field validation over all registered eval cases")
+    parser.add_argument("--passes", type=int, default=20, help="Passes over all cases per measurement (default: 20)")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH, help="Baseline file path")
+    parser.add_argument("--save-baseline", action="store_true", help="Save results as the new baseline")
+    parser.add_argument("--check", action="store_true", help="Exit non-zero if any benchmark regressed")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative slowdown (default: 0.25)")
+    return parser.parse_args()
+
+
+async def main() -> int:
+    """Main entry point."""
+    args = parse_arguments()
+
+    results, case_count = await run_benchmarks(passes=args.passes)
+
+    baseline: Optional[Dict[str, float]] = None
+    if args.baseline.exists():
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+
+    print(format_results(results, case_count, baseline))
+
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({"python": sys.version.split()[0], "cases": case_count, "results": results}, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"\n📁 Baseline saved to: {args.baseline}")
+
+    if args.check:
+        if baseline is None:
+            print(f"\n❌ No baseline found at {args.baseline}")
+            return 1
+        # Results are in ms per pass; ignore slowdowns below 0.1ms
+        regressions = compare_to_baseline(results, baseline, args.tolerance, min_delta_us=0.1)
+        if regressions:
+            print(f"\n❌ {len(regressions)} benchmark(s) regressed by more than {args.tolerance:.0%}:")
+            for regression in regressions:
+                print(f"  - {regression.replace('µs', 'ms')}")
+            return 1
+        print(f"\n✅ No regressions beyond {args.tolerance:.0%}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
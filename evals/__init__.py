@@ -11,7 +11,7 @@ A lightweight framework for evaluating LLM agent nodes with support for:
 from .core import EvalCase, EvalResult
 from .evaluator import Evaluator
 from .field_validators import Exact, OneOf, AllOf, Contains, Criteria
-from .judge import LLMJudge, JudgeResult
+from .judge import BatchedLLMJudge, LLMJudge, JudgeResult
 from .runner import EvalRunner
 from .decorators import eval_case, get_eval_case
 from .registry import EvalRegistry
@@ -31,6 +31,7 @@ __all__ = [
     "Criteria",
     # Judge
     "LLMJudge",
+    "BatchedLLMJudge",
     "JudgeResult",
     # Runner
     "EvalRunner",
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Build the few-shot example stores from the eval cases.
+
+For each supported agent, every registered eval case becomes an example:
+the case's query and its expected output rendered in the agent's response
+XML. The stores are written to src/prompts/examples/<AgentClass>.json and
+loaded at runtime by src/core_nodes/example_store.py.
+
+Re-run after adding or changing eval cases:
+  python -m evals.build_example_stores
+"""
+
+import argparse
+import importlib
+from pathlib import Path
+from typing import Any, Dict, List, Optional, get_args
+
+from pydantic import BaseModel
+
+from evals.registry import EvalRegistry
+from src.core_nodes.example_store import DEFAULT_EXAMPLES_DIR, Example, ExampleStore
+from src.models.base_models import QueryInput
+
+# Agent class -> eval case modules its examples come from. Only agents taking
+# a QueryInput and returning a flat response (fields and lists of entities)
+# are supported.
+AGENT_CASE_MODULES: Dict[str, List[str]] = {
+    "src.workflow_nodes.query_preprocessing.processable_entity_extraction_agent.ProcessableEntityExtractionAgent": [
+        "evals.cases.processable_entity_extraction",
+        "evals.cases.processable_entity_extraction_predicted",
+    ],
+    "src.workflow_nodes.query_preprocessing.unprocessable_entity_extraction_agent.UnprocessableEntityExtractionAgent": [
+        "evals.cases.unprocessable_entity_extraction",
+        "evals.cases.unprocessable_entity_extraction_predicted",
+    ],
+    "src.workflow_nodes.query_preprocessing.query_security_validation_agent.QuerySecurityValidationAgent": [
+        "evals.cases.query_security",
+    ],
+    "src.workflow_nodes.query_preprocessing.user_intent_validation_agent.UserIntentValidationAgent": [
+        "evals.cases.user_intent",
+    ],
+    "src.workflow_nodes.query_preprocessing.pii_extraction_agent.PIIExtractionAgent": [
+        "evals.cases.pii_extraction",
+    ],
+}
+
+
+def _xml_value(value: Any) -> str:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+def _singular(name: str) -> str:
+    if name.endswith("ies"):
+        return name[:-3] + "y"
+    return name[:-1] if name.endswith("s") else name
+
+
+def render_response(output: BaseModel) -> str:
+    """
+    Render an expected output as the agent's response XML.
+
+    Scalar fields become <field>value</field>; lists of models become
+    <entities><entity>...</entity></entities> (item tag = singular of the field).
+    """
+    lines = ["<response>"]
+    for name, value in output:
+        if name == "raw_response" or value is None:
+            continue
+        if isinstance(value, list):
+            item_tag = _singular(name)
+            lines.append(f"<{name}>")
+            for item in value:
+                lines.append(f"<{item_tag}>")
+                for field_name, field_value in item:
+                    lines.append(f"<{field_name}>{_xml_value(field_value)}</{field_name}>")
+                lines.append(f"</{item_tag}>")
+            lines.append(f"</{name}>")
+        elif isinstance(value, BaseModel):
+            raise ValueError(f"Nested field {name!r} is not supported")
+        else:
+            lines.append(f"<{name}>{_xml_value(value)}</{name}>")
+    lines.append("</response>")
+    return "\n".join(lines)
+
+
+def build_store(agent_path: str, case_modules: List[str]) -> ExampleStore:
+    """Collect one agent's eval cases into an ExampleStore (first case wins for repeated queries)"""
+    module_name, class_name = agent_path.rsplit(".", 1)
+    agent_class = getattr(importlib.import_module(module_name), class_name)
+    for case_module in case_modules:
+        importlib.import_module(case_module)  # registers the cases
+
+    # AgentNodeBase[TInput, TOutput] -> TOutput
+    output_type = next(
+        get_args(base)[1] for base in agent_class.__orig_bases__ if len(get_args(base)) == 2
+    )
+    registry = EvalRegistry.for_agent(agent_class=agent_class, input_type=QueryInput, output_type=output_type)
+
+    examples: List[Example] = []
+    seen = set()
+    for name in registry.list_case_names():
+        case = registry.get_case(name)
+        query = case.input_data.query
+        if query in seen:
+            continue
+        seen.add(query)
+        examples.append(Example(name=name, query=query, response=render_response(case.expected_output)))
+    return ExampleStore(examples)
+
+
+def main(output_dir: Optional[Path] = None) -> None:
+    output_dir = output_dir or DEFAULT_EXAMPLES_DIR
+    for agent_path, case_modules in AGENT_CASE_MODULES.items():
+        agent_name = agent_path.rsplit(".", 1)[1]
+        store = build_store(agent_path, case_modules)
+        path = output_dir / f"{agent_name}.json"
+        store.save(path, agent_name)
+        print(f"{agent_name}: {len(store.examples)} examples -> {path}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build few-shot example stores from the eval cases")
+    parser.add_argument("--output-dir", type=Path, help=f"Output directory (default: {DEFAULT_EXAMPLES_DIR})")
+    main(parser.parse_args().output_dir)
@@ -0,0 +1,334 @@
+"""
+Declarative eval case files, streamed into EvalRunner.
+
+A case file holds one case per record: the case metadata, the input and
+expected output as plain JSON and the field_validations serialised with
+their validator type:
+
+    {"name": "basic_merchant", "agent": "ProcessableEntityExtractionAgent",
+     "description": "Simple merchant extraction", "tags": ["merchant"], "priority": 0,
+     "input": {"query": "Tesco transactions"},
+     "expected": {"entities": [{"type": "merchant", "value": "Tesco"}]},
+     "field_validations": {"entities": {"validator": "ListMatches", "items": [
+         {"type": {"validator": "Exact", "value": "merchant"},
+          "value": {"validator": "Substring", "value": "Tesco"}}]}}}
+
+Files ending in .jsonl are JSON Lines. Files ending in .parquet store the
+metadata as columns and input, expected and field_validations as JSON
+strings; reading and writing them requires pyarrow.
+
+iter_case_file() reads a file one record (or Parquet row batch) at a time
+and builds each EvalCase only when the runner asks for it, so a file with
+thousands of cases never has more than a window of them in memory:
+
+    cases = iter_case_file("evals/case_data/user_intent.jsonl", QueryInput, UserIntentValidationOutput)
+    results = await runner.run_batch(cases, parallel=True, batch_size=3)
+
+The existing decorator case modules can be converted with:
+
+    python -m evals.case_files evals.cases.user_intent --output evals/case_data/user_intent.jsonl
+"""
+
+import argparse
+import importlib
+import json
+import sys
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Type, Union
+
+from pydantic import BaseModel
+
+from evals.core import EvalCase
+from evals.decorators import get_registry
+from evals.field_validators import (
+    FieldValidator,
+    Exact,
+    OneOf,
+    AllOf,
+    Contains,
+    Criteria,
+    Substring,
+    ListMatches
+)
+
+VALIDATOR_TYPES: Dict[str, Type[FieldValidator]] = {
+    cls.__name__: cls for cls in (Exact, OneOf, AllOf, Contains, Criteria, Substring, ListMatches)
+}
+
+# Parquet columns holding nested JSON
+_JSON_COLUMNS = ("input", "expected", "field_validations")
+# Row batch size when streaming Parquet
+_PARQUET_BATCH_SIZE = 256
+
+
+def serialize_validator(validator: FieldValidator) -> Dict[str, Any]:
+    """
+    Serialise a field validator to a JSON-compatible dict.
+
+    Plain values in ListMatches item specs are written as Exact, which is how
+    they are compared.
+
+    Args:
+        validator: Field validator
+
+    Returns:
+        {"validator": <type name>, **non-default fields}
+
+    Raises:
+        ValueError: If the validator type has no serialised form
+    """
+    validator_type = type(validator).__name__
+    if VALIDATOR_TYPES.get(validator_type) is not type(validator):
+        raise ValueError(f"Cannot serialise validator type {type(validator)}")
+
+    if isinstance(validator, ListMatches):
+        data: Dict[str, Any] = {"items": [
+            {
+                field: serialize_validator(spec if isinstance(spec, FieldValidator) else Exact(value=spec))
+                for field, spec in item.items()
+            }
+            for item in validator.items
+        ]}
+        if not validator.allow_extras:
+            data["allow_extras"] = False
+    else:
+        data = validator.model_dump(mode="json", exclude_defaults=True)
+    return {"validator": validator_type, **data}
+
+
+def deserialize_validator(data: Dict[str, Any]) -> FieldValidator:
+    """
+    Build a field validator from its serialised form.
+
+    Raises:
+        ValueError: If the validator type is unknown or its fields are invalid
+    """
+    fields = dict(data)
+    validator_type = fields.pop("validator", None)
+    cls = VALIDATOR_TYPES.get(validator_type)
+    if cls is None:
+        raise ValueError(f"Unknown validator type: {validator_type!r}")
+    if cls is ListMatches:
+        fields["items"] = [
+            {field: deserialize_validator(spec) for field, spec in item.items()}
+            for item in fields.get("items", [])
+        ]
+    return cls(**fields)
+
+
+def case_record(func: Callable) -> Dict[str, Any]:
+    """
+    Case file record of a decorated case function.
+
+    Args:
+        func: Function registered with @eval_case
+
+    Returns:
+        Record with metadata, input, expected output and serialised field_validations
+
+    Raises:
+        ValueError: If the case's input or expected output isn't a Pydantic model
+    """
+    metadata = func.eval_metadata
+    case_data = func()
+    input_data = case_data.get("input")
+    expected = case_data.get("expected")
+    field_validations = case_data.get("field_validations")
+
+    if not isinstance(input_data, BaseModel):
+        raise ValueError(f"Case {metadata['name']}: input is not a Pydantic model")
+    if expected is not None and not isinstance(expected, BaseModel):
+        raise ValueError(f"Case {metadata['name']}: expected output is not a Pydantic model")
+
+    agent_class = metadata.get("agent_class")
+    return {
+        "name": metadata["name"],
+        "agent": agent_class.__name__ if agent_class else None,
+        "description": metadata.get("description"),
+        "tags": list(metadata.get("tags", [])),
+        "priority": metadata.get("priority", 0),
+        "input": input_data.model_dump(mode="json"),
+        "expected": expected.model_dump(mode="json") if expected is not None else None,
+        "field_validations": {
+            field: serialize_validator(validator) for field, validator in field_validations.items()
+        } if field_validations else None
+    }
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow  # noqa: F401
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        raise RuntimeError("Parquet case files require pyarrow (pip install pyarrow); use .jsonl instead")
+    return pyarrow
+
+
+def write_case_file(records: Iterable[Dict[str, Any]], path: Union[str, Path]) -> int:
+    """
+    Write case records to a .jsonl or .parquet case file.
+
+    Args:
+        records: Records as built by case_record()
+        path: Output file; the format follows the suffix
+
+    Returns:
+        Number of records written
+    """
+    path = Path(path)
+    pyarrow = _require_pyarrow() if path.suffix == ".parquet" else None
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    if pyarrow is not None:
+        rows = [
+            {**record, **{column: json.dumps(record.get(column)) for column in _JSON_COLUMNS}}
+            for record in records
+        ]
+        pyarrow.parquet.write_table(pyarrow.Table.from_pylist(rows), path)
+        return len(rows)
+
+    count = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            count += 1
+    return count
+
+
+def iter_case_records(path: Union[str, Path]) -> Iterator[Dict[str, Any]]:
+    """
+    Stream the raw records of a case file.
+
+    Raises:
+        ValueError: If a JSONL line is not valid JSON
+    """
+    path = Path(path)
+
+    if path.suffix == ".parquet":
+        pyarrow = _require_pyarrow()
+        parquet_file = pyarrow.parquet.ParquetFile(path)
+        for batch in parquet_file.iter_batches(batch_size=_PARQUET_BATCH_SIZE):
+            for row in batch.to_pylist():
+                for column in _JSON_COLUMNS:
+                    row[column] = json.loads(row[column]) if row.get(column) is not None else None
+                yield row
+        return
+
+    with open(path, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{path}:{line_number}: invalid case record: {e}") from e
+
+
+def build_eval_case(record: Dict[str, Any], input_type: Type[BaseModel], output_type: Type[BaseModel]) -> EvalCase:
+    """Build the EvalCase of one case file record"""
+    field_validations = record.get("field_validations")
+    return EvalCase[input_type, output_type](
+        name=record["name"],
+        input_data=input_type.model_validate(record["input"]),
+        expected_output=output_type.model_validate(record["expected"]) if record.get("expected") is not None else None,
+        field_validations={
+            field: deserialize_validator(validator) for field, validator in field_validations.items()
+        } if field_validations else None,
+        description=record.get("description")
+    )
+
+
+def iter_case_file(
+    path: Union[str, Path],
+    input_type: Type[BaseModel],
+    output_type: Type[BaseModel],
+    agent: Optional[str] = None,
+    names: Optional[List[str]] = None,
+    tags: Optional[List[str]] = None,
+    priority_min: Optional[int] = None,
+    tags_match_all: bool = False
+) -> Iterator[EvalCase]:
+    """
+    Stream the EvalCases of a case file, with the same filters as EvalRegistry.get_cases.
+
+    Records are read and cases built one at a time, as the iterator is consumed.
+
+    Args:
+        path: .jsonl or .parquet case file
+        input_type: Input type for the agent
+        output_type: Output type for the agent
+        agent: Only cases of this agent class name (e.g. "UserIntentValidationAgent")
+        names: Specific case names to get
+        tags: Filter by tags (cases must have at least one matching tag)
+        priority_min: Minimum priority level
+        tags_match_all: Cases must have all of the tags instead of at least one
+
+    Yields:
+        EvalCase for each matching record, in file order
+
+    Raises:
+        ValueError: If a record is malformed (reported with the case name)
+    """
+    wanted = set(names) if names else None
+    for record in iter_case_records(path):
+        if agent is not None and record.get("agent") != agent:
+            continue
+        if wanted is not None and record.get("name") not in wanted:
+            continue
+        if tags:
+            record_tags = record.get("tags") or []
+            if tags_match_all and not all(tag in record_tags for tag in tags):
+                continue
+            if not tags_match_all and not any(tag in record_tags for tag in tags):
+                continue
+        if priority_min is not None and record.get("priority", 0) < priority_min:
+            continue
+        try:
+            yield build_eval_case(record, input_type, output_type)
+        except (KeyError, ValueError) as e:
+            raise ValueError(f"{path}: invalid case {record.get('name')!r}: {e}") from e
+
+
+def convert_modules(modules: List[str], output: Union[str, Path]) -> int:
+    """
+    Convert decorator case modules to a case file.
+
+    Args:
+        modules: Case modules (e.g. evals.cases.user_intent)
+        output: Case file to write (.jsonl or .parquet)
+
+    Returns:
+        Number of cases written
+    """
+    for module in modules:
+        importlib.import_module(module)
+
+    functions = [
+        func
+        for agent_functions in get_registry().values()
+        for func in agent_functions.values()
+        if func.eval_metadata["function"].__module__ in modules
+    ]
+    # Keep the modules in the order given
+    functions.sort(key=lambda func: modules.index(func.eval_metadata["function"].__module__))
+    return write_case_file((case_record(func) for func in functions), output)
+
+
+def parse_arguments():
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description="Convert eval case modules to a declarative case file")
+    parser.add_argument("modules", nargs="+", help="Case modules to convert (e.g. evals.cases.user_intent)")
+    parser.add_argument("--output", "-o", type=Path, required=True, help="Case file to write (.jsonl or .parquet)")
+    return parser.parse_args()
+
+
+def main() -> int:
+    """Main entry point."""
+    args = parse_arguments()
+    count = convert_modules(args.modules, args.output)
+    print(f"📁 Wrote {count} cases to: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,215 @@
+"""
+Index of the eval cases defined in evals/cases/, built without importing them.
+
+Each case module is parsed with ast and every @eval_case decorator with
+literal arguments is recorded (name, agent class name, tags, priority,
+description, module, function and line). The index is cached in
+evals/cache/case_index.json and a module is only parsed again when its
+mtime or size changes, so listing or selecting cases costs a stat per
+module. EvalRegistry.for_agent(..., use_index=True) uses it to import only
+the modules that contain the selected cases.
+
+A module whose decorators can't be read statically (e.g. a computed name)
+is marked incomplete; the registry imports it instead of trusting the index.
+"""
+
+import ast
+import json
+import os
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+DEFAULT_CASES_DIR = Path(__file__).parent / "cases"
+DEFAULT_CACHE_PATH = Path(__file__).parent / "cache" / "case_index.json"
+
+# Bump when the cached entry format changes
+_INDEX_VERSION = 1
+
+
+@dataclass(frozen=True)
+class IndexedCase:
+    """Metadata of one @eval_case, read from source"""
+    name: str
+    agent: Optional[str]
+    tags: Tuple[str, ...]
+    priority: int
+    description: Optional[str]
+    module: str
+    function: str
+    line: int
+
+
+def _decorator_call(node: ast.expr) -> Optional[ast.Call]:
+    """The eval_case(...) call of a decorator, if it is one"""
+    if not isinstance(node, ast.Call):
+        return None
+    func = node.func
+    name = func.id if isinstance(func, ast.Name) else func.attr if isinstance(func, ast.Attribute) else None
+    return node if name == "eval_case" else None
+
+
+def index_source(source: str, module: str) -> Tuple[List[IndexedCase], bool]:
+    """
+    Read the eval cases defined in a module's source.
+
+    Args:
+        source: Module source code
+        module: Dotted module name (e.g. evals.cases.user_intent)
+
+    Returns:
+        (cases in definition order, whether every decorator could be read)
+    """
+    tree = ast.parse(source)
+
+    # Imported names -> original names, so an aliased agent class is indexed by its class name
+    aliases: Dict[str, str] = {}
+    for node in tree.body:
+        if isinstance(node, ast.ImportFrom):
+            for alias in node.names:
+                aliases[alias.asname or alias.name] = alias.name
+
+    cases: List[IndexedCase] = []
+    complete = True
+    for node in tree.body:
+        if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            continue
+        for decorator in node.decorator_list:
+            call = _decorator_call(decorator)
+            if call is None:
+                continue
+            try:
+                if call.args:
+                    raise ValueError("positional eval_case arguments")
+                arguments: Dict[str, Any] = {}
+                for keyword in call.keywords:
+                    if keyword.arg == "agent_class":
+                        value = keyword.value
+                        if isinstance(value, ast.Name):
+                            arguments["agent_class"] = aliases.get(value.id, value.id)
+                        elif isinstance(value, ast.Attribute):
+                            arguments["agent_class"] = value.attr
+                        elif isinstance(value, ast.Constant) and value.value is None:
+                            arguments["agent_class"] = None
+                        else:
+                            raise ValueError("agent_class is not a name")
+                    elif keyword.arg is not None:
+                        arguments[keyword.arg] = ast.literal_eval(keyword.value)
+                    else:
+                        raise ValueError("**kwargs in eval_case")
+                cases.append(IndexedCase(
+                    name=arguments["name"],
+                    agent=arguments.get("agent_class"),
+                    tags=tuple(arguments.get("tags") or ()),
+                    priority=arguments.get("priority", 0),
+                    description=arguments.get("description"),
+                    module=module,
+                    function=node.name,
+                    line=node.lineno
+                ))
+            except (KeyError, ValueError):
+                complete = False
+    return cases, complete
+
+
+class CaseIndex:
+    """Cases of every module in a cases directory, cached on disk by file mtime"""
+
+    def __init__(
+        self,
+        cases_dir: Optional[Path] = None,
+        cache_path: Optional[Path] = None,
+        package: str = "evals.cases"
+    ):
+        """
+        Args:
+            cases_dir: Directory of case modules (defaults to evals/cases)
+            cache_path: Index cache file (defaults to evals/cache/case_index.json)
+            package: Package the case modules are imported from
+        """
+        self.cases_dir = cases_dir or DEFAULT_CASES_DIR
+        self.cache_path = cache_path or DEFAULT_CACHE_PATH
+        self.package = package
+        self.cases: List[IndexedCase] = []
+        # Modules whose decorators couldn't all be read
+        self.incomplete_modules: List[str] = []
+        # Modules parsed by the last refresh (the rest came from the cache)
+        self.parsed_modules: List[str] = []
+        self._by_agent: Dict[Optional[str], List[IndexedCase]] = {}
+        self._tags: Dict[Optional[str], Dict[str, List[str]]] = {}
+        self.refresh()
+
+    def _read_cache(self) -> Dict[str, Any]:
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if cache.get("version") != _INDEX_VERSION:
+            return {}
+        return cache.get("modules", {})
+
+    def _write_cache(self, modules: Dict[str, Any]) -> None:
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        # Written under a per-process name and renamed, so concurrent runs never read a partial file
+        tmp_path = self.cache_path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": _INDEX_VERSION, "modules": modules}, f, separators=(",", ":"))
+        tmp_path.replace(self.cache_path)
+
+    def refresh(self) -> None:
+        """Re-parse the modules that changed since they were cached"""
+        cached = self._read_cache()
+        modules: Dict[str, Any] = {}
+        self.parsed_modules = []
+
+        for path in sorted(self.cases_dir.glob("*.py")):
+            if path.name.startswith("_"):
+                continue
+            stat = path.stat()
+            module = f"{self.package}.{path.stem}"
+            entry = cached.get(path.name)
+            if (
+                entry is None
+                or entry["module"] != module
+                or entry["mtime_ns"] != stat.st_mtime_ns
+                or entry["size"] != stat.st_size
+            ):
+                cases, complete = index_source(path.read_text(encoding="utf-8"), module)
+                entry = {
+                    "mtime_ns": stat.st_mtime_ns,
+                    "size": stat.st_size,
+                    "module": module,
+                    "complete": complete,
+                    "cases": [asdict(case) for case in cases]
+                }
+                self.parsed_modules.append(module)
+            modules[path.name] = entry
+
+        if self.parsed_modules or set(modules) != set(cached):
+            self._write_cache(modules)
+
+        self.cases = []
+        self.incomplete_modules = []
+        for entry in modules.values():
+            self.cases.extend(
+                IndexedCase(**{**case, "tags": tuple(case["tags"])}) for case in entry["cases"]
+            )
+            if not entry["complete"]:
+                self.incomplete_modules.append(entry["module"])
+
+        self._by_agent = {}
+        self._tags = {}
+        for case in self.cases:
+            self._by_agent.setdefault(case.agent, []).append(case)
+            tag_index = self._tags.setdefault(case.agent, {})
+            for tag in case.tags:
+                tag_index.setdefault(tag, []).append(case.name)
+
+    def for_agent(self, agent_name: str) -> List[IndexedCase]:
+        """Cases of an agent, in module and definition order"""
+        return list(self._by_agent.get(agent_name, []))
+
+    def tag_index(self, agent_name: str) -> Dict[str, List[str]]:
+        """Tag -> names of the agent's cases with that tag"""
+        return {tag: list(names) for tag, names in self._tags.get(agent_name, {}).items()}
@@ -0,0 +1,198 @@
+"""
+Compilation of field_validations into pre-built checks.
+
+A case's field_validations dict is compiled once into a list of
+CompiledField: dotted paths are split, OneOf values are pre-lowered into
+sets, Exact values are pre-lowered, AllOf/Contains values are pre-built
+sets and ListMatches item specs are compiled by evals/list_matching.py.
+Validating an output is then one pass of plain function calls, with no
+isinstance dispatch per value.
+
+Compiling costs more than checking the rules as given once, so check_field()
+checks one field without compiling it; the Evaluator uses it for a case's
+first validation and compiles the case when it is validated again.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from evals.field_validators import (
+    Exact,
+    OneOf,
+    AllOf,
+    Contains,
+    Criteria,
+    Substring,
+    ListMatches
+)
+from evals.list_matching import compile_item_spec, compile_value_check, match_list, satisfies_all, value_matches
+
+# Check on one output field: failure messages, empty if it passed
+FieldCheck = Callable[[Any], Sequence[str]]
+
+_PASSED: Tuple[str, ...] = ()
+
+
+# Not frozen: compiling a case builds one per field, and frozen dataclasses are slower to construct
+@dataclass
+class CompiledField:
+    """A compiled validation rule for one field of the output"""
+    name: str
+    path: Tuple[str, ...]
+    # None for Criteria fields, which are judged instead
+    check: Optional[FieldCheck] = None
+    criteria: Optional[List[str]] = None
+
+
+def _value_failures(name: str, validator: Any, value: Any) -> List[str]:
+    """Failure message of an Exact, OneOf or Substring field that didn't match"""
+    if isinstance(validator, Substring):
+        if not isinstance(value, str):
+            return [f"Field '{name}': expected string for Substring validation, got {type(value)}"]
+        return [f"Field '{name}': expected to contain '{validator.value}', got '{value}'"]
+    if isinstance(validator, OneOf):
+        return [f"Field '{name}': expected one of {validator.values}, got {value}"]
+    return [f"Field '{name}': expected {validator.value}, got {value}"]
+
+
+def _compile_value_field(name: str, validator: Any) -> FieldCheck:
+    # A Substring check never matches a value that isn't a string
+    matches = compile_value_check(validator)
+
+    def check(value: Any) -> Sequence[str]:
+        if matches(value):
+            return _PASSED
+        return _value_failures(name, validator, value)
+    return check
+
+
+def _compile_all_of(name: str, validator: AllOf) -> FieldCheck:
+    values = validator.values
+    expected = set(values)
+
+    def check(value: Any) -> Sequence[str]:
+        if not isinstance(value, list):
+            return [f"Field '{name}': expected list for AllOf validation, got {type(value)}"]
+        if set(value) != expected:
+            return [f"Field '{name}': expected all of {values}, got {value}"]
+        return _PASSED
+    return check
+
+
+def _compile_contains(name: str, validator: Contains) -> FieldCheck:
+    required = set(validator.values)
+
+    def check(value: Any) -> Sequence[str]:
+        if not isinstance(value, list):
+            return [f"Field '{name}': expected list for Contains validation, got {type(value)}"]
+        missing = required - set(value)
+        if missing:
+            return [f"Field '{name}': missing required values {missing}"]
+        return _PASSED
+    return check
+
+
+def _format_spec(spec: Dict[str, Any]) -> str:
+    return ", ".join(
+        f"{k}={v.value if isinstance(v, (Exact, Substring)) else v}"
+        for k, v in spec.items()
+    )
+
+
+def _check_list_matches(name: str, validator: ListMatches, value: Any, specs: List[Any]) -> Sequence[str]:
+    """ListMatches check with the item specs compiled, or as given"""
+    if not isinstance(value, list):
+        return [f"Field '{name}': expected list for ListMatches validation, got {type(value)}"]
+    allow_extras = validator.allow_extras
+    if satisfies_all(value, specs, allow_extras):
+        return _PASSED
+    result = match_list(value, specs)
+
+    failures = []
+    for spec_idx in result.unmatched_specs:
+        spec_str = _format_spec(validator.items[spec_idx])
+        if spec_idx in result.contested_specs:
+            failures.append(
+                f"Field '{name}': no item matching spec [{spec_str}] "
+                f"(matching items are matched by other specs)"
+            )
+        else:
+            failures.append(f"Field '{name}': no item matching spec [{spec_str}]")
+    if result.extras and not allow_extras:
+        failures.append(f"Field '{name}': unexpected items {[value[i] for i in result.extras]}")
+    return failures
+
+
+def _compile_list_matches(name: str, validator: ListMatches) -> FieldCheck:
+    specs = [compile_item_spec(spec) for spec in validator.items]
+
+    def check(value: Any) -> Sequence[str]:
+        return _check_list_matches(name, validator, value, specs)
+    return check
+
+
+def _compile_unknown(name: str, validator: Any) -> FieldCheck:
+    failure = (f"Field '{name}': unknown validator type {type(validator)}",)
+
+    def check(value: Any) -> Sequence[str]:
+        return failure
+    return check
+
+
+# Validator type -> compiler of its field check
+_FIELD_COMPILERS: Dict[type, Callable[[str, Any], FieldCheck]] = {
+    ListMatches: _compile_list_matches,
+    Exact: _compile_value_field,
+    OneOf: _compile_value_field,
+    AllOf: _compile_all_of,
+    Contains: _compile_contains,
+    Substring: _compile_value_field,
+}
+
+
+def _field_compiler(validator: Any) -> Callable[[str, Any], FieldCheck]:
+    compiler = _FIELD_COMPILERS.get(type(validator))
+    if compiler is None:
+        # Subclasses of the validator types compile like their base type
+        compiler = next(
+            (compiler for cls, compiler in _FIELD_COMPILERS.items() if isinstance(validator, cls)),
+            _compile_unknown
+        )
+    return compiler
+
+
+def compile_field(name: str, validator: Any) -> CompiledField:
+    """
+    Compile the validation rule for one field.
+
+    Args:
+        name: Field name, with dot notation for nested fields (e.g. "sql_operations.aggregations")
+        validator: FieldValidator for the field
+
+    Returns:
+        CompiledField (an unknown validator type compiles to a check that always fails)
+    """
+    path = tuple(name.split('.'))
+    if isinstance(validator, Criteria):
+        return CompiledField(name=name, path=path, criteria=validator.criteria)
+    return CompiledField(name=name, path=path, check=_field_compiler(validator)(name, validator))
+
+
+def check_field(name: str, validator: Any, value: Any) -> Sequence[str]:
+    """
+    Check one field without keeping a compiled rule (not for Criteria, which is judged).
+
+    Gives the same failures as compile_field(name, validator).check(value).
+    Values and ListMatches item specs are matched as given instead of being
+    compiled, which is cheaper for a rule that is only used once.
+    """
+    if isinstance(validator, ListMatches):
+        return _check_list_matches(name, validator, value, validator.items)
+    if isinstance(validator, (Exact, OneOf, Substring)):
+        return _PASSED if value_matches(validator, value) else _value_failures(name, validator, value)
+    return _field_compiler(validator)(name, validator)(value)
+
+
+def compile_field_validations(field_validations: Dict[str, Any]) -> List[CompiledField]:
+    """Compile a case's field_validations, keeping their order"""
+    return [compile_field(name, validator) for name, validator in field_validations.items()]
@@ -47,6 +47,7 @@ class EvalResult(BaseModel):
         llm_cost: Cost of LLM API calls for this test in USD
         input_tokens: Number of input tokens used
         output_tokens: Number of output tokens used
+        prompt_version: Prompt version label (version@hash) of the agent under test
     """
     case_name: str = Field(description="Name of the test case")
     passed: bool = Field(description="Whether the test passed")
@@ -61,6 +62,7 @@ class EvalResult(BaseModel):
     llm_cost: Optional[float] = Field(default=None, description="LLM API cost in USD")
     input_tokens: Optional[int] = Field(default=None, description="Input tokens used")
     output_tokens: Optional[int] = Field(default=None, description="Output tokens used")
+    prompt_version: Optional[str] = Field(default=None, description="Prompt version label of the agent")
     
     def __str__(self) -> str:
         """String representation for clear reporting."""
@@ -2,19 +2,13 @@
 Evaluator for evaluation framework with field-level validation support.
 """
 
+import asyncio
+from collections import OrderedDict
 from typing import Optional, Dict, Any, Tuple, List
 from pydantic import BaseModel
 
-from evals.field_validators import (
-    FieldValidator,
-    Exact,
-    OneOf,
-    AllOf,
-    Contains,
-    Criteria,
-    Substring,
-    ListMatches
-)
+from evals.compiled_validators import CompiledField, check_field, compile_field_validations
+from evals.field_validators import Criteria, FieldValidator
 
 
 class Evaluator:
@@ -22,14 +16,42 @@ class Evaluator:
     Evaluator that supports field-level validation rules and equality fallback.
     """
 
-    def __init__(self, judge_client=None):
+    def __init__(
+        self,
+        judge_client=None,
+        judge_batch_size: int = 1,
+        verdict_cache=None,
+        compiled_cache_size: int = 4096
+    ):
         """
         Initialize the evaluator.
 
         Args:
             judge_client: Optional LLM client for Criteria validation
+            judge_batch_size: If above 1, Criteria checks requested concurrently are judged
+                up to this many per LLM call (see BatchedLLMJudge)
+            verdict_cache: Optional VerdictCache of earlier judge verdicts
+            compiled_cache_size: Most recently used field_validations dicts that are tracked;
+                a dict is compiled the second time it is validated and its compiled rules are
+                kept while it stays tracked (older ones are dropped, so finished cases can be freed)
         """
         self.judge_client = judge_client
+        self.compiled_cache_size = compiled_cache_size
+        # id(field_validations) -> (field_validations, compiled rules or None before their second use),
+        # least recently used first
+        self._compiled: OrderedDict[int, Tuple[Dict[str, FieldValidator], Optional[List[CompiledField]]]] = OrderedDict()
+        self.judge = None
+        if judge_client:
+            # Import here to avoid circular dependency
+            from evals.judge import BatchedLLMJudge, LLMJudge
+            if judge_batch_size > 1:
+                self.judge = BatchedLLMJudge(
+                    judge_client,
+                    max_batch_size=judge_batch_size,
+                    verdict_cache=verdict_cache
+                )
+            else:
+                self.judge = LLMJudge(judge_client, verdict_cache=verdict_cache)
 
     async def validate(
         self,
@@ -80,6 +102,29 @@ class Evaluator:
         # No validation rules specified
         return False, "No validation rules specified (no field_validations or expected_output)"
 
+    def _compile(self, field_validations: Dict[str, FieldValidator]) -> Optional[List[CompiledField]]:
+        """
+        Compiled rules for a field_validations dict, compiled on its second use.
+
+        Returns:
+            None on first use: checking the rules as given is cheaper than
+            compiling them for a case that is only validated once
+        """
+        key = id(field_validations)
+        cached = self._compiled.get(key)
+        # The dict is kept in the entry, so its id can't be reused while cached
+        if cached is None or cached[0] is not field_validations:
+            self._compiled[key] = (field_validations, None)
+            if len(self._compiled) > self.compiled_cache_size:
+                self._compiled.popitem(last=False)
+            return None
+        self._compiled.move_to_end(key)
+        compiled = cached[1]
+        if compiled is None:
+            compiled = compile_field_validations(field_validations)
+            self._compiled[key] = (field_validations, compiled)
+        return compiled
+
     async def _validate_fields(
         self,
         actual: BaseModel,
@@ -95,17 +140,22 @@ class Evaluator:
         Returns:
             Tuple of (passed, failure_reason)
         """
-        # Get actual output as dict
-        actual_dict = actual.model_dump()
+        # Get actual output as dict (the model's serializer gives the same dict as
+        # model_dump() without its per-call argument handling)
+        actual_dict = actual.__pydantic_serializer__.to_python(actual)
         failures = []
+        # Criteria checks run concurrently (so a batched judge can combine them);
+        # each keeps its place in failures until its verdict is in
+        criteria_checks = []
 
+        compiled = self._compile(field_validations)
         # Validate each field with specified rules
-        for field_name, validator in field_validations.items():
+        for i, (field_name, validator) in enumerate(field_validations.items()):
+            field = compiled[i] if compiled is not None else None
             # Support dot notation for nested fields (e.g., "sql_operations.aggregations")
             if '.' in field_name:
-                parts = field_name.split('.')
                 actual_value = actual_dict
-                for part in parts:
+                for part in field.path if field is not None else field_name.split('.'):
                     if isinstance(actual_value, dict) and part in actual_value:
                         actual_value = actual_value[part]
                     else:
@@ -114,189 +164,38 @@ class Evaluator:
                         break
                 if actual_value is None:
                     continue
-            else:
-                # Check field exists
-                if field_name not in actual_dict:
-                    failures.append(f"Field '{field_name}' not found in output")
-                    continue
+            elif field_name in actual_dict:
                 actual_value = actual_dict[field_name]
+            else:
+                failures.append(f"Field '{field_name}' not found in output")
+                continue
 
-            # Apply appropriate validation
-            if isinstance(validator, Exact):
-                # Handle case-insensitive comparison for strings
-                if hasattr(validator, 'case_sensitive') and not validator.case_sensitive and isinstance(actual_value, str) and isinstance(validator.value, str):
-                    match = actual_value.lower() == validator.value.lower()
-                else:
-                    match = actual_value == validator.value
-
-                if not match:
-                    failures.append(
-                        f"Field '{field_name}': expected {validator.value}, got {actual_value}"
-                    )
-
-            elif isinstance(validator, OneOf):
-                # Handle case-insensitive comparison for strings
-                if hasattr(validator, 'case_sensitive') and not validator.case_sensitive and isinstance(actual_value, str):
-                    # Convert all string values to lowercase for comparison
-                    lower_values = [v.lower() if isinstance(v, str) else v for v in validator.values]
-                    match = actual_value.lower() in lower_values
-                else:
-                    match = actual_value in validator.values
-
-                if not match:
-                    failures.append(
-                        f"Field '{field_name}': expected one of {validator.values}, got {actual_value}"
-                    )
-
-            elif isinstance(validator, AllOf):
-                if not isinstance(actual_value, list):
-                    failures.append(
-                        f"Field '{field_name}': expected list for AllOf validation, got {type(actual_value)}"
-                    )
-                elif set(actual_value) != set(validator.values):
-                    failures.append(
-                        f"Field '{field_name}': expected all of {validator.values}, got {actual_value}"
-                    )
-
-            elif isinstance(validator, Contains):
-                if not isinstance(actual_value, list):
-                    failures.append(
-                        f"Field '{field_name}': expected list for Contains validation, got {type(actual_value)}"
-                    )
-                elif not set(validator.values).issubset(set(actual_value)):
-                    missing = set(validator.values) - set(actual_value)
-                    failures.append(
-                        f"Field '{field_name}': missing required values {missing}"
-                    )
-
-            elif isinstance(validator, Criteria):
-                # Use LLM judge for this field
-                passed, reason = await self._validate_field_with_criteria(
-                    field_name, actual_value, validator.criteria
-                )
+            if field is None:
+                if not isinstance(validator, Criteria):
+                    failures.extend(check_field(field_name, validator, actual_value))
+                    continue
+            elif field.check is not None:
+                failures.extend(field.check(actual_value))
+                continue
+
+            # Use LLM judge for this field
+            criteria_checks.append((len(failures), field_name, self._validate_field_with_criteria(
+                field_name, actual_value, validator.criteria
+            )))
+            failures.append(None)
+
+        if criteria_checks:
+            verdicts = await asyncio.gather(*(check for _, _, check in criteria_checks))
+            for (index, field_name, _), (passed, reason) in zip(criteria_checks, verdicts):
                 if not passed:
-                    failures.append(f"Field '{field_name}': {reason}")
-
-            elif isinstance(validator, Substring):
-                if not isinstance(actual_value, str):
-                    failures.append(
-                        f"Field '{field_name}': expected string for Substring validation, got {type(actual_value)}"
-                    )
-                else:
-                    # Handle case-insensitive comparison
-                    if hasattr(validator, 'case_sensitive') and not validator.case_sensitive:
-                        match = validator.value.lower() in actual_value.lower()
-                    else:
-                        match = validator.value in actual_value
-
-                    if not match:
-                        failures.append(
-                            f"Field '{field_name}': expected to contain '{validator.value}', got '{actual_value}'"
-                        )
-
-            elif isinstance(validator, ListMatches):
-                if not isinstance(actual_value, list):
-                    failures.append(
-                        f"Field '{field_name}': expected list for ListMatches validation, got {type(actual_value)}"
-                    )
-                else:
-                    # Validate that list contains items matching the specifications
-                    list_failures = await self._validate_list_matches(
-                        field_name, actual_value, validator.items
-                    )
-                    if list_failures:
-                        failures.extend(list_failures)
-
-            else:
-                failures.append(f"Field '{field_name}': unknown validator type {type(validator)}")
+                    failures[index] = f"Field '{field_name}': {reason}"
+            failures = [failure for failure in failures if failure is not None]
 
         # Return results
         if failures:
             return False, "; ".join(failures)
         return True, None
 
-    async def _validate_list_matches(
-        self,
-        field_name: str,
-        actual_list: List[Dict],
-        expected_specs: List[Dict]
-    ) -> List[str]:
-        """
-        Validate that a list contains items matching the specifications.
-
-        Args:
-            field_name: Name of the field being validated
-            actual_list: Actual list of items to validate
-            expected_specs: List of specifications (each spec is a dict mapping field names to validators)
-
-        Returns:
-            List of failure messages (empty if all specs match)
-        """
-        failures = []
-
-        for spec_idx, spec in enumerate(expected_specs):
-            # For each spec, try to find a matching item in actual_list
-            found_match = False
-
-            for actual_item in actual_list:
-                # Check if this item matches all validators in the spec
-                item_matches = True
-
-                for item_field, validator in spec.items():
-                    if not isinstance(validator, FieldValidator):
-                        # Handle plain values as Exact validators
-                        validator = Exact(value=validator)
-
-                    # Get the actual value from the item
-                    actual_field_value = actual_item.get(item_field) if isinstance(actual_item, dict) else None
-
-                    # Validate this field
-                    field_valid = False
-
-                    if isinstance(validator, Exact):
-                        # Handle case-insensitive comparison for strings
-                        if hasattr(validator, 'case_sensitive') and not validator.case_sensitive and isinstance(actual_field_value, str) and isinstance(validator.value, str):
-                            field_valid = actual_field_value.lower() == validator.value.lower()
-                        else:
-                            field_valid = actual_field_value == validator.value
-                    elif isinstance(validator, Substring):
-                        if isinstance(actual_field_value, str):
-                            # Handle case-insensitive comparison
-                            if hasattr(validator, 'case_sensitive') and not validator.case_sensitive:
-                                field_valid = validator.value.lower() in actual_field_value.lower()
-                            else:
-                                field_valid = validator.value in actual_field_value
-                        else:
-                            field_valid = False
-                    elif isinstance(validator, OneOf):
-                        # Handle case-insensitive comparison for strings
-                        if hasattr(validator, 'case_sensitive') and not validator.case_sensitive and isinstance(actual_field_value, str):
-                            lower_values = [v.lower() if isinstance(v, str) else v for v in validator.values]
-                            field_valid = actual_field_value.lower() in lower_values
-                        else:
-                            field_valid = actual_field_value in validator.values
-                    # Add more validator types as needed
-
-                    if not field_valid:
-                        item_matches = False
-                        break
-
-                if item_matches:
-                    found_match = True
-                    break
-
-            if not found_match:
-                # Format the spec for error message
-                spec_str = ", ".join(
-                    f"{k}={v.value if isinstance(v, Exact) else v.value if isinstance(v, Substring) else v}"
-                    for k, v in spec.items()
-                )
-                failures.append(
-                    f"Field '{field_name}': no item matching spec [{spec_str}]"
-                )
-
-        return failures
-
     async def _validate_field_with_criteria(
         self,
         field_name: str,
@@ -304,15 +203,11 @@ class Evaluator:
         criteria: List[str]
     ) -> Tuple[bool, Optional[str]]:
         """Validate a specific field using LLM-as-Judge."""
-        if not self.judge_client:
+        if not self.judge:
             return False, "No judge client configured for criteria validation"
 
-        # Import here to avoid circular dependency
-        from evals.judge import LLMJudge
-        judge = LLMJudge(self.judge_client)
-
         # Use judge to evaluate the field
-        result = await judge.evaluate(
+        result = await self.judge.evaluate(
             output=str({field_name: actual_value}), #TODO: better serialization
             criteria=criteria
         )
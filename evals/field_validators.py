@@ -48,12 +48,14 @@ class ListMatches(FieldValidator):
     """
     List must contain items matching the specification.
 
-    Each item in the list is validated against the item_spec,
-    which maps field names to validators.
+    Each item spec maps field names to validators and must be matched by
+    its own item of the list (one item never satisfies two specs). Items
+    not matched by any spec are allowed unless allow_extras is False.
 
     Example:
         ListMatches(items=[
             {"type": Exact(value="category"), "value": Substring(value="transport")}
         ])
     """
-    items: List[dict]
\ No newline at end of file
+    items: List[dict]
+    allow_extras: bool = True
\ No newline at end of file
@@ -2,9 +2,45 @@
 LLM-as-a-Judge implementation for semantic evaluation.
 """
 
-from typing import Any, Dict, List, Optional
+import asyncio
+import hashlib
+import re
+from typing import Any, Dict, List, Optional, Tuple
 from dataclasses import dataclass
 
+try:
+    from .verdict_cache import VerdictCache, verdict_cache_key
+except ImportError:
+    from verdict_cache import VerdictCache, verdict_cache_key
+
+
+SYSTEM_PROMPT: str = """You are a precise and objective evaluator. Your task is to evaluate whether a given output meets ALL specified criteria.
+
+Respond in the following format:
+EVALUATION: PASS or FAIL
+RATIONALE: (Only if FAIL) Brief explanation of which criteria were not met and why"""
+
+BATCH_SYSTEM_PROMPT: str = """You are a precise and objective evaluator. You will be given several numbered items, each with its own criteria and output. Evaluate every item independently: an item passes only if its output meets ALL of its own criteria.
+
+Respond with exactly one verdict per item, in the following format:
+<verdicts>
+<verdict id="1">
+<evaluation>PASS or FAIL</evaluation>
+<rationale>(Only if FAIL) Brief explanation of which criteria were not met and why</rationale>
+</verdict>
+</verdicts>"""
+
+# Part of the verdict cache key, so editing either prompt invalidates stored verdicts
+JUDGE_PROMPT_VERSION: str = hashlib.sha256(
+    (SYSTEM_PROMPT + BATCH_SYSTEM_PROMPT).encode("utf-8")
+).hexdigest()[:12]
+
+_VERDICT_PATTERN = re.compile(r'<verdict\s+id="(\d+)"\s*>(.*?)</verdict>', re.DOTALL)
+_EVALUATION_PATTERN = re.compile(r"<evaluation>\s*(PASS|FAIL)\s*</evaluation>", re.IGNORECASE)
+_RATIONALE_PATTERN = re.compile(r"<rationale>(.*?)</rationale>", re.DOTALL)
+# A single-check response with an actual verdict (what _parse_response reads as PASS or FAIL)
+_SINGLE_VERDICT_PATTERN = re.compile(r"EVALUATION:.*(PASS|FAIL)", re.IGNORECASE)
+
 
 @dataclass
 class JudgeResult:
@@ -20,7 +56,13 @@ class LLMJudge:
     This uses the provided LLM client interface for evaluation.
     """
     
-    def __init__(self, llm_client: Any, temperature: float = 0.1, max_tokens: int = 500):
+    def __init__(
+        self,
+        llm_client: Any,
+        temperature: float = 0.1,
+        max_tokens: int = 500,
+        verdict_cache: Optional[VerdictCache] = None
+    ):
         """
         Initialize the LLM judge.
         
@@ -28,10 +70,15 @@ class LLMJudge:
             llm_client: LLM client implementing the LLMClientInterface
             temperature: Temperature for LLM generation
             max_tokens: Maximum tokens for response
+            verdict_cache: Optional store of earlier verdicts; checks found there
+                are not sent to the LLM
         """
         self.llm_client: Any = llm_client
         self.temperature: float = temperature
         self.max_tokens: int = max_tokens
+        self.verdict_cache: Optional[VerdictCache] = verdict_cache
+        self.llm_calls: int = 0
+        self.items_judged: int = 0
     
     
     async def evaluate(
@@ -51,11 +98,116 @@ class LLMJudge:
         Returns:
             JudgeResult with pass/fail and rationale
         """
+        self.items_judged += 1
+        cached: Optional[JudgeResult] = self._cached_verdict(output, criteria, context)
+        if cached is not None:
+            return cached
+
+        try:
+            return await self._judge_single(output, criteria, context)
+        except Exception as e:
+            # Return failure if evaluation fails (not cached, so the next run retries)
+            return JudgeResult(
+                passed=False,
+                rationale=f"LLM evaluation failed: {str(e)}"
+            )
+    
+    
+    async def _judge_single(
+        self,
+        output: str,
+        criteria: List[str],
+        context: Optional[Dict[str, Any]] = None
+    ) -> JudgeResult:
+        """
+        Judge one check with its own LLM call (exceptions propagate).
+
+        The verdict is cached only if the response had one; an unparseable
+        response still counts as a FAIL but is judged again on the next run.
+        """
+        user_prompt: str = f"""Evaluate the following output against the provided criteria.
+
+{self._format_item(output, criteria, context)}
+
+Remember: The output must meet ALL criteria to PASS. If ANY criterion is not met, it must FAIL."""
+        
+        # Call LLM client
+        self.llm_calls += 1
+        llm_response = await self.llm_client.generate(
+            system_prompt=SYSTEM_PROMPT,
+            user_prompt=user_prompt,
+            temperature=self.temperature,
+            max_tokens=self.max_tokens
+        )
+
+        # Extract text from LLM response
+        response_text: str = llm_response.text if hasattr(llm_response, 'text') else str(llm_response)
+
+        # Parse response
+        result: JudgeResult = self._parse_response(response_text)
+        if _SINGLE_VERDICT_PATTERN.search(response_text):
+            self._store_verdict(output, criteria, context, result)
+        return result
+    
+    
+    def _verdict_key(
+        self,
+        output: str,
+        criteria: List[str],
+        context: Optional[Dict[str, Any]]
+    ) -> str:
+        model: str = getattr(self.llm_client, "model", "unknown")
+        return verdict_cache_key(output, criteria, context, model, JUDGE_PROMPT_VERSION)
+    
+    
+    def _cached_verdict(
+        self,
+        output: str,
+        criteria: List[str],
+        context: Optional[Dict[str, Any]]
+    ) -> Optional[JudgeResult]:
+        """Verdict stored by an earlier run, if any"""
+        if self.verdict_cache is None:
+            return None
+        entry = self.verdict_cache.get(self._verdict_key(output, criteria, context))
+        if entry is None:
+            return None
+        return JudgeResult(passed=entry["passed"], rationale=entry["rationale"])
+    
+    
+    def _store_verdict(
+        self,
+        output: str,
+        criteria: List[str],
+        context: Optional[Dict[str, Any]],
+        result: JudgeResult
+    ) -> None:
+        if self.verdict_cache is not None:
+            self.verdict_cache.put(self._verdict_key(output, criteria, context), result.passed, result.rationale)
+    
+    
+    @staticmethod
+    def _format_item(
+        output: str,
+        criteria: List[str],
+        context: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        Format the criteria, output and context of one evaluation.
+
+        Args:
+            output: The output to evaluate
+            criteria: List of criteria that must ALL be met
+            context: Optional context for evaluation
+
+        Returns:
+            Prompt text for the item
+        """
         # Format criteria as numbered list
         criteria_text: str = "\n".join(
             f"{i+1}. {criterion}" for i, criterion in enumerate(criteria)
         )
-        
+
         # Build context section if provided
         context_section: str = ""
         if context:
@@ -63,47 +215,12 @@ class LLMJudge:
             for key, value in context.items():
                 context_items.append(f"\n{key.upper()}:\n{value}")
             context_section = "\n".join(context_items)
-        
-        # Create evaluation prompt
-        system_prompt: str = """You are a precise and objective evaluator. Your task is to evaluate whether a given output meets ALL specified criteria.
-
-Respond in the following format:
-EVALUATION: PASS or FAIL
-RATIONALE: (Only if FAIL) Brief explanation of which criteria were not met and why"""
-        
-        user_prompt: str = f"""Evaluate the following output against the provided criteria.
 
-CRITERIA (ALL must be met for PASS):
+        return f"""CRITERIA (ALL must be met for PASS):
 {criteria_text}
 
 OUTPUT TO EVALUATE:
-{output}{context_section}
-
-Remember: The output must meet ALL criteria to PASS. If ANY criterion is not met, it must FAIL."""
-        
-        try:
-            # Call LLM client
-            llm_response = await self.llm_client.generate(
-                system_prompt=system_prompt,
-                user_prompt=user_prompt,
-                temperature=self.temperature,
-                max_tokens=self.max_tokens
-            )
-
-            # Extract text from LLM response
-            response_text: str = llm_response.text if hasattr(llm_response, 'text') else str(llm_response)
-
-            # Parse response
-            result: JudgeResult = self._parse_response(response_text)
-            return result
-            
-        except Exception as e:
-            # Return failure if evaluation fails
-            result: JudgeResult = JudgeResult(
-                passed=False,
-                rationale=f"LLM evaluation failed: {str(e)}"
-            )
-            return result
+{output}{context_section}"""
     
     
     def _parse_response(self, response: str) -> JudgeResult:
@@ -150,4 +267,176 @@ Remember: The output must meet ALL criteria to PASS. If ANY criterion is not met
             rationale = None
         
         result: JudgeResult = JudgeResult(passed=passed, rationale=rationale)
-        return result
\ No newline at end of file
+        return result
+
+class BatchedLLMJudge(LLMJudge):
+    """
+    LLM judge that evaluates several pending checks in one call.
+
+    Checks requested concurrently (from the cases in flight, and the Criteria
+    fields of one case) are collected for up to max_wait_ms, or until
+    max_batch_size are pending, and sent in one prompt that asks for a tagged
+    verdict per item. Items whose verdict is missing or unparseable - or all
+    items, if the batch call fails - are re-evaluated with single calls.
+    """
+
+    def __init__(
+        self,
+        llm_client: Any,
+        max_batch_size: int = 8,
+        max_wait_ms: float = 100.0,
+        temperature: float = 0.1,
+        max_tokens: int = 500,
+        verdict_cache: Optional[VerdictCache] = None
+    ):
+        """
+        Initialize the batched judge.
+
+        Args:
+            llm_client: LLM client implementing the LLMClientInterface
+            max_batch_size: Maximum checks per judge call
+            max_wait_ms: How long the first pending check waits for others to join its batch
+            temperature: Temperature for LLM generation
+            max_tokens: Maximum response tokens per item
+            verdict_cache: Optional store of earlier verdicts; checks found there
+                are answered without joining a batch
+        """
+        super().__init__(
+            llm_client,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            verdict_cache=verdict_cache
+        )
+        self.max_batch_size: int = max_batch_size
+        self.max_wait_ms: float = max_wait_ms
+        self.fallback_items: int = 0
+        self._pending: List[Tuple[str, List[str], Optional[Dict[str, Any]], asyncio.Future]] = []
+        self._timer: Optional[asyncio.Task] = None
+        self._batches: set = set()
+    
+    
+    async def evaluate(
+        self,
+        output: str,
+        criteria: List[str],
+        context: Optional[Dict[str, Any]] = None
+    ) -> JudgeResult:
+        """
+        Queue a check for the next batch and wait for its verdict.
+        
+        Args:
+            output: The output to evaluate
+            criteria: List of criteria that must ALL be met
+            context: Optional context for evaluation
+            
+        Returns:
+            JudgeResult with pass/fail and rationale
+        """
+        self.items_judged += 1
+        cached: Optional[JudgeResult] = self._cached_verdict(output, criteria, context)
+        if cached is not None:
+            return cached
+
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._pending.append((output, criteria, context, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = asyncio.create_task(self._flush_after_wait())
+
+        return await future
+    
+    
+    async def _flush_after_wait(self) -> None:
+        await asyncio.sleep(self.max_wait_ms / 1000)
+        self._timer = None
+        self._flush()
+    
+    
+    def _flush(self) -> None:
+        """Send the pending checks as one batch"""
+        batch, self._pending = self._pending, []
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if batch:
+            # Keep a reference so the task isn't garbage collected while running
+            task = asyncio.create_task(self._judge_batch(batch))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+    
+    
+    async def _judge_batch(
+        self,
+        batch: List[Tuple[str, List[str], Optional[Dict[str, Any]], asyncio.Future]]
+    ) -> None:
+        """Judge a batch and resolve each item's future"""
+        verdicts: Dict[int, JudgeResult] = {}
+        if len(batch) > 1:
+            items: str = "\n\n".join(
+                f'<item id="{i}">\n{self._format_item(output, criteria, context)}\n</item>'
+                for i, (output, criteria, context, _) in enumerate(batch, start=1)
+            )
+            user_prompt: str = f"""Evaluate each of the following {len(batch)} items against its own criteria.
+
+{items}
+
+Remember: An item must meet ALL of its criteria to PASS. Return exactly {len(batch)} verdicts, one per item id."""
+            try:
+                self.llm_calls += 1
+                llm_response = await self.llm_client.generate(
+                    system_prompt=BATCH_SYSTEM_PROMPT,
+                    user_prompt=user_prompt,
+                    temperature=self.temperature,
+                    max_tokens=self.max_tokens * len(batch)
+                )
+                response_text: str = llm_response.text if hasattr(llm_response, 'text') else str(llm_response)
+                verdicts = self._parse_batch_response(response_text)
+            except Exception:
+                verdicts = {}
+            verdicts = {i: verdicts[i] for i in range(1, len(batch) + 1) if i in verdicts}
+            self.fallback_items += len(batch) - len(verdicts)
+            for i, result in verdicts.items():
+                output, criteria, context, _ = batch[i - 1]
+                self._store_verdict(output, criteria, context, result)
+
+        async def resolve(index: int, output: str, criteria: List[str], context, future: asyncio.Future) -> None:
+            result = verdicts.get(index)
+            if result is None:
+                try:
+                    result = await self._judge_single(output, criteria, context)
+                except Exception as e:
+                    result = JudgeResult(passed=False, rationale=f"LLM evaluation failed: {str(e)}")
+            if not future.done():
+                future.set_result(result)
+
+        await asyncio.gather(*(
+            resolve(i, output, criteria, context, future)
+            for i, (output, criteria, context, future) in enumerate(batch, start=1)
+        ))
+    
+    
+    @staticmethod
+    def _parse_batch_response(response: str) -> Dict[int, JudgeResult]:
+        """
+        Parse tagged per-item verdicts.
+        
+        Args:
+            response: Raw LLM response
+            
+        Returns:
+            Item id -> JudgeResult for every verdict that could be parsed
+        """
+        verdicts: Dict[int, JudgeResult] = {}
+        for match in _VERDICT_PATTERN.finditer(response):
+            evaluation = _EVALUATION_PATTERN.search(match.group(2))
+            if not evaluation:
+                continue
+            rationale = _RATIONALE_PATTERN.search(match.group(2))
+            rationale_text: Optional[str] = rationale.group(1).strip() if rationale else None
+            verdicts[int(match.group(1))] = JudgeResult(
+                passed=evaluation.group(1).upper() == "PASS",
+                rationale=rationale_text or None
+            )
+        return verdicts
@@ -0,0 +1,354 @@
+"""
+Matching of ListMatches item specs to the items of an actual list.
+
+Each spec must be matched to its own item: the result is a maximum bipartite
+matching between specs and items, so one actual entity is never counted for
+two specs, and a spec only fails if no assignment of items could satisfy it.
+Short lists are first matched greedily by scanning the items directly, which
+settles the common case without any set-up. Otherwise candidate items for a
+spec are looked up in an index built on its Exact fields, so validating a
+large list doesn't compare every spec with every item. Specs compiled once
+with compile_item_spec can be reused for every list; satisfies_all() also
+takes specs as given, and only compiles them if a list needs the index.
+"""
+
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Any, Callable, Dict, FrozenSet, Hashable, List, Optional, Tuple, Union
+
+from evals.field_validators import Exact, FieldValidator, OneOf, Substring
+
+# Lists up to this long are matched greedily by a direct scan before any index is built
+SCAN_MAX_ITEMS = 32
+
+# Predicate on one value (a field of a list item)
+ValueCheck = Callable[[Any], bool]
+
+
+@dataclass
+class ListMatchResult:
+    """Outcome of matching item specs against an actual list."""
+    # Spec index -> index of the item it was matched to
+    matches: Dict[int, int] = field(default_factory=dict)
+    # Specs without an item (in spec order)
+    unmatched_specs: List[int] = field(default_factory=list)
+    # Specs that had candidate items, all of which were needed by other specs
+    contested_specs: List[int] = field(default_factory=list)
+    # Items not matched to any spec (in list order)
+    extras: List[int] = field(default_factory=list)
+
+
+def _hashable_set(values: List[Any]) -> Optional[FrozenSet[Any]]:
+    """values as a frozenset, or None if any value is unhashable"""
+    try:
+        return frozenset(values)
+    except TypeError:
+        return None
+
+
+def _membership(values: List[Any]) -> ValueCheck:
+    """`value in values`, as a set lookup where the values allow it"""
+    value_set = _hashable_set(values)
+    if value_set is None:
+        return lambda value: value in values
+
+    def check(value: Any) -> bool:
+        try:
+            return value in value_set
+        except TypeError:
+            # An unhashable value (a list or dict) equals none of the hashable values
+            return False
+    return check
+
+
+def _equals(expected: Any, case_sensitive: bool) -> ValueCheck:
+    if not case_sensitive and isinstance(expected, str):
+        folded = expected.lower()
+        return lambda value: value.lower() == folded if isinstance(value, str) else value == expected
+    return lambda value: value == expected
+
+
+def compile_value_check(validator: Any) -> ValueCheck:
+    """
+    Build the predicate for one field of a ListMatches item spec.
+
+    Args:
+        validator: Exact, Substring or OneOf, or a plain value (treated as Exact)
+
+    Returns:
+        Predicate on the item's field value (other validator types never match)
+    """
+    if isinstance(validator, Exact):
+        return _equals(validator.value, validator.case_sensitive)
+    if not isinstance(validator, FieldValidator):
+        return _equals(validator, case_sensitive=False)
+
+    if isinstance(validator, Substring):
+        if validator.case_sensitive:
+            needle = validator.value
+            return lambda value: isinstance(value, str) and needle in value
+        needle = validator.value.lower()
+        return lambda value: isinstance(value, str) and needle in value.lower()
+
+    if isinstance(validator, OneOf):
+        contains = _membership(validator.values)
+        if validator.case_sensitive:
+            return contains
+        folded_contains = _membership([v.lower() if isinstance(v, str) else v for v in validator.values])
+        return lambda value: folded_contains(value.lower()) if isinstance(value, str) else contains(value)
+
+    return lambda value: False
+
+
+def value_matches(validator: Any, value: Any) -> bool:
+    """
+    compile_value_check(validator)(value), without building the predicate.
+
+    Cheaper for a rule that is only checked once.
+    """
+    if isinstance(validator, Exact):
+        expected, case_sensitive = validator.value, validator.case_sensitive
+    elif not isinstance(validator, FieldValidator):
+        expected, case_sensitive = validator, False
+    elif isinstance(validator, Substring):
+        if not isinstance(value, str):
+            return False
+        if validator.case_sensitive:
+            return validator.value in value
+        return validator.value.lower() in value.lower()
+    elif isinstance(validator, OneOf):
+        if validator.case_sensitive or not isinstance(value, str):
+            return value in validator.values
+        folded = value.lower()
+        return any(folded == (v.lower() if isinstance(v, str) else v) for v in validator.values)
+    else:
+        return False
+
+    if not case_sensitive and isinstance(expected, str) and isinstance(value, str):
+        return value.lower() == expected.lower()
+    return value == expected
+
+
+def _fold(value: Any, case_sensitive: bool) -> Any:
+    return value if case_sensitive or not isinstance(value, str) else value.lower()
+
+
+# Not frozen, like CompiledField: one is built per spec whenever a case is compiled
+@dataclass
+class ItemSpec:
+    """A compiled ListMatches item spec"""
+    # The spec as given: field -> validator or plain value
+    spec: Dict[str, Any]
+    # Field -> predicate, for every field of the spec
+    checks: Tuple[Tuple[str, ValueCheck], ...]
+
+    @cached_property
+    def index_keys(self) -> Tuple[Tuple[str, bool, Hashable], ...]:
+        """(field, case_sensitive, folded value) for each Exact field on a hashable value"""
+        # Only lists that go through the index need these, so they are built on first use
+        index_keys = []
+        for field_name, validator in self.spec.items():
+            if isinstance(validator, Exact):
+                value, case_sensitive = validator.value, validator.case_sensitive
+            elif isinstance(validator, FieldValidator):
+                continue
+            else:
+                value, case_sensitive = validator, False
+            try:
+                hash(value)
+            except TypeError:
+                continue
+            index_keys.append((field_name, case_sensitive, _fold(value, case_sensitive)))
+        return tuple(index_keys)
+
+
+def compile_item_spec(spec: Dict[str, Any]) -> ItemSpec:
+    """
+    Compile an item spec once, for use in any number of match_list calls.
+
+    Args:
+        spec: Mapping of field names to validators or plain values (treated as Exact)
+
+    Returns:
+        ItemSpec
+    """
+    return ItemSpec(spec=spec, checks=tuple(
+        (field_name, compile_value_check(validator)) for field_name, validator in spec.items()
+    ))
+
+
+class _ItemIndex:
+    """Items grouped by the (folded) value of a field, built lazily per field and case mode"""
+
+    def __init__(self, items: List[Any]):
+        self.items = items
+        self._indexes: Dict[Tuple[str, bool], Dict[Hashable, List[int]]] = {}
+
+    def lookup(self, field_name: str, case_sensitive: bool, key: Hashable) -> List[int]:
+        index = self._indexes.get((field_name, case_sensitive))
+        if index is None:
+            index = {}
+            for i, item in enumerate(self.items):
+                if not isinstance(item, dict):
+                    continue
+                value = _fold(item.get(field_name), case_sensitive)
+                try:
+                    index.setdefault(value, []).append(i)
+                except TypeError:
+                    continue
+            self._indexes[(field_name, case_sensitive)] = index
+        return index.get(key, [])
+
+
+def _satisfies(spec: Union[ItemSpec, Dict[str, Any]], item: Any) -> bool:
+    """Whether item satisfies every field of spec (compiled, or as given)"""
+    if not isinstance(item, dict):
+        return False
+    if isinstance(spec, ItemSpec):
+        for field_name, check in spec.checks:
+            if not check(item.get(field_name)):
+                return False
+        return True
+    for field_name, validator in spec.items():
+        if not value_matches(validator, item.get(field_name)):
+            return False
+    return True
+
+
+def _candidates(spec: ItemSpec, items: List[Any], index: _ItemIndex) -> List[int]:
+    """Indices of the items that satisfy every field of spec, in list order"""
+    # The most selective indexed field gives the pool; the other fields are checked per item
+    pool: Optional[List[int]] = None
+    pool_field: Optional[str] = None
+    for field_name, case_sensitive, key in spec.index_keys:
+        found = index.lookup(field_name, case_sensitive, key)
+        if pool is None or len(found) < len(pool):
+            pool, pool_field = found, field_name
+
+    if pool is None:
+        pool = [i for i, item in enumerate(items) if isinstance(item, dict)]
+    checks = [(field_name, check) for field_name, check in spec.checks if field_name != pool_field]
+    return [
+        i for i in pool
+        if all(check(items[i].get(field_name)) for field_name, check in checks)
+    ]
+
+
+def _augment(spec_idx: int, edges: List[List[int]], item_owner: Dict[int, int]) -> bool:
+    """
+    Find an augmenting path from an unmatched spec and flip it (iterative Kuhn step).
+
+    Returns:
+        True if spec_idx was matched, moving other specs to other candidates on the way
+    """
+    visited = set()
+    stack = [(spec_idx, iter(edges[spec_idx]))]
+    # path[i] is the item tried by the spec at stack[i]
+    path: List[int] = []
+    while stack:
+        spec, candidates = stack[-1]
+        for item in candidates:
+            if item in visited:
+                continue
+            visited.add(item)
+            path.append(item)
+            owner = item_owner.get(item)
+            if owner is None:
+                for (path_spec, _), path_item in zip(stack, path):
+                    item_owner[path_item] = path_spec
+                return True
+            stack.append((owner, iter(edges[owner])))
+            break
+        else:
+            stack.pop()
+            if path:
+                path.pop()
+    return False
+
+
+def _scan(items: List[Any], specs: List[Union[ItemSpec, Dict[str, Any]]]) -> Optional[Dict[int, int]]:
+    """
+    Greedy matching by a direct scan: each spec takes the first free item that satisfies it.
+
+    Returns:
+        Item index -> spec index, or None if a spec was left without an item
+    """
+    item_owner: Dict[int, int] = {}
+    for spec_idx, spec in enumerate(specs):
+        for item_idx, item in enumerate(items):
+            if item_idx not in item_owner and _satisfies(spec, item):
+                item_owner[item_idx] = spec_idx
+                break
+        else:
+            return None
+    return item_owner
+
+
+def satisfies_all(
+    items: List[Any],
+    specs: List[Union[ItemSpec, Dict[str, Any]]],
+    allow_extras: bool = True
+) -> bool:
+    """
+    Whether every spec can be matched to its own item (and, unless allow_extras, every item to a spec).
+
+    Equivalent to checking match_list's result, but a short list that the
+    greedy scan matches needs no ListMatchResult, and specs as given are
+    only compiled if the list needs the full matching.
+    """
+    if not specs:
+        return allow_extras or not items
+    if len(items) <= SCAN_MAX_ITEMS:
+        item_owner = _scan(items, specs)
+        if item_owner is not None:
+            return allow_extras or len(item_owner) == len(items)
+    result = match_list(items, specs)
+    return not result.unmatched_specs and (allow_extras or not result.extras)
+
+
+def match_list(items: List[Any], specs: List[Union[ItemSpec, Dict[str, Any]]]) -> ListMatchResult:
+    """
+    Match each spec to a distinct item that satisfies it.
+
+    Args:
+        items: Actual list (items that aren't dicts never match)
+        specs: Compiled item specs, or specs mapping field names to validators or plain values
+
+    Returns:
+        ListMatchResult with a maximum matching; ties go to earlier items
+    """
+    compiled = [spec if isinstance(spec, ItemSpec) else compile_item_spec(spec) for spec in specs]
+
+    # Greedy pass first: each spec takes the first free item that satisfies it.
+    # On a short list, scanning the items directly finds the matching outright
+    # in the common case, without building the index or the candidate lists.
+    if len(items) <= SCAN_MAX_ITEMS:
+        item_owner = _scan(items, compiled)
+        if item_owner is not None:
+            return ListMatchResult(
+                matches={spec_idx: item for item, spec_idx in item_owner.items()},
+                extras=[i for i in range(len(items)) if i not in item_owner]
+            )
+
+    index = _ItemIndex(items)
+    edges = [_candidates(spec, items, index) for spec in compiled]
+
+    # Greedy pass over the candidate lists, then augmenting paths for the specs it left out
+    item_owner: Dict[int, int] = {}
+    unassigned_specs: List[int] = []
+    for spec_idx, candidates in enumerate(edges):
+        free = next((item for item in candidates if item not in item_owner), None)
+        if free is None:
+            unassigned_specs.append(spec_idx)
+        else:
+            item_owner[free] = spec_idx
+    for spec_idx in unassigned_specs:
+        if edges[spec_idx]:
+            _augment(spec_idx, edges, item_owner)
+
+    result = ListMatchResult()
+    result.matches = {spec_idx: item for item, spec_idx in item_owner.items()}
+    result.unmatched_specs = [i for i in range(len(specs)) if i not in result.matches]
+    result.contested_specs = [i for i in result.unmatched_specs if edges[i]]
+    result.extras = [i for i in range(len(items)) if i not in item_owner]
+    return result
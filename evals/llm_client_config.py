@@ -10,23 +10,79 @@ from typing import Optional
 from dotenv import load_dotenv
 
 from src.clients.llm_clients.llm_client_interface import LLMClientInterface
-from src.clients.llm_clients.anthropic_llm_client import AnthropicLLMClient
+from src.clients.llm_clients.rate_limiter import RateLimitedLLMClient, TokenBucket
+from src.clients.llm_clients.replay_llm_client import ReplayLLMClient
 
 
 # Load environment variables
 load_dotenv()
 
+# Live API calls per second when LLM_RATE_LIMIT is not set. The eval scripts
+# used to run 3 cases and then wait 5s, i.e. at most 0.6 agent calls per second.
+DEFAULT_LLM_RATE_LIMIT: float = 0.6
 
-def get_llm_client() -> Optional[LLMClientInterface]:
+
+def get_rate_limit() -> float:
+    """
+    Live API calls per second for eval runs.
+
+    Returns:
+        LLM_RATE_LIMIT if set, otherwise DEFAULT_LLM_RATE_LIMIT
+
+    Raises:
+        ValueError: If LLM_RATE_LIMIT is not a positive number
+    """
+    value = os.getenv("LLM_RATE_LIMIT")
+    if not value:
+        return DEFAULT_LLM_RATE_LIMIT
+    try:
+        rate_limit = float(value)
+    except ValueError:
+        rate_limit = 0.0
+    if not rate_limit > 0:
+        raise ValueError(f"LLM_RATE_LIMIT must be a positive number of calls per second, got {value!r}")
+    return rate_limit
+
+
+def get_llm_client(rate_limited: bool = True) -> Optional[LLMClientInterface]:
     """
     Get configured LLM client for evaluations.
 
     This is the single place to configure which LLM client to use.
     When moving to another project, only this function needs to be modified.
 
+    Set LLM_CASSETTE (and optionally LLM_REPLAY_MODE=record|replay) to record
+    responses to, or replay them from, a cassette file instead of paying for
+    fresh API calls.
+
+    Live API calls (agent and judge calls together) are paced at
+    DEFAULT_LLM_RATE_LIMIT per second; set LLM_RATE_LIMIT to change the rate,
+    e.g. 0.8 for a 50 requests per minute limit.
+
+    Args:
+        rate_limited: Pace live calls with a TokenBucket (False when the caller
+            applies its own limiter, e.g. a SharedTokenBucket across processes)
+
     Returns:
         Configured LLM client or None if not configured
     """
+    cassette_path = os.getenv("LLM_CASSETTE")
+    replay_mode = os.getenv("LLM_REPLAY_MODE", "replay")
+
+    # Replay mode is fully offline and does not need an API key
+    if cassette_path and replay_mode == "replay":
+        return ReplayLLMClient(
+            cassette_path=cassette_path,
+            mode="replay",
+            simulate_latency=os.getenv("LLM_REPLAY_SIMULATE_LATENCY", "").lower() in ("1", "true", "yes")
+        )
+
+    try:
+        rate_limit = get_rate_limit()
+    except ValueError as e:
+        print(f"Error: {e}")
+        return None
+
     # Get API key from environment
     api_key = os.getenv("ANTHROPIC_API_KEY")
 
@@ -38,20 +94,33 @@ def get_llm_client() -> Optional[LLMClientInterface]:
 
     # Return configured client
     # When integrating with another project, replace this with your LLM client
-    return AnthropicLLMClient(api_key=api_key)
+    # (imported here so replay runs never load the Anthropic SDK)
+    from src.clients.llm_clients.anthropic_llm_client import AnthropicLLMClient
+    client: LLMClientInterface = AnthropicLLMClient(api_key=api_key)
+
+    if rate_limited:
+        client = RateLimitedLLMClient(client, TokenBucket(rate_limit))
+
+    if cassette_path:
+        client = ReplayLLMClient(cassette_path=cassette_path, mode="record", llm_client=client)
 
+    return client
 
-def get_llm_client_or_exit() -> LLMClientInterface:
+
+def get_llm_client_or_exit(rate_limited: bool = True) -> LLMClientInterface:
     """
     Get configured LLM client or exit with error message.
 
+    Args:
+        rate_limited: See get_llm_client
+
     Returns:
         Configured LLM client
 
     Raises:
         SystemExit: If LLM client is not configured
     """
-    client = get_llm_client()
+    client = get_llm_client(rate_limited=rate_limited)
     if not client:
         import sys
         sys.exit(1)
@@ -0,0 +1,571 @@
+#!/usr/bin/env python3
+"""
+Prompt token budget analyser and compressor.
+
+Reports how many tokens each XML section (<role>, <purpose>, <examples>, ...)
+of every system prompt in src/prompts costs, and optionally writes compressed
+versions of the prompts:
+
+- whitespace: trailing spaces, repeated spaces and runs of blank lines
+- duplicates: prose lines repeated verbatim earlier in the prompt
+- redundant examples: examples whose query repeats an earlier example, or
+  whose expected answer has the same shape as an earlier example with a very
+  similar query
+
+With --validate, each compressed prompt is run against its agent's eval cases
+next to the original, and is only accepted if the pass rate stays within the
+tolerance. Compressed prompts are written to files for review; the prompt
+modules themselves are never modified.
+
+Examples:
+  # Token budget per section for every prompt (local estimate)
+  python -m evals.prompt_budget
+
+  # Exact counts from the Anthropic token counting endpoint
+  python -m evals.prompt_budget --tokenizer anthropic
+
+  # Compress, validate against the dev cases and write the accepted prompts
+  python -m evals.prompt_budget --compress --validate --tags dev_cases --output-dir build/prompts
+"""
+
+import argparse
+import asyncio
+import importlib
+import math
+import os
+import pkgutil
+import re
+import sys
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from src.parsers.prompt_section_parser import PromptSection, split_instructions
+from src.parsers.xml_tag_parser import get_xml_tag_content
+
+
+PROMPTS_PACKAGE = "src.prompts"
+
+# Prompt module -> (agent class, eval case module) used by --validate
+PROMPT_AGENTS: Dict[str, Tuple[str, str]] = {
+    "category_normalisation_prompt": (
+        "src.workflow_nodes.query_preprocessing.category_normalisation_agent.CategoryNormalisationAgent",
+        "evals.cases.category_normalisation"
+    ),
+    "pii_extraction_prompt": (
+        "src.workflow_nodes.query_preprocessing.pii_extraction_agent.PIIExtractionAgent",
+        "evals.cases.pii_extraction"
+    ),
+    "processable_entity_extraction_prompt": (
+        "src.workflow_nodes.query_preprocessing.processable_entity_extraction_agent.ProcessableEntityExtractionAgent",
+        "evals.cases.processable_entity_extraction"
+    ),
+    "query_characteristics_extraction_prompt": (
+        "src.workflow_nodes.query_preprocessing.query_characteristics_extraction_agent."
+        "QueryCharacteristicsExtractionAgent",
+        "evals.cases.query_characteristics_extraction"
+    ),
+    "query_security_validation_prompt": (
+        "src.workflow_nodes.query_preprocessing.query_security_validation_agent.QuerySecurityValidationAgent",
+        "evals.cases.query_security"
+    ),
+    "unprocessable_entity_extraction_prompt": (
+        "src.workflow_nodes.query_preprocessing.unprocessable_entity_extraction_agent."
+        "UnprocessableEntityExtractionAgent",
+        "evals.cases.unprocessable_entity_extraction"
+    ),
+    "user_intent_validation_prompt": (
+        "src.workflow_nodes.query_preprocessing.user_intent_validation_agent.UserIntentValidationAgent",
+        "evals.cases.user_intent"
+    ),
+}
+
+
+# ========== Token counting ==========
+
+class TokenCounter(ABC):
+    """Counts the tokens in a piece of prompt text"""
+    name: str = "base"
+
+    @abstractmethod
+    def count(self, text: str) -> int:
+        pass
+
+
+class HeuristicTokenCounter(TokenCounter):
+    """
+    Offline estimate that tracks BPE tokenisers more closely than len/4 on
+    XML-heavy prompts: short words are one token, long words and numbers are
+    split into chunks, and every punctuation character (so every < / >) is a
+    token of its own.
+    """
+    name = "heuristic"
+
+    _PATTERN = re.compile(r"[A-Za-z]+|\d+|\n+|[^\sA-Za-z\d]")
+
+    def count(self, text: str) -> int:
+        tokens = 0
+        for match in self._PATTERN.finditer(text):
+            piece = match.group(0)
+            if piece[0].isalpha():
+                tokens += max(1, math.ceil(len(piece) / 6))
+            elif piece[0].isdigit():
+                tokens += math.ceil(len(piece) / 3)
+            else:
+                tokens += 1
+        return tokens
+
+
+class AnthropicTokenCounter(TokenCounter):
+    """Exact counts from the Anthropic token counting endpoint (one request per distinct text)"""
+    name = "anthropic"
+
+    def __init__(self, api_key: str, model: str = "claude-haiku-4-5-20251001"):
+        from anthropic import Anthropic
+
+        self.client = Anthropic(api_key=api_key)
+        self.model = model
+        self._cache: Dict[str, int] = {}
+        # Tokens the request itself adds (message framing and the placeholder user turn)
+        self._overhead = self._count_request("")
+
+    def _count_request(self, system_prompt: str) -> int:
+        kwargs = {"system": system_prompt} if system_prompt else {}
+        response = self.client.messages.count_tokens(
+            model=self.model,
+            messages=[{"role": "user", "content": "."}],
+            **kwargs
+        )
+        return response.input_tokens
+
+    def count(self, text: str) -> int:
+        if not text.strip():
+            return 0
+        if text not in self._cache:
+            self._cache[text] = max(0, self._count_request(text) - self._overhead)
+        return self._cache[text]
+
+
+# ========== Budget report ==========
+
+@dataclass
+class SectionBudget:
+    """Token cost of one prompt section"""
+    name: str
+    tokens: int
+    child_count: int = 0
+    largest_children: List[Tuple[str, int]] = field(default_factory=list)
+
+
+@dataclass
+class PromptBudget:
+    """Token cost of a whole prompt, split by section"""
+    prompt_name: str
+    total_tokens: int
+    sections: List[SectionBudget]
+
+    @property
+    def unsectioned_tokens(self) -> int:
+        """Tokens outside any section (root tags, stray text)"""
+        return max(0, self.total_tokens - sum(section.tokens for section in self.sections))
+
+
+def analyse_prompt(prompt_name: str, prompt: str, counter: TokenCounter, top_children: int = 3) -> PromptBudget:
+    """
+    Count tokens per top-level section of a prompt.
+
+    Args:
+        prompt_name: Name shown in the report
+        prompt: System prompt text
+        counter: Token counter to use
+        top_children: How many of the largest child blocks (e.g. examples) to list per section
+
+    Returns:
+        PromptBudget for the prompt
+    """
+    sections = []
+    for section in split_instructions(prompt):
+        children = section.children()
+        child_tokens = [
+            (child.label or child.name, counter.count(child.text)) for child in children
+        ]
+        sections.append(SectionBudget(
+            name=section.name,
+            tokens=counter.count(section.text),
+            child_count=len(children),
+            largest_children=sorted(child_tokens, key=lambda item: item[1], reverse=True)[:top_children]
+        ))
+    return PromptBudget(prompt_name=prompt_name, total_tokens=counter.count(prompt), sections=sections)
+
+
+def format_budget(budget: PromptBudget) -> str:
+    """Render one prompt's budget as a table"""
+    lines = [f"{budget.prompt_name}: {budget.total_tokens:,} tokens"]
+    for section in budget.sections:
+        share = section.tokens / budget.total_tokens if budget.total_tokens else 0.0
+        line = f"  {section.name:<32}{section.tokens:>8,}{share:>8.1%}"
+        if section.child_count > 1:
+            line += f"   {section.child_count} blocks, avg {section.tokens // section.child_count:,}"
+        lines.append(line)
+        for label, tokens in section.largest_children if section.child_count > 1 else []:
+            lines.append(f"      {label[:40]:<40}{tokens:>8,}")
+    if budget.unsectioned_tokens:
+        lines.append(f"  {'(outside sections)':<32}{budget.unsectioned_tokens:>8,}")
+    return "\n".join(lines)
+
+
+# ========== Compression ==========
+
+@dataclass
+class CompressionResult:
+    """A compressed prompt and what was removed from it"""
+    prompt: str
+    removed_examples: List[str] = field(default_factory=list)
+    removed_duplicate_lines: int = 0
+
+
+def _example_query(example: PromptSection) -> str:
+    """The example's input text (<query> or <request>, else everything before <response>)"""
+    for tag in ("query", "request"):
+        content = get_xml_tag_content(example.body, tag)
+        if content:
+            return content
+    return example.body.split("<response>")[0]
+
+
+# Leaf tags holding free text copied from (or written about) the query
+_FREE_TEXT_TAGS = {"value", "justification", "reasoning", "confidence", "explanation"}
+
+
+def _example_signature(example: PromptSection) -> Tuple[Tuple[str, str], ...]:
+    """Shape of the expected answer: its elements (with attributes) and leaf values, ignoring free text"""
+    response = get_xml_tag_content(example.body, "response")
+    shape = [
+        ("element", " ".join(tag.split()))
+        for tag in re.findall(r"<([A-Za-z_][^<>]*?)/?>", response)
+    ]
+    shape += [
+        (tag, value.strip().lower())
+        for tag, value in re.findall(r"<([A-Za-z_][\w-]*)>([^<]*)</\1>", response)
+        if tag not in _FREE_TEXT_TAGS
+    ]
+    return tuple(sorted(shape))
+
+
+def _words(text: str) -> Set[str]:
+    return set(re.findall(r"[a-z0-9£$€]+", text.lower()))
+
+
+def _jaccard(a: Set[str], b: Set[str]) -> float:
+    # Queries without words (gibberish, special characters) are never "similar"
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def find_redundant_examples(
+    examples: List[PromptSection],
+    similarity: float = 0.6,
+    min_examples: int = 3
+) -> List[PromptSection]:
+    """
+    Pick the examples that add nothing to the ones before them.
+
+    An example is redundant if its query repeats a kept example's query, or if
+    its expected answer has the same shape as a kept example whose query is at
+    least `similarity` similar (word-set Jaccard).
+
+    Args:
+        examples: The <example> blocks of an <examples> section, in order
+        similarity: Query similarity at which same-shaped examples are redundant
+        min_examples: Never reduce the section below this many examples
+
+    Returns:
+        Redundant examples, in order
+    """
+    kept: List[Tuple[str, Tuple, Set[str]]] = []
+    redundant: List[PromptSection] = []
+    removable = max(0, len(examples) - min_examples)
+    for example in examples:
+        query = " ".join(_example_query(example).lower().split())
+        signature = _example_signature(example)
+        words = _words(query)
+        is_redundant = any(
+            query == kept_query or (signature == kept_signature and _jaccard(words, kept_words) >= similarity)
+            for kept_query, kept_signature, kept_words in kept
+        )
+        if is_redundant and len(redundant) < removable:
+            redundant.append(example)
+        else:
+            kept.append((query, signature, words))
+    return redundant
+
+
+def _remove_spans(text: str, spans: List[Tuple[int, int]]) -> str:
+    for start, end in sorted(spans, reverse=True):
+        text = text[:start] + text[end:]
+    return text
+
+
+def _normalise_whitespace(prompt: str) -> str:
+    lines = [re.sub(r"(?<=\S) {2,}", " ", line.rstrip()) for line in prompt.split("\n")]
+    text = "\n".join(lines)
+    text = re.sub(r"\n{3,}", "\n\n", text)
+    # No blank line directly inside a section's tags
+    text = re.sub(r"^(<[A-Za-z_][^<>/]*>)\n\n", r"\1\n", text, flags=re.MULTILINE)
+    text = re.sub(r"\n\n(</[A-Za-z_][\w-]*>)$", r"\n\1", text, flags=re.MULTILINE)
+    return text
+
+
+def _drop_duplicate_lines(prompt: str, min_length: int = 25) -> Tuple[str, int]:
+    """
+    Drop bullet and prose lines already present verbatim earlier in the prompt.
+
+    Only bullets and sentences are considered: tag lines, separators,
+    headings (ending with ':') and numbered items are kept, as their meaning
+    depends on where they appear.
+    """
+    seen: Set[str] = set()
+    kept: List[str] = []
+    dropped = 0
+    for line in prompt.split("\n"):
+        key = " ".join(line.split()).lower()
+        is_prose = re.match(r"[*\-•]?\s*[a-z]", key) is not None and not key.endswith(":")
+        if len(key) >= min_length and is_prose:
+            if key in seen:
+                dropped += 1
+                continue
+            seen.add(key)
+        kept.append(line)
+    return "\n".join(kept), dropped
+
+
+def compress_prompt(prompt: str, similarity: float = 0.6, min_examples: int = 3) -> CompressionResult:
+    """
+    Compress a prompt without changing its section structure.
+
+    Args:
+        prompt: System prompt text
+        similarity: Query similarity at which same-shaped examples are redundant
+        min_examples: Minimum examples kept per <examples> section
+
+    Returns:
+        CompressionResult with the compressed prompt
+    """
+    result = CompressionResult(prompt=prompt)
+
+    spans: List[Tuple[int, int]] = []
+    for section in split_instructions(prompt):
+        if section.name != "examples":
+            continue
+        examples = [child for child in section.children() if child.name == "example"]
+        for example in find_redundant_examples(examples, similarity, min_examples):
+            spans.append((example.start, example.end))
+            result.removed_examples.append(example.label or _example_query(example)[:40])
+    text = _remove_spans(prompt, spans)
+
+    text, result.removed_duplicate_lines = _drop_duplicate_lines(text)
+    result.prompt = _normalise_whitespace(text)
+    return result
+
+
+# ========== Validation ==========
+
+@dataclass
+class ValidationResult:
+    """Eval pass counts for the original and compressed prompt"""
+    prompt_name: str
+    total: int
+    original_passed: int
+    compressed_passed: int
+    tolerance: float
+
+    @property
+    def accepted(self) -> bool:
+        if not self.total:
+            return False
+        return (self.original_passed - self.compressed_passed) / self.total <= self.tolerance
+
+
+def _import_attribute(path: str):
+    module_name, attribute = path.rsplit(".", 1)
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+async def validate_compression(
+    prompt_name: str,
+    original: str,
+    compressed: str,
+    llm_client,
+    tolerance: float = 0.02,
+    tags: Optional[List[str]] = None,
+    batch_size: int = 3
+) -> Optional[ValidationResult]:
+    """
+    Run the agent's eval cases with the original and the compressed prompt.
+
+    Args:
+        prompt_name: Prompt module name (a key of PROMPT_AGENTS)
+        original: Original system prompt
+        compressed: Compressed system prompt
+        llm_client: LLM client for the agent and judge
+        tolerance: Largest acceptable drop in pass rate (absolute, 0.02 = 2 points)
+        tags: Only run cases with ANY of these tags
+        batch_size: Concurrent cases
+
+    Returns:
+        ValidationResult, or None if the prompt has no agent/eval cases
+    """
+    from evals.registry import EvalRegistry
+    from evals.runner import EvalRunner
+
+    if prompt_name not in PROMPT_AGENTS:
+        return None
+    agent_path, cases_module = PROMPT_AGENTS[prompt_name]
+    agent_class = _import_attribute(agent_path)
+    importlib.import_module(cases_module)  # registers the cases
+
+    agent = agent_class(llm_client=llm_client)
+    registry = EvalRegistry.for_agent(
+        agent_class=agent_class,
+        input_type=agent.get_input_model(),
+        output_type=agent.get_output_model()
+    )
+    cases = registry.get_cases(tags=tags) if tags else registry.get_all_cases()
+    if not cases:
+        return None
+
+    passed: List[int] = []
+    for system_prompt in (original, compressed):
+        runner = EvalRunner(agent_class=agent_class, llm_client=llm_client, save_results=False)
+        runner.agent.system_prompt = system_prompt
+        results = await runner.run_batch(cases, parallel=True, batch_size=batch_size)
+        passed.append(sum(1 for result in results if result.passed))
+
+    return ValidationResult(
+        prompt_name=prompt_name,
+        total=len(cases),
+        original_passed=passed[0],
+        compressed_passed=passed[1],
+        tolerance=tolerance
+    )
+
+
+# ========== CLI ==========
+
+def load_prompts(names: Optional[List[str]] = None) -> Dict[str, str]:
+    """get_instructions() output for every prompt module (or the named ones)"""
+    package = importlib.import_module(PROMPTS_PACKAGE)
+    prompts: Dict[str, str] = {}
+    for module_info in pkgutil.iter_modules(package.__path__):
+        if names and module_info.name not in names:
+            continue
+        module = importlib.import_module(f"{PROMPTS_PACKAGE}.{module_info.name}")
+        if hasattr(module, "get_instructions"):
+            prompts[module_info.name] = module.get_instructions()
+    return prompts
+
+
+def parse_arguments():
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Report prompt token budgets per XML section and compress prompts",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__.split("Examples:", 1)[1]
+    )
+    parser.add_argument("--prompts", nargs="+", help="Prompt modules to include (default: all in src/prompts)")
+    parser.add_argument(
+        "--tokenizer",
+        choices=["heuristic", "anthropic"],
+        default="heuristic",
+        help="Local estimate, or exact counts via the Anthropic API (needs ANTHROPIC_API_KEY)"
+    )
+    parser.add_argument("--compress", action="store_true", help="Compress the prompts and report the savings")
+    parser.add_argument("--similarity", type=float, default=0.6, help="Query similarity for redundant examples")
+    parser.add_argument("--min-examples", type=int, default=3, help="Minimum examples kept per prompt")
+    parser.add_argument("--validate", action="store_true", help="Check compressed prompts against the eval cases")
+    parser.add_argument("--tolerance", type=float, default=0.02, help="Allowed pass-rate drop (default: 0.02)")
+    parser.add_argument("--tags", nargs="+", help="Only validate with cases that have ANY of these tags")
+    parser.add_argument("--batch-size", type=int, default=3, help="Concurrent eval cases (default: 3)")
+    parser.add_argument("--output-dir", type=Path, help="Write compressed (and accepted, with --validate) prompts here")
+    return parser.parse_args()
+
+
+def make_counter(tokenizer: str) -> TokenCounter:
+    if tokenizer == "heuristic":
+        return HeuristicTokenCounter()
+    api_key = os.getenv("ANTHROPIC_API_KEY")
+    if not api_key:
+        print("Error: ANTHROPIC_API_KEY environment variable not set (or use --tokenizer heuristic)")
+        sys.exit(1)
+    return AnthropicTokenCounter(api_key=api_key)
+
+
+async def main() -> int:
+    """Main entry point."""
+    args = parse_arguments()
+    if args.validate and not args.compress:
+        print("Error: --validate requires --compress")
+        return 2
+
+    counter = make_counter(args.tokenizer)
+    prompts = load_prompts(args.prompts)
+
+    print("=" * 72)
+    print(f"PROMPT TOKEN BUDGET ({counter.name} tokenizer)")
+    print("=" * 72)
+    for name, prompt in prompts.items():
+        print(format_budget(analyse_prompt(name, prompt, counter)))
+        print()
+
+    if not args.compress:
+        return 0
+
+    llm_client = None
+    if args.validate:
+        from evals.llm_client_config import get_llm_client_or_exit
+        llm_client = get_llm_client_or_exit()
+
+    print("=" * 72)
+    print("COMPRESSION")
+    print("=" * 72)
+    rejected = 0
+    for name, prompt in prompts.items():
+        result = compress_prompt(prompt, similarity=args.similarity, min_examples=args.min_examples)
+        before, after = counter.count(prompt), counter.count(result.prompt)
+        saving = 1 - after / before if before else 0.0
+        print(
+            f"{name}: {before:,} -> {after:,} tokens ({saving:.1%} saved; "
+            f"{len(result.removed_examples)} examples, {result.removed_duplicate_lines} duplicate lines removed)"
+        )
+        for label in result.removed_examples:
+            print(f"    - example: {label}")
+
+        accepted = True
+        if llm_client is not None and result.prompt != prompt:
+            validation = await validate_compression(
+                name, prompt, result.prompt, llm_client,
+                tolerance=args.tolerance, tags=args.tags, batch_size=args.batch_size
+            )
+            if validation is None:
+                print("    validation: skipped (no eval cases)")
+                accepted = False
+            else:
+                accepted = validation.accepted
+                rejected += 0 if accepted else 1
+                print(
+                    f"    validation: {validation.original_passed}/{validation.total} -> "
+                    f"{validation.compressed_passed}/{validation.total} "
+                    f"({'accepted' if accepted else 'REJECTED'}, tolerance {validation.tolerance:.0%})"
+                )
+
+        if args.output_dir and accepted and result.prompt != prompt:
+            args.output_dir.mkdir(parents=True, exist_ok=True)
+            (args.output_dir / f"{name}.txt").write_text(result.prompt, encoding="utf-8")
+
+    return 1 if rejected else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
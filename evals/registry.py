@@ -9,6 +9,7 @@ from pathlib import Path
 from typing import Type, List, Dict, Any, Optional, Callable
 
 from pydantic import BaseModel
+from evals.case_index import CaseIndex
 from evals.core import EvalCase
 from evals.decorators import get_eval_case, get_registry
 
@@ -16,6 +17,11 @@ from evals.decorators import get_eval_case, get_registry
 class EvalRegistry:
     """
     Registry for managing and discovering evaluation cases.
+
+    EvalCase objects are only built (by calling the case function) when a case
+    is selected. With use_index, case names and tags come from the case index
+    (see evals/case_index.py) and a case module is only imported once one of
+    its cases is selected.
     """
 
     def __init__(self, agent_class: Type, input_type: Type[BaseModel], output_type: Type[BaseModel]):
@@ -33,13 +39,21 @@ class EvalRegistry:
         self.output_type = output_type
         self._cases: Dict[str, EvalCase] = {}
         self._functions: Dict[str, Callable] = {}
+        # Every known case, in registration order -> {"tags": [...], "priority": int}
+        self._metadata: Dict[str, Dict[str, Any]] = {}
+        # Tag -> names of the cases with that tag
+        self._tag_index: Dict[str, List[str]] = {}
+        # Indexed cases whose module isn't imported yet -> module name
+        self._modules: Dict[str, str] = {}
 
     @classmethod
     def for_agent(
         cls,
         agent_class: Type,
         input_type: Type[BaseModel],
-        output_type: Type[BaseModel]
+        output_type: Type[BaseModel],
+        use_index: bool = False,
+        modules: Optional[List[str]] = None
     ) -> 'EvalRegistry':
         """
         Create a registry for a specific agent and load its cases.
@@ -48,26 +62,97 @@ class EvalRegistry:
             agent_class: The agent class
             input_type: Input type for the agent
             output_type: Output type for the agent
+            use_index: Find cases in the case index instead of the modules imported so far
+            modules: Only load cases defined in these modules (e.g. ["evals.cases.user_intent"])
 
         Returns:
             EvalRegistry with loaded cases
         """
         registry = cls(agent_class, input_type, output_type)
-        registry.load_cases()
+        if use_index:
+            registry.load_index(modules=modules)
+        else:
+            registry.load_cases(modules=modules)
         return registry
 
-    def load_cases(self):
-        """Load all evaluation cases for this agent from the decorator registry."""
+    def _add(self, name: str, tags: List[str], priority: int):
+        """Record a case's tags and priority"""
+        previous = self._metadata.get(name)
+        if previous is not None:
+            for tag in previous["tags"]:
+                self._tag_index[tag].remove(name)
+        self._metadata[name] = {"tags": list(tags), "priority": priority}
+        for tag in tags:
+            self._tag_index.setdefault(tag, []).append(name)
+
+    def load_cases(self, modules: Optional[List[str]] = None):
+        """
+        Load all evaluation cases for this agent from the decorator registry.
+
+        Args:
+            modules: Only load cases defined in these modules
+        """
         global_registry = get_registry()
 
         # Get cases for this specific agent
         if self.agent_name in global_registry:
             agent_cases = global_registry[self.agent_name]
             for name, func in agent_cases.items():
+                metadata = getattr(func, "eval_metadata", {})
+                if modules is not None and metadata["function"].__module__ not in modules:
+                    continue
+                if self._functions.get(name) is func:
+                    continue
+                # New or re-registered: the EvalCase is built on first use
                 self._functions[name] = func
-                # Convert to EvalCase
-                eval_case = get_eval_case(func, self.input_type, self.output_type)
-                self._cases[name] = eval_case
+                self._cases.pop(name, None)
+                self._modules.pop(name, None)
+                self._add(name, metadata.get("tags", []), metadata.get("priority", 0))
+
+    def load_index(self, case_index: Optional[CaseIndex] = None, modules: Optional[List[str]] = None):
+        """
+        Load this agent's cases from the case index, without importing their modules.
+
+        Args:
+            case_index: Index to read (defaults to the cached index of evals/cases)
+            modules: Only load cases defined in these modules
+        """
+        case_index = case_index or CaseIndex()
+        for case in case_index.for_agent(self.agent_name):
+            if modules is not None and case.module not in modules:
+                continue
+            if case.name not in self._metadata:
+                self._add(case.name, list(case.tags), case.priority)
+                self._modules[case.name] = case.module
+
+        # Modules the index couldn't read completely are imported as before
+        for module in case_index.incomplete_modules:
+            if modules is None or module in modules:
+                importlib.import_module(module)
+        # Cases already registered (their modules were imported) use the live functions
+        self.load_cases(modules=modules)
+
+    def _function(self, name: str) -> Optional[Callable]:
+        """The case function, importing its module if it was only indexed"""
+        func = self._functions.get(name)
+        if func is None and name in self._modules:
+            module = self._modules[name]
+            importlib.import_module(module)
+            # Registers every case of the module (decorators don't run the case functions)
+            self.load_cases(modules=[module])
+            func = self._functions.get(name)
+        return func
+
+    def _case(self, name: str) -> Optional[EvalCase]:
+        """The EvalCase for a case name, built on first use"""
+        case = self._cases.get(name)
+        if case is None:
+            func = self._function(name)
+            if func is None:
+                return None
+            case = get_eval_case(func, self.input_type, self.output_type)
+            self._cases[name] = case
+        return case
 
     def auto_discover(self, path: Optional[Path] = None):
         """
@@ -101,13 +186,16 @@ class EvalRegistry:
 
     def get_case(self, name: str) -> Optional[EvalCase]:
         """Get a specific evaluation case by name."""
-        return self._cases.get(name)
+        if name not in self._metadata:
+            return None
+        return self._case(name)
 
     def get_cases(
         self,
         names: Optional[List[str]] = None,
         tags: Optional[List[str]] = None,
-        priority_min: Optional[int] = None
+        priority_min: Optional[int] = None,
+        tags_match_all: bool = False
     ) -> List[EvalCase]:
         """
         Get evaluation cases with optional filtering.
@@ -116,65 +204,56 @@ class EvalRegistry:
             names: Specific case names to get
             tags: Filter by tags (cases must have at least one matching tag)
             priority_min: Minimum priority level
+            tags_match_all: Cases must have all of the tags instead of at least one
 
         Returns:
             List of matching evaluation cases
         """
-        cases = []
-
-        for name, case in self._cases.items():
-            # Filter by name
-            if names and name not in names:
-                continue
-
-            # Get metadata from function
-            func = self._functions.get(name)
-            if not func:
-                continue
-
-            metadata = getattr(func, "eval_metadata", {})
+        selected = self._metadata.keys()
 
-            # Filter by tags
-            if tags:
-                case_tags = metadata.get("tags", [])
-                if not any(tag in case_tags for tag in tags):
-                    continue
+        # Filter by name
+        if names:
+            wanted = set(names)
+            selected = [name for name in selected if name in wanted]
 
-            # Filter by priority
-            if priority_min is not None:
-                priority = metadata.get("priority", 0)
-                if priority < priority_min:
-                    continue
+        # Filter by tags, using the tag index
+        if tags:
+            tagged = [set(self._tag_index.get(tag, ())) for tag in tags]
+            matching = set.intersection(*tagged) if tags_match_all else set.union(*tagged)
+            selected = [name for name in selected if name in matching]
 
-            cases.append(case)
+        # Filter by priority
+        if priority_min is not None:
+            selected = [name for name in selected if self._metadata[name]["priority"] >= priority_min]
 
+        cases = []
+        for name in selected:
+            case = self._case(name)
+            if case is not None:
+                cases.append(case)
         return cases
 
     def get_all_cases(self) -> List[EvalCase]:
         """Get all evaluation cases."""
-        return list(self._cases.values())
+        return self.get_cases()
 
     def get_cases_by_tag(self, tag: str) -> List[EvalCase]:
         """Get all cases with a specific tag."""
-        return self.get_cases(tags=[tag])
+        return [case for case in map(self._case, self._tag_index.get(tag, [])) if case is not None]
 
     def list_tags(self) -> List[str]:
         """List all unique tags used in evaluation cases."""
-        tags = set()
-        for func in self._functions.values():
-            metadata = getattr(func, "eval_metadata", {})
-            tags.update(metadata.get("tags", []))
-        return sorted(list(tags))
+        return sorted(tag for tag, names in self._tag_index.items() if names)
 
     def list_case_names(self) -> List[str]:
         """List all case names."""
-        return sorted(list(self._cases.keys()))
+        return sorted(self._metadata)
 
     def summary(self) -> Dict[str, Any]:
         """Get a summary of the registry."""
         return {
             "agent": self.agent_name,
-            "total_cases": len(self._cases),
+            "total_cases": len(self._metadata),
             "case_names": self.list_case_names(),
             "tags": self.list_tags()
-        }
\ No newline at end of file
+        }
@@ -0,0 +1,153 @@
+"""
+Content-addressed cache of agent LLM responses for eval runs.
+
+Re-running a suite after a change that does not alter what is sent to the
+model (a parser fix, a validator tweak) reuses the stored raw responses, so
+only parse_response and validation run again. Any change to the system
+prompt, the rendered user prompt, the model or the temperature is a miss.
+
+Entries are appended to one JSONL file per agent class under evals/cache/.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Dict, Optional
+
+from src.clients.llm_clients.llm_client_interface import LLMClientInterface
+from src.models.llm_metrics import LLMMetrics, LLMResponse
+
+DEFAULT_CACHE_DIR = Path(__file__).parent / "cache" / "responses"
+
+
+def response_cache_key(
+    agent_name: str,
+    system_prompt: str,
+    user_prompt: str,
+    model: str,
+    temperature: float
+) -> str:
+    """
+    Build the cache key for an agent's LLM request.
+
+    Args:
+        agent_name: Agent class name
+        system_prompt: System prompt (hashed into the key)
+        user_prompt: Rendered user prompt
+        model: Model name
+        temperature: Sampling temperature
+
+    Returns:
+        Hex-encoded SHA-256 digest
+    """
+    system_prompt_hash = hashlib.sha256(system_prompt.encode("utf-8")).hexdigest()
+    payload = json.dumps(
+        [agent_name, system_prompt_hash, user_prompt, model, float(temperature)],
+        ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Stored LLM responses of one agent, keyed by response_cache_key"""
+
+    def __init__(self, agent_name: str, cache_dir: Optional[Path] = None):
+        """
+        Args:
+            agent_name: Agent class name (one cache file per agent)
+            cache_dir: Directory for cache files (defaults to evals/cache/responses)
+        """
+        self.agent_name = agent_name
+        self.path = (cache_dir or DEFAULT_CACHE_DIR) / f"{agent_name}.jsonl"
+        self.hits = 0
+        self.misses = 0
+        # Lines of the cache file that could not be read (e.g. a write cut short)
+        self.skipped = 0
+        self._entries: Dict[str, LLMResponse] = {}
+        # Whether the file ends without a newline, so the next entry must start a new line
+        self._unterminated = False
+        if self.path.exists():
+            self._load()
+
+    def _load(self) -> None:
+        """Load all entries into memory (later entries win), skipping malformed lines"""
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                self._unterminated = not line.endswith("\n")
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                    self._entries[entry["key"]] = LLMResponse(
+                        text=entry["text"],
+                        metrics=LLMMetrics(**entry["metrics"])
+                    )
+                except (ValueError, KeyError, TypeError):
+                    self.skipped += 1
+
+    def get(self, key: str) -> Optional[LLMResponse]:
+        """Stored response for key, counting the hit or miss"""
+        response = self._entries.get(key)
+        if response is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return response
+
+    def put(self, key: str, response: LLMResponse) -> None:
+        """Store a response in memory and append it to the cache file"""
+        self._entries[key] = response
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        entry = {"key": key, "text": response.text, "metrics": response.metrics.model_dump()}
+        line = json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n"
+        if self._unterminated:
+            line = "\n" + line
+            self._unterminated = False
+        # One write per entry, so a concurrent or interrupted run can't interleave partial lines
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(line)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class CachingLLMClient(LLMClientInterface):
+    """
+    Wraps an agent's LLM client so repeated requests are served from a ResponseCache.
+
+    Cached responses keep their token counts but report zero cost and
+    latency, since no call was made.
+    """
+
+    def __init__(self, llm_client: LLMClientInterface, cache: ResponseCache):
+        self.llm_client = llm_client
+        self.cache = cache
+        self.model = getattr(llm_client, "model", "unknown")
+
+    async def generate(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float = 0.1,
+        max_tokens: int = 1000
+    ) -> LLMResponse:
+        key = response_cache_key(self.cache.agent_name, system_prompt, user_prompt, self.model, temperature)
+        cached = self.cache.get(key)
+        if cached is not None:
+            metrics = cached.metrics.model_copy(update={
+                "response_time_ms": 0.0,
+                "input_cost": 0.0,
+                "output_cost": 0.0,
+                "total_cost": 0.0
+            })
+            return LLMResponse(text=cached.text, metrics=metrics)
+
+        response = await self.llm_client.generate(
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+            temperature=temperature,
+            max_tokens=max_tokens
+        )
+        self.cache.put(key, response)
+        return response
@@ -33,9 +33,14 @@ class ResultWriter:
         self.results_dir = results_dir / agent_name
         self.results_dir.mkdir(parents=True, exist_ok=True)
 
-        # Initialize file paths with timestamp as filename
-        self.results_file = self.results_dir / f"{self.timestamp}.jsonl"
-        self.summary_file = self.results_dir / f"{self.timestamp}_summary.json"
+        # Initialize file paths with timestamp as filename (suffixed if a run started in the same second)
+        run_name = self.timestamp
+        suffix = 1
+        while (self.results_dir / f"{run_name}.jsonl").exists():
+            run_name = f"{self.timestamp}-{suffix}"
+            suffix += 1
+        self.results_file = self.results_dir / f"{run_name}.jsonl"
+        self.summary_file = self.results_dir / f"{run_name}_summary.json"
 
         # Track results for summary
         self.all_results: List[EvalResult] = []
@@ -167,6 +172,42 @@ class ResultWriter:
         with open(self.summary_file, "w", encoding="utf-8") as f:
             json.dump(summary, f, indent=2, ensure_ascii=False)
 
+    def latest_results_file(self) -> Optional[Path]:
+        """
+        Find the most recent results file of an earlier run of this agent.
+
+        Returns:
+            Path to the JSONL file, or None if there is no earlier run
+        """
+        earlier = [path for path in self.results_dir.glob("*.jsonl") if path != self.results_file]
+        if not earlier:
+            return None
+        return max(earlier, key=lambda path: path.stat().st_mtime)
+
+    @staticmethod
+    def read_results(results_file: Path) -> List[EvalResult]:
+        """
+        Load the results written by an earlier run.
+
+        If a case appears more than once, its last result wins.
+
+        Args:
+            results_file: JSONL file written by write_result
+
+        Returns:
+            One EvalResult per case, in file order
+        """
+        results: Dict[str, EvalResult] = {}
+        with open(results_file, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                result = EvalResult(**json.loads(line))
+                results.pop(result.case_name, None)
+                results[result.case_name] = result
+        return list(results.values())
+
     def get_results_path(self) -> Path:
         """
         Get the path to the results directory.
@@ -7,20 +7,27 @@ import random
 import time
 from datetime import datetime
 from pathlib import Path
-from typing import Any, List, Optional, Type, TypeVar, Generic
+from typing import Any, Iterable, List, Optional, Sized, Tuple, Type, TypeVar, Generic
 
 from src.core_nodes.agent_node_base import AgentNodeBase
+from src.core_nodes.example_store import ExampleStore
+from src.prompts.prompt_registry import get_prompt
 from src.clients.llm_clients.llm_client_interface import LLMClientInterface
+from src.clients.llm_clients.rate_limiter import RateLimitedLLMClient, RateLimiter
 from pydantic import BaseModel
 
 try:
     # Try relative imports first (when used as a package)
     from .core import EvalCase, EvalResult
     from .evaluator import Evaluator
+    from .response_cache import CachingLLMClient, ResponseCache
+    from .verdict_cache import VerdictCache
 except ImportError:
     # Fall back to absolute imports (when running directly)
     from core import EvalCase, EvalResult
     from evaluator import Evaluator
+    from response_cache import CachingLLMClient, ResponseCache
+    from verdict_cache import VerdictCache
 
 # Type variables for agent input/output
 TInput = TypeVar('TInput', bound=BaseModel)
@@ -47,11 +54,16 @@ class EvalRunner(Generic[TInput, TOutput]):
         use_judge_for_criteria: bool = True,
         max_retries: int = 3,
         initial_retry_delay: float = 1.0,
-        batch_delay_seconds: float = 5.0,
+        rate_limiter: Optional[RateLimiter] = None,
         sequential_delay_seconds: float = 2,
         jitter_factor: float = 0.1,
         save_results: bool = True,
-        results_dir: Optional[Path] = None
+        results_dir: Optional[Path] = None,
+        few_shot_k: Optional[int] = None,
+        prompt_version: Optional[str] = None,
+        use_cache: bool = True,
+        cache_dir: Optional[Path] = None,
+        judge_batch_size: int = 1
     ):
         """
         Initialize the evaluation runner.
@@ -64,12 +76,29 @@ class EvalRunner(Generic[TInput, TOutput]):
             use_judge_for_criteria: Whether to use LLM-as-a-Judge for criteria
             max_retries: Maximum number of retries for rate-limited requests
             initial_retry_delay: Initial delay in seconds for retry backoff
-            batch_delay_seconds: Delay between batches to avoid rate limits
+            rate_limiter: Optional limiter every LLM call (agent and judge) must acquire a
+                token from, e.g. TokenBucket(0.8) to stay under 50 requests per minute
             sequential_delay_seconds: Delay between sequential requests (non-parallel mode)
             jitter_factor: Random jitter factor (0.0-1.0) for retry delays to prevent thundering herd
             save_results: Whether to save results to disk
             results_dir: Optional directory for saving results
+            few_shot_k: If set, replace the agent's static examples with the k most
+                similar examples from its store (see src/core_nodes/example_store.py)
+            prompt_version: Run the agent with this registered prompt version instead of
+                its default (see src/prompts/prompt_registry.py)
+            use_cache: Reuse stored agent responses for unchanged requests, so only parsing
+                and validation run again (see evals/response_cache.py), and stored judge
+                verdicts for unchanged criteria checks (see evals/verdict_cache.py)
+            cache_dir: Optional directory for the response and verdict caches
+            judge_batch_size: If above 1, judge up to this many Criteria checks of the
+                cases in flight in one LLM call (see BatchedLLMJudge in evals/judge.py)
         """
+        if rate_limiter is not None:
+            llm_client = RateLimitedLLMClient(llm_client, rate_limiter)
+        elif isinstance(llm_client, RateLimitedLLMClient):
+            # Already paced (e.g. by evals/llm_client_config.py); report its rate
+            rate_limiter = llm_client.rate_limiter
+
         self.agent_class: Type[AgentNodeBase[TInput, TOutput]] = agent_class
         self.llm_client: LLMClientInterface = llm_client
         # Get the actual model name from the LLM client
@@ -78,27 +107,58 @@ class EvalRunner(Generic[TInput, TOutput]):
         self.default_field_name: Optional[str] = default_field_name
         self.max_retries: int = max_retries
         self.initial_retry_delay: float = initial_retry_delay
-        self.batch_delay_seconds: float = batch_delay_seconds
+        self.rate_limiter: Optional[RateLimiter] = rate_limiter
         self.sequential_delay_seconds: float = sequential_delay_seconds
         self.jitter_factor: float = jitter_factor
         self.save_results: bool = save_results
         self.results_dir: Optional[Path] = results_dir
+        self.few_shot_k: Optional[int] = few_shot_k
+
+        # Agent responses are cached per request; the judge keeps its own cache of
+        # verdicts, so a changed agent output is still judged afresh
+        self.response_cache: Optional[ResponseCache] = None
+        self.verdict_cache: Optional[VerdictCache] = None
+        agent_client: LLMClientInterface = llm_client
+        if use_cache:
+            self.response_cache = ResponseCache(agent_class.__name__, cache_dir)
+            self.verdict_cache = VerdictCache(cache_dir)
+            agent_client = CachingLLMClient(llm_client, self.response_cache)
+            if self.response_cache.skipped:
+                print(f"⚠️  Skipped {self.response_cache.skipped} malformed lines in {self.response_cache.path}")
+            if self.verdict_cache.skipped:
+                print(f"⚠️  Skipped {self.verdict_cache.skipped} malformed lines in {self.verdict_cache.path}")
 
         # Initialize agent instance
         # AgentNodeBase constructor requires llm_client and optionally model_name
         if model_name:
             self.agent = agent_class(
-                llm_client=llm_client,
+                llm_client=agent_client,
                 model_name=model_name
             )
         else:
             self.agent = agent_class(
-                llm_client=llm_client
+                llm_client=agent_client
             )
 
+        if prompt_version:
+            self.agent.use_prompt(get_prompt(self.agent.prompt.agent, prompt_version))
+
+        if few_shot_k:
+            example_store = ExampleStore.for_agent(agent_class.__name__)
+            if example_store is None:
+                raise ValueError(
+                    f"No example store for {agent_class.__name__} "
+                    f"(build one with: python -m evals.build_example_stores)"
+                )
+            self.agent.use_example_store(example_store, k=few_shot_k)
+
         # Initialize the evaluator
         judge_client = llm_client if use_judge_for_criteria else None
-        self.evaluator = Evaluator(judge_client=judge_client)
+        self.evaluator = Evaluator(
+            judge_client=judge_client,
+            judge_batch_size=judge_batch_size,
+            verdict_cache=self.verdict_cache
+        )
 
         # Initialize result writer if saving results
         self.result_writer = None
@@ -131,7 +191,9 @@ class EvalRunner(Generic[TInput, TOutput]):
                 "model": self.actual_model_name,
                 "batch_size": 1,
                 "max_retries": self.max_retries,
-                "parallel": False
+                "parallel": False,
+                "few_shot_k": self.few_shot_k,
+                "prompt_version": self.agent.prompt_version
             }
             self.result_writer.write_summary([result], metadata)
 
@@ -193,7 +255,8 @@ class EvalRunner(Generic[TInput, TOutput]):
                     duration_ms=duration_ms,
                     llm_cost=metrics.total_cost if metrics else None,
                     input_tokens=metrics.input_tokens if metrics else None,
-                    output_tokens=metrics.output_tokens if metrics else None
+                    output_tokens=metrics.output_tokens if metrics else None,
+                    prompt_version=self.agent.prompt_version
                 )
 
                 # Save result if configured
@@ -229,7 +292,8 @@ class EvalRunner(Generic[TInput, TOutput]):
                     actual_output=None,
                     error=error_str,
                     model_name=self.actual_model_name,
-                    timestamp=datetime.now().isoformat()
+                    timestamp=datetime.now().isoformat(),
+                    prompt_version=self.agent.prompt_version
                 )
 
                 # Save failed result if configured
@@ -247,7 +311,8 @@ class EvalRunner(Generic[TInput, TOutput]):
             actual_output=None,
             error="Max retries exceeded",
             model_name=self.actual_model_name,
-            timestamp=datetime.now().isoformat()
+            timestamp=datetime.now().isoformat(),
+            prompt_version=self.agent.prompt_version
         )
 
         # Save failed result if configured
@@ -259,69 +324,195 @@ class EvalRunner(Generic[TInput, TOutput]):
     
     async def run_batch(
         self,
-        eval_cases: List[EvalCase],
+        eval_cases: Iterable[EvalCase],
         parallel: bool = True,
         batch_size: int = 5
     ) -> List[EvalResult]:
         """
-        Run multiple evaluation cases with delays between batches.
+        Run multiple evaluation cases.
+
+        In parallel mode up to batch_size cases are in flight at once and the
+        next case starts as soon as one finishes. Request pacing comes from the
+        rate limiter (if any) rather than from pauses between groups of cases.
+
+        eval_cases may be a lazy iterator (e.g. evals.case_files.iter_case_file);
+        the next case is only taken from it when a slot frees up.
 
         Args:
-            eval_cases: List of test cases to execute
+            eval_cases: Test cases to execute (a list or an iterator)
             parallel: Whether to run cases in parallel
-            batch_size: Number of concurrent executions (if parallel), reduced to 5 to avoid rate limits
+            batch_size: Maximum number of cases in flight (if parallel)
 
         Returns:
-            List of EvalResult objects
+            List of EvalResult objects, in the order of eval_cases
         """
-        if not parallel:
-            # Sequential execution with configurable delay between each
-            results: List[EvalResult] = []
-            for i, case in enumerate(eval_cases):
-                result: EvalResult = await self.run_single(case)
-                results.append(result)
-                # Add configurable delay between sequential requests
-                if i < len(eval_cases) - 1:
-                    await asyncio.sleep(self.sequential_delay_seconds)
-            return results
-
-        # Parallel execution in batches with delays
-        results: List[EvalResult] = []
-        total_batches = (len(eval_cases) + batch_size - 1) // batch_size
+        results, wall_time_s = await self._execute(eval_cases, parallel, batch_size)
+        self._write_batch_summary(results, parallel, batch_size, wall_time_s, len(results))
+        return results
 
-        for batch_num, i in enumerate(range(0, len(eval_cases), batch_size)):
-            batch: List[EvalCase] = eval_cases[i:i + batch_size]
+    async def run_failed(
+        self,
+        eval_cases: List[EvalCase],
+        results_file: Optional[Path] = None,
+        parallel: bool = True,
+        batch_size: int = 5
+    ) -> List[EvalResult]:
+        """
+        Re-run only the cases that failed or errored in an earlier run.
 
-            print(f"Running batch {batch_num + 1}/{total_batches} ({len(batch)} cases)")
+        Passing results of the earlier run are carried over, so this run's
+        results file and summary cover every case in eval_cases and the next
+        re-run can start from it. Cases with no earlier result are run too.
 
-            # Run batch concurrently
-            batch_results: List[EvalResult] = await asyncio.gather(
-                *[self.run_single(case) for case in batch],
-                return_exceptions=False
-            )
+        Args:
+            eval_cases: Cases to consider (typically the same selection as the earlier run)
+            results_file: JSONL results of the earlier run (default: this agent's latest)
+            parallel: Whether to run cases in parallel
+            batch_size: Maximum number of cases in flight (if parallel)
 
-            results.extend(batch_results)
+        Returns:
+            Carried-over and new results, in the order of eval_cases
 
-            # Add delay between batches to avoid rate limits (except after last batch)
-            if batch_num < total_batches - 1:
-                print(f"Waiting {self.batch_delay_seconds}s before next batch...")
-                await asyncio.sleep(self.batch_delay_seconds)
+        Raises:
+            FileNotFoundError: If there is no earlier run to start from
+        """
+        if results_file is None and self.result_writer:
+            results_file = self.result_writer.latest_results_file()
+        if results_file is None or not Path(results_file).exists():
+            raise FileNotFoundError(f"No earlier results to re-run failures from: {results_file or 'none saved'}")
+
+        from evals.result_writer import ResultWriter
+        previous = {result.case_name: result for result in ResultWriter.read_results(Path(results_file))}
+        carried_over = {
+            case.name: previous[case.name] for case in eval_cases
+            if case.name in previous and previous[case.name].passed
+        }
+        to_run = [case for case in eval_cases if case.name not in carried_over]
+        print(f"Re-running {len(to_run)} of {len(eval_cases)} cases from {results_file} "
+              f"({len(carried_over)} passed and are carried over)")
+
+        stale = sum(1 for result in carried_over.values() if result.prompt_version != self.agent.prompt_version)
+        if stale:
+            print(f"⚠️  {stale} carried-over results were produced with a different prompt version")
 
-        # Write summary if saving results
         if self.result_writer:
-            metadata = {
-                "model": self.actual_model_name,
-                "batch_size": batch_size,
-                "max_retries": self.max_retries,
-                "parallel": parallel
-            }
-            self.result_writer.write_summary(results, metadata)
+            for result in carried_over.values():
+                self.result_writer.write_result(result)
 
-            # Print results path
-            print(f"\n📁 Results saved to: {self.result_writer.get_results_path()}")
-            print(f"📊 Summary: {self.result_writer.get_summary_path()}")
+        new_results, wall_time_s = await self._execute(to_run, parallel, batch_size)
+        by_name = {**carried_over, **{result.case_name: result for result in new_results}}
+        results = [by_name[case.name] for case in eval_cases]
 
+        self._write_batch_summary(
+            results, parallel, batch_size, wall_time_s, len(new_results),
+            rerun_of=str(results_file)
+        )
         return results
+
+    async def _execute(
+        self,
+        eval_cases: Iterable[EvalCase],
+        parallel: bool,
+        batch_size: int
+    ) -> Tuple[List[EvalResult], float]:
+        """Run the cases and return (results in input order, wall time in seconds)"""
+        start_time = time.perf_counter()
+
+        if not parallel:
+            # Sequential execution with configurable delay between each
+            results: List[EvalResult] = []
+            for i, case in enumerate(eval_cases):
+                # Add configurable delay between sequential requests
+                if i > 0:
+                    await asyncio.sleep(self.sequential_delay_seconds)
+                result: EvalResult = await self.run_single(case)
+                results.append(result)
+        else:
+            rate = f", {self.rate_limiter.rate_per_s:g} LLM calls/s" if self.rate_limiter else ""
+            count = f"{len(eval_cases)} cases" if isinstance(eval_cases, Sized) else "streamed cases"
+            print(f"Running {count} (up to {batch_size} in flight{rate})")
+
+            # Sliding window: a slot is released the moment its case finishes, and
+            # the next case is only taken from eval_cases once a slot is free
+            semaphore = asyncio.Semaphore(batch_size)
+
+            async def run_in_window(case: EvalCase) -> EvalResult:
+                try:
+                    return await self.run_single(case)
+                finally:
+                    semaphore.release()
+
+            tasks = []
+            cases = iter(eval_cases)
+            try:
+                while True:
+                    await semaphore.acquire()
+                    case = next(cases, None)
+                    if case is None:
+                        break
+                    tasks.append(asyncio.create_task(run_in_window(case)))
+            except BaseException:
+                # e.g. a malformed record in a case file: don't leave cases running
+                for task in tasks:
+                    task.cancel()
+                raise
+            results = list(await asyncio.gather(*tasks))
+
+        return results, time.perf_counter() - start_time
+
+    def _write_batch_summary(
+        self,
+        results: List[EvalResult],
+        parallel: bool,
+        batch_size: int,
+        wall_time_s: float,
+        cases_run: int,
+        rerun_of: Optional[str] = None
+    ) -> None:
+        """Print throughput and write the run summary (if saving results)"""
+        throughput = cases_run / wall_time_s if wall_time_s > 0 else 0.0
+        print(f"Completed {cases_run} cases in {wall_time_s:.1f}s ({throughput:.2f} cases/s)")
+        if self.response_cache:
+            print(f"Response cache: {self.response_cache.hits} hits, {self.response_cache.misses} misses")
+        judge = self.evaluator.judge
+        if judge and judge.items_judged:
+            print(f"Judge: {judge.items_judged} criteria checks in {judge.llm_calls} LLM calls")
+        verdict_cache = judge.verdict_cache if judge else None
+        if verdict_cache and (verdict_cache.hits or verdict_cache.misses):
+            print(
+                f"Judge cache: {verdict_cache.hits} hits, {verdict_cache.misses} misses "
+                f"({verdict_cache.hit_rate:.0%} hit rate)"
+            )
+
+        if not self.result_writer:
+            return
+
+        metadata = {
+            "model": self.actual_model_name,
+            "batch_size": batch_size,
+            "max_retries": self.max_retries,
+            "parallel": parallel,
+            "rate_limit_per_s": self.rate_limiter.rate_per_s if self.rate_limiter else None,
+            "wall_time_s": round(wall_time_s, 3),
+            "throughput_cases_per_s": round(throughput, 3),
+            "response_cache_hits": self.response_cache.hits if self.response_cache else None,
+            "response_cache_misses": self.response_cache.misses if self.response_cache else None,
+            "judge_calls": judge.llm_calls if judge else None,
+            "judge_checks": judge.items_judged if judge else None,
+            "judge_cache_hits": verdict_cache.hits if verdict_cache else None,
+            "judge_cache_misses": verdict_cache.misses if verdict_cache else None,
+            "judge_cache_hit_rate": round(verdict_cache.hit_rate, 3) if verdict_cache else None,
+            "few_shot_k": self.few_shot_k,
+            "prompt_version": self.agent.prompt_version
+        }
+        if rerun_of:
+            metadata["rerun_of"] = rerun_of
+            metadata["cases_rerun"] = cases_run
+        self.result_writer.write_summary(results, metadata)
+
+        # Print results path
+        print(f"\n📁 Results saved to: {self.result_writer.get_results_path()}")
+        print(f"📊 Summary: {self.result_writer.get_summary_path()}")
     
     
     def print_summary(self, results: List[EvalResult]) -> None:
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Run an agent's eval cases in parallel worker processes.
+
+Cases are split into N shards by a stable hash of their name. Each shard runs
+in its own spawned process with its own event loop, LLM client and
+EvalRunner. All shards draw from one SharedTokenBucket, so --rate-limit is a
+global limit on LLM calls (agent and judge); it defaults to the rate of
+evals/llm_client_config.py (LLM_RATE_LIMIT, or 0.6 calls/second). The shards' result files are
+merged into one results file and summary under evals/results/<AgentClass>/.
+
+Examples:
+  # 260 predicted-intent cases in 4 processes, at most 0.8 LLM calls/second overall
+  python -m evals.sharded_runner evals.cases.processable_entity_extraction_predicted --shards 4 --rate-limit 0.8
+
+  # Several case modules of one agent, dev cases only
+  python -m evals.sharded_runner evals.cases.processable_entity_extraction \\
+      evals.cases.processable_entity_extraction_predicted --tags dev_cases predicted_user_intent
+
+  # Offline scaling check against the fake LLM client
+  python -m evals.sharded_runner evals.cases.unprocessable_entity_extraction_predicted --shards 8 --fake
+"""
+
+import argparse
+import asyncio
+import hashlib
+import importlib
+import multiprocessing
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple, Type
+
+from src.clients.llm_clients.llm_client_interface import LLMClientInterface
+from src.clients.llm_clients.rate_limiter import RateLimiter, SharedTokenBucket
+from src.core_nodes.agent_node_base import AgentNodeBase
+from src.core_nodes.process_pool import run_in_processes
+from evals.core import EvalResult
+from evals.decorators import get_registry
+from evals.registry import EvalRegistry
+from evals.result_writer import ResultWriter
+from evals.runner import EvalRunner
+
+
+def shard_index(case_name: str, num_shards: int) -> int:
+    """Shard a case belongs to (stable across runs and processes, unlike hash())"""
+    digest = hashlib.sha256(case_name.encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % num_shards
+
+
+def load_case_functions(
+    modules: List[str],
+    tags: Optional[List[str]] = None
+) -> Tuple[Type[AgentNodeBase], Dict[str, Callable]]:
+    """
+    Import case modules and collect their decorated case functions.
+
+    Args:
+        modules: Case modules (e.g. evals.cases.processable_entity_extraction_predicted)
+        tags: Only keep cases with ANY of these tags
+
+    Returns:
+        (agent class, case name -> case function) in registration order
+
+    Raises:
+        ValueError: If the modules define no cases or cases for more than one agent
+    """
+    for module in modules:
+        importlib.import_module(module)
+
+    agent_classes = set()
+    functions: Dict[str, Callable] = {}
+    for agent_functions in get_registry().values():
+        for name, func in agent_functions.items():
+            metadata = func.eval_metadata
+            if metadata["function"].__module__ not in modules or metadata["agent_class"] is None:
+                continue
+            if tags and not any(tag in metadata["tags"] for tag in tags):
+                continue
+            agent_classes.add(metadata["agent_class"])
+            functions[name] = func
+
+    if not functions:
+        raise ValueError(f"No eval cases found in {', '.join(modules)}")
+    if len(agent_classes) > 1:
+        names = ", ".join(sorted(agent_class.__name__ for agent_class in agent_classes))
+        raise ValueError(f"Case modules must all be for one agent, found: {names}")
+    return agent_classes.pop(), functions
+
+
+def create_eval_client(args) -> LLMClientInterface:
+    """The fake client, or the client configured in evals/llm_client_config.py"""
+    if args.fake:
+        from src.clients.llm_clients.llm_client_factory import create_llm_client
+        return create_llm_client(fake=True, fake_median_ms=args.fake_median_ms)
+
+    from evals.llm_client_config import get_llm_client_or_exit
+    # The shards share the SharedTokenBucket of run_sharded instead of pacing on their own
+    return get_llm_client_or_exit(rate_limited=False)
+
+
+async def run_shard(index: int, args, output_dir: Path, rate_limiter: Optional[RateLimiter]) -> None:
+    """Run the cases of one shard, writing results under output_dir/shard-<index>"""
+    agent_class, functions = load_case_functions(args.modules, args.tags)
+    llm_client = create_eval_client(args)
+
+    agent = agent_class(llm_client)
+    registry = EvalRegistry.for_agent(
+        agent_class=agent_class,
+        input_type=agent.get_input_model(),
+        output_type=agent.get_output_model()
+    )
+    # Only this shard's cases are built (an empty names list would select every case)
+    names = [name for name in functions if shard_index(name, args.shards) == index]
+    cases = registry.get_cases(names=names) if names else []
+    print(f"🚀 [{index}] Running {len(cases)} cases")
+
+    runner = EvalRunner(
+        agent_class=agent_class,
+        llm_client=llm_client,
+        rate_limiter=rate_limiter,
+        results_dir=output_dir / f"shard-{index}",
+        use_cache=not args.no_cache,
+        prompt_version=args.prompt_version
+    )
+    await runner.run_batch(cases, parallel=True, batch_size=args.batch_size)
+
+
+def shard_process(index: int, args, output_dir: Path, rate_limiter: Optional[RateLimiter]) -> None:
+    """Entry point for each child process (own event loop and LLM client)"""
+    asyncio.run(run_shard(index, args, output_dir, rate_limiter))
+
+
+def merge_results(output_dir: Path, case_names: List[str]) -> List[EvalResult]:
+    """Read every shard's results file and return the results in case order"""
+    by_name: Dict[str, EvalResult] = {}
+    for results_file in sorted(output_dir.glob("shard-*/*/*.jsonl")):
+        for result in ResultWriter.read_results(results_file):
+            by_name[result.case_name] = result
+    return [by_name[name] for name in case_names if name in by_name]
+
+
+def run_sharded(args) -> List[EvalResult]:
+    """Run all shards and write the merged results and summary"""
+    agent_class, functions = load_case_functions(args.modules, args.tags)
+    case_names = list(functions)
+    sizes = [0] * args.shards
+    for name in case_names:
+        sizes[shard_index(name, args.shards)] += 1
+    print(f"{agent_class.__name__}: {len(case_names)} cases in {args.shards} shards ({', '.join(map(str, sizes))})")
+
+    rate_limiter: Optional[RateLimiter] = None
+    if args.rate_limit:
+        rate_limiter = SharedTokenBucket(args.rate_limit, context=multiprocessing.get_context("spawn"))
+
+    with tempfile.TemporaryDirectory(prefix="eval-shards-") as tmp:
+        output_dir = Path(tmp)
+        start = time.perf_counter()
+        exit_code = run_in_processes(shard_process, args.shards, args, output_dir, rate_limiter)
+        wall_time_s = time.perf_counter() - start
+        results = merge_results(output_dir, case_names)
+
+    if exit_code:
+        print(f"⚠️  A shard exited with code {exit_code}; {len(case_names) - len(results)} cases have no result")
+
+    writer = ResultWriter(agent_name=agent_class.__name__, results_dir=args.results_dir)
+    for result in results:
+        writer.write_result(result)
+    throughput = len(results) / wall_time_s if wall_time_s > 0 else 0.0
+    writer.write_summary(results, {
+        "model": results[0].model_name if results else None,
+        "shards": args.shards,
+        "shard_sizes": sizes,
+        "batch_size": args.batch_size,
+        "rate_limit_per_s": args.rate_limit,
+        "wall_time_s": round(wall_time_s, 3),
+        "throughput_cases_per_s": round(throughput, 3),
+        "prompt_version": results[0].prompt_version if results else None,
+        "case_modules": args.modules
+    })
+
+    passed = sum(1 for result in results if result.passed)
+    print(f"\n{'='*60}")
+    print(f"Passed: {passed}/{len(results)}")
+    print(f"Wall time: {wall_time_s:.1f}s ({throughput:.2f} cases/s)")
+    print(f"{'='*60}")
+    print(f"\n📁 Results saved to: {writer.get_results_path()}")
+    print(f"📊 Summary: {writer.get_summary_path()}")
+    return results
+
+
+def parse_arguments(argv: Optional[List[str]] = None):
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Run an agent's eval cases sharded across processes",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__.split("Examples:", 1)[1]
+    )
+    parser.add_argument("modules", nargs="+", help="Case modules, all for the same agent")
+    parser.add_argument("--shards", type=int, default=4, help="Worker processes (default: 4)")
+    parser.add_argument("--batch-size", type=int, default=3, help="Cases in flight per shard (default: 3)")
+    parser.add_argument("--rate-limit", type=float, default=None, help="Global LLM calls/second across all shards (default: LLM_RATE_LIMIT, or 0.6)")
+    parser.add_argument("--tags", nargs="+", help="Only run cases that have ANY of these tags")
+    parser.add_argument("--prompt-version", default=None, help="Registered prompt version to evaluate")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore stored agent responses and judge verdicts")
+    parser.add_argument("--results-dir", type=Path, default=None, help="Base results directory (default: evals/results)")
+    parser.add_argument("--fake", action="store_true", help="Use the fake LLM client instead of the configured one")
+    parser.add_argument("--fake-median-ms", type=float, default=800.0, help="Fake LLM median latency (default: 800)")
+    args = parser.parse_args(argv)
+    if args.shards < 1:
+        parser.error("--shards must be at least 1")
+    if args.rate_limit is not None and args.rate_limit <= 0:
+        parser.error("--rate-limit must be greater than 0")
+    if args.rate_limit is None and not args.fake:
+        from evals.llm_client_config import get_rate_limit
+        try:
+            args.rate_limit = get_rate_limit()
+        except ValueError as e:
+            parser.error(str(e))
+    return args
+
+
+def main() -> int:
+    """Main entry point."""
+    args = parse_arguments()
+    results = run_sharded(args)
+    return 0 if results and all(result.passed for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
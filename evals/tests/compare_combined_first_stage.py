@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Compare the four first-stage agents with the combined single-call agent.
+
+Runs the existing eval cases for QuerySecurityValidationAgent,
+UserIntentValidationAgent, ProcessableEntityExtractionAgent and
+UnprocessableEntityExtractionAgent twice:
+
+- separate: the workflow's default first stage (the four agents concurrently)
+- combined: one CombinedFirstStageAgent call
+
+Each distinct query runs through the first stage once per mode and every case
+is graded against the output of its own agent (or section). The report shows
+pass rates per agent alongside LLM calls, tokens, cost and first-stage
+latency, plus the cases whose outcome differs between the modes.
+"""
+
+import argparse
+import asyncio
+import math
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Type
+
+# Import evaluation cases at top level to trigger decorator registration
+import evals.cases.query_security  # noqa: F401
+import evals.cases.user_intent  # noqa: F401
+import evals.cases.processable_entity_extraction  # noqa: F401
+import evals.cases.unprocessable_entity_extraction  # noqa: F401
+
+from src.clients.llm_clients.llm_client_interface import LLMClientInterface
+from src.core_nodes.agent_node_base import AgentNodeBase
+from evals.core import EvalCase
+from evals.evaluator import Evaluator
+from evals.registry import EvalRegistry
+from evals.llm_client_config import get_llm_client_or_exit
+
+from src.workflow_nodes.query_preprocessing.combined_first_stage_agent import CombinedFirstStageAgent
+from src.workflow_nodes.query_preprocessing.processable_entity_extraction_agent import ProcessableEntityExtractionAgent
+from src.workflow_nodes.query_preprocessing.query_security_validation_agent import QuerySecurityValidationAgent
+from src.workflow_nodes.query_preprocessing.unprocessable_entity_extraction_agent import UnprocessableEntityExtractionAgent
+from src.workflow_nodes.query_preprocessing.user_intent_validation_agent import UserIntentValidationAgent
+from src.models.base_models import QueryInput
+from src.models.llm_metrics import LLMMetrics
+from src.models.entity_extraction_models import (
+    ProcessableEntityExtractionOutput,
+    QuerySecurityValidationOutput,
+    UnprocessableEntityExtractionOutput,
+    UserIntentValidationOutput
+)
+
+
+# (agent class, output type, CombinedFirstStageOutput attribute holding its result)
+SUITES: List[Tuple[Type[AgentNodeBase], Type, str]] = [
+    (QuerySecurityValidationAgent, QuerySecurityValidationOutput, "security"),
+    (UserIntentValidationAgent, UserIntentValidationOutput, "intent"),
+    (ProcessableEntityExtractionAgent, ProcessableEntityExtractionOutput, "processable"),
+    (UnprocessableEntityExtractionAgent, UnprocessableEntityExtractionOutput, "unprocessable"),
+]
+
+# Runs the first stage for one query: (section -> output, metrics for each LLM call)
+FirstStage = Callable[[QueryInput], Awaitable[Tuple[Dict[str, Any], List[LLMMetrics]]]]
+
+
+@dataclass
+class ModeReport:
+    """Results of one mode over all suites"""
+    passed: Dict[Tuple[str, str], bool] = field(default_factory=dict)  # (agent, case) -> passed
+    failure_reasons: Dict[Tuple[str, str], str] = field(default_factory=dict)
+    stage_latencies_ms: List[float] = field(default_factory=list)
+    calls: int = 0
+    total_cost: float = 0.0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    elapsed_s: float = 0.0
+
+    def record_stage(self, duration_ms: float, metrics: List[LLMMetrics]) -> None:
+        self.stage_latencies_ms.append(duration_ms)
+        self.calls += len(metrics)
+        for call_metrics in metrics:
+            self.total_cost += call_metrics.total_cost
+            self.input_tokens += call_metrics.input_tokens
+            self.output_tokens += call_metrics.output_tokens
+
+    def pass_rate(self, agent_name: str) -> Tuple[int, int]:
+        results = [passed for (agent, _), passed in self.passed.items() if agent == agent_name]
+        return sum(results), len(results)
+
+    def latency_percentile(self, percentile: float) -> float:
+        if not self.stage_latencies_ms:
+            return 0.0
+        ordered = sorted(self.stage_latencies_ms)
+        # Nearest rank, as in benchmarks/load_generator.py
+        rank = max(0, min(len(ordered) - 1, math.ceil(percentile * len(ordered) / 100) - 1))
+        return ordered[rank]
+
+
+def load_suites(tags: Optional[List[str]] = None) -> List[Tuple[Type[AgentNodeBase], str, List[EvalCase]]]:
+    """Load the eval cases for each first-stage agent (optionally cases with ANY of the tags)"""
+    suites = []
+    for agent_class, output_type, section in SUITES:
+        registry = EvalRegistry.for_agent(agent_class=agent_class, input_type=QueryInput, output_type=output_type)
+        cases = registry.get_cases(tags=tags) if tags else registry.get_all_cases()
+        suites.append((agent_class, section, cases))
+    return suites
+
+
+def separate_first_stage(llm_client: LLMClientInterface) -> FirstStage:
+    """The workflow's default first stage: the four agents concurrently"""
+    agents = [(section, agent_class(llm_client)) for agent_class, _, section in SUITES]
+
+    async def run(query_input: QueryInput) -> Tuple[Dict[str, Any], List[LLMMetrics]]:
+        results = await asyncio.gather(*(agent.process_with_metrics(query_input) for _, agent in agents))
+        outputs = {section: output for (section, _), (output, _) in zip(agents, results)}
+        return outputs, [metrics for _, metrics in results]
+
+    return run
+
+
+def combined_first_stage(llm_client: LLMClientInterface) -> FirstStage:
+    """The combined first stage: one CombinedFirstStageAgent call"""
+    agent = CombinedFirstStageAgent(llm_client)
+
+    async def run(query_input: QueryInput) -> Tuple[Dict[str, Any], List[LLMMetrics]]:
+        output, metrics = await agent.process_with_metrics(query_input)
+        return {section: getattr(output, section) for _, _, section in SUITES}, [metrics]
+
+    return run
+
+
+async def run_mode(
+    first_stage: FirstStage,
+    suites: List[Tuple[Type[AgentNodeBase], str, List[EvalCase]]],
+    evaluator: Evaluator,
+    concurrency: int
+) -> ModeReport:
+    """
+    Run the first stage once per distinct query and grade every case against
+    the output of its own agent (or section).
+    """
+    report = ModeReport()
+    semaphore = asyncio.Semaphore(concurrency)
+    stages: Dict[str, asyncio.Future] = {}
+
+    async def run_stage(query_input: QueryInput) -> Dict[str, Any]:
+        async with semaphore:
+            start = time.perf_counter()
+            outputs, metrics = await first_stage(query_input)
+            report.record_stage((time.perf_counter() - start) * 1000, metrics)
+            return outputs
+
+    async def run_case(agent_name: str, section: str, case: EvalCase) -> None:
+        query = case.input_data.query
+        if query not in stages:
+            stages[query] = asyncio.ensure_future(run_stage(case.input_data))
+        try:
+            outputs = await stages[query]
+        except Exception as e:
+            report.passed[(agent_name, case.name)] = False
+            report.failure_reasons[(agent_name, case.name)] = f"Error: {e}"
+            return
+        passed, failure_reason = await evaluator.validate(
+            actual=outputs[section],
+            expected_output=case.expected_output,
+            field_validations=case.field_validations
+        )
+        report.passed[(agent_name, case.name)] = passed
+        if failure_reason:
+            report.failure_reasons[(agent_name, case.name)] = failure_reason
+
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        run_case(agent_class.__name__, section, case)
+        for agent_class, section, cases in suites
+        for case in cases
+    ))
+    report.elapsed_s = time.perf_counter() - start
+    return report
+
+
+def format_comparison(
+    suites: List[Tuple[Type[AgentNodeBase], str, List[EvalCase]]],
+    separate: ModeReport,
+    combined: ModeReport
+) -> str:
+    """Side-by-side pass rates, cost and latency, then the cases whose outcome changed"""
+    lines = [
+        "=" * 72,
+        "FIRST STAGE: SEPARATE AGENTS vs COMBINED AGENT",
+        "=" * 72,
+        f"{'Agent':<38}{'Separate':>12}{'Combined':>12}{'Delta':>10}",
+    ]
+    for agent_class, _, _ in suites:
+        name = agent_class.__name__
+        sep_passed, total = separate.pass_rate(name)
+        comb_passed, _ = combined.pass_rate(name)
+        if not total:
+            continue
+        lines.append(
+            f"{name:<38}{sep_passed:>6}/{total:<5}{comb_passed:>6}/{total:<5}"
+            f"{(comb_passed - sep_passed) / total:>+10.1%}"
+        )
+    lines.extend([
+        "-" * 72,
+        f"{'LLM calls':<38}{separate.calls:>12}{combined.calls:>12}",
+        f"{'Input tokens':<38}{separate.input_tokens:>12,}{combined.input_tokens:>12,}",
+        f"{'Output tokens':<38}{separate.output_tokens:>12,}{combined.output_tokens:>12,}",
+        f"{'Cost (USD)':<38}{separate.total_cost:>12.4f}{combined.total_cost:>12.4f}",
+        f"{'Stage latency p50 (ms)':<38}{separate.latency_percentile(50):>12.0f}{combined.latency_percentile(50):>12.0f}",
+        f"{'Stage latency p95 (ms)':<38}{separate.latency_percentile(95):>12.0f}{combined.latency_percentile(95):>12.0f}",
+        f"{'Wall time (s)':<38}{separate.elapsed_s:>12.1f}{combined.elapsed_s:>12.1f}",
+    ])
+
+    changed = sorted(key for key, passed in separate.passed.items() if combined.passed.get(key) != passed)
+    if changed:
+        lines.extend(["-" * 72, "Cases whose outcome changed:"])
+        for agent_name, case_name in changed:
+            if separate.passed[(agent_name, case_name)]:
+                reason = combined.failure_reasons.get((agent_name, case_name), "")
+                lines.append(f"  - {agent_name}/{case_name}: regressed ({reason})")
+            else:
+                lines.append(f"  + {agent_name}/{case_name}: fixed")
+    lines.append("=" * 72)
+    return "\n".join(lines)
+
+
+def parse_arguments():
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Compare the four first-stage agents with the combined single-call agent",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Compare over all first-stage cases
+  python -m evals.tests.compare_combined_first_stage
+
+  # Compare over the dev cases only
+  python -m evals.tests.compare_combined_first_stage --tags dev_cases
+
+  # Offline, against a recorded cassette
+  LLM_CASSETTE=evals/cassettes/first_stage.jsonl python -m evals.tests.compare_combined_first_stage
+        """
+    )
+
+    parser.add_argument(
+        "--tags",
+        nargs="+",
+        help="Only run cases that have ANY of these tags. Example: --tags dev_cases"
+    )
+
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=3,
+        help="Concurrent LLM calls per mode (default: 3)"
+    )
+
+    parser.add_argument(
+        "--no-judge",
+        action="store_true",
+        help="Skip LLM-as-a-Judge criteria (only deterministic validators are checked)"
+    )
+
+    return parser.parse_args()
+
+
+async def main() -> Tuple[ModeReport, ModeReport]:
+    """Main entry point."""
+    args = parse_arguments()
+
+    # Get LLM client from centralized config
+    llm_client: LLMClientInterface = get_llm_client_or_exit()
+    evaluator = Evaluator(judge_client=None if args.no_judge else llm_client)
+
+    suites = load_suites(tags=args.tags)
+    total_cases = sum(len(cases) for _, _, cases in suites)
+    distinct_queries = len({case.input_data.query for _, _, cases in suites for case in cases})
+    print(f"Running {total_cases} cases ({distinct_queries} distinct queries) in both modes\n")
+
+    separate = await run_mode(separate_first_stage(llm_client), suites, evaluator, args.concurrency)
+    combined = await run_mode(combined_first_stage(llm_client), suites, evaluator, args.concurrency)
+
+    print(format_comparison(suites, separate, combined))
+    return separate, combined
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Compare registered prompt versions of one agent on its eval cases.
+
+Runs the agent's eval cases once per prompt version (see
+src/prompts/prompt_registry.py) and reports pass rate, tokens, cost and
+latency per version, plus the cases whose outcome differs from the first
+version. Results are saved per run with the version label in each result
+and in the summary metadata.
+"""
+
+import argparse
+import asyncio
+import importlib
+from dataclasses import dataclass
+from typing import List, Optional, Type
+
+from src.clients.llm_clients.llm_client_interface import LLMClientInterface
+from src.core_nodes.agent_node_base import AgentNodeBase
+from src.prompts.prompt_registry import PROMPT_VERSIONS, get_prompt, list_versions
+from evals.core import EvalCase, EvalResult
+from evals.llm_client_config import get_llm_client_or_exit
+from evals.prompt_budget import PROMPT_AGENTS
+from evals.registry import EvalRegistry
+from evals.runner import EvalRunner
+
+
+@dataclass
+class VersionReport:
+    """Eval results of one prompt version"""
+    version: str
+    label: str
+    results: List[EvalResult]
+
+    @property
+    def passed(self) -> int:
+        return sum(1 for result in self.results if result.passed)
+
+    @property
+    def input_tokens(self) -> int:
+        return sum(result.input_tokens or 0 for result in self.results)
+
+    @property
+    def output_tokens(self) -> int:
+        return sum(result.output_tokens or 0 for result in self.results)
+
+    @property
+    def total_cost(self) -> float:
+        return sum(result.llm_cost or 0.0 for result in self.results)
+
+    def latency_percentile(self, percentile: float) -> float:
+        durations = sorted(result.duration_ms for result in self.results if result.duration_ms is not None)
+        if not durations:
+            return 0.0
+        return durations[min(len(durations) - 1, int(percentile / 100 * len(durations)))]
+
+
+def load_agent(prompt_name: str) -> Type[AgentNodeBase]:
+    """Import the agent using a prompt, and register its eval cases"""
+    module_key = f"{prompt_name}_prompt"
+    if module_key not in PROMPT_AGENTS:
+        raise ValueError(f"No agent with eval cases uses prompt {prompt_name!r}")
+    agent_path, cases_module = PROMPT_AGENTS[module_key]
+    module_name, class_name = agent_path.rsplit(".", 1)
+    importlib.import_module(cases_module)
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def load_cases(agent_class: Type[AgentNodeBase], llm_client: LLMClientInterface,
+               tags: Optional[List[str]] = None) -> List[EvalCase]:
+    """The agent's eval cases (optionally those with ANY of the tags)"""
+    agent = agent_class(llm_client)
+    registry = EvalRegistry.for_agent(
+        agent_class=agent_class,
+        input_type=agent.get_input_model(),
+        output_type=agent.get_output_model()
+    )
+    return registry.get_cases(tags=tags) if tags else registry.get_all_cases()
+
+
+async def run_version(
+    agent_class: Type[AgentNodeBase],
+    llm_client: LLMClientInterface,
+    cases: List[EvalCase],
+    version: str,
+    batch_size: int
+) -> VersionReport:
+    """Run the cases with one prompt version"""
+    # Cost and latency are compared, so every case makes a fresh call
+    runner = EvalRunner(agent_class=agent_class, llm_client=llm_client, prompt_version=version, use_cache=False)
+    results = await runner.run_batch(cases, parallel=True, batch_size=batch_size)
+    return VersionReport(version=version, label=runner.agent.prompt_version, results=results)
+
+
+def format_comparison(prompt_name: str, reports: List[VersionReport]) -> str:
+    """Per-version table, then the cases whose outcome differs from the first version"""
+    width = 20 + 16 * len(reports)
+    lines = ["=" * width, f"PROMPT VERSIONS: {prompt_name}", "=" * width]
+
+    def row(name: str, values: List[str]) -> None:
+        lines.append(f"{name:<20}" + "".join(f"{value:>16}" for value in values))
+
+    total = len(reports[0].results)
+    row("Version", [report.label for report in reports])
+    row("Passed", [f"{report.passed}/{total} ({report.passed / total:.0%})" for report in reports])
+    row("Input tokens", [f"{report.input_tokens:,}" for report in reports])
+    row("Output tokens", [f"{report.output_tokens:,}" for report in reports])
+    row("Cost (USD)", [f"{report.total_cost:.4f}" for report in reports])
+    row("Latency p50 (ms)", [f"{report.latency_percentile(50):.0f}" for report in reports])
+    row("Latency p95 (ms)", [f"{report.latency_percentile(95):.0f}" for report in reports])
+
+    baseline = {result.case_name: result.passed for result in reports[0].results}
+    for report in reports[1:]:
+        changed = sorted(
+            result.case_name for result in report.results if baseline.get(result.case_name) != result.passed
+        )
+        if not changed:
+            continue
+        lines.extend(["-" * width, f"Outcome changed {reports[0].version} -> {report.version}:"])
+        for case_name in changed:
+            lines.append(f"  {'+' if not baseline[case_name] else '-'} {case_name}")
+    lines.append("=" * width)
+    return "\n".join(lines)
+
+
+def parse_arguments():
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Compare prompt versions of an agent on its eval cases",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Compare every registered version of the processable entity extraction prompt
+  python -m evals.tests.compare_prompt_versions processable_entity_extraction
+
+  # Compare two versions on the dev cases only
+  python -m evals.tests.compare_prompt_versions processable_entity_extraction --versions v1 v2 --tags dev_cases
+        """
+    )
+
+    parser.add_argument("prompt", choices=sorted(PROMPT_VERSIONS), help="Agent prompt name")
+
+    parser.add_argument(
+        "--versions",
+        nargs="+",
+        help="Versions to compare, first is the baseline (default: all registered, default version first)"
+    )
+
+    parser.add_argument(
+        "--tags",
+        nargs="+",
+        help="Only run cases that have ANY of these tags. Example: --tags dev_cases"
+    )
+
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=3,
+        help="Concurrent cases per batch (default: 3)"
+    )
+
+    return parser.parse_args()
+
+
+async def main() -> List[VersionReport]:
+    """Main entry point."""
+    args = parse_arguments()
+    versions = args.versions or list_versions(args.prompt)
+    for version in versions:
+        get_prompt(args.prompt, version)  # fail fast on unknown versions
+
+    # Get LLM client from centralized config
+    llm_client: LLMClientInterface = get_llm_client_or_exit()
+
+    agent_class = load_agent(args.prompt)
+    cases = load_cases(agent_class, llm_client, tags=args.tags)
+    if not cases:
+        print("No evaluation cases found matching criteria")
+        return []
+    print(f"Running {len(cases)} cases for each of: {', '.join(versions)}\n")
+
+    reports: List[VersionReport] = []
+    for version in versions:
+        reports.append(await run_version(agent_class, llm_client, cases, version, args.batch_size))
+
+    print(format_comparison(args.prompt, reports))
+    return reports
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -5,11 +5,9 @@ Runner for evaluation cases using the decorator pattern.
 
 import argparse
 import asyncio
+from pathlib import Path
 from typing import Optional, List, Dict, Any
 
-# Import evaluation cases at top level to trigger decorator registration
-import evals.cases.category_normalisation  # noqa: F401
-
 from src.clients.llm_clients.llm_client_interface import LLMClientInterface
 from evals.core import EvalCase, EvalResult
 from evals.registry import EvalRegistry
@@ -25,7 +23,10 @@ async def run_category_normalisation_evals(
     llm_client: LLMClientInterface,
     case_names: Optional[List[str]] = None,
     tags: Optional[List[str]] = None,
-    tags_match_all: bool = True
+    tags_match_all: bool = True,
+    use_cache: bool = True,
+    rerun_failed: bool = False,
+    results_file: Optional[Path] = None
 ):
     """
     Run evaluation cases for CategoryNormalisationAgent.
@@ -35,15 +36,21 @@ async def run_category_normalisation_evals(
         case_names: Optional list of specific case names to run
         tags: Optional list of tags to filter cases by
         tags_match_all: If True, cases must have ALL tags (AND). If False, cases with ANY tag (OR).
+        use_cache: If False, ignore stored agent responses and make fresh LLM calls
+        rerun_failed: Re-run only cases that failed or errored in an earlier run, carrying over the rest
+        results_file: Results JSONL of the earlier run (default: the latest)
 
     Returns:
         List of evaluation results
     """
-    # Create registry and load cases
+    # Create registry from the case index (the case module is imported, and cases
+    # are built, only for the cases selected below)
     registry = EvalRegistry.for_agent(
         agent_class=CategoryNormalisationAgent,
         input_type=CategoryNormalisationInput,
-        output_type=CategoryNormalisationOutput
+        output_type=CategoryNormalisationOutput,
+        use_index=True,
+        modules=["evals.cases.category_normalisation"]
     )
 
     # Print registry summary
@@ -61,22 +68,8 @@ async def run_category_normalisation_evals(
         print(f"Running specific cases: {case_names}")
     elif tags:
         if tags_match_all:
-            # For AND logic, we need to filter cases that have ALL specified tags
-            # The registry stores metadata on the function objects
-            matching_cases: List[EvalCase] = []
-
-            # Get all cases and check their metadata
-            for name, func in registry._functions.items():
-                metadata: Dict[str, Any] = getattr(func, "eval_metadata", {})
-                case_tags: List[str] = metadata.get("tags", [])
-
-                # Check if this case has ALL the required tags
-                if all(tag in case_tags for tag in tags):
-                    case: Optional[EvalCase] = registry.get_case(name)
-                    if case:
-                        matching_cases.append(case)
-
-            cases: List[EvalCase] = matching_cases
+            # Get cases with ALL of the tags (AND logic)
+            cases: List[EvalCase] = registry.get_cases(tags=tags, tags_match_all=True)
             print(f"Running cases with ALL tags: {tags} (AND logic)")
             print(f"Filtered cases: {len(cases)} out of {summary['total_cases']} total")
         else:
@@ -96,11 +89,18 @@ async def run_category_normalisation_evals(
     runner: EvalRunner = EvalRunner(
         agent_class=CategoryNormalisationAgent,
         llm_client=llm_client,
-        save_results=True  # Enable saving results to disk
+        save_results=True,  # Enable saving results to disk
+        use_cache=use_cache
     )
 
     # Run evaluations with smaller batch size to avoid rate limits
-    results: List[EvalResult] = await runner.run_batch(cases, parallel=True, batch_size=3)
+    if rerun_failed:
+        # Only cases that failed or errored in the earlier run are sent to the agent again
+        results: List[EvalResult] = await runner.run_failed(
+            cases, results_file=results_file, parallel=True, batch_size=3
+        )
+    else:
+        results: List[EvalResult] = await runner.run_batch(cases, parallel=True, batch_size=3)
 
     # Print results summary
     passed: int = sum(1 for r in results if r.passed)
@@ -166,6 +166,24 @@ Available tags:
         help="Run specific cases by name. Example: --cases tier3_petrol tier3_groceries_supermarket"
     )
 
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignore stored agent responses and judge verdicts and make fresh LLM calls for every case"
+    )
+
+    parser.add_argument(
+        "--rerun-failed",
+        action="store_true",
+        help="Re-run only the cases that failed or errored in the latest (or --results-file) run"
+    )
+
+    parser.add_argument(
+        "--results-file",
+        type=Path,
+        help="Results JSONL of the run to re-run failures from (default: the latest run)"
+    )
+
     return parser.parse_args()
 
 
@@ -182,18 +200,29 @@ async def main() -> List[EvalResult]:
         # Run specific cases by name
         results: List[EvalResult] = await run_category_normalisation_evals(
             llm_client,
-            case_names=args.cases
+            case_names=args.cases,
+            use_cache=not args.no_cache,
+            rerun_failed=args.rerun_failed,
+            results_file=args.results_file
         )
     elif args.tags:
         # Run cases with specified tags (AND logic)
         results: List[EvalResult] = await run_category_normalisation_evals(
             llm_client,
             tags=args.tags,
-            tags_match_all=True  # Use AND logic for multiple tags
+            tags_match_all=True,  # Use AND logic for multiple tags
+            use_cache=not args.no_cache,
+            rerun_failed=args.rerun_failed,
+            results_file=args.results_file
         )
     else:
         # Run all evaluations
-        results: List[EvalResult] = await run_category_normalisation_evals(llm_client)
+        results: List[EvalResult] = await run_category_normalisation_evals(
+            llm_client,
+            use_cache=not args.no_cache,
+            rerun_failed=args.rerun_failed,
+            results_file=args.results_file
+        )
 
     return results
 
@@ -24,7 +24,8 @@ async def run_sentiment_analysis_evals(
     llm_client,
     case_names: Optional[List[str]] = None,
     tags: Optional[List[str]] = None,
-    limit: Optional[int] = None
+    limit: Optional[int] = None,
+    judge_batch_size: int = 5
 ):
     """
     Run evaluation cases for SentimentAnalysisAgent.
@@ -34,6 +35,7 @@ async def run_sentiment_analysis_evals(
         case_names: Optional list of specific case names to run
         tags: Optional list of tags to filter cases by
         limit: Optional limit on number of cases to run
+        judge_batch_size: Criteria checks judged per LLM call (1 for one call per check)
 
     Returns:
         List of evaluation results
@@ -78,12 +80,13 @@ async def run_sentiment_analysis_evals(
     runner = EvalRunner(
         agent_class=SentimentAnalysisAgent,
         llm_client=llm_client,
-        save_results=True
+        save_results=True,
+        judge_batch_size=judge_batch_size
     )
 
-    # Run evaluations (smaller batch for semantic evaluation)
+    # Run evaluations (cases in flight share judge calls)
     print("\nRunning evaluations...")
-    results = await runner.run_batch(cases, parallel=False, batch_size=2)
+    results = await runner.run_batch(cases, parallel=True, batch_size=judge_batch_size)
 
     # Print detailed results
     print_summary(results)
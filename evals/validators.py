@@ -3,6 +3,7 @@ Output validation strategies for different types of expected outputs.
 """
 
 from abc import ABC, abstractmethod
+from collections import Counter
 from typing import Any, Dict, List, Optional, Union
 
 
@@ -223,6 +224,14 @@ class CriteriaValidator(Validator):
             return False, judge_result.rationale or "Criteria not met"
 
 
+def normalize_entity(entity: Dict[str, Any]) -> tuple:
+    """Create a comparable representation of an entity."""
+    return (
+        entity.get('type', '').lower().strip(),
+        entity.get('value', '').strip()
+    )
+
+
 class EntityListValidator(Validator):
     """
     Validator for entity extraction outputs.
@@ -279,29 +288,26 @@ class EntityListValidator(Validator):
         if not actual_entities:
             return False, f"Expected {len(expected_entities)} entities, but got none"
 
-        # Normalize entities for comparison
-        def normalize_entity(entity: Dict[str, Any]) -> tuple:
-            """Create a comparable representation of an entity."""
-            return (
-                entity.get('type', '').lower().strip(),
-                entity.get('value', '').strip()
-            )
+        # Normalize each entity once
+        expected_norm = [normalize_entity(e) for e in expected_entities]
+        actual_norm = [normalize_entity(e) for e in actual_entities]
 
-        # Convert to sets for comparison (if order doesn't matter)
+        # Compare as multisets (if order doesn't matter), so a repeated
+        # entity must be present as many times as it is expected
         if not self.ordered:
-            expected_set = {normalize_entity(e) for e in expected_entities}
-            actual_set = {normalize_entity(e) for e in actual_entities}
+            expected_counts = Counter(expected_norm)
+            actual_counts = Counter(actual_norm)
 
             # Check if all expected entities are present
-            missing = expected_set - actual_set
+            missing = expected_counts - actual_counts
             if missing:
-                missing_str = ', '.join([f"{t}:{v}" for t, v in missing])
+                missing_str = ', '.join([f"{t}:{v}" for t, v in missing.elements()])
                 return False, f"Missing entities: {missing_str}"
 
             # Check for unexpected entities (optional - could be lenient)
-            extra = actual_set - expected_set
+            extra = actual_counts - expected_counts
             if extra:
-                extra_str = ', '.join([f"{t}:{v}" for t, v in extra])
+                extra_str = ', '.join([f"{t}:{v}" for t, v in extra.elements()])
                 return False, f"Unexpected entities: {extra_str}"
 
             return True, None
@@ -311,10 +317,7 @@ class EntityListValidator(Validator):
             if len(actual_entities) != len(expected_entities):
                 return False, f"Expected {len(expected_entities)} entities, got {len(actual_entities)}"
 
-            for i, (exp, act) in enumerate(zip(expected_entities, actual_entities)):
-                exp_norm = normalize_entity(exp)
-                act_norm = normalize_entity(act)
-
+            for i, (exp_norm, act_norm) in enumerate(zip(expected_norm, actual_norm)):
                 if exp_norm != act_norm:
                     return False, f"Entity {i}: expected {exp_norm[0]}:{exp_norm[1]}, got {act_norm[0]}:{act_norm[1]}"
 
@@ -0,0 +1,114 @@
+"""
+Persistent cache of LLM judge verdicts.
+
+The same criteria applied to a byte-identical output (with the same context,
+judge model and judge prompts) gets the same verdict it got last time, without
+a judge call. Verdicts are appended to one JSONL file under
+evals/cache/verdicts/. Errored judge calls are never stored.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+DEFAULT_CACHE_DIR = Path(__file__).parent / "cache" / "verdicts"
+
+
+def verdict_cache_key(
+    output: str,
+    criteria: List[str],
+    context: Optional[Dict[str, Any]],
+    judge_model: str,
+    judge_prompt_version: str
+) -> str:
+    """
+    Build the cache key for a criteria check.
+
+    Args:
+        output: Output being judged
+        criteria: Criteria the output must meet
+        context: Optional context given to the judge
+        judge_model: Model name of the judge client
+        judge_prompt_version: Version of the judge prompts (see evals/judge.py)
+
+    Returns:
+        Hex-encoded SHA-256 digest
+    """
+    payload = json.dumps(
+        [criteria, output, context, judge_model, judge_prompt_version],
+        ensure_ascii=False,
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class VerdictCache:
+    """Stored judge verdicts, keyed by verdict_cache_key"""
+
+    def __init__(self, cache_dir: Optional[Path] = None):
+        """
+        Args:
+            cache_dir: Directory for the cache file (defaults to evals/cache/verdicts)
+        """
+        self.path = (cache_dir or DEFAULT_CACHE_DIR) / "judge_verdicts.jsonl"
+        self.hits = 0
+        self.misses = 0
+        # Lines of the cache file that could not be read (e.g. a write cut short)
+        self.skipped = 0
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        # Whether the file ends without a newline, so the next entry must start a new line
+        self._unterminated = False
+        if self.path.exists():
+            self._load()
+
+    def _load(self) -> None:
+        """Load all entries into memory (later entries win), skipping malformed lines"""
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                self._unterminated = not line.endswith("\n")
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                    self._entries[entry["key"]] = {"passed": entry["passed"], "rationale": entry["rationale"]}
+                except (ValueError, KeyError, TypeError):
+                    self.skipped += 1
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Stored verdict for key, counting the hit or miss.
+
+        Returns:
+            {"passed": bool, "rationale": Optional[str]}, or None on a miss
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return {"passed": entry["passed"], "rationale": entry["rationale"]}
+
+    def put(self, key: str, passed: bool, rationale: Optional[str]) -> None:
+        """Store a verdict in memory and append it to the cache file"""
+        self._entries[key] = {"passed": passed, "rationale": rationale}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        entry = {"key": key, "passed": passed, "rationale": rationale}
+        line = json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n"
+        if self._unterminated:
+            line = "\n" + line
+            self._unterminated = False
+        # One write per entry, so a concurrent or interrupted run can't interleave partial lines
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(line)
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of lookups served from the cache (0.0 before any lookup)"""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def __len__(self) -> int:
+        return len(self._entries)
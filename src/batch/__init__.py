@@ -0,0 +1,9 @@
+"""
+Bulk JSONL/CSV batch processing with checkpoint/resume
+
+    python -m src.batch queries.jsonl results.jsonl
+"""
+
+from src.batch.runner import BatchRunner, BatchSummary, Checkpoint, iter_input
+
+__all__ = ["BatchRunner", "BatchSummary", "Checkpoint", "iter_input"]
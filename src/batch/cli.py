@@ -0,0 +1,81 @@
+"""
+Run a JSONL/CSV file of queries through the preprocessing workflow (`python -m src.batch`).
+
+Examples:
+  # Process a file (resumes automatically from results.jsonl.checkpoint.json)
+  python -m src.batch queries.jsonl results.jsonl --concurrency 50
+
+  # CSV input with a custom query column, against the fake LLM client
+  python -m src.batch queries.csv results.jsonl --query-field text --fake
+
+  # Throw away previous progress and start again
+  python -m src.batch queries.jsonl results.jsonl --restart
+"""
+
+import argparse
+import asyncio
+from pathlib import Path
+
+from src.batch.runner import BatchRunner
+from src.clients.llm_clients.llm_client_factory import create_llm_client
+from src.clients.llm_clients.rate_limiter import TokenBucket
+from src.workflows.query_preprocessing_workflow import QueryPreprocessingWorkflow
+
+
+def parse_arguments():
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description="Bulk query preprocessing with checkpoint/resume")
+    parser.add_argument("input", type=Path, help="Input file (.jsonl, .txt or .csv)")
+    parser.add_argument("output", type=Path, help="Output JSONL file")
+    parser.add_argument("--checkpoint", type=Path, default=None, help="Checkpoint file (default: <output>.checkpoint.json)")
+    parser.add_argument("--concurrency", type=int, default=20, help="Queries in flight (default: 20)")
+    parser.add_argument("--checkpoint-every", type=int, default=100, help="Results between checkpoints (default: 100)")
+    parser.add_argument("--max-retries", type=int, default=2, help="Retries for API errors (default: 2)")
+    parser.add_argument("--query-field", default="query", help="Field/column holding the query (default: query)")
+    parser.add_argument("--id-field", default="id", help="Field/column holding a record id (default: id)")
+    parser.add_argument("--limit", type=int, default=None, help="Stop after this many new queries")
+    parser.add_argument("--restart", action="store_true", help="Ignore the checkpoint and start from scratch")
+    parser.add_argument("--rate-limit", type=float, default=None, help="Maximum LLM calls/second")
+    parser.add_argument("--fake", action="store_true", help="Use the fake LLM client instead of Anthropic")
+    parser.add_argument("--fake-median-ms", type=float, default=800.0, help="Fake LLM median latency (default: 800)")
+    return parser.parse_args()
+
+
+async def run(args) -> int:
+    """Run the batch and print a summary."""
+    llm_client = create_llm_client(
+        fake=args.fake,
+        fake_median_ms=args.fake_median_ms,
+        rate_limiter=TokenBucket(args.rate_limit) if args.rate_limit else None
+    )
+    runner = BatchRunner(
+        QueryPreprocessingWorkflow(llm_client=llm_client),
+        input_path=args.input,
+        output_path=args.output,
+        checkpoint_path=args.checkpoint,
+        concurrency=args.concurrency,
+        checkpoint_every=args.checkpoint_every,
+        max_retries=args.max_retries,
+        query_field=args.query_field,
+        id_field=args.id_field
+    )
+
+    print(f"🚀 Processing {args.input} -> {args.output}")
+    try:
+        summary = await runner.run(restart=args.restart, limit=args.limit)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+    print(summary.format())
+    print(f"\n📁 Results saved to: {args.output}")
+    return 0
+
+
+def main() -> int:
+    """Main entry point."""
+    args = parse_arguments()
+    try:
+        return asyncio.run(run(args))
+    except KeyboardInterrupt:
+        print("\n⏸️  Interrupted; progress is checkpointed, re-run the same command to resume")
+        return 130
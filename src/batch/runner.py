@@ -0,0 +1,301 @@
+"""
+Bulk batch runner for the query preprocessing workflow
+
+Streams queries from a JSONL or CSV file through the workflow with bounded
+concurrency and appends one JSON record per query to an output JSONL file as
+results complete (in completion order, tagged with the input row index).
+
+Progress is checkpointed periodically: every row below a low watermark is
+done, plus a small set of completed rows above it. The checkpoint also
+records the output file size at that moment; on resume the output is
+truncated back to it, so rows that finished after the last checkpoint are
+re-run once rather than duplicated. Memory is bounded by the concurrency
+window, not the file size.
+"""
+
+import asyncio
+import csv
+import json
+import os
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple, Union
+
+from src.workflows.exceptions import WorkflowError, get_workflow_error_details
+from src.workflows.query_preprocessing_workflow import QueryPreprocessingWorkflow
+
+
+def iter_input(
+    path: Union[str, Path],
+    query_field: str = "query",
+    id_field: str = "id"
+) -> Iterator[Tuple[int, Optional[str], str]]:
+    """
+    Lazily read (row index, record id, query) from a JSONL or CSV file.
+
+    Plain-text lines in a .jsonl/.txt file are treated as the query itself.
+
+    Args:
+        path: Input file (.csv for CSV, anything else is read as JSON lines)
+        query_field: Field/column holding the query
+        id_field: Optional field/column holding a caller-supplied id
+
+    Yields:
+        (index, id, query) where index is the 0-based data row number
+    """
+    path = Path(path)
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        if path.suffix.lower() == ".csv":
+            for index, row in enumerate(csv.DictReader(f)):
+                yield index, row.get(id_field) or None, row[query_field]
+            return
+
+        index = 0
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith("{"):
+                record = json.loads(line)
+                record_id = record.get(id_field)
+                yield index, (str(record_id) if record_id is not None else None), record[query_field]
+            else:
+                yield index, None, line
+            index += 1
+
+
+@dataclass
+class Checkpoint:
+    """Durable progress of a batch run"""
+    input_path: str
+    next_index: int = 0
+    completed_above: List[int] = field(default_factory=list)
+    output_bytes: int = 0
+    outcomes: Dict[str, int] = field(default_factory=dict)
+    total_cost: float = 0.0
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["Checkpoint"]:
+        if not path.exists():
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(**json.load(f))
+
+    def save(self, path: Path) -> None:
+        """Atomically write the checkpoint"""
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(asdict(self), f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+
+class _CompletionTracker:
+    """Low watermark plus the set of finished rows above it"""
+
+    def __init__(self, next_index: int, completed_above: List[int]):
+        self.next_index = next_index
+        self.completed_above: Set[int] = set(completed_above)
+        self._advance()
+
+    def _advance(self) -> None:
+        while self.next_index in self.completed_above:
+            self.completed_above.remove(self.next_index)
+            self.next_index += 1
+
+    def is_done(self, index: int) -> bool:
+        return index < self.next_index or index in self.completed_above
+
+    def mark_done(self, index: int) -> None:
+        self.completed_above.add(index)
+        self._advance()
+
+
+@dataclass
+class BatchSummary:
+    """Outcome counts for a batch run (including resumed progress)"""
+    processed: int
+    skipped: int
+    outcomes: Dict[str, int]
+    total_cost: float
+    elapsed_s: float
+
+    def format(self) -> str:
+        rate = self.processed / self.elapsed_s if self.elapsed_s > 0 else 0.0
+        lines = [
+            "=" * 60,
+            "BATCH SUMMARY",
+            "=" * 60,
+            f"Processed this run: {self.processed:,} ({rate:,.1f}/s)",
+            f"Skipped (already done): {self.skipped:,}",
+            f"Total cost: ${self.total_cost:.4f}",
+            "Outcomes (all runs):",
+        ]
+        for outcome, count in sorted(self.outcomes.items()):
+            lines.append(f"  {outcome}: {count:,}")
+        lines.append("=" * 60)
+        return "\n".join(lines)
+
+
+class BatchRunner:
+    """
+    Runs every query in an input file through the workflow, resumably.
+
+    Example:
+        runner = BatchRunner(workflow, "queries.jsonl", "results.jsonl")
+        summary = await runner.run()
+    """
+
+    def __init__(
+        self,
+        workflow: QueryPreprocessingWorkflow,
+        input_path: Union[str, Path],
+        output_path: Union[str, Path],
+        checkpoint_path: Optional[Union[str, Path]] = None,
+        concurrency: int = 20,
+        checkpoint_every: int = 100,
+        max_retries: int = 2,
+        retry_delay_s: float = 2.0,
+        query_field: str = "query",
+        id_field: str = "id",
+        output_buffer_bytes: int = 1 << 20
+    ):
+        """
+        Initialize the runner.
+
+        Args:
+            workflow: Workflow used for every query
+            input_path: JSONL or CSV input file
+            output_path: JSONL output file (appended to)
+            checkpoint_path: Checkpoint file (defaults to <output>.checkpoint.json)
+            concurrency: Queries processed at the same time
+            checkpoint_every: Completed queries between checkpoints
+            max_retries: Retries for unexpected (non-workflow) errors such as rate limits
+            retry_delay_s: Base delay for exponential backoff between retries
+            query_field: Input field/column holding the query
+            id_field: Input field/column holding an optional record id
+            output_buffer_bytes: Output write buffer size
+        """
+        self.workflow = workflow
+        self.input_path = Path(input_path)
+        self.output_path = Path(output_path)
+        self.checkpoint_path = Path(checkpoint_path or f"{self.output_path}.checkpoint.json")
+        self.concurrency = concurrency
+        self.checkpoint_every = checkpoint_every
+        self.max_retries = max_retries
+        self.retry_delay_s = retry_delay_s
+        self.query_field = query_field
+        self.id_field = id_field
+        self.output_buffer_bytes = output_buffer_bytes
+
+    async def _process(self, index: int, record_id: Optional[str], query: str) -> Dict[str, Any]:
+        record: Dict[str, Any] = {"index": index, "id": record_id, "query": query}
+        for attempt in range(self.max_retries + 1):
+            try:
+                result = await self.workflow.process(query)
+                record.update({"outcome": "success", "result": result.to_dict()})
+                return record
+            except WorkflowError as e:
+                record.update(get_workflow_error_details(e))
+                return record
+            except Exception as e:
+                if attempt == self.max_retries:
+                    record.update(get_workflow_error_details(e))
+                    return record
+                await asyncio.sleep(self.retry_delay_s * (2 ** attempt))
+        return record
+
+    def _load_checkpoint(self, restart: bool) -> Checkpoint:
+        checkpoint = None if restart else Checkpoint.load(self.checkpoint_path)
+        if checkpoint is None:
+            checkpoint = Checkpoint(input_path=str(self.input_path))
+            if self.output_path.exists():
+                self.output_path.unlink()
+            return checkpoint
+
+        if Path(checkpoint.input_path).resolve() != self.input_path.resolve():
+            raise ValueError(
+                f"Checkpoint {self.checkpoint_path} belongs to {checkpoint.input_path}, not {self.input_path} "
+                f"(use restart=True to start over)"
+            )
+        # Drop results written after the last checkpoint; those rows are re-run
+        if self.output_path.exists() and self.output_path.stat().st_size > checkpoint.output_bytes:
+            with open(self.output_path, "r+b") as f:
+                f.truncate(checkpoint.output_bytes)
+        return checkpoint
+
+    async def run(self, restart: bool = False, limit: Optional[int] = None) -> BatchSummary:
+        """
+        Process all remaining queries.
+
+        Args:
+            restart: Ignore any checkpoint and start from scratch (the output file is replaced)
+            limit: Stop after starting this many new queries (the run can be resumed later)
+
+        Returns:
+            BatchSummary for the run
+        """
+        start = time.perf_counter()
+        checkpoint = self._load_checkpoint(restart)
+        tracker = _CompletionTracker(checkpoint.next_index, checkpoint.completed_above)
+        self.output_path.parent.mkdir(parents=True, exist_ok=True)
+
+        processed = skipped = started = since_checkpoint = 0
+        in_flight: Set[asyncio.Task] = set()
+
+        with open(self.output_path, "a", encoding="utf-8", buffering=self.output_buffer_bytes) as output:
+
+            def save_checkpoint() -> None:
+                output.flush()
+                os.fsync(output.fileno())
+                checkpoint.next_index = tracker.next_index
+                checkpoint.completed_above = sorted(tracker.completed_above)
+                checkpoint.output_bytes = os.fstat(output.fileno()).st_size
+                checkpoint.save(self.checkpoint_path)
+
+            def handle(done: Set[asyncio.Task]) -> None:
+                nonlocal processed, since_checkpoint
+                for task in done:
+                    record = task.result()
+                    output.write(json.dumps(record, ensure_ascii=False) + "\n")
+                    tracker.mark_done(record["index"])
+                    outcome = record["outcome"]
+                    checkpoint.outcomes[outcome] = checkpoint.outcomes.get(outcome, 0) + 1
+                    if outcome == "success":
+                        checkpoint.total_cost += record["result"]["total_cost"]
+                    processed += 1
+                    since_checkpoint += 1
+                if since_checkpoint >= self.checkpoint_every:
+                    save_checkpoint()
+                    since_checkpoint = 0
+
+            try:
+                for index, record_id, query in iter_input(self.input_path, self.query_field, self.id_field):
+                    if tracker.is_done(index):
+                        skipped += 1
+                        continue
+                    if limit is not None and started >= limit:
+                        break
+                    if len(in_flight) >= self.concurrency:
+                        done, in_flight = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                        handle(done)
+                    in_flight.add(asyncio.create_task(self._process(index, record_id, query)))
+                    started += 1
+
+                while in_flight:
+                    done, in_flight = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                    handle(done)
+            finally:
+                for task in in_flight:
+                    task.cancel()
+                save_checkpoint()
+
+        return BatchSummary(
+            processed=processed,
+            skipped=skipped,
+            outcomes=dict(checkpoint.outcomes),
+            total_cost=checkpoint.total_cost,
+            elapsed_s=time.perf_counter() - start
+        )
@@ -1,6 +1,4 @@
 import time
-from anthropic import AsyncAnthropic
-from anthropic.types import TextBlock
 
 from src.clients.llm_clients.llm_client_interface import LLMClientInterface
 from src.clients.llm_clients.pricing import PricingConfig
@@ -8,10 +6,22 @@ from src.models.llm_metrics import LLMResponse, LLMMetrics
 
 
 class AnthropicLLMClient(LLMClientInterface):
-    def __init__(self, api_key: str, model: str = "claude-haiku-4-5-20251001"):
+    def __init__(self, api_key: str, model: str = "claude-haiku-4-5-20251001", cache_system_prompt: bool = False):
+        """
+        Args:
+            api_key: Anthropic API key
+            model: Model name
+            cache_system_prompt: Mark the system prompt as a prompt cache breakpoint. Repeated
+                calls with the same system prompt then read it from the cache at a tenth of the
+                input price (prompts below the model's minimum cacheable length are not cached)
+        """
+        # Imported here rather than at module level: the SDK takes over a second to
+        # import, which entry points that never construct this client shouldn't pay
+        from anthropic import AsyncAnthropic
         self.client = AsyncAnthropic(api_key=api_key)
         self.model = model
         self.pricing = PricingConfig.get_pricing(model)
+        self.cache_system_prompt = cache_system_prompt
     
     async def generate(
         self,
@@ -25,10 +35,14 @@ class AnthropicLLMClient(LLMClientInterface):
         # Start timing
         start_time = time.perf_counter()
         
+        system = system_prompt
+        if self.cache_system_prompt:
+            system = [{"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}}]
+
         # Make API call
         response = await self.client.messages.create(
             model=self.model,
-            system=system_prompt,
+            system=system,
             messages=[{"role": "user", "content": user_prompt}],
             temperature=temperature,
             max_tokens=max_tokens
@@ -40,7 +54,7 @@ class AnthropicLLMClient(LLMClientInterface):
         
         # Extract text from the first content block
         content = response.content[0]
-        if isinstance(content, TextBlock):
+        if content.type == "text":
             text = content.text
         else:
             text = str(content)
@@ -49,9 +63,16 @@ class AnthropicLLMClient(LLMClientInterface):
         input_tokens = response.usage.input_tokens
         output_tokens = response.usage.output_tokens
         total_tokens = input_tokens + output_tokens
+        cache_read_input_tokens = getattr(response.usage, "cache_read_input_tokens", None) or 0
+        cache_creation_input_tokens = getattr(response.usage, "cache_creation_input_tokens", None) or 0
         
         # Calculate costs
-        costs = self.pricing.calculate_cost(input_tokens, output_tokens)
+        costs = self.pricing.calculate_cost(
+            input_tokens,
+            output_tokens,
+            cache_read_tokens=cache_read_input_tokens,
+            cache_creation_tokens=cache_creation_input_tokens
+        )
         
         # Create metrics
         metrics = LLMMetrics(
@@ -62,7 +83,9 @@ class AnthropicLLMClient(LLMClientInterface):
             input_cost=costs["input_cost"],
             output_cost=costs["output_cost"],
             total_cost=costs["total_cost"],
-            model=self.model
+            model=self.model,
+            cache_read_input_tokens=cache_read_input_tokens,
+            cache_creation_input_tokens=cache_creation_input_tokens
         )
         
         return LLMResponse(text=text, metrics=metrics)
\ No newline at end of file
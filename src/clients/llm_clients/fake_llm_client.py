@@ -0,0 +1,241 @@
+"""
+Fake LLM Client
+Synthetic LLM client returning canned agent XML with configurable latency and failure injection,
+for load testing and benchmarking the workflow without calling the API
+"""
+
+import asyncio
+import math
+import random
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from src.clients.llm_clients.llm_client_interface import LLMClientInterface
+from src.clients.llm_clients.pricing import PricingConfig
+from src.models.llm_metrics import LLMResponse, LLMMetrics
+from src.parsers.prompt_section_parser import remove_sections
+from src.prompts.prompt_registry import get_prompt, list_versions
+
+
+class FakeRateLimitError(Exception):
+    """Injected rate limit error (message matches the Anthropic 429 error shape)"""
+    def __init__(self, message: str = "Error code: 429 - rate_limit_error (injected by FakeLLMClient)"):
+        super().__init__(message)
+
+
+class FakeLLMError(Exception):
+    """Injected generic API error"""
+    def __init__(self, message: str = "Error code: 500 - api_error (injected by FakeLLMClient)"):
+        super().__init__(message)
+
+
+@dataclass
+class LatencyProfile:
+    """
+    Latency distribution for simulated LLM calls.
+
+    Latencies are sampled from a lognormal distribution with the given median
+    and shape (sigma). With probability tail_probability a sample is multiplied
+    by tail_multiplier to simulate heavy-tail stalls.
+    """
+    median_ms: float = 800.0
+    sigma: float = 0.35
+    tail_probability: float = 0.0
+    tail_multiplier: float = 5.0
+
+    @classmethod
+    def zero(cls) -> "LatencyProfile":
+        """Profile with no latency at all (measures pure Python overhead)"""
+        return cls(median_ms=0.0, sigma=0.0)
+
+    def sample_ms(self, rng: random.Random) -> float:
+        """Draw a single latency sample in milliseconds"""
+        if self.median_ms <= 0:
+            return 0.0
+        latency = rng.lognormvariate(math.log(self.median_ms), self.sigma) if self.sigma > 0 else self.median_ms
+        if self.tail_probability > 0 and rng.random() < self.tail_probability:
+            latency *= self.tail_multiplier
+        return latency
+
+
+# Canned responses for the query preprocessing agents. The defaults describe a
+# valid, secure query with a category entity so the full workflow (including
+# category normalisation) is exercised.
+PROCESSABLE_ENTITY_RESPONSE = """<response>
+<entities>
+<entity>
+<type>merchant</type>
+<value>Tesco</value>
+</entity>
+<entity>
+<type>category</type>
+<value>groceries</value>
+</entity>
+<entity>
+<type>temporal</type>
+<value>last month</value>
+</entity>
+</entities>
+</response>"""
+
+QUERY_SECURITY_RESPONSE = """<response>
+<valid>true</valid>
+<justification>Clean natural language query</justification>
+</response>"""
+
+UNPROCESSABLE_ENTITY_RESPONSE = """<response>
+<entities></entities>
+</response>"""
+
+USER_INTENT_RESPONSE = """<response>
+<valid>true</valid>
+<justification>Legitimate spending analysis query</justification>
+</response>"""
+
+CATEGORY_NORMALISATION_RESPONSE = """<response>
+<entities>
+<entity>
+<type>category</type>
+<value>groceries</value>
+<canon>expenses:groceries.supermarkets</canon>
+</entity>
+</entities>
+</response>"""
+
+
+
+def _combined_section(tag: str, response: str) -> str:
+    """Re-wrap a single agent's <response> body as a section of the combined response"""
+    body = response.removeprefix("<response>").removesuffix("</response>")
+    return f"<{tag}>{body}</{tag}>"
+
+
+COMBINED_FIRST_STAGE_RESPONSE = "<response>\n" + "\n".join([
+    _combined_section("security_validation", QUERY_SECURITY_RESPONSE),
+    _combined_section("intent_validation", USER_INTENT_RESPONSE),
+    _combined_section("processable_entities", PROCESSABLE_ENTITY_RESPONSE),
+    _combined_section("unprocessable_entities", UNPROCESSABLE_ENTITY_RESPONSE),
+]) + "\n</response>"
+
+
+def default_canned_responses() -> Dict[str, str]:
+    """
+    Map each query preprocessing agent's system prompt to a canned XML response.
+
+    Every registered version of each agent's prompt is mapped (see
+    src/prompts/prompt_registry.py). Each prompt is also mapped without its
+    <examples> block, as sent by agents using an example store
+    (AgentNodeBase.use_example_store).
+
+    Returns:
+        Dictionary of system prompt -> response XML
+    """
+    canned = {
+        "processable_entity_extraction": PROCESSABLE_ENTITY_RESPONSE,
+        "query_security_validation": QUERY_SECURITY_RESPONSE,
+        "unprocessable_entity_extraction": UNPROCESSABLE_ENTITY_RESPONSE,
+        "user_intent_validation": USER_INTENT_RESPONSE,
+        "category_normalisation": CATEGORY_NORMALISATION_RESPONSE,
+        "combined_first_stage": COMBINED_FIRST_STAGE_RESPONSE,
+    }
+
+    responses = {
+        get_prompt(agent, version).instructions: response
+        for agent, response in canned.items()
+        for version in list_versions(agent)
+    }
+    for prompt, response in list(responses.items()):
+        responses.setdefault(remove_sections(prompt, "examples"), response)
+    return responses
+
+
+class FakeLLMClient(LLMClientInterface):
+    """
+    LLM client that returns canned XML responses after a simulated delay.
+
+    Responses are looked up by system prompt, so each agent receives XML
+    matching its own output schema. Rate limit (429) and generic errors can be
+    injected with configurable probabilities. Token counts are estimated from
+    text length and priced with a real model's pricing for realistic metrics.
+    """
+
+    def __init__(
+        self,
+        latency_profile: Optional[LatencyProfile] = None,
+        responses: Optional[Dict[str, str]] = None,
+        default_response: str = "<response></response>",
+        rate_limit_probability: float = 0.0,
+        error_probability: float = 0.0,
+        model: str = "fake-llm",
+        pricing_model: str = "claude-haiku-4-5-20251001",
+        seed: Optional[int] = None
+    ):
+        """
+        Initialize the fake client.
+
+        Args:
+            latency_profile: Latency distribution (defaults to LatencyProfile())
+            responses: Mapping of system prompt -> response XML (defaults to the preprocessing agents)
+            default_response: Response for system prompts not in the mapping
+            rate_limit_probability: Probability of raising FakeRateLimitError per call
+            error_probability: Probability of raising FakeLLMError per call
+            model: Model name reported in metrics
+            pricing_model: Model whose pricing is used for cost estimates
+            seed: Optional random seed for reproducible runs
+        """
+        self.latency_profile = latency_profile or LatencyProfile()
+        self.responses = responses if responses is not None else default_canned_responses()
+        self.default_response = default_response
+        self.rate_limit_probability = rate_limit_probability
+        self.error_probability = error_probability
+        self.model = model
+        self.pricing = PricingConfig.get_pricing(pricing_model)
+        self._random = random.Random(seed)
+        self.call_count = 0
+
+    @staticmethod
+    def estimate_tokens(text: str) -> int:
+        """Rough token estimate (~4 characters per token)"""
+        return max(1, len(text) // 4)
+
+    async def generate(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float = 0.1,
+        max_tokens: int = 1000
+    ) -> LLMResponse:
+        """Return the canned response for this system prompt after a simulated delay"""
+        self.call_count += 1
+        latency_ms = self.latency_profile.sample_ms(self._random)
+
+        if latency_ms > 0:
+            await asyncio.sleep(latency_ms / 1000)
+        else:
+            # Still yield to the event loop so concurrency behaves like a real client
+            await asyncio.sleep(0)
+
+        roll = self._random.random()
+        if roll < self.rate_limit_probability:
+            raise FakeRateLimitError()
+        if roll < self.rate_limit_probability + self.error_probability:
+            raise FakeLLMError()
+
+        text = self.responses.get(system_prompt, self.default_response)
+
+        input_tokens = self.estimate_tokens(system_prompt) + self.estimate_tokens(user_prompt)
+        output_tokens = self.estimate_tokens(text)
+        costs = self.pricing.calculate_cost(input_tokens, output_tokens)
+
+        metrics = LLMMetrics(
+            response_time_ms=latency_ms,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            total_tokens=input_tokens + output_tokens,
+            input_cost=costs["input_cost"],
+            output_cost=costs["output_cost"],
+            total_cost=costs["total_cost"],
+            model=self.model
+        )
+
+        return LLMResponse(text=text, metrics=metrics)
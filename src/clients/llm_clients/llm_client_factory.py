@@ -0,0 +1,51 @@
+"""
+LLM client construction for command-line entry points (service, workers)
+"""
+
+import os
+from typing import Optional
+
+from dotenv import load_dotenv
+
+from src.clients.llm_clients.llm_client_interface import LLMClientInterface
+from src.clients.llm_clients.rate_limiter import RateLimiter, RateLimitedLLMClient
+
+
+def create_llm_client(
+    fake: bool = False,
+    fake_median_ms: float = 800.0,
+    seed: Optional[int] = None,
+    rate_limiter: Optional[RateLimiter] = None
+) -> LLMClientInterface:
+    """
+    Create the fake or Anthropic LLM client.
+
+    Args:
+        fake: Use FakeLLMClient (no API key or network needed)
+        fake_median_ms: Median latency of the fake client
+        seed: Optional seed for the fake client
+        rate_limiter: Optional limiter every LLM call must acquire a token from
+
+    Returns:
+        Configured LLM client
+
+    Raises:
+        SystemExit: If the Anthropic client is requested but ANTHROPIC_API_KEY is not set
+    """
+    client: LLMClientInterface
+    if fake:
+        from src.clients.llm_clients.fake_llm_client import FakeLLMClient, LatencyProfile
+        client = FakeLLMClient(latency_profile=LatencyProfile(median_ms=fake_median_ms), seed=seed)
+    else:
+        load_dotenv()
+        api_key = os.getenv("ANTHROPIC_API_KEY")
+        if not api_key:
+            print("Error: ANTHROPIC_API_KEY environment variable not set (or run with --fake)")
+            raise SystemExit(1)
+
+        from src.clients.llm_clients.anthropic_llm_client import AnthropicLLMClient
+        client = AnthropicLLMClient(api_key=api_key)
+
+    if rate_limiter is not None:
+        client = RateLimitedLLMClient(client, rate_limiter)
+    return client
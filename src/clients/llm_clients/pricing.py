@@ -20,18 +20,35 @@ class ModelPricing:
         self.input_cost_per_million = input_cost_per_million
         self.output_cost_per_million = output_cost_per_million
     
-    def calculate_cost(self, input_tokens: int, output_tokens: int) -> Dict[str, float]:
+    # Prompt cache reads and writes relative to the base input price
+    CACHE_READ_MULTIPLIER = 0.1
+    CACHE_WRITE_MULTIPLIER = 1.25
+    
+    def calculate_cost(
+        self,
+        input_tokens: int,
+        output_tokens: int,
+        cache_read_tokens: int = 0,
+        cache_creation_tokens: int = 0
+    ) -> Dict[str, float]:
         """
         Calculate the cost for a given number of tokens.
         
         Args:
-            input_tokens: Number of input tokens
+            input_tokens: Number of uncached input tokens
             output_tokens: Number of output tokens
+            cache_read_tokens: Input tokens served from the prompt cache
+            cache_creation_tokens: Input tokens written to the prompt cache
             
         Returns:
             Dictionary with input_cost, output_cost, and total_cost in USD
         """
-        input_cost = (input_tokens / 1_000_000) * self.input_cost_per_million
+        billed_input_tokens = (
+            input_tokens
+            + cache_read_tokens * self.CACHE_READ_MULTIPLIER
+            + cache_creation_tokens * self.CACHE_WRITE_MULTIPLIER
+        )
+        input_cost = (billed_input_tokens / 1_000_000) * self.input_cost_per_million
         output_cost = (output_tokens / 1_000_000) * self.output_cost_per_million
         
         return {
@@ -0,0 +1,179 @@
+"""
+Token-bucket rate limiting for LLM calls
+
+Three buckets share the same reservation algorithm: a caller takes its tokens
+immediately (the balance may go negative) and then sleeps until the deficit
+has been refilled. Each acquire is one short critical section with no
+polling, and callers are served in arrival order.
+
+- TokenBucket: one event loop
+- SharedTokenBucket: processes started by one launcher (multiprocessing shared memory)
+- FileLockTokenBucket: unrelated processes on one host (fcntl lock on a state file; POSIX only)
+"""
+
+import asyncio
+import multiprocessing
+import os
+import struct
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+from src.clients.llm_clients.llm_client_interface import LLMClientInterface
+from src.core_nodes.tracing import trace_span
+from src.models.llm_metrics import LLMResponse
+
+
+def _reserve(
+    tokens: float,
+    last_refill: float,
+    now: float,
+    rate: float,
+    capacity: float,
+    n: float
+) -> Tuple[float, float]:
+    """Refill, take n tokens and return (new balance, seconds to wait)"""
+    tokens = min(capacity, tokens + (now - last_refill) * rate) - n
+    return tokens, (-tokens / rate if tokens < 0 else 0.0)
+
+
+class RateLimiter(ABC):
+    def __init__(self, rate_per_s: float, capacity: Optional[float] = None):
+        """
+        Args:
+            rate_per_s: Sustained rate (e.g. requests per second)
+            capacity: Maximum burst size (defaults to one second of tokens)
+        """
+        if rate_per_s <= 0:
+            raise ValueError("rate_per_s must be positive")
+        self.rate_per_s = rate_per_s
+        self.capacity = capacity if capacity is not None else max(1.0, rate_per_s)
+
+    @abstractmethod
+    def _reserve_tokens(self, n: float) -> float:
+        """Take n tokens and return how long the caller must wait"""
+        pass
+
+    async def acquire(self, n: float = 1.0) -> float:
+        """
+        Wait until n tokens are available.
+
+        Returns:
+            Seconds spent waiting
+        """
+        wait_s = self._reserve_tokens(n)
+        if wait_s > 0:
+            await asyncio.sleep(wait_s)
+        return wait_s
+
+
+class TokenBucket(RateLimiter):
+    """Token bucket for a single event loop"""
+
+    def __init__(self, rate_per_s: float, capacity: Optional[float] = None):
+        super().__init__(rate_per_s, capacity)
+        self._tokens = self.capacity
+        self._last_refill = time.monotonic()
+
+    def _reserve_tokens(self, n: float) -> float:
+        now = time.monotonic()
+        self._tokens, wait_s = _reserve(self._tokens, self._last_refill, now, self.rate_per_s, self.capacity, n)
+        self._last_refill = now
+        return wait_s
+
+
+class SharedTokenBucket(RateLimiter):
+    """
+    Token bucket in shared memory, for processes started by one launcher.
+
+    Pass the instance to child processes (as a Process argument); all of
+    them then draw from the same bucket.
+    """
+
+    def __init__(self, rate_per_s: float, capacity: Optional[float] = None, context=None):
+        super().__init__(rate_per_s, capacity)
+        context = context or multiprocessing.get_context()
+        # [tokens, last_refill]; the lock is only held for the arithmetic
+        self._state = context.RawArray("d", [self.capacity, time.monotonic()])
+        self._lock = context.Lock()
+
+    def _reserve_tokens(self, n: float) -> float:
+        with self._lock:
+            now = time.monotonic()
+            tokens, wait_s = _reserve(
+                self._state[0], self._state[1], now, self.rate_per_s, self.capacity, n
+            )
+            self._state[0] = tokens
+            self._state[1] = now
+        return wait_s
+
+
+class FileLockTokenBucket(RateLimiter):
+    """
+    Token bucket stored in a small file guarded by an fcntl lock.
+
+    Works across processes that were started independently (for example
+    several `python -m src.workers work` commands). POSIX only.
+    """
+
+    _FORMAT = "dd"
+
+    def __init__(self, path: Union[str, Path], rate_per_s: float, capacity: Optional[float] = None):
+        super().__init__(rate_per_s, capacity)
+        try:
+            import fcntl  # noqa: F401
+        except ImportError:
+            raise RuntimeError("FileLockTokenBucket requires fcntl (POSIX); use SharedTokenBucket instead")
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def _reserve_tokens(self, n: float) -> float:
+        import fcntl
+
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            now = time.time()
+            data = os.pread(fd, struct.calcsize(self._FORMAT), 0)
+            if len(data) == struct.calcsize(self._FORMAT):
+                tokens, last_refill = struct.unpack(self._FORMAT, data)
+            else:
+                tokens, last_refill = self.capacity, now
+            tokens, wait_s = _reserve(tokens, last_refill, now, self.rate_per_s, self.capacity, n)
+            os.pwrite(fd, struct.pack(self._FORMAT, tokens, now), 0)
+        finally:
+            os.close(fd)  # also releases the lock
+        return wait_s
+
+    async def acquire(self, n: float = 1.0) -> float:
+        # flock can block on other processes, so take it off the event loop
+        wait_s = await asyncio.to_thread(self._reserve_tokens, n)
+        if wait_s > 0:
+            await asyncio.sleep(wait_s)
+        return wait_s
+
+
+class RateLimitedLLMClient(LLMClientInterface):
+    """Wraps an LLM client so every generate() call first acquires a token"""
+
+    def __init__(self, llm_client: LLMClientInterface, rate_limiter: RateLimiter):
+        self.llm_client = llm_client
+        self.rate_limiter = rate_limiter
+        self.model = getattr(llm_client, "model", "unknown")
+
+    async def generate(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float = 0.1,
+        max_tokens: int = 1000
+    ) -> LLMResponse:
+        with trace_span("llm.rate_limit_wait"):
+            await self.rate_limiter.acquire()
+        return await self.llm_client.generate(
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+            temperature=temperature,
+            max_tokens=max_tokens
+        )
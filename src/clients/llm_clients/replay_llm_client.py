@@ -0,0 +1,174 @@
+"""
+Record/Replay LLM Client
+Persists LLM responses to a cassette file so tests, evals and benchmarks can be re-run offline
+"""
+
+import asyncio
+import hashlib
+import json
+import random
+from pathlib import Path
+from typing import Dict, List, Literal, Optional, Union
+
+from src.clients.llm_clients.llm_client_interface import LLMClientInterface
+from src.models.llm_metrics import LLMResponse, LLMMetrics
+
+
+class CassetteMissError(KeyError):
+    """Raised in replay mode when a request has no recorded response"""
+    def __init__(self, request_hash: str):
+        self.request_hash = request_hash
+        super().__init__(f"No recorded response for request {request_hash}")
+
+
+def request_hash(
+    system_prompt: str,
+    user_prompt: str,
+    temperature: float,
+    max_tokens: int
+) -> str:
+    """
+    Build a stable hash identifying an LLM request.
+
+    Args:
+        system_prompt: System prompt sent to the model
+        user_prompt: User prompt sent to the model
+        temperature: Sampling temperature
+        max_tokens: Maximum output tokens
+
+    Returns:
+        Hex-encoded SHA-256 digest of the request
+    """
+    payload = json.dumps(
+        [system_prompt, user_prompt, float(temperature), int(max_tokens)],
+        ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ReplayLLMClient(LLMClientInterface):
+    """
+    LLM client that records real responses to a cassette and replays them offline.
+
+    In "record" mode every request is forwarded to the wrapped client and the
+    response text and metrics are appended to the cassette (one JSON object per
+    line, keyed by request hash - prompts themselves are not stored).
+
+    In "replay" mode responses are served from the cassette without any network
+    access. Optionally, latency is simulated by sleeping for a duration sampled
+    from the recorded response times.
+    """
+
+    def __init__(
+        self,
+        cassette_path: Union[str, Path],
+        mode: Literal["record", "replay"] = "replay",
+        llm_client: Optional[LLMClientInterface] = None,
+        simulate_latency: bool = False,
+        latency_scale: float = 1.0,
+        seed: Optional[int] = None
+    ):
+        """
+        Initialize the replay client.
+
+        Args:
+            cassette_path: Path to the JSONL cassette file
+            mode: "record" to call the wrapped client and persist, "replay" to serve offline
+            llm_client: Client to forward requests to (required in record mode)
+            simulate_latency: Whether to sleep for a recorded latency sample in replay mode
+            latency_scale: Multiplier applied to simulated latencies
+            seed: Optional seed for latency sampling, for reproducible runs
+
+        Raises:
+            ValueError: If mode is invalid or record mode has no wrapped client
+            FileNotFoundError: If replay mode is used with a missing cassette
+        """
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown replay mode: {mode}")
+        if mode == "record" and llm_client is None:
+            raise ValueError("Record mode requires an llm_client to forward requests to")
+
+        self.cassette_path = Path(cassette_path)
+        self.mode = mode
+        self.llm_client = llm_client
+        self.simulate_latency = simulate_latency
+        self.latency_scale = latency_scale
+        self._random = random.Random(seed)
+        self._entries: Dict[str, LLMResponse] = {}
+        self._latencies_ms: List[float] = []
+
+        if self.cassette_path.exists():
+            self._load()
+        elif mode == "replay":
+            raise FileNotFoundError(f"Cassette not found: {self.cassette_path}")
+
+        # Mirror the wrapped client's model name so runners report it correctly
+        if llm_client is not None:
+            self.model = getattr(llm_client, "model", "unknown")
+        elif self._entries:
+            self.model = next(iter(self._entries.values())).metrics.model
+        else:
+            self.model = "unknown"
+
+    def _load(self) -> None:
+        """Load all cassette entries into memory (later entries win)"""
+        with open(self.cassette_path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                entry = json.loads(line)
+                metrics = LLMMetrics(**entry["metrics"])
+                self._entries[entry["key"]] = LLMResponse(text=entry["text"], metrics=metrics)
+                self._latencies_ms.append(metrics.response_time_ms)
+
+    def _append(self, key: str, response: LLMResponse) -> None:
+        """Append a single entry to the cassette"""
+        self.cassette_path.parent.mkdir(parents=True, exist_ok=True)
+        entry = {
+            "key": key,
+            "text": response.text,
+            "metrics": response.metrics.model_dump()
+        }
+        with open(self.cassette_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False, separators=(",", ":")))
+            f.write("\n")
+
+    async def generate(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float = 0.1,
+        max_tokens: int = 1000
+    ) -> LLMResponse:
+        """Serve a recorded response, or record a fresh one in record mode"""
+        key = request_hash(system_prompt, user_prompt, temperature, max_tokens)
+
+        if self.mode == "record":
+            response = await self.llm_client.generate(
+                system_prompt=system_prompt,
+                user_prompt=user_prompt,
+                temperature=temperature,
+                max_tokens=max_tokens
+            )
+            self._entries[key] = response
+            self._latencies_ms.append(response.metrics.response_time_ms)
+            self._append(key, response)
+            return response
+
+        recorded = self._entries.get(key)
+        if recorded is None:
+            raise CassetteMissError(key)
+
+        if not self.simulate_latency:
+            return recorded
+
+        # Sample from the recorded latency distribution rather than this entry's own latency
+        latency_ms = self._random.choice(self._latencies_ms) * self.latency_scale
+        await asyncio.sleep(latency_ms / 1000)
+        metrics = recorded.metrics.model_copy(update={"response_time_ms": latency_ms})
+        return LLMResponse(text=recorded.text, metrics=metrics)
+
+    def __len__(self) -> int:
+        """Number of distinct recorded requests"""
+        return len(self._entries)
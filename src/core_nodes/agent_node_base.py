@@ -1,9 +1,13 @@
 from abc import ABC, abstractmethod
-from typing import Type, TypeVar, Optional, Generic
+from typing import Type, TypeVar, Optional, Generic, Tuple
 from pydantic import BaseModel
 
 from src.clients.llm_clients.llm_client_interface import LLMClientInterface
+from src.core_nodes.example_store import ExampleStore
+from src.core_nodes.tracing import trace_span
 from src.models.llm_metrics import LLMMetrics
+from src.parsers.prompt_section_parser import remove_sections
+from src.prompts.prompt_registry import PromptVersion
 
 TInput = TypeVar('TInput', bound=BaseModel)
 TOutput = TypeVar('TOutput', bound=BaseModel)
@@ -23,6 +27,27 @@ class AgentNodeBase(ABC, Generic[TInput, TOutput]):
         self.temperature = temperature
         self.max_tokens = max_tokens
         self.last_metrics: Optional[LLMMetrics] = None
+        self.example_store: Optional[ExampleStore] = None
+        self.example_k: int = 0
+        self.prompt: Optional[PromptVersion] = None
+        self._system_prompt: Optional[str] = None
+
+
+    @property
+    def system_prompt(self) -> str:
+        """The system prompt (a registered prompt's instructions are loaded on first use)"""
+        if self._system_prompt is None and self.prompt is not None:
+            self._system_prompt = self.prompt.instructions
+        return self._system_prompt
+
+    @system_prompt.setter
+    def system_prompt(self, value: str) -> None:
+        self._system_prompt = value
+
+    @property
+    def prompt_version(self) -> Optional[str]:
+        """Label (version@hash) of the registered prompt in use, if any"""
+        return self.prompt.label if self.prompt is not None else None
 
 
     def set_prompts(self, system_prompt: str, task_prompt: str) -> None:
@@ -30,6 +55,30 @@ class AgentNodeBase(ABC, Generic[TInput, TOutput]):
         self.task_prompt: str = task_prompt
 
 
+    def use_prompt(self, prompt: PromptVersion) -> None:
+        """
+        Use a registered prompt version (see src/prompts/prompt_registry.py).
+
+        Its label is attached to the metrics of every call as prompt_version.
+        The prompt module is only imported when the system prompt is first used.
+        """
+        self.prompt = prompt
+        self._system_prompt = None
+
+
+    def use_example_store(self, example_store: ExampleStore, k: int = 5) -> None:
+        """
+        Replace the static <examples> block of the system prompt with the k
+        examples most similar to each query, sent in the user prompt.
+
+        The system prompt then no longer changes between queries, so it can be
+        served from the prompt cache. Only applies to inputs with a `query`.
+        """
+        self.system_prompt = remove_sections(self.system_prompt, "examples")
+        self.example_store = example_store
+        self.example_k = k
+
+
     @abstractmethod
     def parse_response(self, llm_response: str) -> TOutput:
         """Parse the LLM response into a Pydantic model"""
@@ -52,22 +101,48 @@ class AgentNodeBase(ABC, Generic[TInput, TOutput]):
 
     async def process(self, input_data: TInput) -> TOutput:
         """Template method that calls LLM and parses response"""
-        # Format the user prompt from input data
-        user_prompt = self.format_user_prompt(input_data)
-
-        # Call LLM with the prompts (now returns LLMResponse)
-        llm_response = await self.llm_client.generate(
-            system_prompt=self.system_prompt,
-            user_prompt=user_prompt,
-            temperature=self.temperature,
-            max_tokens=self.max_tokens
-        )
-
-        # Store metrics for later retrieval
-        self.last_metrics = llm_response.metrics
-
-        # Parse and return the response
-        return self.parse_response(llm_response.text)
+        output, _ = await self.process_with_metrics(input_data)
+        return output
+
+    async def process_with_metrics(self, input_data: TInput) -> Tuple[TOutput, LLMMetrics]:
+        """
+        Call the LLM and parse the response, returning the metrics for this call.
+
+        Unlike last_metrics, the returned metrics cannot be overwritten by a
+        concurrent call on the same agent instance.
+        """
+        with trace_span("agent.process", agent=type(self).__name__):
+            # Format the user prompt from input data
+            with trace_span("agent.format_prompt"):
+                user_prompt = self.format_user_prompt(input_data)
+                query = getattr(input_data, "query", None)
+                if self.example_store is not None and query:
+                    examples = self.example_store.select(query, self.example_k)
+                    user_prompt = self.example_store.render(examples) + user_prompt
+
+            # Call LLM with the prompts (now returns LLMResponse)
+            with trace_span("llm.generate") as span:
+                llm_response = await self.llm_client.generate(
+                    system_prompt=self.system_prompt,
+                    user_prompt=user_prompt,
+                    temperature=self.temperature,
+                    max_tokens=self.max_tokens
+                )
+                if span is not None:
+                    # Wall time minus api_ms is time spent queueing in the client
+                    span.attributes["model"] = llm_response.metrics.model
+                    span.attributes["api_ms"] = llm_response.metrics.response_time_ms
+
+            # Clients build fresh metrics for each call, so tag them in place
+            metrics = llm_response.metrics
+            metrics.prompt_version = self.prompt_version
+
+            # Store metrics for later retrieval
+            self.last_metrics = metrics
+
+            # Parse and return the response
+            with trace_span("agent.parse"):
+                return self.parse_response(llm_response.text), metrics
     
     def get_last_metrics(self) -> Optional[LLMMetrics]:
         """Get metrics from the last LLM call"""
@@ -0,0 +1,146 @@
+"""
+Few-shot example store with a local BM25 index.
+
+Each agent's store is a JSON file of (query, response XML) pairs exported
+from its eval cases (see evals/build_example_stores.py). Instead of sending
+every worked example in the system prompt, an agent using a store sends the
+k examples most similar to the incoming query in the user prompt, and the
+rest of its system prompt stays static (and cacheable).
+"""
+
+import json
+import math
+import re
+from collections import Counter, defaultdict
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+DEFAULT_EXAMPLES_DIR = Path(__file__).resolve().parent.parent / "prompts" / "examples"
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9£$€]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word/number tokens"""
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+def _normalise_query(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+class BM25Index:
+    """Okapi BM25 over a fixed list of documents, with an inverted index"""
+
+    def __init__(self, documents: List[str], k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+        self._lengths: List[int] = []
+        for doc_id, document in enumerate(documents):
+            counts = Counter(tokenize(document))
+            self._lengths.append(sum(counts.values()))
+            for term, frequency in counts.items():
+                self._postings[term].append((doc_id, frequency))
+        self._average_length = sum(self._lengths) / len(self._lengths) if self._lengths else 0.0
+        count = len(documents)
+        self._idf = {
+            term: math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for term, postings in self._postings.items()
+        }
+
+    def scores(self, query: str) -> Dict[int, float]:
+        """BM25 score of every document sharing at least one term with the query"""
+        scores: Dict[int, float] = defaultdict(float)
+        for term in set(tokenize(query)):
+            idf = self._idf.get(term)
+            if idf is None:
+                continue
+            for doc_id, frequency in self._postings[term]:
+                length_norm = 1 - self.b + self.b * self._lengths[doc_id] / self._average_length
+                scores[doc_id] += idf * frequency * (self.k1 + 1) / (frequency + self.k1 * length_norm)
+        return scores
+
+    def search(self, query: str, k: int) -> List[Tuple[int, float]]:
+        """The k best (document id, score) pairs, best first"""
+        ranked = sorted(self.scores(query).items(), key=lambda item: (-item[1], item[0]))
+        return ranked[:k]
+
+
+@dataclass
+class Example:
+    """A worked example: the query and the agent's expected XML response"""
+    name: str
+    query: str
+    response: str
+
+
+class ExampleStore:
+    """
+    Selects the most relevant worked examples for a query.
+
+    Example:
+        store = ExampleStore.for_agent("ProcessableEntityExtractionAgent")
+        block = store.render(store.select("Tesco spending last month", k=5))
+    """
+
+    def __init__(self, examples: List[Example], k1: float = 1.5, b: float = 0.75):
+        self.examples = examples
+        self.index = BM25Index([example.query for example in examples], k1=k1, b=b)
+
+    def select(self, query: str, k: int) -> List[Example]:
+        """
+        Pick the k examples most similar to the query.
+
+        Examples with the query itself are skipped, so an eval case never sees
+        its own answer (and an exact match adds nothing a model needs).
+        Fewer than k are returned if fewer share any terms with the query.
+        """
+        normalised = _normalise_query(query)
+        selected: List[Example] = []
+        for doc_id, _ in self.index.search(query, k + 5):
+            example = self.examples[doc_id]
+            if _normalise_query(example.query) == normalised:
+                continue
+            selected.append(example)
+            if len(selected) == k:
+                break
+        return selected
+
+    @staticmethod
+    def render(examples: List[Example]) -> str:
+        """Format examples as an <examples> block in the style of the static prompts"""
+        if not examples:
+            return ""
+        blocks = [
+            f"<example>\n<query>{example.query}</query>\n{example.response}\n</example>"
+            for example in examples
+        ]
+        return "<examples>\n" + "\n\n".join(blocks) + "\n</examples>\n\n"
+
+    def save(self, path: Union[str, Path], agent_name: str) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"agent": agent_name, "examples": [asdict(e) for e in self.examples]}, f, indent=1)
+            f.write("\n")
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "ExampleStore":
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls([Example(**example) for example in data["examples"]])
+
+    @classmethod
+    def for_agent(cls, agent_name: str, directory: Optional[Union[str, Path]] = None) -> Optional["ExampleStore"]:
+        """The store exported for an agent class name, or None if there is none"""
+        path = Path(directory or DEFAULT_EXAMPLES_DIR) / f"{agent_name}.json"
+        return _load_cached(str(path.resolve())) if path.exists() else None
+
+
+@lru_cache(maxsize=None)
+def _load_cached(path: str) -> ExampleStore:
+    # Stores are read-only once built, so agents and workflows can share them
+    return ExampleStore.load(path)
@@ -0,0 +1,107 @@
+"""
+Latency Histogram
+Constant-memory, log-bucketed latency histogram for streaming percentile estimates
+"""
+
+import math
+from typing import Dict, Optional
+
+
+class LatencyHistogram:
+    """
+    HDR-style histogram with logarithmically sized buckets.
+
+    Each bucket spans a fixed relative width (``relative_error``), so any
+    percentile is reported within that relative error of the true value.
+    Memory is bounded by the number of distinct buckets touched, which is at
+    most log(max_ms / min_ms) / log(1 + relative_error) - about 1,400 buckets
+    for 0.01ms to 1 hour at 1% error - regardless of how many values are recorded.
+    """
+
+    def __init__(self, relative_error: float = 0.01, min_value_ms: float = 0.01):
+        """
+        Initialize the histogram.
+
+        Args:
+            relative_error: Relative bucket width (0.01 = percentiles within 1%)
+            min_value_ms: Values below this are counted in a single zero bucket
+        """
+        self.relative_error = relative_error
+        self.min_value_ms = min_value_ms
+        self._log_base = math.log1p(relative_error)
+        self._buckets: Dict[int, int] = {}
+        self._zero_count = 0
+        self.count = 0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def _bucket_index(self, value_ms: float) -> int:
+        return int(math.log(value_ms / self.min_value_ms) / self._log_base)
+
+    def _bucket_value(self, index: int) -> float:
+        """Geometric midpoint of a bucket"""
+        return self.min_value_ms * math.exp((index + 0.5) * self._log_base)
+
+    def record(self, value_ms: float) -> None:
+        """Record a single latency value in milliseconds"""
+        self.count += 1
+        if self.min is None or value_ms < self.min:
+            self.min = value_ms
+        if self.max is None or value_ms > self.max:
+            self.max = value_ms
+
+        if value_ms < self.min_value_ms:
+            self._zero_count += 1
+            return
+
+        index = self._bucket_index(value_ms)
+        self._buckets[index] = self._buckets.get(index, 0) + 1
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """
+        Add another histogram's counts into this one.
+
+        Raises:
+            ValueError: If the histograms use different bucket layouts
+        """
+        if other.relative_error != self.relative_error or other.min_value_ms != self.min_value_ms:
+            raise ValueError("Cannot merge histograms with different bucket layouts")
+
+        for index, bucket_count in other._buckets.items():
+            self._buckets[index] = self._buckets.get(index, 0) + bucket_count
+        self._zero_count += other._zero_count
+        self.count += other.count
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        if other.max is not None and (self.max is None or other.max > self.max):
+            self.max = other.max
+
+    def percentile(self, q: float) -> float:
+        """
+        Estimate a percentile.
+
+        Args:
+            q: Percentile in the range 0-100
+
+        Returns:
+            Estimated value in milliseconds (0.0 if the histogram is empty)
+        """
+        if self.count == 0:
+            return 0.0
+
+        rank = max(1, math.ceil(q / 100 * self.count))
+        seen = self._zero_count
+        if seen >= rank:
+            return self.min
+
+        for index in sorted(self._buckets):
+            seen += self._buckets[index]
+            if seen >= rank:
+                # Clamp so estimates never fall outside the observed range
+                return min(max(self._bucket_value(index), self.min), self.max)
+
+        return self.max
+
+    def bucket_count(self) -> int:
+        """Number of non-empty buckets (memory footprint indicator)"""
+        return len(self._buckets) + (1 if self._zero_count else 0)
@@ -1,75 +1,175 @@
 """
 Metrics Aggregator for tracking LLM usage across multiple agent calls
+
+Metrics are kept as constant-memory streaming aggregates (counters, sums and a
+latency histogram) rather than a list of every call, so long-running services
+can aggregate indefinitely. Recent activity is also kept in fixed-size time
+slices to support windowed ("last N minutes") summaries.
 """
 
-from typing import Dict, List, Any, Optional
+import time
+from collections import deque
+from typing import Deque, Dict, Any, Optional, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime
 
+from src.core_nodes.latency_histogram import LatencyHistogram
 from src.models.llm_metrics import LLMMetrics
 
 
+@dataclass
+class StreamingStats:
+    """Running totals and latency distribution for a set of LLM calls"""
+    calls: int = 0
+    total_cost: float = 0.0
+    total_tokens: int = 0
+    total_input_tokens: int = 0
+    total_output_tokens: int = 0
+    total_response_time_ms: float = 0.0
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+    def add(self, metrics: LLMMetrics) -> None:
+        """Fold a single call into the aggregates"""
+        self.calls += 1
+        self.total_cost += metrics.total_cost
+        self.total_tokens += metrics.total_tokens
+        self.total_input_tokens += metrics.input_tokens
+        self.total_output_tokens += metrics.output_tokens
+        self.total_response_time_ms += metrics.response_time_ms
+        self.latency.record(metrics.response_time_ms)
+
+    def merge(self, other: "StreamingStats") -> None:
+        """Fold another set of aggregates into this one"""
+        self.calls += other.calls
+        self.total_cost += other.total_cost
+        self.total_tokens += other.total_tokens
+        self.total_input_tokens += other.total_input_tokens
+        self.total_output_tokens += other.total_output_tokens
+        self.total_response_time_ms += other.total_response_time_ms
+        self.latency.merge(other.latency)
+
+    @property
+    def avg_response_time_ms(self) -> float:
+        return self.total_response_time_ms / self.calls if self.calls else 0.0
+
+
 @dataclass
 class AgentMetrics:
-    """Metrics for a specific agent"""
+    """
+    Metrics for a specific agent.
+
+    All-time aggregates are kept in ``totals``. Calls are additionally bucketed
+    into time slices of ``slice_seconds``, retained for ``retention_seconds``,
+    which back windowed summaries.
+    """
     agent_name: str
-    calls: List[LLMMetrics] = field(default_factory=list)
-    
-    def add_call(self, metrics: LLMMetrics):
+    slice_seconds: float = 60.0
+    retention_seconds: float = 3600.0
+    totals: StreamingStats = field(default_factory=StreamingStats)
+    _slices: Deque[Tuple[float, StreamingStats]] = field(default_factory=deque, repr=False)
+
+    def add_call(self, metrics: LLMMetrics, now: Optional[float] = None):
         """Add metrics from a single call"""
-        self.calls.append(metrics)
-    
-    def get_summary(self) -> Dict[str, Any]:
+        if now is None:
+            now = time.monotonic()
+
+        self.totals.add(metrics)
+
+        slice_start = now - (now % self.slice_seconds)
+        if not self._slices or self._slices[-1][0] != slice_start:
+            self._slices.append((slice_start, StreamingStats()))
+        self._slices[-1][1].add(metrics)
+
+        # Drop slices that have aged out of the retention period
+        while self._slices and self._slices[0][0] + self.slice_seconds <= now - self.retention_seconds:
+            self._slices.popleft()
+
+    def get_stats(self, window_seconds: Optional[float] = None, now: Optional[float] = None) -> StreamingStats:
+        """
+        Get aggregates for all time, or for the most recent window.
+
+        Windows are resolved to whole slices, so a window may include up to one
+        slice of older calls.
+
+        Args:
+            window_seconds: Only include calls from the last N seconds (None = all time)
+            now: Current monotonic time (defaults to time.monotonic())
+        """
+        if window_seconds is None:
+            return self.totals
+
+        if now is None:
+            now = time.monotonic()
+
+        stats = StreamingStats()
+        for slice_start, slice_stats in self._slices:
+            if slice_start + self.slice_seconds > now - window_seconds:
+                stats.merge(slice_stats)
+        return stats
+
+    def get_summary(self, window_seconds: Optional[float] = None, now: Optional[float] = None) -> Dict[str, Any]:
         """Get summary statistics for this agent"""
-        if not self.calls:
-            return {
-                "agent_name": self.agent_name,
-                "total_calls": 0,
-                "total_cost": 0.0,
-                "total_tokens": 0,
-                "avg_response_time_ms": 0.0
-            }
-        
-        total_cost = sum(m.total_cost for m in self.calls)
-        total_tokens = sum(m.total_tokens for m in self.calls)
-        total_input_tokens = sum(m.input_tokens for m in self.calls)
-        total_output_tokens = sum(m.output_tokens for m in self.calls)
-        avg_response_time = sum(m.response_time_ms for m in self.calls) / len(self.calls)
-        
-        return {
-            "agent_name": self.agent_name,
-            "total_calls": len(self.calls),
-            "total_cost": total_cost,
-            "total_tokens": total_tokens,
-            "total_input_tokens": total_input_tokens,
-            "total_output_tokens": total_output_tokens,
-            "avg_response_time_ms": avg_response_time,
-            "min_response_time_ms": min(m.response_time_ms for m in self.calls),
-            "max_response_time_ms": max(m.response_time_ms for m in self.calls),
-        }
+        stats = self.get_stats(window_seconds, now=now)
+        return _summarise(stats, {"agent_name": self.agent_name})
+
+
+def _summarise(stats: StreamingStats, summary: Dict[str, Any]) -> Dict[str, Any]:
+    """Add the standard summary fields for a set of aggregates"""
+    summary.update({
+        "total_calls": stats.calls,
+        "total_cost": stats.total_cost,
+        "total_tokens": stats.total_tokens,
+        "total_input_tokens": stats.total_input_tokens,
+        "total_output_tokens": stats.total_output_tokens,
+        "avg_response_time_ms": stats.avg_response_time_ms,
+        "min_response_time_ms": stats.latency.min or 0.0,
+        "max_response_time_ms": stats.latency.max or 0.0,
+        "p50_response_time_ms": stats.latency.percentile(50),
+        "p90_response_time_ms": stats.latency.percentile(90),
+        "p99_response_time_ms": stats.latency.percentile(99),
+    })
+    return summary
 
 
 class MetricsAggregator:
     """Aggregate metrics across multiple agents and calls"""
-    
-    def __init__(self):
+
+    def __init__(self, slice_seconds: float = 60.0, retention_seconds: float = 3600.0):
+        """
+        Initialize the aggregator.
+
+        Args:
+            slice_seconds: Granularity of windowed summaries
+            retention_seconds: How far back windowed summaries can look
+        """
         self.agents: Dict[str, AgentMetrics] = {}
         self.start_time = datetime.now()
-    
+        self.slice_seconds = slice_seconds
+        self.retention_seconds = retention_seconds
+
     def add_metrics(self, agent_name: str, metrics: LLMMetrics):
         """Add metrics for a specific agent call"""
         if agent_name not in self.agents:
-            self.agents[agent_name] = AgentMetrics(agent_name)
+            self.agents[agent_name] = AgentMetrics(
+                agent_name,
+                slice_seconds=self.slice_seconds,
+                retention_seconds=self.retention_seconds
+            )
         self.agents[agent_name].add_call(metrics)
-    
-    def get_agent_summary(self, agent_name: str) -> Optional[Dict[str, Any]]:
+
+    def get_agent_summary(self, agent_name: str, window_seconds: Optional[float] = None) -> Optional[Dict[str, Any]]:
         """Get summary for a specific agent"""
         if agent_name in self.agents:
-            return self.agents[agent_name].get_summary()
+            return self.agents[agent_name].get_summary(window_seconds)
         return None
-    
-    def get_summary(self) -> Dict[str, Any]:
-        """Get overall summary of all metrics"""
+
+    def get_summary(self, window_seconds: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Get overall summary of all metrics.
+
+        Args:
+            window_seconds: Only include calls from the last N seconds (None = all time)
+        """
         if not self.agents:
             return {
                 "total_agents": 0,
@@ -78,53 +178,40 @@ class MetricsAggregator:
                 "total_tokens": 0,
                 "duration_seconds": (datetime.now() - self.start_time).total_seconds()
             }
-        
-        agent_summaries = [agent.get_summary() for agent in self.agents.values()]
-        
-        total_calls = sum(s["total_calls"] for s in agent_summaries)
-        total_cost = sum(s["total_cost"] for s in agent_summaries)
-        total_tokens = sum(s["total_tokens"] for s in agent_summaries)
-        total_input_tokens = sum(s["total_input_tokens"] for s in agent_summaries)
-        total_output_tokens = sum(s["total_output_tokens"] for s in agent_summaries)
-        
-        # Calculate weighted average response time
-        weighted_sum = sum(s["avg_response_time_ms"] * s["total_calls"] for s in agent_summaries)
-        avg_response_time = weighted_sum / total_calls if total_calls > 0 else 0
-        
-        return {
-            "total_agents": len(self.agents),
-            "total_calls": total_calls,
-            "total_cost": total_cost,
-            "total_tokens": total_tokens,
-            "total_input_tokens": total_input_tokens,
-            "total_output_tokens": total_output_tokens,
-            "avg_response_time_ms": avg_response_time,
-            "duration_seconds": (datetime.now() - self.start_time).total_seconds(),
-            "agents": agent_summaries
-        }
-    
+
+        now = time.monotonic()
+        overall = StreamingStats()
+        agent_summaries = []
+        for agent in self.agents.values():
+            stats = agent.get_stats(window_seconds, now=now)
+            overall.merge(stats)
+            agent_summaries.append(_summarise(stats, {"agent_name": agent.agent_name}))
+
+        summary = _summarise(overall, {"total_agents": len(self.agents)})
+        summary["duration_seconds"] = (datetime.now() - self.start_time).total_seconds()
+        summary["agents"] = agent_summaries
+        if window_seconds is not None:
+            summary["window_seconds"] = window_seconds
+        return summary
+
     def get_total_cost(self) -> float:
         """Get total cost across all agents"""
-        return sum(
-            sum(m.total_cost for m in agent.calls)
-            for agent in self.agents.values()
-        )
-    
+        return sum(agent.totals.total_cost for agent in self.agents.values())
+
     def get_average_latency(self) -> float:
         """Get average latency across all calls"""
-        all_calls = []
-        for agent in self.agents.values():
-            all_calls.extend(agent.calls)
-        
-        if not all_calls:
+        total_calls = sum(agent.totals.calls for agent in self.agents.values())
+
+        if not total_calls:
             return 0.0
-        
-        return sum(m.response_time_ms for m in all_calls) / len(all_calls)
-    
-    def format_summary(self) -> str:
+
+        total_time = sum(agent.totals.total_response_time_ms for agent in self.agents.values())
+        return total_time / total_calls
+
+    def format_summary(self, window_seconds: Optional[float] = None) -> str:
         """Format summary as a readable string"""
-        summary = self.get_summary()
-        
+        summary = self.get_summary(window_seconds)
+
         lines = [
             "=" * 60,
             "METRICS SUMMARY",
@@ -133,23 +220,29 @@ class MetricsAggregator:
             f"Total API Calls: {summary['total_calls']}",
             f"Total Cost: ${summary['total_cost']:.6f}",
             f"Total Tokens: {summary['total_tokens']:,}",
-            f"  - Input: {summary['total_input_tokens']:,}",
-            f"  - Output: {summary['total_output_tokens']:,}",
-            f"Avg Response Time: {summary['avg_response_time_ms']:.0f}ms",
+            f"  - Input: {summary.get('total_input_tokens', 0):,}",
+            f"  - Output: {summary.get('total_output_tokens', 0):,}",
+            f"Avg Response Time: {summary.get('avg_response_time_ms', 0.0):.0f}ms",
+            f"Response Time p50/p90/p99: {summary.get('p50_response_time_ms', 0.0):.0f}ms"
+            f" / {summary.get('p90_response_time_ms', 0.0):.0f}ms"
+            f" / {summary.get('p99_response_time_ms', 0.0):.0f}ms",
             f"Duration: {summary['duration_seconds']:.2f}s",
             "-" * 60,
             "PER AGENT BREAKDOWN:",
         ]
-        
-        for agent_summary in summary["agents"]:
+
+        for agent_summary in summary.get("agents", []):
             lines.extend([
                 f"\n{agent_summary['agent_name']}:",
                 f"  Calls: {agent_summary['total_calls']}",
                 f"  Cost: ${agent_summary['total_cost']:.6f}",
                 f"  Tokens: {agent_summary['total_tokens']:,}",
                 f"  Avg Time: {agent_summary['avg_response_time_ms']:.0f}ms",
+                f"  p50/p90/p99: {agent_summary['p50_response_time_ms']:.0f}ms"
+                f" / {agent_summary['p90_response_time_ms']:.0f}ms"
+                f" / {agent_summary['p99_response_time_ms']:.0f}ms",
             ])
-        
+
         lines.append("=" * 60)
-        
+
         return "\n".join(lines)
\ No newline at end of file
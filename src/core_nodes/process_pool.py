@@ -0,0 +1,53 @@
+"""
+Multi-process launcher
+
+Runs the same entry point in N spawned processes, each with its own event
+loop and LLM client, so CPU-side work (Pydantic validation, regex parsing,
+JSON, TLS) is spread across cores. SIGINT/SIGTERM received by the parent are
+forwarded to the children, which drain and exit on their own.
+"""
+
+import multiprocessing
+import signal
+from typing import Any, Callable, List
+
+
+def run_in_processes(target: Callable[..., Any], num_processes: int, *args: Any) -> int:
+    """
+    Run target(process_index, *args) in num_processes spawned processes.
+
+    The target must be a module-level (picklable) function; it typically
+    calls asyncio.run(...). Arguments must be picklable or multiprocessing
+    primitives created from the "spawn" context (e.g. SharedTokenBucket).
+
+    Args:
+        target: Entry point for each child process
+        num_processes: Number of processes to start
+        *args: Extra arguments passed to every child
+
+    Returns:
+        0 if every child exited cleanly, otherwise the first non-zero exit code
+    """
+    context = multiprocessing.get_context("spawn")
+    processes: List[multiprocessing.process.BaseProcess] = [
+        context.Process(target=target, args=(index, *args), name=f"worker-{index}")
+        for index in range(num_processes)
+    ]
+    for process in processes:
+        process.start()
+
+    def forward(signum, frame):
+        for process in processes:
+            if process.is_alive():
+                process.terminate()  # SIGTERM: children shut down gracefully
+
+    previous = {sig: signal.signal(sig, forward) for sig in (signal.SIGINT, signal.SIGTERM)}
+    try:
+        for process in processes:
+            process.join()
+    finally:
+        for sig, handler in previous.items():
+            signal.signal(sig, handler)
+
+    exit_codes = [process.exitcode for process in processes]
+    return next((code for code in exit_codes if code), 0)
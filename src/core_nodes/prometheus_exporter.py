@@ -0,0 +1,254 @@
+"""
+Prometheus Exporter for workflow and agent metrics
+
+Exposes per-agent (and per prompt version) LLM call counters, token and cost counters, latency
+histograms, prompt cache hit rates and workflow outcome counters in the
+Prometheus text exposition format, either over a local HTTP endpoint or
+written to a node_exporter textfile-collector path.
+
+Recording is a few dictionary updates under a lock; all formatting happens
+at scrape/write time, so the hot path stays cheap.
+"""
+
+import bisect
+import os
+import threading
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+from src.models.llm_metrics import LLMMetrics
+
+
+# Latency bucket upper bounds in seconds (LLM calls are typically 0.3s-10s)
+DEFAULT_LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.05, 0.1, 0.25, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0, 5.0, 7.5, 10.0, 20.0, 30.0, 60.0
+)
+
+WORKFLOW_OUTCOMES: Tuple[str, ...] = ("success", "insecure", "invalid", "unprocessable", "no_entities", "error")
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class _Histogram:
+    """Fixed-bucket histogram storing per-bucket (non-cumulative) counts"""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = buckets
+        self.counts: List[int] = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+
+@dataclass
+class _AgentSeries:
+    """Counters for one (agent, model, prompt_version) label set"""
+    calls: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_read_tokens: int = 0
+    cache_creation_tokens: int = 0
+    cache_hits: int = 0
+    cost: float = 0.0
+    latency: Optional[_Histogram] = field(default=None, repr=False)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _series_labels(agent: str, model: str, prompt_version: str) -> str:
+    labels = f'agent="{_escape(agent)}",model="{_escape(model)}"'
+    if prompt_version:
+        labels += f',prompt_version="{_escape(prompt_version)}"'
+    return labels
+
+
+def _format_le(bound: float) -> str:
+    return repr(float(bound))
+
+
+class PrometheusExporter:
+    """
+    Collects workflow and agent metrics and renders them for Prometheus.
+
+    Feed it with add_metrics() (same signature as MetricsAggregator.add_metrics)
+    and record_workflow_outcome(), then expose it with start_http_server() or
+    write_textfile().
+    """
+
+    def __init__(
+        self,
+        namespace: str = "query_preprocessing",
+        latency_buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS
+    ):
+        """
+        Initialize the exporter.
+
+        Args:
+            namespace: Prefix for all metric names
+            latency_buckets: Histogram bucket upper bounds in seconds
+        """
+        self.namespace = namespace
+        self.latency_buckets = tuple(sorted(latency_buckets))
+        self._lock = threading.Lock()
+        self._agents: Dict[Tuple[str, str, str], _AgentSeries] = {}
+        self._outcomes: Dict[str, int] = {outcome: 0 for outcome in WORKFLOW_OUTCOMES}
+        self._workflow_latency = _Histogram(self.latency_buckets)
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    def add_metrics(self, agent_name: str, metrics: LLMMetrics) -> None:
+        """
+        Record a single LLM call for an agent.
+
+        Calls tagged with a prompt version get a prompt_version label, so
+        versions under a traffic split can be compared per series.
+        """
+        key = (agent_name, metrics.model, metrics.prompt_version or "")
+        with self._lock:
+            series = self._agents.get(key)
+            if series is None:
+                series = _AgentSeries(latency=_Histogram(self.latency_buckets))
+                self._agents[key] = series
+            series.calls += 1
+            series.input_tokens += metrics.input_tokens
+            series.output_tokens += metrics.output_tokens
+            series.cache_read_tokens += metrics.cache_read_input_tokens
+            series.cache_creation_tokens += metrics.cache_creation_input_tokens
+            if metrics.cache_read_input_tokens > 0:
+                series.cache_hits += 1
+            series.cost += metrics.total_cost
+            series.latency.observe(metrics.response_time_ms / 1000)
+
+    def record_workflow_outcome(self, outcome: str, duration_ms: Optional[float] = None) -> None:
+        """
+        Record the outcome of a workflow run.
+
+        Args:
+            outcome: Outcome label (see get_workflow_outcome)
+            duration_ms: Optional end-to-end workflow duration
+        """
+        with self._lock:
+            self._outcomes[outcome] = self._outcomes.get(outcome, 0) + 1
+            if duration_ms is not None:
+                self._workflow_latency.observe(duration_ms / 1000)
+
+    def _render_histogram(self, lines: List[str], name: str, labels: str, histogram: _Histogram) -> None:
+        cumulative = 0
+        separator = "," if labels else ""
+        for bound, count in zip(histogram.buckets, histogram.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels}{separator}le="{_format_le(bound)}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{labels}{separator}le="+Inf"}} {histogram.count}')
+        label_block = f"{{{labels}}}" if labels else ""
+        lines.append(f"{name}_sum{label_block} {histogram.total}")
+        lines.append(f"{name}_count{label_block} {histogram.count}")
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format"""
+        ns = self.namespace
+        with self._lock:
+            agents = [(_series_labels(*key), series) for key, series in sorted(self._agents.items())]
+            outcomes = sorted(self._outcomes.items())
+
+            counters = [
+                ("llm_calls_total", "LLM calls made by each agent", lambda s: s.calls),
+                ("llm_input_tokens_total", "Input tokens sent by each agent", lambda s: s.input_tokens),
+                ("llm_output_tokens_total", "Output tokens received by each agent", lambda s: s.output_tokens),
+                ("llm_cache_read_tokens_total", "Input tokens served from the prompt cache",
+                 lambda s: s.cache_read_tokens),
+                ("llm_cache_creation_tokens_total", "Input tokens written to the prompt cache",
+                 lambda s: s.cache_creation_tokens),
+                ("llm_cache_hits_total", "LLM calls that read from the prompt cache", lambda s: s.cache_hits),
+                ("llm_cost_usd_total", "LLM cost in USD", lambda s: s.cost),
+            ]
+
+            lines: List[str] = []
+            for name, help_text, getter in counters:
+                lines.append(f"# HELP {ns}_{name} {help_text}")
+                lines.append(f"# TYPE {ns}_{name} counter")
+                for labels, series in agents:
+                    lines.append(f"{ns}_{name}{{{labels}}} {getter(series)}")
+
+            lines.append(f"# HELP {ns}_llm_cache_hit_ratio Fraction of LLM calls that read from the prompt cache")
+            lines.append(f"# TYPE {ns}_llm_cache_hit_ratio gauge")
+            for labels, series in agents:
+                ratio = series.cache_hits / series.calls if series.calls else 0.0
+                lines.append(f"{ns}_llm_cache_hit_ratio{{{labels}}} {ratio}")
+
+            lines.append(f"# HELP {ns}_llm_latency_seconds LLM call latency")
+            lines.append(f"# TYPE {ns}_llm_latency_seconds histogram")
+            for labels, series in agents:
+                self._render_histogram(lines, f"{ns}_llm_latency_seconds", labels, series.latency)
+
+            lines.append(f"# HELP {ns}_workflow_runs_total Workflow runs by outcome")
+            lines.append(f"# TYPE {ns}_workflow_runs_total counter")
+            for outcome, count in outcomes:
+                lines.append(f'{ns}_workflow_runs_total{{outcome="{_escape(outcome)}"}} {count}')
+
+            lines.append(f"# HELP {ns}_workflow_duration_seconds End-to-end workflow duration")
+            lines.append(f"# TYPE {ns}_workflow_duration_seconds histogram")
+            self._render_histogram(lines, f"{ns}_workflow_duration_seconds", "", self._workflow_latency)
+
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path: Union[str, Path]) -> None:
+        """
+        Atomically write metrics for the node_exporter textfile collector.
+
+        Args:
+            path: Target .prom file path
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.render())
+        os.replace(tmp_path, path)
+
+    def start_http_server(self, port: int = 9464, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+        """
+        Serve /metrics from a background daemon thread.
+
+        Args:
+            port: Port to listen on (0 picks a free port)
+            host: Interface to bind (defaults to localhost only)
+
+        Returns:
+            The running server (use server.server_address for the bound port)
+        """
+        exporter = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/metrics", "/"):
+                    self.send_error(404)
+                    return
+                body = exporter.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                # Scrapes every few seconds would otherwise flood stderr
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), MetricsHandler)
+        thread = threading.Thread(target=self._server.serve_forever, name="prometheus-exporter", daemon=True)
+        thread.start()
+        return self._server
+
+    def stop_http_server(self) -> None:
+        """Stop the HTTP server if it is running"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
@@ -0,0 +1,381 @@
+"""
+Lightweight span tracing for workflow runs
+
+A trace is a tree of spans (workflow run -> stages -> agent calls -> prompt
+formatting / LLM call / parsing). The active span is carried in a context
+variable, so spans created inside tasks started by asyncio.gather are parented
+correctly without passing anything around.
+
+When no trace is active (the run was not sampled, or no tracer is configured),
+trace_span() returns a shared no-op context manager, so instrumentation costs
+a single context variable lookup.
+
+Finished traces are annotated with critical-path membership and slack, then
+handed to a sink (in-memory or OTLP-compatible JSON lines).
+"""
+
+import json
+import os
+import random
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterator, List, Optional, Union
+
+
+@dataclass
+class Span:
+    """A single timed operation within a trace"""
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    start_ns: int
+    end_ns: int = 0
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end_ns - self.start_ns) / 1_000_000
+
+
+class _Trace:
+    """Mutable state for a trace in progress"""
+
+    def __init__(self, trace_id: str):
+        self.trace_id = trace_id
+        self.spans: List[Span] = []
+        # Anchor monotonic timings to wall-clock time once per trace
+        self.wall_offset_ns = time.time_ns() - time.perf_counter_ns()
+
+    def now_ns(self) -> int:
+        return time.perf_counter_ns() + self.wall_offset_ns
+
+
+@dataclass
+class _ActiveSpan:
+    trace: _Trace
+    span: Span
+
+
+_current_span: ContextVar[Optional[_ActiveSpan]] = ContextVar("current_span", default=None)
+
+_NOOP = nullcontext()
+
+
+def _new_id(num_bytes: int) -> str:
+    return os.urandom(num_bytes).hex()
+
+
+class _SpanContext:
+    """Context manager that records a child span of the current span"""
+
+    __slots__ = ("_parent", "_name", "_attributes", "_active", "_token")
+
+    def __init__(self, parent: _ActiveSpan, name: str, attributes: Dict[str, Any]):
+        self._parent = parent
+        self._name = name
+        self._attributes = attributes
+
+    def __enter__(self) -> Span:
+        trace = self._parent.trace
+        span = Span(
+            name=self._name,
+            trace_id=trace.trace_id,
+            span_id=_new_id(8),
+            parent_id=self._parent.span.span_id,
+            start_ns=trace.now_ns(),
+            attributes=self._attributes
+        )
+        self._active = _ActiveSpan(trace, span)
+        self._token = _current_span.set(self._active)
+        return span
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        span = self._active.span
+        span.end_ns = self._active.trace.now_ns()
+        if exc_type is not None:
+            span.attributes["error"] = exc_type.__name__
+        _current_span.reset(self._token)
+        self._active.trace.spans.append(span)
+
+
+def trace_span(name: str, **attributes: Any):
+    """
+    Record a child span of the currently active span.
+
+    Returns a no-op context manager when no trace is active.
+
+    Example:
+        with trace_span("parse", agent="security"):
+            result = parse(...)
+    """
+    parent = _current_span.get()
+    if parent is None:
+        return _NOOP
+    return _SpanContext(parent, name, attributes)
+
+
+def current_span() -> Optional[Span]:
+    """Get the currently active span, if any"""
+    active = _current_span.get()
+    return active.span if active else None
+
+
+# ========== Critical Path Analysis ==========
+
+@dataclass
+class CriticalPathReport:
+    """Critical path and per-span slack for one trace"""
+    root: Span
+    path: List[Span]
+    slack_ms: Dict[str, float]
+    self_time_ms: Dict[str, float]
+
+    def format(self) -> str:
+        """Format the critical path as a readable string"""
+        lines = [f"Critical path ({self.root.duration_ms:.1f}ms total):"]
+        for span in self.path:
+            lines.append(f"  {span.name}: {span.duration_ms:.1f}ms (self {self.self_time_ms[span.span_id]:.1f}ms)")
+        return "\n".join(lines)
+
+
+def analyse_critical_path(spans: List[Span]) -> CriticalPathReport:
+    """
+    Compute the critical path and slack of a finished trace.
+
+    The critical path is found by walking back from the end of each span:
+    the child that finished last is critical, then the last child that
+    finished before that one started, and so on, recursively.
+
+    Slack is how long a span could have been delayed without delaying the
+    whole trace: the gap until the next critical sibling starts (or the
+    parent ends), plus the parent's own slack. Critical spans have zero slack.
+
+    Args:
+        spans: All spans of a single trace
+
+    Returns:
+        CriticalPathReport for the trace
+
+    Raises:
+        ValueError: If the spans do not contain exactly one root span
+    """
+    roots = [span for span in spans if span.parent_id is None]
+    if len(roots) != 1:
+        raise ValueError(f"Expected exactly one root span, found {len(roots)}")
+    root = roots[0]
+
+    children: Dict[str, List[Span]] = {span.span_id: [] for span in spans}
+    for span in spans:
+        if span.parent_id is not None and span.parent_id in children:
+            children[span.parent_id].append(span)
+
+    path: List[Span] = []
+    critical_ids = set()
+
+    def walk(span: Span) -> None:
+        path.append(span)
+        critical_ids.add(span.span_id)
+        cursor = span.end_ns
+        critical_children = []
+        for child in sorted(children[span.span_id], key=lambda c: c.end_ns, reverse=True):
+            if child.end_ns <= cursor:
+                critical_children.append(child)
+                cursor = child.start_ns
+        for child in reversed(critical_children):
+            walk(child)
+
+    walk(root)
+
+    slack_ms: Dict[str, float] = {root.span_id: 0.0}
+    self_time_ms: Dict[str, float] = {}
+
+    def assign(span: Span) -> None:
+        kids = children[span.span_id]
+        critical_starts = sorted(k.start_ns for k in kids if k.span_id in critical_ids)
+
+        for kid in kids:
+            if kid.span_id in critical_ids:
+                slack_ms[kid.span_id] = 0.0
+            else:
+                next_start = next((s for s in critical_starts if s >= kid.end_ns), span.end_ns)
+                slack_ms[kid.span_id] = (next_start - kid.end_ns) / 1_000_000 + slack_ms[span.span_id]
+            assign(kid)
+
+        # Self time: duration not covered by any child (merged intervals)
+        covered = 0
+        current_start = current_end = None
+        for kid in sorted(kids, key=lambda k: k.start_ns):
+            if current_end is None or kid.start_ns > current_end:
+                if current_end is not None:
+                    covered += current_end - current_start
+                current_start, current_end = kid.start_ns, kid.end_ns
+            else:
+                current_end = max(current_end, kid.end_ns)
+        if current_end is not None:
+            covered += current_end - current_start
+        self_time_ms[span.span_id] = max(0, span.end_ns - span.start_ns - covered) / 1_000_000
+
+    assign(root)
+
+    return CriticalPathReport(root=root, path=path, slack_ms=slack_ms, self_time_ms=self_time_ms)
+
+
+# ========== Sinks ==========
+
+class SpanSink(ABC):
+    @abstractmethod
+    def export(self, spans: List[Span]) -> None:
+        """Export the spans of one finished trace"""
+        pass
+
+
+class InMemorySpanSink(SpanSink):
+    """Keeps the most recent traces in memory (useful for tests and debugging)"""
+
+    def __init__(self, max_traces: int = 1000):
+        self.traces: Deque[List[Span]] = deque(maxlen=max_traces)
+
+    def export(self, spans: List[Span]) -> None:
+        self.traces.append(spans)
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def to_otlp_json(spans: List[Span], service_name: str) -> Dict[str, Any]:
+    """
+    Convert spans to an OTLP/JSON ExportTraceServiceRequest payload.
+
+    Args:
+        spans: Spans to convert
+        service_name: Value for the service.name resource attribute
+
+    Returns:
+        JSON-serialisable dictionary
+    """
+    otlp_spans = []
+    for span in spans:
+        otlp_span = {
+            "traceId": span.trace_id,
+            "spanId": span.span_id,
+            "name": span.name,
+            "kind": 1,
+            "startTimeUnixNano": str(span.start_ns),
+            "endTimeUnixNano": str(span.end_ns),
+            "attributes": [{"key": key, "value": _otlp_value(value)} for key, value in span.attributes.items()],
+        }
+        if span.parent_id:
+            otlp_span["parentSpanId"] = span.parent_id
+        if "error" in span.attributes:
+            otlp_span["status"] = {"code": 2, "message": str(span.attributes["error"])}
+        otlp_spans.append(otlp_span)
+
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": service_name}}]},
+            "scopeSpans": [{"scope": {"name": "src.core_nodes.tracing"}, "spans": otlp_spans}],
+        }]
+    }
+
+
+class OTLPJsonFileSink(SpanSink):
+    """Appends one OTLP/JSON payload per trace to a JSON lines file"""
+
+    def __init__(self, path: Union[str, Path], service_name: str = "query-preprocessing"):
+        self.path = Path(path)
+        self.service_name = service_name
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def export(self, spans: List[Span]) -> None:
+        line = json.dumps(to_otlp_json(spans, self.service_name), separators=(",", ":"))
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+
+# ========== Tracer ==========
+
+class Tracer:
+    """
+    Starts sampled traces and exports them when they finish.
+
+    Only a fraction (sample_rate) of traces are recorded; unsampled runs skip
+    all span bookkeeping.
+    """
+
+    def __init__(
+        self,
+        sink: SpanSink,
+        sample_rate: float = 1.0,
+        analyse: bool = True,
+        seed: Optional[int] = None
+    ):
+        """
+        Initialize the tracer.
+
+        Args:
+            sink: Where finished traces are exported
+            sample_rate: Fraction of traces to record (0.0-1.0)
+            analyse: Annotate spans with critical-path membership and slack before export
+            seed: Optional seed for the sampling decision
+        """
+        self.sink = sink
+        self.sample_rate = sample_rate
+        self.analyse = analyse
+        self._random = random.Random(seed)
+
+    def start_trace(self, name: str, **attributes: Any):
+        """
+        Start a root span, if this trace is sampled.
+
+        Returns:
+            Context manager yielding the root Span, or None if not sampled
+        """
+        if self.sample_rate < 1.0 and self._random.random() >= self.sample_rate:
+            return _NOOP
+        return self._record_trace(name, attributes)
+
+    @contextmanager
+    def _record_trace(self, name: str, attributes: Dict[str, Any]) -> Iterator[Span]:
+        trace = _Trace(_new_id(16))
+        root = Span(
+            name=name,
+            trace_id=trace.trace_id,
+            span_id=_new_id(8),
+            parent_id=None,
+            start_ns=trace.now_ns(),
+            attributes=attributes
+        )
+        token = _current_span.set(_ActiveSpan(trace, root))
+        try:
+            yield root
+        except BaseException as e:
+            root.attributes["error"] = type(e).__name__
+            raise
+        finally:
+            root.end_ns = trace.now_ns()
+            _current_span.reset(token)
+            trace.spans.append(root)
+            if self.analyse:
+                report = analyse_critical_path(trace.spans)
+                critical_ids = {span.span_id for span in report.path}
+                for span in trace.spans:
+                    span.attributes["critical_path"] = span.span_id in critical_ids
+                    span.attributes["slack_ms"] = round(report.slack_ms[span.span_id], 3)
+                    span.attributes["self_time_ms"] = round(report.self_time_ms[span.span_id], 3)
+            self.sink.export(trace.spans)
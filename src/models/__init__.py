@@ -2,45 +2,71 @@
 Models package exports for MII Scratchpad.
 
 This module re-exports all Pydantic models used across the application.
+
+Exports are resolved on first access, so importing one model module (e.g.
+src.models.llm_metrics) does not build every model class in the package.
 """
 
-# Base models
-from src.models.base_models import QueryInput
-
-# Entity extraction models
-from src.models.entity_extraction_models import (
-    ProcessableEntity,
-    ProcessableEntityExtractionOutput,
-    UnprocessableEntity,
-    UnprocessableEntityExtractionOutput,
-    UserIntentValidationOutput,
-    QuerySecurityValidationOutput
-)
-
-# Query characteristics models
-from src.models.query_characteristics_models import (
-    QueryCharacteristicsInput,
-    QueryCharacteristicsOutput,
-    SQLOperations,
-    AdvancedSQL,
-    Aggregation,
-    Filter,
-    OrderBy,
-    Join,
-    WindowFunction,
-    MissingRequirement
-)
-
-# Category normalization models
-from src.models.category_normalisation_models import (
-    CategoryNormalisationOutput
-)
-
-# LLM metrics
-from src.models.llm_metrics import (
-    LLMMetrics,
-    LLMResponse
-)
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from src.models.base_models import QueryInput
+    from src.models.entity_extraction_models import (
+        ProcessableEntity,
+        ProcessableEntityExtractionOutput,
+        UnprocessableEntity,
+        UnprocessableEntityExtractionOutput,
+        UserIntentValidationOutput,
+        QuerySecurityValidationOutput
+    )
+    from src.models.query_characteristics_models import (
+        QueryCharacteristicsInput,
+        QueryCharacteristicsOutput,
+        SQLOperations,
+        AdvancedSQL,
+        Aggregation,
+        Filter,
+        OrderBy,
+        Join,
+        WindowFunction,
+        MissingRequirement
+    )
+    from src.models.category_normalisation_models import CategoryNormalisationOutput
+    from src.models.llm_metrics import LLMMetrics, LLMResponse
+
+# Export name -> defining module
+_EXPORTS = {
+    # Base
+    "QueryInput": "src.models.base_models",
+
+    # Entity extraction
+    "ProcessableEntity": "src.models.entity_extraction_models",
+    "ProcessableEntityExtractionOutput": "src.models.entity_extraction_models",
+    "UnprocessableEntity": "src.models.entity_extraction_models",
+    "UnprocessableEntityExtractionOutput": "src.models.entity_extraction_models",
+    "UserIntentValidationOutput": "src.models.entity_extraction_models",
+    "QuerySecurityValidationOutput": "src.models.entity_extraction_models",
+
+    # Query characteristics
+    "QueryCharacteristicsInput": "src.models.query_characteristics_models",
+    "QueryCharacteristicsOutput": "src.models.query_characteristics_models",
+    "SQLOperations": "src.models.query_characteristics_models",
+    "AdvancedSQL": "src.models.query_characteristics_models",
+    "Aggregation": "src.models.query_characteristics_models",
+    "Filter": "src.models.query_characteristics_models",
+    "OrderBy": "src.models.query_characteristics_models",
+    "Join": "src.models.query_characteristics_models",
+    "WindowFunction": "src.models.query_characteristics_models",
+    "MissingRequirement": "src.models.query_characteristics_models",
+
+    # Category normalization
+    "CategoryNormalisationOutput": "src.models.category_normalisation_models",
+
+    # LLM metrics
+    "LLMMetrics": "src.models.llm_metrics",
+    "LLMResponse": "src.models.llm_metrics",
+}
 
 __all__ = [
     # Base
@@ -73,3 +99,16 @@ __all__ = [
     "LLMMetrics",
     "LLMResponse"
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
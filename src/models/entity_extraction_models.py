@@ -104,6 +104,27 @@ class QuerySecurityValidationOutput(BaseModel):
         }
 
 
+
+class CombinedFirstStageOutput(BaseModel):
+    """Output model for CombinedFirstStageAgent (the four first-stage outputs from one call)"""
+    security: QuerySecurityValidationOutput = Field(
+        description="Security validation result"
+    )
+    intent: UserIntentValidationOutput = Field(
+        description="User intent validation result"
+    )
+    processable: ProcessableEntityExtractionOutput = Field(
+        description="Processable entity extraction result"
+    )
+    unprocessable: UnprocessableEntityExtractionOutput = Field(
+        description="Unprocessable entity extraction result"
+    )
+    raw_response: Optional[str] = Field(
+        default=None,
+        description="Raw LLM response for debugging"
+    )
+
+
 class PIIEntity(BaseModel):
     """Model for a PII entity extracted from user query"""
     type: str = Field(
@@ -34,6 +34,18 @@ class LLMMetrics(BaseModel):
     model: str = Field(
         description="Model name used for generation"
     )
+    cache_read_input_tokens: int = Field(
+        default=0,
+        description="Input tokens served from the prompt cache"
+    )
+    cache_creation_input_tokens: int = Field(
+        default=0,
+        description="Input tokens written to the prompt cache"
+    )
+    prompt_version: Optional[str] = Field(
+        default=None,
+        description="Prompt version label (version@hash) the call was made with"
+    )
     
     def format_cost(self) -> str:
         """Format cost in a readable way"""
@@ -0,0 +1,120 @@
+"""
+Splits XML-sectioned prompts into their blocks.
+
+Prompts put section tags on lines of their own (`<role>`, `<examples>`,
+`<example label="...">` ... `</example>`), while inline tags such as
+`<query>...</query>` share a line with their content. Only the former are
+treated as blocks, so tags mentioned in prose or used inline never unbalance
+the structure.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import List, Optional
+
+_OPEN_LINE = re.compile(r"^<([A-Za-z_][\w-]*)((?:\s[^<>]*)?)>$")
+_CLOSE_LINE = re.compile(r"^</([A-Za-z_][\w-]*)>$")
+
+
+@dataclass
+class PromptSection:
+    """A block of a prompt, from its opening tag line to its closing tag line"""
+    name: str
+    attributes: str
+    start: int
+    end: int
+    text: str
+
+    @property
+    def body(self) -> str:
+        """Content between the opening and closing tag lines"""
+        first_newline = self.text.find("\n")
+        last_newline = self.text.rfind("\n", 0, len(self.text) - 1)
+        if first_newline == -1 or last_newline <= first_newline:
+            return ""
+        return self.text[first_newline + 1:last_newline + 1]
+
+    @property
+    def label(self) -> Optional[str]:
+        """The label="..." attribute, if any"""
+        match = re.search(r'label="([^"]*)"', self.attributes)
+        return match.group(1) if match else None
+
+    def children(self) -> List["PromptSection"]:
+        """Top-level blocks inside this section (offsets relative to the whole prompt)"""
+        body_offset = self.text.find("\n") + 1
+        return parse_sections(self.body, offset=self.start + body_offset)
+
+
+def parse_sections(text: str, offset: int = 0) -> List[PromptSection]:
+    """
+    Find the top-level blocks of a prompt.
+
+    Args:
+        text: Prompt text
+        offset: Added to every start/end (used for nested sections)
+
+    Returns:
+        Blocks in order of appearance; unclosed opening tags are ignored
+    """
+    sections: List[PromptSection] = []
+    # (name, attributes, start) for each open block
+    stack: List[tuple] = []
+    position = 0
+    for line in text.splitlines(keepends=True):
+        stripped = line.strip()
+        line_start = position
+        position += len(line)
+
+        open_match = _OPEN_LINE.match(stripped)
+        if open_match:
+            stack.append((open_match.group(1), open_match.group(2), line_start))
+            continue
+
+        close_match = _CLOSE_LINE.match(stripped)
+        if not close_match:
+            continue
+        name = close_match.group(1)
+        # Unwind to the matching opening tag (skipping any that were never closed)
+        for depth in range(len(stack) - 1, -1, -1):
+            if stack[depth][0] == name:
+                _, attributes, start = stack[depth]
+                del stack[depth:]
+                if depth == 0:
+                    sections.append(PromptSection(
+                        name=name,
+                        attributes=attributes,
+                        start=offset + start,
+                        end=offset + position,
+                        text=text[start:position]
+                    ))
+                break
+    return sections
+
+
+def split_instructions(prompt: str) -> List[PromptSection]:
+    """
+    Return the sections of a system prompt.
+
+    If the prompt is wrapped in a single root block (usually <instructions>),
+    its children are returned; otherwise the top-level blocks.
+    """
+    sections = parse_sections(prompt)
+    if len(sections) == 1:
+        return sections[0].children()
+    return sections
+
+
+def remove_sections(prompt: str, name: str) -> str:
+    """
+    Remove every section with this name from a system prompt (see split_instructions).
+
+    A blank line following a removed section is removed with it.
+    """
+    text = prompt
+    for section in reversed([s for s in split_instructions(prompt) if s.name == name]):
+        end = section.end
+        if text[end:end + 1] == "\n":
+            end += 1
+        text = text[:section.start] + text[end:]
+    return text
@@ -0,0 +1,100 @@
+"""
+Combined first-stage prompt
+
+Runs the four first-stage analyses (security validation, intent validation,
+processable and unprocessable entity extraction) in a single LLM call. The
+individual agents' instructions are embedded unchanged, one per section, so
+the combined prompt stays in step with them; each analysis answers in its own
+section of the response, which is then parsed by that agent's parse_response.
+"""
+
+from src.prompts import (
+    processable_entity_extraction_prompt,
+    query_security_validation_prompt,
+    unprocessable_entity_extraction_prompt,
+    user_intent_validation_prompt
+)
+
+# (response section tag, prompt module) in the order the model should answer
+SECTIONS = (
+    ("security_validation", query_security_validation_prompt),
+    ("intent_validation", user_intent_validation_prompt),
+    ("processable_entities", processable_entity_extraction_prompt),
+    ("unprocessable_entities", unprocessable_entity_extraction_prompt),
+)
+
+
+def get_instructions() -> str:
+    analyses = "\n\n".join(
+        f'<analysis name="{section}">\n{module.get_instructions().strip()}\n</analysis>'
+        for section, module in SECTIONS
+    )
+    instructions: str = f"""<instructions>
+<role>
+You are the first-stage query analyst for NatWest's transaction query system. You perform four independent analyses of the same user query in a single pass: technical security validation, user intent validation, processable entity extraction and unprocessable entity extraction. Each analysis is defined by its own instructions below; follow each one exactly as if it were the only task, and do not let the conclusion of one analysis influence another.
+</role>
+
+<analyses>
+{analyses}
+</analyses>
+
+<output_format>
+Answer every analysis, in this order, each inside its own section of a single response. The content of each section is exactly what that analysis' instructions ask for inside its <response> tag (do not repeat the <response> tag inside a section):
+
+<response>
+<security_validation>
+<valid>true or false</valid>
+<justification>max 5 words</justification>
+</security_validation>
+<intent_validation>
+<valid>true or false</valid>
+<justification>max 5 words</justification>
+</intent_validation>
+<processable_entities>
+<entities>
+<entity>
+<type>entity type</type>
+<value>exact text from the query</value>
+</entity>
+</entities>
+</processable_entities>
+<unprocessable_entities>
+<entities>
+<entity>
+<type>entity type</type>
+<value>exact text from the query</value>
+<critical>true or false</critical>
+</entity>
+</entities>
+</unprocessable_entities>
+</response>
+
+Use an empty <entities></entities> when an extraction finds nothing. Always include all four sections, even when the query is insecure or invalid.
+</output_format>
+</instructions>
+"""
+    return instructions
+
+
+def get_task(query: str) -> str:
+    task: str = f"""<task>
+This is the user query to analyse:
+
+<query>
+{query}
+</query>
+
+<immediate_task>
+Run all four analyses on this query and return a single XML response with the security_validation, intent_validation, processable_entities and unprocessable_entities sections, in that order.
+</immediate_task>
+
+<remember>
+- Each analysis is independent: judge security on HOW the query is written and intent on WHAT is asked
+- Entity values must be the exact text from the query
+- Processable entities are temporal, category, merchant, amount, environmental or budget; everything else the unprocessable analysis covers
+- Justifications must be 5 words or less
+- Always return all four sections
+</remember>
+</task>
+"""
+    return task
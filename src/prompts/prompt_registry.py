@@ -0,0 +1,171 @@
+"""
+Prompt Registry
+Versioned prompts per agent, with content hashes and percentage traffic splits
+
+Each agent resolves its prompt by (agent, version) instead of importing a
+prompt module directly, so a new prompt version can be trialled without
+editing imports:
+
+    prompt = get_prompt("processable_entity_extraction", "v2")
+    prompt.instructions, prompt.get_task(query), prompt.label  # "v2@1a2b3c4d"
+
+The label includes a hash of the instructions, so metrics and eval results
+tagged with it also distinguish edits made to a version after it was named.
+"""
+
+import bisect
+import hashlib
+import importlib
+from dataclasses import dataclass
+from functools import cached_property, lru_cache
+from types import ModuleType
+from typing import Any, Dict, List, Optional
+
+# Agent prompt name -> version -> prompt module (get_instructions/get_task).
+# The first version listed is the default.
+PROMPT_VERSIONS: Dict[str, Dict[str, str]] = {
+    "processable_entity_extraction": {
+        "v1": "src.prompts.processable_entity_extraction_prompt",
+        "v2": "src.prompts.processable_entity_extraction_prompt_V2",
+    },
+    "unprocessable_entity_extraction": {
+        "v1": "src.prompts.unprocessable_entity_extraction_prompt",
+    },
+    "query_security_validation": {
+        "v1": "src.prompts.query_security_validation_prompt",
+    },
+    "user_intent_validation": {
+        "v1": "src.prompts.user_intent_validation_prompt",
+    },
+    "category_normalisation": {
+        "v1": "src.prompts.category_normalisation_prompt",
+    },
+    "pii_extraction": {
+        "v1": "src.prompts.pii_extraction_prompt",
+    },
+    "query_characteristics_extraction": {
+        "v1": "src.prompts.query_characteristics_extraction_prompt",
+    },
+    "combined_first_stage": {
+        "v1": "src.prompts.combined_first_stage_prompt",
+    },
+}
+
+
+@dataclass(frozen=True)
+class PromptVersion:
+    """A registered prompt: one version of one agent's instructions and task template"""
+    agent: str
+    version: str
+    module_path: str
+
+    @cached_property
+    def module(self) -> ModuleType:
+        return importlib.import_module(self.module_path)
+
+    @cached_property
+    def instructions(self) -> str:
+        """The system prompt"""
+        return self.module.get_instructions()
+
+    @cached_property
+    def content_hash(self) -> str:
+        """SHA-256 of the instructions (hex)"""
+        return hashlib.sha256(self.instructions.encode("utf-8")).hexdigest()
+
+    @property
+    def label(self) -> str:
+        """Version and short content hash, e.g. "v2@1a2b3c4d" (used to tag metrics and results)"""
+        return f"{self.version}@{self.content_hash[:8]}"
+
+    def get_task(self, *args: Any, **kwargs: Any) -> str:
+        """The prompt module's get_task()"""
+        return self.module.get_task(*args, **kwargs)
+
+
+def list_versions(agent: str) -> List[str]:
+    """Registered versions of an agent's prompt, default first"""
+    if agent not in PROMPT_VERSIONS:
+        raise KeyError(f"No prompts registered for agent {agent!r}")
+    return list(PROMPT_VERSIONS[agent])
+
+
+def register_prompt(agent: str, version: str, module_path: str, default: bool = False) -> None:
+    """
+    Register (or replace) a prompt version.
+
+    Args:
+        agent: Agent prompt name, e.g. "processable_entity_extraction"
+        version: Version name, e.g. "v3"
+        module_path: Module providing get_instructions() and get_task()
+        default: Make this the agent's default version
+    """
+    versions = PROMPT_VERSIONS.setdefault(agent, {})
+    versions[version] = module_path
+    if default:
+        PROMPT_VERSIONS[agent] = {version: module_path, **versions}
+
+
+def get_prompt(agent: str, version: Optional[str] = None) -> PromptVersion:
+    """
+    Resolve an agent's prompt.
+
+    Args:
+        agent: Agent prompt name (a key of PROMPT_VERSIONS)
+        version: Version name (default: the agent's default version)
+
+    Raises:
+        KeyError: If the agent or version is not registered
+    """
+    versions = list_versions(agent)
+    version = version or versions[0]
+    if version not in PROMPT_VERSIONS[agent]:
+        raise KeyError(f"Unknown prompt version {version!r} for {agent!r} (registered: {', '.join(versions)})")
+    return _load_prompt(agent, version, PROMPT_VERSIONS[agent][version])
+
+
+@lru_cache(maxsize=None)
+def _load_prompt(agent: str, version: str, module_path: str) -> PromptVersion:
+    # One instance per registration, so instructions and hashes are computed once
+    return PromptVersion(agent=agent, version=version, module_path=module_path)
+
+
+class TrafficSplit:
+    """
+    Assigns requests to prompt versions by percentage.
+
+    Assignment hashes a request key (the query), so the same query always
+    gets the same version and repeated runs are comparable.
+
+    Example:
+        split = TrafficSplit({"v1": 90, "v2": 10})
+        split.choose("How much did I spend at Tesco?")  # "v1" for ~90% of queries
+    """
+
+    def __init__(self, weights: Dict[str, float], salt: str = ""):
+        """
+        Args:
+            weights: Version -> share of traffic (percentages, or any non-negative weights)
+            salt: Changes which keys land in which version
+        """
+        if any(weight < 0 for weight in weights.values()) or sum(weights.values()) <= 0:
+            raise ValueError(f"Traffic weights must be non-negative with a positive total: {weights}")
+        self.weights = dict(weights)
+        self.salt = salt
+        total = sum(weights.values())
+        self._versions: List[str] = []
+        self._bounds: List[float] = []
+        cumulative = 0.0
+        for version, weight in weights.items():
+            if weight == 0:
+                continue
+            cumulative += weight / total
+            self._versions.append(version)
+            self._bounds.append(cumulative)
+        self._bounds[-1] = 1.0
+
+    def choose(self, key: str) -> str:
+        """The version for a request key"""
+        digest = hashlib.sha256(f"{self.salt}:{key}".encode("utf-8")).digest()
+        position = int.from_bytes(digest[:8], "big") / 2 ** 64
+        return self._versions[bisect.bisect_right(self._bounds, position)]
@@ -0,0 +1,10 @@
+"""
+HTTP service for the query preprocessing workflow
+
+Run locally against the fake LLM client:
+    python -m src.service --fake --port 8080
+"""
+
+from src.service.server import PreprocessingService, QueueFullError, ServiceDrainingError
+
+__all__ = ["PreprocessingService", "QueueFullError", "ServiceDrainingError"]
@@ -0,0 +1,10 @@
+#!/usr/bin/env python3
+"""Entry point for `python -m src.service` (see src/service/cli.py)"""
+
+import sys
+
+from src.service.cli import main
+
+
+if __name__ == "__main__":
+    sys.exit(main())
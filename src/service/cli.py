@@ -0,0 +1,105 @@
+"""
+Run the query preprocessing HTTP service (`python -m src.service`).
+
+Examples:
+  # Against the fake LLM client (no API key, for load tests)
+  python -m src.service --fake --port 8080
+
+  # Against Anthropic (reads ANTHROPIC_API_KEY from the environment / .env)
+  python -m src.service --port 8080 --concurrency 50
+
+  # One process per core sharing the port, with a global limit of 50 LLM calls/second
+  python -m src.service --fake --processes 8 --rate-limit 50
+
+  curl -s localhost:8080/preprocess -d '{"query": "Tesco groceries last month"}'
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import signal
+from typing import Optional
+
+from src.clients.llm_clients.llm_client_factory import create_llm_client
+from src.clients.llm_clients.rate_limiter import RateLimiter, SharedTokenBucket, TokenBucket
+from src.core_nodes.process_pool import run_in_processes
+from src.core_nodes.prometheus_exporter import PrometheusExporter
+from src.service.server import PreprocessingService
+from src.workflows.query_preprocessing_workflow import QueryPreprocessingWorkflow
+
+
+def parse_arguments():
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description="Serve the query preprocessing workflow over HTTP")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8080, help="Port to listen on (default: 8080)")
+    parser.add_argument("--concurrency", type=int, default=100, help="Queries processed at once (default: 100)")
+    parser.add_argument("--queue-size", type=int, default=1000, help="Maximum queued queries before 429 (default: 1000)")
+    parser.add_argument("--max-batch-size", type=int, default=100, help="Maximum queries per batch request")
+    parser.add_argument("--drain-timeout", type=float, default=30.0, help="Seconds to drain queued work on shutdown")
+    parser.add_argument("--processes", type=int, default=1, help="Server processes sharing the port (default: 1)")
+    parser.add_argument("--rate-limit", type=float, default=None, help="Global LLM calls/second across all processes")
+    parser.add_argument("--metrics-port", type=int, default=None,
+                        help="Serve Prometheus metrics on this port (+ process index with --processes)")
+    parser.add_argument("--fake", action="store_true", help="Use the fake LLM client instead of Anthropic")
+    parser.add_argument("--fake-median-ms", type=float, default=800.0, help="Fake LLM median latency (default: 800)")
+    return parser.parse_args()
+
+
+async def serve(args, process_index: int = 0, rate_limiter: Optional[RateLimiter] = None) -> None:
+    """Run one service process until SIGINT/SIGTERM, then drain"""
+    exporter = None
+    if args.metrics_port is not None:
+        exporter = PrometheusExporter()
+        exporter.start_http_server(port=args.metrics_port + process_index, host=args.host)
+
+    workflow = QueryPreprocessingWorkflow(
+        llm_client=create_llm_client(
+            fake=args.fake,
+            fake_median_ms=args.fake_median_ms,
+            rate_limiter=rate_limiter
+        ),
+        metrics_exporter=exporter
+    )
+    service = PreprocessingService(
+        workflow,
+        max_queue_size=args.queue_size,
+        concurrency=args.concurrency,
+        max_batch_size=args.max_batch_size
+    )
+    await service.start(host=args.host, port=args.port, reuse_port=args.processes > 1)
+    print(f"🚀 [{process_index}] Serving on http://{args.host}:{args.port} "
+          f"({'fake' if args.fake else 'Anthropic'} LLM client)")
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    await stop.wait()
+
+    print(f"⏳ [{process_index}] Draining queued requests (up to {args.drain_timeout:.0f}s)...")
+    await service.shutdown(drain_timeout_s=args.drain_timeout)
+    if exporter is not None:
+        exporter.stop_http_server()
+    print(f"✅ [{process_index}] Shut down cleanly")
+
+
+def serve_process(process_index: int, args, rate_limiter: Optional[RateLimiter]) -> None:
+    """Entry point for each child process (own event loop and LLM client)"""
+    asyncio.run(serve(args, process_index, rate_limiter))
+
+
+def main() -> int:
+    """Main entry point."""
+    args = parse_arguments()
+
+    if args.processes <= 1:
+        rate_limiter = TokenBucket(args.rate_limit) if args.rate_limit else None
+        asyncio.run(serve(args, rate_limiter=rate_limiter))
+        return 0
+
+    rate_limiter = None
+    if args.rate_limit:
+        rate_limiter = SharedTokenBucket(args.rate_limit, context=multiprocessing.get_context("spawn"))
+    return run_in_processes(serve_process, args.processes, args, rate_limiter)
+
@@ -0,0 +1,342 @@
+"""
+Asyncio HTTP service for the query preprocessing workflow
+
+Endpoints:
+- POST /preprocess        {"query": "..."}
+- POST /preprocess/batch  {"queries": ["...", ...]}
+- GET  /health
+
+All requests share one QueryPreprocessingWorkflow (and so one LLM client).
+Queries are placed on a bounded queue and processed by a fixed pool of worker
+tasks; when the queue is full, requests are rejected with 429 rather than
+piling up unbounded work. On shutdown the listener is closed, queued work is
+drained and only then are connections closed.
+
+Request bodies must be sent with Content-Length; chunked requests get 411.
+"""
+
+import asyncio
+import json
+import time
+from dataclasses import dataclass
+from http import HTTPStatus
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from src.workflows.exceptions import WorkflowError, get_workflow_error_details
+from src.workflows.query_preprocessing_workflow import QueryPreprocessingWorkflow
+
+
+class QueueFullError(Exception):
+    """Raised when the request queue has no room for more work"""
+    pass
+
+
+class ServiceDrainingError(Exception):
+    """Raised when work is submitted while the service is shutting down"""
+    pass
+
+
+@dataclass
+class _WorkItem:
+    query: str
+    future: asyncio.Future
+
+
+class PreprocessingService:
+    """
+    HTTP front end with a bounded work queue over a shared workflow.
+
+    Example:
+        service = PreprocessingService(QueryPreprocessingWorkflow(llm_client))
+        await service.start(port=8080)
+        ...
+        await service.shutdown()
+    """
+
+    def __init__(
+        self,
+        workflow: QueryPreprocessingWorkflow,
+        max_queue_size: int = 1000,
+        concurrency: int = 100,
+        max_batch_size: int = 100,
+        max_body_bytes: int = 1_000_000
+    ):
+        """
+        Initialize the service.
+
+        Args:
+            workflow: Shared workflow used for every request
+            max_queue_size: Maximum number of queued (not yet started) queries
+            concurrency: Number of queries processed at the same time
+            max_batch_size: Maximum number of queries in one batch request
+            max_body_bytes: Maximum accepted request body size
+        """
+        self.workflow = workflow
+        self.max_queue_size = max_queue_size
+        self.concurrency = concurrency
+        self.max_batch_size = max_batch_size
+        self.max_body_bytes = max_body_bytes
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._connections: Set[asyncio.Task] = set()
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._draining = False
+        self._in_flight = 0
+        self._active_requests = 0
+
+    # ========== Lifecycle ==========
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8080, reuse_port: bool = False) -> asyncio.AbstractServer:
+        """
+        Start the worker pool and the HTTP listener.
+
+        Args:
+            host: Interface to bind
+            port: Port to listen on (0 picks a free port)
+            reuse_port: Set SO_REUSEPORT so several processes can listen on the same port
+
+        Returns:
+            The asyncio server (use server.sockets[0].getsockname() for the bound port)
+        """
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.concurrency)]
+        self._server = await asyncio.start_server(self._handle_connection, host, port, reuse_port=reuse_port or None)
+        return self._server
+
+    async def shutdown(self, drain_timeout_s: float = 30.0) -> None:
+        """
+        Stop accepting requests, finish queued work, then close everything.
+
+        Args:
+            drain_timeout_s: Maximum time to wait for queued work to complete
+        """
+        self._draining = True
+        if self._server is not None:
+            self._server.close()
+
+        deadline = time.perf_counter() + drain_timeout_s
+        if self._queue is not None:
+            try:
+                await asyncio.wait_for(self._queue.join(), timeout=drain_timeout_s)
+            except asyncio.TimeoutError:
+                pass
+
+        # Let handlers write their final responses before closing idle keep-alive connections
+        while self._active_requests and time.perf_counter() < deadline:
+            await asyncio.sleep(0.01)
+
+        for task in self._workers + list(self._connections):
+            task.cancel()
+        await asyncio.gather(*self._workers, *self._connections, return_exceptions=True)
+        self._workers = []
+
+        if self._server is not None:
+            await self._server.wait_closed()
+            self._server = None
+
+    # ========== Work Queue ==========
+
+    def submit(self, query: str) -> asyncio.Future:
+        """
+        Queue a query for processing.
+
+        Returns:
+            Future resolving to a WorkflowResult (or raising the workflow exception)
+
+        Raises:
+            ServiceDrainingError: If the service is shutting down
+            QueueFullError: If the queue is full
+        """
+        if self._draining:
+            raise ServiceDrainingError("Service is shutting down")
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait(_WorkItem(query, future))
+        except asyncio.QueueFull:
+            raise QueueFullError(f"Request queue is full ({self.max_queue_size} queued)")
+        return future
+
+    def submit_batch(self, queries: List[str]) -> List[asyncio.Future]:
+        """
+        Queue a batch of queries, all or nothing.
+
+        Raises:
+            ServiceDrainingError: If the service is shutting down
+            QueueFullError: If the queue cannot take the whole batch
+        """
+        if self._draining:
+            raise ServiceDrainingError("Service is shutting down")
+        if self.max_queue_size - self._queue.qsize() < len(queries):
+            raise QueueFullError(f"Request queue cannot take {len(queries)} more queries")
+        return [self.submit(query) for query in queries]
+
+    async def _worker(self) -> None:
+        while True:
+            item = await self._queue.get()
+            self._in_flight += 1
+            try:
+                if not item.future.done():
+                    result = await self.workflow.process(item.query)
+                    if not item.future.done():
+                        item.future.set_result(result)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if not item.future.done():
+                    item.future.set_exception(e)
+            finally:
+                self._in_flight -= 1
+                self._queue.task_done()
+
+    # ========== Request Handling ==========
+
+    def health(self) -> Tuple[int, Dict[str, Any]]:
+        """Health check status code and body"""
+        body = {
+            "status": "draining" if self._draining else "ok",
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "max_queue_size": self.max_queue_size,
+            "in_flight": self._in_flight,
+            "concurrency": self.concurrency
+        }
+        return (503 if self._draining else 200), body
+
+    @staticmethod
+    def _result_body(future: asyncio.Future) -> Tuple[int, Dict[str, Any]]:
+        """Map a finished work future to a status code and structured body"""
+        error = future.exception()
+        if error is None:
+            return 200, {"outcome": "success", "result": future.result().to_dict()}
+        details = get_workflow_error_details(error)
+        # Rejections by the workflow are client-side outcomes; anything else is ours (or the LLM's)
+        return (422 if isinstance(error, WorkflowError) else 502), details
+
+    async def _preprocess(self, payload: Any) -> Tuple[int, Dict[str, Any]]:
+        query = payload.get("query") if isinstance(payload, dict) else None
+        if not isinstance(query, str) or not query.strip():
+            return 400, {"error": "Request body must be a JSON object with a non-empty 'query' string"}
+        future = self.submit(query)
+        await asyncio.wait([future])
+        return self._result_body(future)
+
+    async def _preprocess_batch(self, payload: Any) -> Tuple[int, Dict[str, Any]]:
+        queries = payload.get("queries") if isinstance(payload, dict) else None
+        if not isinstance(queries, list) or not queries or not all(isinstance(q, str) and q.strip() for q in queries):
+            return 400, {"error": "Request body must be a JSON object with a non-empty 'queries' list of strings"}
+        if len(queries) > self.max_batch_size:
+            return 413, {"error": f"Batch size {len(queries)} exceeds maximum of {self.max_batch_size}"}
+        futures = self.submit_batch(queries)
+        await asyncio.wait(futures)
+        results = []
+        for future in futures:
+            status, body = self._result_body(future)
+            results.append({"status": status, **body})
+        return 200, {"results": results}
+
+    async def _route(self, method: str, path: str, body: bytes) -> Tuple[int, Dict[str, Any]]:
+        if path == "/health":
+            if method != "GET":
+                return 405, {"error": "Method not allowed"}
+            return self.health()
+
+        handlers = {"/preprocess": self._preprocess, "/preprocess/batch": self._preprocess_batch}
+        handler = handlers.get(path)
+        if handler is None:
+            return 404, {"error": f"Not found: {path}"}
+        if method != "POST":
+            return 405, {"error": "Method not allowed"}
+
+        try:
+            payload = json.loads(body or b"null")
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            return 400, {"error": "Request body must be valid JSON"}
+
+        try:
+            return await handler(payload)
+        except QueueFullError as e:
+            return 429, {"error": str(e)}
+        except ServiceDrainingError as e:
+            return 503, {"error": str(e)}
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        task = asyncio.current_task()
+        self._connections.add(task)
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except asyncio.LimitOverrunError:
+                    await self._write_response(writer, 431, {"error": "Request headers too large"}, keep_alive=False)
+                    break
+
+                request_line, *header_lines = head.decode("latin-1").rstrip("\r\n").split("\r\n")
+                try:
+                    method, target, version = request_line.split(" ", 2)
+                except ValueError:
+                    await self._write_response(writer, 400, {"error": "Malformed request line"}, keep_alive=False)
+                    break
+                headers = {}
+                for line in header_lines:
+                    name, _, value = line.partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                if "transfer-encoding" in headers:
+                    # Only Content-Length bodies are read; the chunks would otherwise be parsed as the next request
+                    await self._write_response(
+                        writer, 411, {"error": "Transfer-Encoding is not supported; send Content-Length"}, keep_alive=False
+                    )
+                    break
+                # Digits only: int() would also accept a sign, spaces and underscores
+                raw_length = headers.get("content-length", "0")
+                if not (raw_length.isascii() and raw_length.isdigit()):
+                    await self._write_response(writer, 400, {"error": "Malformed Content-Length"}, keep_alive=False)
+                    break
+                length = int(raw_length)
+                if length > self.max_body_bytes:
+                    await self._write_response(writer, 413, {"error": "Request body too large"}, keep_alive=False)
+                    break
+                try:
+                    body = await reader.readexactly(length) if length else b""
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+
+                self._active_requests += 1
+                try:
+                    status, payload = await self._route(method, target.split("?", 1)[0], body)
+                    keep_alive = (
+                        version == "HTTP/1.1"
+                        and headers.get("connection", "").lower() != "close"
+                        and not self._draining
+                    )
+                    await self._write_response(writer, status, payload, keep_alive)
+                finally:
+                    self._active_requests -= 1
+                if not keep_alive:
+                    break
+        except (asyncio.CancelledError, ConnectionError):
+            pass
+        finally:
+            self._connections.discard(task)
+            writer.close()
+
+    @staticmethod
+    async def _write_response(
+        writer: asyncio.StreamWriter,
+        status: int,
+        payload: Dict[str, Any],
+        keep_alive: bool
+    ) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        headers = [
+            f"HTTP/1.1 {status} {HTTPStatus(status).phrase}",
+            "Content-Type: application/json",
+            f"Content-Length: {len(body)}",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}",
+        ]
+        if status in (429, 503):
+            headers.append("Retry-After: 1")
+        writer.write(("\r\n".join(headers) + "\r\n\r\n").encode("latin-1") + body)
+        await writer.drain()
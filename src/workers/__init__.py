@@ -0,0 +1,22 @@
+"""
+Queue-driven workers for high-volume asynchronous preprocessing
+
+    python -m src.workers enqueue --db queue.sqlite queries.txt
+    python -m src.workers work --db queue.sqlite --results results.jsonl --fake
+"""
+
+from src.workers.queue_backends import Job, QueueBackend, InMemoryQueue, SQLiteQueue
+from src.workers.result_sinks import ResultSink, InMemoryResultSink, JSONLResultSink
+from src.workers.runner import WorkerRunner, WorkerStats
+
+__all__ = [
+    "Job",
+    "QueueBackend",
+    "InMemoryQueue",
+    "SQLiteQueue",
+    "ResultSink",
+    "InMemoryResultSink",
+    "JSONLResultSink",
+    "WorkerRunner",
+    "WorkerStats",
+]
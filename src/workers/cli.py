@@ -0,0 +1,155 @@
+"""
+Enqueue queries into, and run workers against, a durable SQLite queue (`python -m src.workers`).
+
+Examples:
+  # Enqueue one query per line (or JSONL objects with "query" and optional "id")
+  python -m src.workers enqueue --db queue.sqlite queries.txt
+
+  # Run a worker
+  python -m src.workers work --db queue.sqlite --results results.jsonl --fake --prefetch 50
+
+  # One worker process per core, sharing a global limit of 50 LLM calls/second
+  python -m src.workers work --db queue.sqlite --fake --processes 8 --rate-limit 50
+
+  # Show queue counts
+  python -m src.workers stats --db queue.sqlite
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import multiprocessing
+import signal
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from src.clients.llm_clients.llm_client_factory import create_llm_client
+from src.clients.llm_clients.rate_limiter import FileLockTokenBucket, RateLimiter, SharedTokenBucket, TokenBucket
+from src.core_nodes.process_pool import run_in_processes
+from src.workers.queue_backends import SQLiteQueue
+from src.workers.result_sinks import JSONLResultSink
+from src.workers.runner import WorkerRunner
+from src.workflows.query_preprocessing_workflow import QueryPreprocessingWorkflow
+
+
+def read_queries(path: Path) -> List[Tuple[str, Optional[str]]]:
+    """
+    Read (query, idempotency_key) pairs from a text or JSONL file.
+
+    Plain-text lines use a hash of the query as the idempotency key, so
+    enqueueing the same file twice does not duplicate work.
+    """
+    items = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith("{"):
+                record = json.loads(line)
+                query = record["query"]
+                key = str(record["id"]) if "id" in record else None
+            else:
+                query, key = line, None
+            if key is None:
+                key = hashlib.sha256(query.encode("utf-8")).hexdigest()[:32]
+            items.append((query, key))
+    return items
+
+
+def parse_arguments():
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description="Queue-driven query preprocessing workers")
+    parser.add_argument("--db", type=Path, default=Path("queue.sqlite"), help="SQLite queue file")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    enqueue = subparsers.add_parser("enqueue", help="Add queries to the queue")
+    enqueue.add_argument("input", type=Path, help="Text file (one query per line) or JSONL file")
+
+    work = subparsers.add_parser("work", help="Process queued queries")
+    work.add_argument("--results", type=Path, default=Path("results.jsonl"), help="JSONL results file")
+    work.add_argument("--prefetch", type=int, default=20, help="Jobs leased at once (default: 20)")
+    work.add_argument("--visibility-timeout", type=float, default=120.0, help="Lease duration in seconds")
+    work.add_argument("--max-attempts", type=int, default=3, help="Deliveries before a job fails")
+    work.add_argument("--retry-delay", type=float, default=1.0,
+                      help="Backoff in seconds before retrying a failed job, doubled per attempt (default: 1)")
+    work.add_argument("--exit-when-empty", action="store_true", help="Stop once the queue is drained")
+    work.add_argument("--processes", type=int, default=1, help="Worker processes to start (default: 1)")
+    work.add_argument("--rate-limit", type=float, default=None, help="Global LLM calls/second across all workers")
+    work.add_argument("--rate-limit-file", type=Path, default=None,
+                      help="Share the rate limit through this lock file (for separately started workers)")
+    work.add_argument("--fake", action="store_true", help="Use the fake LLM client instead of Anthropic")
+    work.add_argument("--fake-median-ms", type=float, default=800.0, help="Fake LLM median latency (default: 800)")
+
+    subparsers.add_parser("stats", help="Show job counts by state")
+    return parser.parse_args()
+
+
+async def work(args, process_index: int = 0, rate_limiter: Optional[RateLimiter] = None) -> None:
+    """Run one worker until the queue is drained (with --exit-when-empty) or SIGINT/SIGTERM"""
+    queue = SQLiteQueue(args.db, max_attempts=args.max_attempts)
+    sink = JSONLResultSink(args.results)
+    workflow = QueryPreprocessingWorkflow(
+        llm_client=create_llm_client(
+            fake=args.fake,
+            fake_median_ms=args.fake_median_ms,
+            rate_limiter=rate_limiter
+        )
+    )
+    runner = WorkerRunner(
+        workflow,
+        queue,
+        sink,
+        prefetch=args.prefetch,
+        visibility_timeout_s=args.visibility_timeout,
+        retry_delay_s=args.retry_delay
+    )
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, runner.stop)
+
+    print(f"🚀 [{process_index}] Worker started (db={args.db}, prefetch={args.prefetch})")
+    stats = await runner.run(stop_when_empty=args.exit_when_empty)
+    await sink.close()
+    queue.close()
+    print(f"✅ [{process_index}] Worker stopped: {stats.format()}")
+
+
+def work_process(process_index: int, args, rate_limiter: Optional[RateLimiter]) -> None:
+    """Entry point for each child process (own event loop and LLM client)"""
+    asyncio.run(work(args, process_index, rate_limiter))
+
+
+async def run_command(args) -> None:
+    """Run the enqueue or stats command."""
+    queue = SQLiteQueue(args.db)
+    if args.command == "enqueue":
+        added = await queue.enqueue_many(read_queries(args.input))
+        print(f"✅ Enqueued {added} new job(s) into {args.db}")
+    print(json.dumps(await queue.stats(), indent=2))
+    queue.close()
+
+
+def main() -> int:
+    """Main entry point."""
+    args = parse_arguments()
+
+    if args.command != "work":
+        asyncio.run(run_command(args))
+        return 0
+
+    rate_limiter: Optional[RateLimiter] = None
+    if args.rate_limit and args.rate_limit_file:
+        rate_limiter = FileLockTokenBucket(args.rate_limit_file, args.rate_limit)
+    elif args.rate_limit and args.processes > 1:
+        rate_limiter = SharedTokenBucket(args.rate_limit, context=multiprocessing.get_context("spawn"))
+    elif args.rate_limit:
+        rate_limiter = TokenBucket(args.rate_limit)
+
+    if args.processes <= 1:
+        asyncio.run(work(args, rate_limiter=rate_limiter))
+        return 0
+    return run_in_processes(work_process, args.processes, args, rate_limiter)
+
@@ -0,0 +1,334 @@
+"""
+Queue backends for the preprocessing worker runner
+
+Delivery is at-least-once: a worker leases jobs for a visibility timeout and
+must ack them before it expires, otherwise they become visible again and are
+redelivered (to this or another worker). A worker that fails a job nacks it
+with a backoff delay; the job is not leased again until the delay has passed.
+Jobs that keep failing are moved to the "failed" state after max_attempts
+deliveries.
+
+Enqueueing with an idempotency key that is already known returns the existing
+job instead of adding a duplicate.
+"""
+
+import asyncio
+import heapq
+import sqlite3
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+
+@dataclass
+class Job:
+    """A query waiting to be preprocessed"""
+    job_id: str
+    query: str
+    idempotency_key: Optional[str] = None
+    attempts: int = 0
+
+
+class QueueBackend(ABC):
+    @abstractmethod
+    async def enqueue(self, query: str, idempotency_key: Optional[str] = None) -> str:
+        """Add a query to the queue and return its job id"""
+        pass
+
+    @abstractmethod
+    async def lease(self, max_jobs: int, visibility_timeout_s: float, wait_s: float = 0.0) -> List[Job]:
+        """
+        Lease up to max_jobs ready jobs.
+
+        Args:
+            max_jobs: Maximum number of jobs to return
+            visibility_timeout_s: Seconds before unacknowledged jobs are redelivered
+            wait_s: How long to wait for a job if none are ready
+
+        Returns:
+            Leased jobs (possibly empty)
+        """
+        pass
+
+    @abstractmethod
+    async def ack(self, job_id: str) -> None:
+        """Mark a leased job as done"""
+        pass
+
+    @abstractmethod
+    async def nack(self, job_id: str, delay_s: float = 0.0) -> bool:
+        """
+        Release a leased job so it can be retried (or failed after max_attempts).
+
+        Args:
+            job_id: Leased job
+            delay_s: Seconds before the job may be leased again
+
+        Returns:
+            True if the job used up its attempts and was moved to "failed"
+        """
+        pass
+
+    @abstractmethod
+    async def stats(self) -> Dict[str, int]:
+        """Job counts by state"""
+        pass
+
+
+class InMemoryQueue(QueueBackend):
+    """In-process queue built on asyncio.Queue (not durable, single process only)"""
+
+    def __init__(self, max_attempts: int = 3):
+        self.max_attempts = max_attempts
+        self._ready: asyncio.Queue = asyncio.Queue()
+        self._leased: Dict[str, Tuple[Job, float]] = {}
+        # (ready_at, sequence, job) of nacked jobs waiting out their backoff
+        self._delayed: List[Tuple[float, int, Job]] = []
+        self._delayed_seq = 0
+        self._keys: Dict[str, str] = {}
+        self._done = 0
+        self._failed = 0
+
+    async def enqueue(self, query: str, idempotency_key: Optional[str] = None) -> str:
+        if idempotency_key is not None and idempotency_key in self._keys:
+            return self._keys[idempotency_key]
+        job = Job(job_id=uuid.uuid4().hex, query=query, idempotency_key=idempotency_key)
+        if idempotency_key is not None:
+            self._keys[idempotency_key] = job.job_id
+        self._ready.put_nowait(job)
+        return job.job_id
+
+    def _requeue_expired(self) -> None:
+        now = time.monotonic()
+        for job_id, (job, expires_at) in list(self._leased.items()):
+            if expires_at <= now:
+                del self._leased[job_id]
+                self._release(job)
+        while self._delayed and self._delayed[0][0] <= now:
+            self._ready.put_nowait(heapq.heappop(self._delayed)[2])
+
+    def _release(self, job: Job, delay_s: float = 0.0) -> bool:
+        if job.attempts >= self.max_attempts:
+            self._failed += 1
+            return True
+        if delay_s > 0:
+            self._delayed_seq += 1
+            heapq.heappush(self._delayed, (time.monotonic() + delay_s, self._delayed_seq, job))
+        else:
+            self._ready.put_nowait(job)
+        return False
+
+    async def lease(self, max_jobs: int, visibility_timeout_s: float, wait_s: float = 0.0) -> List[Job]:
+        self._requeue_expired()
+        jobs: List[Job] = []
+        deadline = time.monotonic() + wait_s
+        while self._ready.empty() and wait_s > 0:
+            # Wake up when the next backed-off job is due, if that is before the deadline
+            remaining = deadline - time.monotonic()
+            if self._delayed:
+                remaining = min(remaining, self._delayed[0][0] - time.monotonic())
+            try:
+                jobs.append(await asyncio.wait_for(self._ready.get(), timeout=max(0.0, remaining)))
+                break
+            except asyncio.TimeoutError:
+                self._requeue_expired()
+                if self._ready.empty() and time.monotonic() >= deadline:
+                    return []
+        while len(jobs) < max_jobs and not self._ready.empty():
+            jobs.append(self._ready.get_nowait())
+
+        expires_at = time.monotonic() + visibility_timeout_s
+        for job in jobs:
+            job.attempts += 1
+            self._leased[job.job_id] = (job, expires_at)
+        return jobs
+
+    async def ack(self, job_id: str) -> None:
+        if self._leased.pop(job_id, None) is not None:
+            self._done += 1
+
+    async def nack(self, job_id: str, delay_s: float = 0.0) -> bool:
+        leased = self._leased.pop(job_id, None)
+        if leased is None:
+            return False
+        return self._release(leased[0], delay_s)
+
+    async def stats(self) -> Dict[str, int]:
+        return {
+            "pending": self._ready.qsize() + len(self._delayed),
+            "leased": len(self._leased),
+            "done": self._done,
+            "failed": self._failed
+        }
+
+
+class SQLiteQueue(QueueBackend):
+    """
+    Durable queue in a local SQLite file.
+
+    Several worker processes can share one file: leasing runs in an
+    IMMEDIATE transaction, so each ready job is handed to one worker at a time.
+    """
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            idempotency_key TEXT UNIQUE,
+            query TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'pending',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            lease_expires_at REAL,
+            next_attempt_at REAL,
+            created_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_jobs_ready ON jobs (status, lease_expires_at);
+    """
+
+    def __init__(self, path: Union[str, Path], max_attempts: int = 3, poll_interval_s: float = 0.1):
+        """
+        Initialize the queue, creating the database if needed.
+
+        Args:
+            path: SQLite database file
+            max_attempts: Deliveries before a job is marked failed
+            poll_interval_s: How often lease() polls while waiting for jobs
+        """
+        self.path = Path(path)
+        self.max_attempts = max_attempts
+        self.poll_interval_s = poll_interval_s
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=30.0, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self._SCHEMA)
+        # Databases created before retry backoff lack next_attempt_at
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+        if "next_attempt_at" not in columns:
+            self._conn.execute("ALTER TABLE jobs ADD COLUMN next_attempt_at REAL")
+
+    def close(self) -> None:
+        """Close the database connection"""
+        self._conn.close()
+
+    async def _run(self, func, *args):
+        # sqlite3 blocks (including on busy locks held by other processes), so keep it off the event loop
+        return await asyncio.to_thread(self._locked, func, *args)
+
+    def _locked(self, func, *args):
+        with self._lock:
+            return func(*args)
+
+    def _enqueue(self, query: str, idempotency_key: Optional[str]) -> str:
+        cursor = self._conn.execute(
+            "INSERT INTO jobs (idempotency_key, query, created_at) VALUES (?, ?, ?) "
+            "ON CONFLICT (idempotency_key) DO NOTHING",
+            (idempotency_key, query, time.time())
+        )
+        if cursor.rowcount:
+            return str(cursor.lastrowid)
+        row = self._conn.execute("SELECT id FROM jobs WHERE idempotency_key = ?", (idempotency_key,)).fetchone()
+        return str(row[0])
+
+    async def enqueue(self, query: str, idempotency_key: Optional[str] = None) -> str:
+        return await self._run(self._enqueue, query, idempotency_key)
+
+    async def enqueue_many(self, items: List[Tuple[str, Optional[str]]]) -> int:
+        """
+        Enqueue (query, idempotency_key) pairs in a single transaction.
+
+        Returns:
+            Number of new jobs added (duplicates by idempotency key are skipped)
+        """
+        def insert() -> int:
+            now = time.time()
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                cursor = self._conn.executemany(
+                    "INSERT INTO jobs (idempotency_key, query, created_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT (idempotency_key) DO NOTHING",
+                    [(key, query, now) for query, key in items]
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            return cursor.rowcount
+        return await self._run(insert)
+
+    def _lease(self, max_jobs: int, visibility_timeout_s: float) -> List[Job]:
+        now = time.time()
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Expired leases that have used up their attempts are dead-lettered
+            self._conn.execute(
+                "UPDATE jobs SET status = 'failed', lease_expires_at = NULL "
+                "WHERE status = 'pending' AND lease_expires_at < ? AND attempts >= ?",
+                (now, self.max_attempts)
+            )
+            rows = self._conn.execute(
+                "SELECT id, query, idempotency_key, attempts FROM jobs "
+                "WHERE status = 'pending' AND (lease_expires_at IS NULL OR lease_expires_at < ?) "
+                "AND (next_attempt_at IS NULL OR next_attempt_at <= ?) "
+                "ORDER BY id LIMIT ?",
+                (now, now, max_jobs)
+            ).fetchall()
+            if rows:
+                self._conn.executemany(
+                    "UPDATE jobs SET attempts = attempts + 1, lease_expires_at = ? WHERE id = ?",
+                    [(now + visibility_timeout_s, row[0]) for row in rows]
+                )
+            self._conn.execute("COMMIT")
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        return [
+            Job(job_id=str(job_id), query=query, idempotency_key=key, attempts=attempts + 1)
+            for job_id, query, key, attempts in rows
+        ]
+
+    async def lease(self, max_jobs: int, visibility_timeout_s: float, wait_s: float = 0.0) -> List[Job]:
+        deadline = time.monotonic() + wait_s
+        while True:
+            jobs = await self._run(self._lease, max_jobs, visibility_timeout_s)
+            if jobs or time.monotonic() >= deadline:
+                return jobs
+            await asyncio.sleep(min(self.poll_interval_s, max(0.0, deadline - time.monotonic())))
+
+    async def ack(self, job_id: str) -> None:
+        await self._run(
+            self._conn.execute,
+            "UPDATE jobs SET status = 'done', lease_expires_at = NULL WHERE id = ?",
+            (int(job_id),)
+        )
+
+    def _nack(self, job_id: str, delay_s: float) -> bool:
+        row = self._conn.execute(
+            "UPDATE jobs SET lease_expires_at = NULL, next_attempt_at = ?, "
+            "status = CASE WHEN attempts >= ? THEN 'failed' ELSE status END "
+            "WHERE id = ? AND status = 'pending' RETURNING status",
+            (time.time() + delay_s, self.max_attempts, int(job_id))
+        ).fetchone()
+        return row is not None and row[0] == "failed"
+
+    async def nack(self, job_id: str, delay_s: float = 0.0) -> bool:
+        return await self._run(self._nack, job_id, delay_s)
+
+    def _stats(self) -> Dict[str, int]:
+        now = time.time()
+        counts = {"pending": 0, "leased": 0, "done": 0, "failed": 0}
+        rows = self._conn.execute(
+            "SELECT CASE WHEN status = 'pending' AND lease_expires_at >= ? THEN 'leased' ELSE status END, COUNT(*) "
+            "FROM jobs GROUP BY 1",
+            (now,)
+        ).fetchall()
+        for state, count in rows:
+            counts[state] = count
+        return counts
+
+    async def stats(self) -> Dict[str, int]:
+        return await self._run(self._stats)
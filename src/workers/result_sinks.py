@@ -0,0 +1,60 @@
+"""
+Result sinks for the preprocessing worker runner
+
+Each processed job produces one JSON-serialisable record:
+    {"job_id", "idempotency_key", "query", "attempts", "outcome", "result" | error details}
+
+Delivery is at-least-once, so a sink may see the same job more than once;
+consumers should de-duplicate on idempotency_key (or job_id).
+"""
+
+import asyncio
+import json
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, List, Union
+
+
+class ResultSink(ABC):
+    @abstractmethod
+    async def write(self, record: Dict[str, Any]) -> None:
+        """Store the result record of one job"""
+        pass
+
+    async def close(self) -> None:
+        """Flush and release resources"""
+        pass
+
+
+class InMemoryResultSink(ResultSink):
+    """Collects result records in a list"""
+
+    def __init__(self):
+        self.records: List[Dict[str, Any]] = []
+
+    async def write(self, record: Dict[str, Any]) -> None:
+        self.records.append(record)
+
+
+class JSONLResultSink(ResultSink):
+    """
+    Appends result records to a JSON lines file.
+
+    Each record is flushed before write() returns, so a job is only acked
+    once its result is on disk.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._lock = asyncio.Lock()
+
+    async def write(self, record: Dict[str, Any]) -> None:
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        async with self._lock:
+            self._file.write(line)
+            self._file.flush()
+
+    async def close(self) -> None:
+        self._file.close()
@@ -0,0 +1,176 @@
+"""
+Queue-driven worker runner for the query preprocessing workflow
+
+Leases jobs from a QueueBackend, runs each through the workflow and writes
+the outcome to a ResultSink before acknowledging the job.
+
+Typed workflow exceptions (insecure, invalid, unprocessable, no entities) are
+final outcomes and are written and acked like successes. Any other exception
+(LLM errors, rate limits) is logged and the job is released for redelivery
+after an exponential backoff; when its last attempt fails, an "error" record
+is written so the sink explains every failed job.
+"""
+
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Set
+
+from src.workers.queue_backends import Job, QueueBackend
+from src.workers.result_sinks import ResultSink
+from src.workflows.exceptions import WorkflowError, get_workflow_error_details
+from src.workflows.query_preprocessing_workflow import QueryPreprocessingWorkflow
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class WorkerStats:
+    """Counters for one worker runner"""
+    processed: int = 0
+    retried: int = 0
+    failed: int = 0
+    started_at: float = 0.0
+
+    def format(self) -> str:
+        elapsed = time.perf_counter() - self.started_at if self.started_at else 0.0
+        rate = self.processed / elapsed if elapsed > 0 else 0.0
+        return (
+            f"processed={self.processed} retried={self.retried} failed={self.failed} "
+            f"elapsed={elapsed:.1f}s rate={rate:.1f}/s"
+        )
+
+
+class WorkerRunner:
+    """
+    Processes queued queries with at most `prefetch` jobs leased at a time.
+
+    Example:
+        runner = WorkerRunner(workflow, SQLiteQueue("queue.sqlite"), JSONLResultSink("results.jsonl"))
+        await runner.run(stop_when_empty=True)
+    """
+
+    def __init__(
+        self,
+        workflow: QueryPreprocessingWorkflow,
+        queue: QueueBackend,
+        sink: ResultSink,
+        prefetch: int = 10,
+        visibility_timeout_s: float = 120.0,
+        poll_interval_s: float = 0.5,
+        retry_delay_s: float = 1.0,
+        max_retry_delay_s: float = 60.0,
+        jitter_factor: float = 0.1
+    ):
+        """
+        Initialize the runner.
+
+        Args:
+            workflow: Workflow used to process each query
+            queue: Queue backend to lease jobs from
+            sink: Where result records are written
+            prefetch: Maximum jobs leased (and processed concurrently) by this worker
+            visibility_timeout_s: Lease duration before unacked jobs are redelivered
+            poll_interval_s: How long to wait for new jobs when the queue is empty
+            retry_delay_s: Backoff before the second attempt of a failed job (doubles per attempt)
+            max_retry_delay_s: Upper bound on the backoff
+            jitter_factor: Random jitter (0.0-1.0) added to each backoff so retries don't align
+        """
+        self.workflow = workflow
+        self.queue = queue
+        self.sink = sink
+        self.prefetch = prefetch
+        self.visibility_timeout_s = visibility_timeout_s
+        self.poll_interval_s = poll_interval_s
+        self.retry_delay_s = retry_delay_s
+        self.max_retry_delay_s = max_retry_delay_s
+        self.jitter_factor = jitter_factor
+        self.stats = WorkerStats()
+        self._stopping = False
+
+    def stop(self) -> None:
+        """Stop leasing new jobs; run() returns once in-flight jobs finish"""
+        self._stopping = True
+
+    async def _handle(self, job: Job) -> None:
+        record: Dict[str, Any] = {
+            "job_id": job.job_id,
+            "idempotency_key": job.idempotency_key,
+            "query": job.query,
+            "attempts": job.attempts
+        }
+        try:
+            result = await self.workflow.process(job.query)
+            record.update({"outcome": "success", "result": result.to_dict()})
+        except WorkflowError as e:
+            record.update(get_workflow_error_details(e))
+        except Exception as e:
+            delay_s = min(self.max_retry_delay_s, self.retry_delay_s * 2 ** (job.attempts - 1))
+            delay_s += random.uniform(0, delay_s * self.jitter_factor)
+            if not await self.queue.nack(job.job_id, delay_s):
+                logger.warning(
+                    "Job %s failed on attempt %d, retrying in %.1fs: %r", job.job_id, job.attempts, delay_s, e
+                )
+                self.stats.retried += 1
+                return
+            logger.error("Job %s failed on its last attempt (%d): %r", job.job_id, job.attempts, e)
+            # The job is dead-lettered; record why
+            record.update(get_workflow_error_details(e))
+            await self.sink.write(record)
+            self.stats.failed += 1
+            return
+
+        await self.sink.write(record)
+        await self.queue.ack(job.job_id)
+        self.stats.processed += 1
+
+    async def run(self, stop_when_empty: bool = False, max_jobs: Optional[int] = None) -> WorkerStats:
+        """
+        Process jobs until stopped.
+
+        Args:
+            stop_when_empty: Return once the queue has no pending jobs and nothing is in flight
+            max_jobs: Return after leasing this many jobs
+
+        Returns:
+            WorkerStats for this run
+        """
+        self.stats = WorkerStats(started_at=time.perf_counter())
+        self._stopping = False
+        in_flight: Set[asyncio.Task] = set()
+        leased_total = 0
+
+        while not self._stopping:
+            capacity = self.prefetch - len(in_flight)
+            if max_jobs is not None:
+                capacity = min(capacity, max_jobs - leased_total)
+                if capacity <= 0 and not in_flight:
+                    break
+
+            if capacity > 0:
+                # Only block waiting for jobs when there is nothing else to do
+                wait_s = 0.0 if in_flight else self.poll_interval_s
+                jobs = await self.queue.lease(capacity, self.visibility_timeout_s, wait_s=wait_s)
+                leased_total += len(jobs)
+                for job in jobs:
+                    in_flight.add(asyncio.create_task(self._handle(job)))
+                if not jobs and not in_flight:
+                    # Jobs waiting out a retry backoff still count as queued work
+                    if stop_when_empty and (await self.queue.stats())["pending"] == 0:
+                        break
+                    continue
+
+            if in_flight:
+                done, in_flight = await asyncio.wait(
+                    in_flight,
+                    timeout=self.poll_interval_s,
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    task.result()
+
+        if in_flight:
+            await asyncio.gather(*in_flight)
+        return self.stats
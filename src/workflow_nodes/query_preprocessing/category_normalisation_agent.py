@@ -1,4 +1,4 @@
-from typing import Type
+from typing import Type, Optional
 
 from src.core_nodes.agent_node_base import AgentNodeBase
 from src.clients.llm_clients.llm_client_interface import LLMClientInterface
@@ -8,18 +8,18 @@ from src.models.category_normalisation_models import (
     NormalisedCategoryEntity
 )
 from src.parsers.xml_tag_parser import parse_list_of_objects
-from src.prompts.category_normalisation_prompt import get_instructions, get_task
+from src.prompts.prompt_registry import get_prompt
 
 
 class CategoryNormalisationAgent(AgentNodeBase[CategoryNormalisationInput, CategoryNormalisationOutput]):
-    def __init__(self, llm_client: LLMClientInterface):
+    def __init__(self, llm_client: LLMClientInterface, prompt_version: Optional[str] = None):
         super().__init__(
             llm_client=llm_client,
             temperature=0.1,
             max_tokens=1000
         )
-        # Set only the system prompt here
-        self.system_prompt = get_instructions()
+        # Resolve the system prompt and task template through the prompt registry
+        self.use_prompt(get_prompt("category_normalisation", prompt_version))
     
     def parse_response(self, llm_response: str) -> CategoryNormalisationOutput:
         """Parse the LLM response to extract normalised categories"""
@@ -65,4 +65,4 @@ class CategoryNormalisationAgent(AgentNodeBase[CategoryNormalisationInput, Categ
 """
 
         # Build and return the task prompt with query and entities
-        return get_task(input_data.query, entities_xml.strip())
\ No newline at end of file
+        return self.prompt.get_task(input_data.query, entities_xml.strip())
\ No newline at end of file
@@ -0,0 +1,70 @@
+from typing import Type, Optional
+
+from src.core_nodes.agent_node_base import AgentNodeBase
+from src.clients.llm_clients.llm_client_interface import LLMClientInterface
+from src.models.base_models import QueryInput
+from src.models.entity_extraction_models import CombinedFirstStageOutput
+from src.parsers.xml_tag_parser import get_xml_tag_content
+from src.prompts.prompt_registry import get_prompt
+from src.workflow_nodes.query_preprocessing.processable_entity_extraction_agent import ProcessableEntityExtractionAgent
+from src.workflow_nodes.query_preprocessing.query_security_validation_agent import QuerySecurityValidationAgent
+from src.workflow_nodes.query_preprocessing.unprocessable_entity_extraction_agent import UnprocessableEntityExtractionAgent
+from src.workflow_nodes.query_preprocessing.user_intent_validation_agent import UserIntentValidationAgent
+
+
+class CombinedFirstStageAgent(AgentNodeBase[QueryInput, CombinedFirstStageOutput]):
+    """
+    Runs security validation, intent validation and processable/unprocessable
+    entity extraction in one LLM call instead of four.
+
+    Each section of the response is parsed by the corresponding single-purpose
+    agent's parse_response, so the outputs are identical in shape to the
+    four-call path. A missing section parses as that agent's empty response
+    (which fails both validations).
+    """
+
+    def __init__(self, llm_client: LLMClientInterface, prompt_version: Optional[str] = None):
+        # The section parsers; their LLM clients are never called
+        self.security_agent = QuerySecurityValidationAgent(llm_client)
+        self.intent_agent = UserIntentValidationAgent(llm_client)
+        self.processable_agent = ProcessableEntityExtractionAgent(llm_client)
+        self.unprocessable_agent = UnprocessableEntityExtractionAgent(llm_client)
+        super().__init__(
+            llm_client=llm_client,
+            temperature=0.0,  # Zero temperature as the response includes the security decision
+            max_tokens=sum(agent.max_tokens for agent in (
+                self.security_agent, self.intent_agent, self.processable_agent, self.unprocessable_agent
+            ))
+        )
+        # Resolve the system prompt and task template through the prompt registry
+        self.use_prompt(get_prompt("combined_first_stage", prompt_version))
+
+    def parse_response(self, llm_response: str) -> CombinedFirstStageOutput:
+        """Split the response into its sections and parse each with its agent's parser"""
+        return CombinedFirstStageOutput(
+            security=self.security_agent.parse_response(
+                get_xml_tag_content(llm_response, "security_validation")
+            ),
+            intent=self.intent_agent.parse_response(
+                get_xml_tag_content(llm_response, "intent_validation")
+            ),
+            processable=self.processable_agent.parse_response(
+                get_xml_tag_content(llm_response, "processable_entities")
+            ),
+            unprocessable=self.unprocessable_agent.parse_response(
+                get_xml_tag_content(llm_response, "unprocessable_entities")
+            ),
+            raw_response=llm_response
+        )
+
+    def get_input_model(self) -> Type[QueryInput]:
+        """Return the Pydantic model class for the input"""
+        return QueryInput
+
+    def get_output_model(self) -> Type[CombinedFirstStageOutput]:
+        """Return the Pydantic model class for the output"""
+        return CombinedFirstStageOutput
+
+    def format_user_prompt(self, input_data: QueryInput) -> str:
+        """Format the input data into a user prompt for the LLM"""
+        return self.prompt.get_task(input_data.query)
@@ -1,4 +1,4 @@
-from typing import Type
+from typing import Type, Optional
 
 from src.core_nodes.agent_node_base import AgentNodeBase
 from src.clients.llm_clients.llm_client_interface import LLMClientInterface
@@ -8,18 +8,18 @@ from src.models.entity_extraction_models import (
     PIIExtractionOutput
 )
 from src.parsers.xml_tag_parser import parse_list_of_objects
-from src.prompts.pii_extraction_prompt import get_instructions, get_task
+from src.prompts.prompt_registry import get_prompt
 
 
 class PIIExtractionAgent(AgentNodeBase[QueryInput, PIIExtractionOutput]):
-    def __init__(self, llm_client: LLMClientInterface):
+    def __init__(self, llm_client: LLMClientInterface, prompt_version: Optional[str] = None):
         super().__init__(
             llm_client=llm_client,
             temperature=0.1,
             max_tokens=1500
         )
-        # Set the system prompt from the prompt file
-        self.system_prompt = get_instructions()
+        # Resolve the system prompt and task template through the prompt registry
+        self.use_prompt(get_prompt("pii_extraction", prompt_version))
 
     def parse_response(self, llm_response: str) -> PIIExtractionOutput:
         """Parse the LLM response to extract PII entities"""
@@ -59,4 +59,4 @@ class PIIExtractionAgent(AgentNodeBase[QueryInput, PIIExtractionOutput]):
 
     def format_user_prompt(self, input_data: QueryInput) -> str:
         """Format the input data into a user prompt for the LLM"""
-        return get_task(input_data.query)
+        return self.prompt.get_task(input_data.query)
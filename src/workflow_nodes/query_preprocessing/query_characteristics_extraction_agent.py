@@ -35,7 +35,7 @@ from src.parsers.xml_tag_parser import (
     parse_boolean_tag,
     parse_numeric_tag
 )
-from src.prompts.query_characteristics_extraction_prompt import get_instructions, get_task
+from src.prompts.prompt_registry import get_prompt
 
 
 class QueryCharacteristicsExtractionAgent(
@@ -48,13 +48,14 @@ class QueryCharacteristicsExtractionAgent(
     with all defaults populated for predictable client consumption.
     """
 
-    def __init__(self, llm_client: LLMClientInterface):
+    def __init__(self, llm_client: LLMClientInterface, prompt_version: Optional[str] = None):
         super().__init__(
             llm_client=llm_client,
             temperature=0.1,
             max_tokens=1500
         )
-        self.system_prompt = get_instructions()
+        # Resolve the system prompt and task template through the prompt registry
+        self.use_prompt(get_prompt("query_characteristics_extraction", prompt_version))
 
     def parse_response(self, llm_response: str) -> QueryCharacteristicsOutput:
         """
@@ -325,4 +326,4 @@ class QueryCharacteristicsExtractionAgent(
 
     def format_user_prompt(self, input_data: QueryCharacteristicsInput) -> str:
         """Format the input data into a user prompt for the LLM"""
-        return get_task(input_data.query, input_data.processable_entities)
+        return self.prompt.get_task(input_data.query, input_data.processable_entities)
@@ -1,4 +1,4 @@
-from typing import Type, Literal, cast
+from typing import Type, Literal, cast, Optional
 
 from src.core_nodes.agent_node_base import AgentNodeBase
 from src.clients.llm_clients.llm_client_interface import LLMClientInterface
@@ -8,18 +8,18 @@ from src.models.entity_extraction_models import (
     UnprocessableEntityExtractionOutput
 )
 from src.parsers.xml_tag_parser import parse_list_of_objects
-from src.prompts.unprocessable_entity_extraction_prompt import get_instructions, get_task
+from src.prompts.prompt_registry import get_prompt
 
 
 class UnprocessableEntityExtractionAgent(AgentNodeBase[QueryInput, UnprocessableEntityExtractionOutput]):
-    def __init__(self, llm_client: LLMClientInterface):
+    def __init__(self, llm_client: LLMClientInterface, prompt_version: Optional[str] = None):
         super().__init__(
             llm_client=llm_client,
             temperature=0.1,
             max_tokens=1500
         )
-        # Set the system prompt from the prompt file
-        self.system_prompt = get_instructions()
+        # Resolve the system prompt and task template through the prompt registry
+        self.use_prompt(get_prompt("unprocessable_entity_extraction", prompt_version))
     
     def parse_response(self, llm_response: str) -> UnprocessableEntityExtractionOutput:
         """Parse the LLM response to extract unprocessable entities"""
@@ -109,4 +109,4 @@ class UnprocessableEntityExtractionAgent(AgentNodeBase[QueryInput, Unprocessable
 
     def format_user_prompt(self, input_data: QueryInput) -> str:
         """Format the input data into a user prompt for the LLM"""
-        return get_task(input_data.query)
\ No newline at end of file
+        return self.prompt.get_task(input_data.query)
\ No newline at end of file
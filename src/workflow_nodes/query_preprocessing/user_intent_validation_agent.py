@@ -1,22 +1,22 @@
-from typing import Type
+from typing import Type, Optional
 
 from src.core_nodes.agent_node_base import AgentNodeBase
 from src.clients.llm_clients.llm_client_interface import LLMClientInterface
 from src.models.base_models import QueryInput
 from src.models.entity_extraction_models import UserIntentValidationOutput
 from src.parsers.xml_tag_parser import get_xml_tag_content, parse_boolean_tag
-from src.prompts.user_intent_validation_prompt import get_instructions, get_task
+from src.prompts.prompt_registry import get_prompt
 
 
 class UserIntentValidationAgent(AgentNodeBase[QueryInput, UserIntentValidationOutput]):
-    def __init__(self, llm_client: LLMClientInterface):
+    def __init__(self, llm_client: LLMClientInterface, prompt_version: Optional[str] = None):
         super().__init__(
             llm_client=llm_client,
             temperature=0.1,
             max_tokens=500  # Much smaller output expected
         )
-        # Set the system prompt from the prompt file
-        self.system_prompt = get_instructions()
+        # Resolve the system prompt and task template through the prompt registry
+        self.use_prompt(get_prompt("user_intent_validation", prompt_version))
     
     def parse_response(self, llm_response: str) -> UserIntentValidationOutput:
         """Parse the LLM response to extract validation result"""
@@ -46,4 +46,4 @@ class UserIntentValidationAgent(AgentNodeBase[QueryInput, UserIntentValidationOu
 
     def format_user_prompt(self, input_data: QueryInput) -> str:
         """Format the input data into a user prompt for the LLM"""
-        return get_task(input_data.query)
\ No newline at end of file
+        return self.prompt.get_task(input_data.query)
\ No newline at end of file
@@ -2,7 +2,7 @@
 Custom exceptions for query preprocessing workflow
 """
 
-from typing import Optional, List
+from typing import Any, Dict, Optional, List
 
 
 class WorkflowError(Exception):
@@ -43,4 +43,54 @@ class UnprocessableEntityError(WorkflowError):
 class NoProcessableEntitiesError(UnprocessableEntityError):
     """Raised when no processable entities are found"""
     def __init__(self):
-        super().__init__("No processable entities found in query")
\ No newline at end of file
+        super().__init__("No processable entities found in query")
+
+
+def get_workflow_outcome(error: Optional[BaseException] = None) -> str:
+    """
+    Map a workflow exception (or None for success) to an outcome label.
+
+    Args:
+        error: Exception raised by the workflow, or None if it succeeded
+
+    Returns:
+        One of "success", "insecure", "invalid", "no_entities", "unprocessable" or "error"
+    """
+    if error is None:
+        return "success"
+    if isinstance(error, InsecureQueryError):
+        return "insecure"
+    if isinstance(error, InvalidQueryError):
+        return "invalid"
+    if isinstance(error, NoProcessableEntitiesError):
+        return "no_entities"
+    if isinstance(error, UnprocessableEntityError):
+        return "unprocessable"
+    return "error"
+
+
+def get_workflow_error_details(error: BaseException) -> Dict[str, Any]:
+    """
+    Describe a workflow exception as a JSON-serialisable dictionary.
+
+    Args:
+        error: Exception raised by the workflow
+
+    Returns:
+        Dictionary with outcome, error type, message and, where available,
+        justification and unprocessable entities
+    """
+    details: Dict[str, Any] = {
+        "outcome": get_workflow_outcome(error),
+        "error": type(error).__name__,
+        "message": str(error)
+    }
+    justification = getattr(error, "justification", None)
+    if justification:
+        details["justification"] = justification
+    if isinstance(error, UnprocessableEntityError) and error.entities:
+        details["entities"] = [
+            entity.model_dump() if hasattr(entity, "model_dump") else entity
+            for entity in error.entities
+        ]
+    return details
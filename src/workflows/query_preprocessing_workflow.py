@@ -4,12 +4,18 @@ Orchestrates multiple agents to validate and extract entities from user queries
 """
 
 import asyncio
+import time
 from typing import Dict, Any, Optional, List
 from dataclasses import dataclass
 from datetime import datetime
 
 from src.clients.llm_clients.llm_client_interface import LLMClientInterface
+from src.core_nodes.agent_node_base import AgentNodeBase
+from src.core_nodes.example_store import ExampleStore
+from src.core_nodes.prometheus_exporter import PrometheusExporter
+from src.core_nodes.tracing import Tracer, trace_span
 from src.models.llm_metrics import LLMMetrics
+from src.prompts.prompt_registry import TrafficSplit
 
 # Import agents
 from src.workflow_nodes.query_preprocessing.processable_entity_extraction_agent import ProcessableEntityExtractionAgent
@@ -27,7 +33,8 @@ from src.workflows.exceptions import (
     InsecureQueryError,
     InvalidQueryError,
     UnprocessableEntityError,
-    NoProcessableEntitiesError
+    NoProcessableEntitiesError,
+    get_workflow_outcome
 )
 
 
@@ -47,6 +54,20 @@ class WorkflowResult:
         """Calculate total cost across all agents"""
         return sum(m.total_cost for m in self.metrics.values())
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the result to a JSON-serialisable dictionary"""
+        return {
+            "query": self.query,
+            "processable_entities": [entity.model_dump() for entity in self.processable_entities],
+            "normalised_categories": [entity.model_dump() for entity in self.normalised_categories],
+            "unprocessable_entities": [entity.model_dump() for entity in self.unprocessable_entities],
+            "is_secure": self.is_secure,
+            "is_valid": self.is_valid,
+            "metrics": {name: metrics.model_dump() for name, metrics in self.metrics.items()},
+            "total_time_ms": self.total_time_ms,
+            "total_cost": self.get_total_cost()
+        }
+
 
 class QueryPreprocessingWorkflow:
     """
@@ -55,18 +76,41 @@ class QueryPreprocessingWorkflow:
     Flow:
     1. Run 4 agents concurrently: processable extraction, security validation, 
        unprocessable extraction, user intent validation
+       (or, with combined_first_stage, one agent producing all four results)
     2. Check results in order for early termination
     3. Run category normalisation if processable entities exist
     """
     
-    def __init__(self, llm_client: LLMClientInterface):
+    def __init__(
+        self,
+        llm_client: LLMClientInterface,
+        metrics_exporter: Optional[PrometheusExporter] = None,
+        tracer: Optional[Tracer] = None,
+        combined_first_stage: bool = False,
+        few_shot_k: Optional[int] = None,
+        prompt_splits: Optional[Dict[str, Dict[str, float]]] = None
+    ):
         """
         Initialize the workflow with all required agents.
-        
+
         Args:
             llm_client: The LLM client to use for all agents
+            metrics_exporter: Optional exporter to record agent calls and workflow outcomes
+            tracer: Optional tracer to record spans for (sampled) workflow runs
+            combined_first_stage: Make one LLM call for the first stage instead of four
+                (fewer requests and lower latency, slightly lower accuracy; see
+                evals/tests/compare_combined_first_stage.py)
+            few_shot_k: Send each agent with an example store the k most similar
+                examples instead of its static examples (see src/core_nodes/example_store.py)
+            prompt_splits: Split traffic between prompt versions by percentage, per agent
+                prompt name, e.g. {"processable_entity_extraction": {"v1": 90, "v2": 10}}.
+                Each query always gets the same version; metrics carry its prompt_version
+                (see src/prompts/prompt_registry.py)
         """
         self.llm_client = llm_client
+        self.metrics_exporter = metrics_exporter
+        self.tracer = tracer
+        self.combined_first_stage = combined_first_stage
         
         # Initialize all agents
         self.processable_agent = ProcessableEntityExtractionAgent(llm_client)
@@ -74,6 +118,44 @@ class QueryPreprocessingWorkflow:
         self.security_agent = QuerySecurityValidationAgent(llm_client)
         self.intent_agent = UserIntentValidationAgent(llm_client)
         self.category_agent = CategoryNormalisationAgent(llm_client)
+        # Agents load their system prompts on first use; the combined agent is only built when enabled
+        self.combined_agent: Optional[AgentNodeBase] = None
+        if combined_first_stage:
+            from src.workflow_nodes.query_preprocessing.combined_first_stage_agent import CombinedFirstStageAgent
+            self.combined_agent = CombinedFirstStageAgent(llm_client)
+
+        # One agent per prompt version under a traffic split, keyed by prompt name
+        self.prompt_splits: Dict[str, TrafficSplit] = {}
+        self._prompt_variants: Dict[str, Dict[str, AgentNodeBase]] = {}
+        agents_by_prompt = {
+            agent.prompt.agent: agent for agent in (
+                self.processable_agent, self.unprocessable_agent, self.security_agent,
+                self.intent_agent, self.combined_agent, self.category_agent
+            ) if agent is not None
+        }
+        for prompt_name, weights in (prompt_splits or {}).items():
+            if prompt_name not in agents_by_prompt:
+                raise ValueError(
+                    f"No workflow agent uses prompt {prompt_name!r} "
+                    f"(available: {', '.join(sorted(agents_by_prompt))})"
+                )
+            self.prompt_splits[prompt_name] = TrafficSplit(weights, salt=prompt_name)
+            agent_class = type(agents_by_prompt[prompt_name])
+            self._prompt_variants[prompt_name] = {
+                version: agent_class(llm_client, prompt_version=version) for version in weights
+            }
+
+        if few_shot_k:
+            first_stage_agents = [self.processable_agent, self.unprocessable_agent, self.security_agent, self.intent_agent]
+            variants = [
+                variant
+                for first_stage_agent in first_stage_agents
+                for variant in self._prompt_variants.get(first_stage_agent.prompt.agent, {}).values()
+            ]
+            for agent in first_stage_agents + variants:
+                example_store = ExampleStore.for_agent(type(agent).__name__)
+                if example_store is not None:
+                    agent.use_example_store(example_store, k=few_shot_k)
     
     async def process(self, query: str) -> WorkflowResult:
         """
@@ -91,6 +173,31 @@ class QueryPreprocessingWorkflow:
             UnprocessableEntityError: If query has critical unprocessable entities
             NoProcessableEntitiesError: If no processable entities found
         """
+        if self.tracer is None:
+            return await self._process_with_metrics(query)
+
+        with self.tracer.start_trace("workflow.process", query_length=len(query)):
+            return await self._process_with_metrics(query)
+
+    async def _process_with_metrics(self, query: str) -> WorkflowResult:
+        """Run the workflow and record its outcome with the exporter, if configured"""
+        if self.metrics_exporter is None:
+            return await self._process(query)
+
+        start = time.perf_counter()
+        try:
+            result = await self._process(query)
+        except Exception as e:
+            self.metrics_exporter.record_workflow_outcome(
+                get_workflow_outcome(e),
+                duration_ms=(time.perf_counter() - start) * 1000
+            )
+            raise
+        self.metrics_exporter.record_workflow_outcome("success", duration_ms=result.total_time_ms)
+        return result
+
+    async def _process(self, query: str) -> WorkflowResult:
+        """Run the workflow steps (see process)"""
         start_time = datetime.now()
         metrics = {}
         
@@ -101,29 +208,35 @@ class QueryPreprocessingWorkflow:
         # Create input for agents
         query_input = QueryInput(query=query)
 
-        results = await asyncio.gather(
-            self.processable_agent.process(query_input),
-            self.security_agent.process(query_input),
-            self.unprocessable_agent.process(query_input),
-            self.intent_agent.process(query_input),
-            return_exceptions=False  # Let exceptions propagate
-        )
+        if self.combined_first_stage:
+            with trace_span("stage.combined_first_stage"):
+                combined_result, metrics["combined_first_stage"] = (
+                    await self._select_agent(self.combined_agent, query).process_with_metrics(query_input)
+                )
+            processable_result = combined_result.processable
+            security_result = combined_result.security
+            unprocessable_result = combined_result.unprocessable
+            intent_result = combined_result.intent
+        else:
+            with trace_span("stage.parallel_agents"):
+                # Metrics are returned per call (not read from agent.last_metrics)
+                # so concurrent workflow runs sharing these agents don't mix them up
+                results = await asyncio.gather(
+                    self._select_agent(self.processable_agent, query).process_with_metrics(query_input),
+                    self._select_agent(self.security_agent, query).process_with_metrics(query_input),
+                    self._select_agent(self.unprocessable_agent, query).process_with_metrics(query_input),
+                    self._select_agent(self.intent_agent, query).process_with_metrics(query_input),
+                    return_exceptions=False  # Let exceptions propagate
+                )
+
+            # Unpack results
+            processable_result, metrics["processable_extraction"] = results[0]
+            security_result, metrics["security_validation"] = results[1]
+            unprocessable_result, metrics["unprocessable_extraction"] = results[2]
+            intent_result, metrics["intent_validation"] = results[3]
         
-        # Unpack results
-        processable_result = results[0]
-        security_result = results[1]
-        unprocessable_result = results[2]
-        intent_result = results[3]
-        
-        # Collect metrics
-        if self.processable_agent.last_metrics:
-            metrics["processable_extraction"] = self.processable_agent.last_metrics
-        if self.security_agent.last_metrics:
-            metrics["security_validation"] = self.security_agent.last_metrics
-        if self.unprocessable_agent.last_metrics:
-            metrics["unprocessable_extraction"] = self.unprocessable_agent.last_metrics
-        if self.intent_agent.last_metrics:
-            metrics["intent_validation"] = self.intent_agent.last_metrics
+        # Export metrics
+        self._export_metrics(metrics)
         
         # Step 2: Check results in specified order
         
@@ -174,12 +287,14 @@ class QueryPreprocessingWorkflow:
             )
             
             # Run category normalisation
-            category_result = await self.category_agent.process(category_input)
+            with trace_span("stage.category_normalisation"):
+                category_agent = self._select_agent(self.category_agent, query)
+                category_result, category_metrics = await category_agent.process_with_metrics(category_input)
             normalised_categories = category_result.entities
             
             # Add metrics
-            if self.category_agent.last_metrics:
-                metrics["category_normalisation"] = self.category_agent.last_metrics
+            metrics["category_normalisation"] = category_metrics
+            self._export_metrics({"category_normalisation": category_metrics})
         
         # Calculate total time
         end_time = datetime.now()
@@ -197,6 +312,20 @@ class QueryPreprocessingWorkflow:
             total_time_ms=total_time_ms
         )
     
+    def _select_agent(self, agent: AgentNodeBase, query: str) -> AgentNodeBase:
+        """The agent to run for this query: the given one, or its version under a prompt traffic split"""
+        prompt_name = agent.prompt.agent
+        split = self.prompt_splits.get(prompt_name)
+        if split is None:
+            return agent
+        return self._prompt_variants[prompt_name][split.choose(query)]
+    
+    def _export_metrics(self, metrics: Dict[str, LLMMetrics]) -> None:
+        """Forward agent metrics to the exporter, if configured"""
+        if self.metrics_exporter is not None:
+            for agent_name, agent_metrics in metrics.items():
+                self.metrics_exporter.add_metrics(agent_name, agent_metrics)
+    
     def get_workflow_summary(self, result: WorkflowResult) -> str:
         """
         Generate a human-readable summary of the workflow result.
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the resumable batch runner
+"""
+
+import asyncio
+import json
+
+from src.batch import BatchRunner, iter_input
+from src.clients.llm_clients.fake_llm_client import FakeLLMClient, LatencyProfile
+from src.workflows.query_preprocessing_workflow import QueryPreprocessingWorkflow
+
+
+def make_runner(tmp_path, input_name: str = "queries.jsonl", **kwargs):
+    """Build a runner over a zero-latency fake LLM client"""
+    llm_client = FakeLLMClient(latency_profile=LatencyProfile.zero())
+    runner = BatchRunner(
+        QueryPreprocessingWorkflow(llm_client=llm_client),
+        input_path=tmp_path / input_name,
+        output_path=tmp_path / "results.jsonl",
+        concurrency=4,
+        checkpoint_every=5,
+        **kwargs
+    )
+    return runner, llm_client
+
+
+def read_output(tmp_path):
+    """Read the output JSONL records"""
+    with open(tmp_path / "results.jsonl", "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+class TestBatchRunner:
+    """Test streaming input, output records and checkpoint/resume"""
+
+    def test_iter_input_formats(self, tmp_path):
+        """JSONL objects, plain lines and CSV rows are read lazily with row indexes"""
+        (tmp_path / "mixed.jsonl").write_text('{"id": 7, "query": "a"}\n\nplain b\n', encoding="utf-8")
+        (tmp_path / "rows.csv").write_text("ref,text\nx1,first\nx2,second\n", encoding="utf-8")
+
+        assert list(iter_input(tmp_path / "mixed.jsonl")) == [(0, "7", "a"), (1, None, "plain b")]
+        assert list(iter_input(tmp_path / "rows.csv", query_field="text", id_field="ref")) == [
+            (0, "x1", "first"), (1, "x2", "second")
+        ]
+
+    def test_resume_does_not_repeat_finished_queries(self, tmp_path):
+        """An interrupted run resumes where the checkpoint left off, without duplicate output"""
+        queries = [{"id": f"q{i}", "query": f"Tesco groceries {i}"} for i in range(30)]
+        with open(tmp_path / "queries.jsonl", "w", encoding="utf-8") as f:
+            for query in queries:
+                f.write(json.dumps(query) + "\n")
+
+        runner, llm_client = make_runner(tmp_path)
+        first = asyncio.run(runner.run(limit=12))
+        assert first.processed == 12
+
+        # Simulate a crash after the checkpoint: a partial record past the checkpointed size
+        with open(tmp_path / "results.jsonl", "a", encoding="utf-8") as f:
+            f.write('{"index": 99, "partial')
+
+        runner, llm_client = make_runner(tmp_path)
+        second = asyncio.run(runner.run())
+
+        records = read_output(tmp_path)
+        assert second.skipped == 12
+        assert second.processed == 18
+        assert llm_client.call_count == 18 * 5
+        assert sorted(record["index"] for record in records) == list(range(30))
+        assert records[0]["outcome"] == "success"
+        assert second.outcomes == {"success": 30}
+
+    def test_errors_are_recorded(self, tmp_path):
+        """Queries that keep failing are written with their error type instead of stopping the batch"""
+        (tmp_path / "queries.jsonl").write_text("one\ntwo\n", encoding="utf-8")
+        runner, _ = make_runner(tmp_path, max_retries=1, retry_delay_s=0.0)
+        runner.workflow.llm_client.error_probability = 1.0
+
+        summary = asyncio.run(runner.run())
+
+        records = read_output(tmp_path)
+        assert summary.outcomes == {"error": 2}
+        assert {record["error"] for record in records} == {"FakeLLMError"}
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Unit tests for declarative eval case files and their streaming loader
+"""
+
+import asyncio
+import importlib
+import json
+
+import pytest
+
+from evals.case_files import convert_modules, deserialize_validator, iter_case_file, serialize_validator
+from evals.decorators import get_eval_case, get_registry
+from evals.evaluator import Evaluator
+from evals.field_validators import Exact, ListMatches, OneOf, Substring
+from src.models.base_models import QueryInput
+from src.models.entity_extraction_models import ProcessableEntityExtractionOutput
+
+MODULE = "evals.cases.processable_entity_extraction"
+
+
+def module_cases():
+    """EvalCases of MODULE, built from the decorated functions"""
+    importlib.import_module(MODULE)
+    return [
+        get_eval_case(func, QueryInput, ProcessableEntityExtractionOutput)
+        for func in get_registry()["ProcessableEntityExtractionAgent"].values()
+        if func.eval_metadata["function"].__module__ == MODULE
+    ]
+
+
+class TestValidatorSerialisation:
+    """Test the serialised form of field validators"""
+
+    def test_round_trip(self):
+        """Validators come back equal, with plain ListMatches spec values written as Exact"""
+        list_matches = ListMatches(items=[{"type": "merchant", "value": Substring(value="Tesco")}], allow_extras=False)
+        data = serialize_validator(list_matches)
+
+        assert data == {
+            "validator": "ListMatches",
+            "items": [{
+                "type": {"validator": "Exact", "value": "merchant"},
+                "value": {"validator": "Substring", "value": "Tesco"}
+            }],
+            "allow_extras": False
+        }
+        assert deserialize_validator(json.loads(json.dumps(data))) == ListMatches(
+            items=[{"type": Exact(value="merchant"), "value": Substring(value="Tesco")}], allow_extras=False
+        )
+        one_of = OneOf(values=["a", 1], case_sensitive=True)
+        assert deserialize_validator(serialize_validator(one_of)) == one_of
+
+    def test_unknown_type_rejected(self):
+        with pytest.raises(ValueError, match="Unknown validator type"):
+            deserialize_validator({"validator": "Regex", "pattern": ".*"})
+
+
+class TestCaseFiles:
+    """Test converting case modules and streaming the cases back"""
+
+    def test_converted_cases_validate_identically(self, tmp_path):
+        """Cases read from a converted file give the same validation results as the module's cases"""
+        path = tmp_path / "cases.jsonl"
+        originals = module_cases()
+
+        assert convert_modules([MODULE], path) == len(originals)
+
+        loaded = list(iter_case_file(path, QueryInput, ProcessableEntityExtractionOutput))
+        evaluator = Evaluator()
+        assert [case.name for case in loaded] == [case.name for case in originals]
+        for original, case in zip(originals, loaded):
+            assert case.input_data == original.input_data
+            assert case.expected_output == original.expected_output
+            # Validate each case against its own expected output and against its neighbour's
+            for actual in (original.expected_output, originals[0].expected_output):
+                assert asyncio.run(evaluator.validate(actual, case.expected_output, case.field_validations)) == \
+                    asyncio.run(evaluator.validate(actual, original.expected_output, original.field_validations))
+
+    def test_records_are_read_lazily(self, tmp_path):
+        """A record is only read once the iterator reaches it"""
+        path = tmp_path / "cases.jsonl"
+        convert_modules([MODULE], path)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write("not json\n")
+
+        cases = iter_case_file(path, QueryInput, ProcessableEntityExtractionOutput)
+
+        assert next(cases).name == module_cases()[0].name
+        with pytest.raises(ValueError, match=r"cases.jsonl:\d+: invalid case record"):
+            list(cases)
+
+    def test_filters_match_registry(self, tmp_path):
+        """Name, tag and agent filters select the same cases as the decorator metadata"""
+        path = tmp_path / "cases.jsonl"
+        convert_modules([MODULE], path)
+        functions = {
+            name: func for name, func in get_registry()["ProcessableEntityExtractionAgent"].items()
+            if func.eval_metadata["function"].__module__ == MODULE
+        }
+
+        def load(**filters):
+            return [case.name for case in iter_case_file(path, QueryInput, ProcessableEntityExtractionOutput, **filters)]
+
+        assert load(tags=["temporal", "basic"], tags_match_all=True) == [
+            name for name, func in functions.items() if {"temporal", "basic"} <= set(func.eval_metadata["tags"])
+        ]
+        assert load(tags=["merchant", "amount"]) == [
+            name for name, func in functions.items() if {"merchant", "amount"} & set(func.eval_metadata["tags"])
+        ]
+        first = next(iter(functions))
+        assert load(names=[first]) == [first]
+        assert load(agent="UserIntentValidationAgent") == []
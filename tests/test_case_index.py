@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the eval case index and lazy EvalRegistry
+"""
+
+import importlib
+import os
+import pkgutil
+import shutil
+from pathlib import Path
+
+import evals.cases
+from evals.case_index import CaseIndex, index_source
+from evals.decorators import get_registry
+from evals.registry import EvalRegistry
+from src.models.base_models import QueryInput
+from src.models.entity_extraction_models import ProcessableEntityExtractionOutput
+from src.workflow_nodes.query_preprocessing.processable_entity_extraction_agent import ProcessableEntityExtractionAgent
+
+CASES_DIR = Path(evals.cases.__file__).parent
+
+
+class TestCaseIndex:
+    """Test indexing case modules from source"""
+
+    def test_index_matches_decorators(self, tmp_path):
+        """The index records the same cases, tags and priorities the decorators register"""
+        index = CaseIndex(cache_path=tmp_path / "case_index.json")
+        for module in pkgutil.iter_modules(evals.cases.__path__):
+            importlib.import_module(f"evals.cases.{module.name}")
+
+        registered = {
+            (agent, name): func.eval_metadata
+            for agent, functions in get_registry().items()
+            for name, func in functions.items()
+            if func.eval_metadata["function"].__module__.startswith("evals.cases.")
+        }
+        indexed = {(case.agent, case.name): case for case in index.cases}
+
+        assert index.incomplete_modules == []
+        assert set(indexed) == set(registered)
+        for key, case in indexed.items():
+            assert list(case.tags) == registered[key]["tags"]
+            assert case.priority == registered[key]["priority"]
+            assert case.module == registered[key]["function"].__module__
+
+    def test_cache_reparses_changed_modules_only(self, tmp_path):
+        """A module is parsed again only when its mtime or size changes"""
+        cases_dir = tmp_path / "cases"
+        cases_dir.mkdir()
+        for name in ("user_intent.py", "query_security.py"):
+            shutil.copy(CASES_DIR / name, cases_dir / name)
+        cache_path = tmp_path / "case_index.json"
+
+        assert len(CaseIndex(cases_dir, cache_path).parsed_modules) == 2
+        assert CaseIndex(cases_dir, cache_path).parsed_modules == []
+
+        stat = (cases_dir / "user_intent.py").stat()
+        os.utime(cases_dir / "user_intent.py", ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        assert CaseIndex(cases_dir, cache_path).parsed_modules == ["evals.cases.user_intent"]
+
+    def test_non_literal_decorator_marks_module_incomplete(self):
+        """Cases whose decorator can't be read statically are not guessed at"""
+        cases, complete = index_source(
+            'NAME = "x"\n\n@eval_case(name=NAME, tags=["a"])\ndef eval_x():\n    pass\n',
+            "evals.cases.example"
+        )
+
+        assert cases == [] and not complete
+
+
+class TestLazyRegistry:
+    """Test selecting cases through the index"""
+
+    def test_only_selected_cases_are_built(self, tmp_path):
+        """Names and tags come from the index; EvalCase objects are built for the selection only"""
+        registry = EvalRegistry(ProcessableEntityExtractionAgent, QueryInput, ProcessableEntityExtractionOutput)
+        registry.load_index(
+            CaseIndex(cache_path=tmp_path / "case_index.json"),
+            modules=["evals.cases.processable_entity_extraction_predicted"]
+        )
+
+        assert registry.summary()["total_cases"] == 260
+        assert registry._cases == {}
+
+        cases = registry.get_cases(names=["predicted_intent_002"])
+
+        assert [case.name for case in cases] == ["predicted_intent_002"]
+        assert list(registry._cases) == ["predicted_intent_002"]
+
+    def test_tag_filters(self, tmp_path):
+        """ANY and ALL tag selection agree with a scan of the case metadata"""
+        registry = EvalRegistry(ProcessableEntityExtractionAgent, QueryInput, ProcessableEntityExtractionOutput)
+        registry.load_index(
+            CaseIndex(cache_path=tmp_path / "case_index.json"),
+            modules=["evals.cases.processable_entity_extraction"]
+        )
+        functions = get_registry()["ProcessableEntityExtractionAgent"]
+
+        def scan(match):
+            return [
+                name for name, func in functions.items()
+                if func.eval_metadata["function"].__module__ == "evals.cases.processable_entity_extraction"
+                and match(func.eval_metadata["tags"])
+            ]
+
+        any_tags = [case.name for case in registry.get_cases(tags=["merchant", "amount"])]
+        all_tags = [case.name for case in registry.get_cases(tags=["temporal", "basic"], tags_match_all=True)]
+
+        assert any_tags == scan(lambda tags: "merchant" in tags or "amount" in tags)
+        assert all_tags == scan(lambda tags: "temporal" in tags and "basic" in tags)
+        assert [case.name for case in registry.get_cases_by_tag("amount")] == scan(lambda tags: "amount" in tags)
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the combined single-call first-stage agent
+"""
+
+import asyncio
+
+import pytest
+
+from src.clients.llm_clients.fake_llm_client import COMBINED_FIRST_STAGE_RESPONSE, FakeLLMClient, LatencyProfile
+from src.prompts import combined_first_stage_prompt
+from src.workflow_nodes.query_preprocessing.combined_first_stage_agent import CombinedFirstStageAgent
+from src.workflows.exceptions import InsecureQueryError, UnprocessableEntityError
+from src.workflows.query_preprocessing_workflow import QueryPreprocessingWorkflow
+
+
+def make_client() -> FakeLLMClient:
+    return FakeLLMClient(latency_profile=LatencyProfile.zero())
+
+
+class TestCombinedFirstStageAgent:
+    """Test that each section is parsed by its single-purpose agent's parser"""
+
+    def test_parses_every_section(self):
+        """The combined response yields the same outputs as the four canned single responses"""
+        agent = CombinedFirstStageAgent(make_client())
+
+        output = agent.parse_response(COMBINED_FIRST_STAGE_RESPONSE)
+
+        assert output.security.valid is True
+        assert output.security.justification == "Clean natural language query"
+        assert output.intent.valid is True
+        assert [(e.type, e.value) for e in output.processable.entities] == [
+            ("merchant", "Tesco"), ("category", "groceries"), ("temporal", "last month")
+        ]
+        assert output.unprocessable.entities == []
+
+    def test_sections_do_not_leak_into_each_other(self):
+        """Entities and verdicts are read only from their own section"""
+        agent = CombinedFirstStageAgent(make_client())
+        response = (
+            "<response>"
+            "<security_validation><valid>false</valid><justification>SQL injection</justification></security_validation>"
+            "<intent_validation><valid>true</valid><justification>Banking query</justification></intent_validation>"
+            "<processable_entities><entities></entities></processable_entities>"
+            "<unprocessable_entities><entities><entity><type>geographic</type><value>Paris</value>"
+            "<critical>true</critical></entity></entities></unprocessable_entities>"
+            "</response>"
+        )
+
+        output = agent.parse_response(response)
+
+        assert output.security.valid is False
+        assert output.intent.valid is True
+        assert output.processable.entities == []
+        assert [(e.type, e.value, e.critical) for e in output.unprocessable.entities] == [
+            ("geographic", "Paris", True)
+        ]
+
+    def test_missing_sections_fail_validation(self):
+        """A truncated response is treated as insecure and invalid rather than passing silently"""
+        output = CombinedFirstStageAgent(make_client()).parse_response("<response></response>")
+
+        assert output.security.valid is False
+        assert output.intent.valid is False
+
+
+class TestCombinedWorkflow:
+    """Test the workflow's combined_first_stage option"""
+
+    def test_single_first_stage_call(self):
+        """The first stage makes one LLM call; category normalisation still runs"""
+        client = make_client()
+        workflow = QueryPreprocessingWorkflow(llm_client=client, combined_first_stage=True)
+
+        result = asyncio.run(workflow.process("Tesco groceries last month"))
+
+        assert client.call_count == 2
+        assert list(result.metrics) == ["combined_first_stage", "category_normalisation"]
+        assert result.is_secure and result.is_valid
+        assert [c.canon for c in result.normalised_categories] == ["expenses:groceries.supermarkets"]
+
+    def test_rejections_follow_the_same_order(self):
+        """Security is still checked before unprocessable entities"""
+        client = make_client()
+        instructions = combined_first_stage_prompt.get_instructions()
+        workflow = QueryPreprocessingWorkflow(llm_client=client, combined_first_stage=True)
+
+        client.responses[instructions] = COMBINED_FIRST_STAGE_RESPONSE.replace(
+            "<unprocessable_entities>\n<entities></entities>",
+            "<unprocessable_entities>\n<entities><entity><type>geographic</type><value>Paris</value>"
+            "<critical>true</critical></entity></entities>"
+        )
+        with pytest.raises(UnprocessableEntityError):
+            asyncio.run(workflow.process("Tesco in Paris"))
+
+        client.responses[instructions] = client.responses[instructions].replace("<valid>true</valid>", "<valid>false</valid>", 1)
+        with pytest.raises(InsecureQueryError):
+            asyncio.run(workflow.process("Tesco in Paris'; DROP TABLE users"))
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Unit tests for compiled field validators
+"""
+
+import asyncio
+
+from benchmarks.validation import load_validation_cases
+from evals.compiled_validators import check_field, compile_field, compile_value_check
+from evals.evaluator import Evaluator
+from evals.field_validators import AllOf, Contains, Criteria, Exact, ListMatches, OneOf, Substring
+from src.models.entity_extraction_models import ProcessableEntityExtractionOutput
+
+
+class TestCompiledChecks:
+    """Test the checks built for each validator type"""
+
+    def test_value_checks(self):
+        """Case folding is applied once at compile time and keeps the comparison rules"""
+        one_of = compile_value_check(OneOf(values=["Tesco", "ASDA", 3]))
+        assert one_of("asda") and one_of(3)
+        assert not one_of("Lidl") and not one_of(["asda"])
+        assert compile_value_check(OneOf(values=["Tesco"], case_sensitive=True))("tesco") is False
+
+        exact = compile_value_check(Exact(value="Tesco"))
+        assert exact("TESCO") and not exact("Tesco Extra")
+        assert compile_value_check("merchant")("merchant")
+        assert compile_value_check(Substring(value="TRANS"))("public transport")
+
+    def test_field_messages(self):
+        """Failure messages are the ones the evaluator has always reported"""
+        assert compile_field("sentiment", Exact(value="positive")).check("negative") == [
+            "Field 'sentiment': expected positive, got negative"
+        ]
+        assert compile_field("tags", AllOf(values=["a", "b"])).check(["b", "a"]) == ()
+        assert compile_field("tags", Contains(values=["a"])).check("a") == [
+            "Field 'tags': expected list for Contains validation, got <class 'str'>"
+        ]
+
+        criteria = compile_field("summary.text", Criteria(criteria=["Is short"]))
+        assert criteria.check is None and criteria.path == ("summary", "text")
+
+
+class TestEvaluatorCompilation:
+    """Test compiled rules through the evaluator"""
+
+    def test_rules_compiled_on_second_use(self):
+        """A field_validations dict is checked as given once, then compiled once and reused"""
+        evaluator = Evaluator()
+        field_validations = {
+            "entities": ListMatches(items=[{"type": Exact(value="merchant"), "value": Exact(value="Tesco")}])
+        }
+        output = ProcessableEntityExtractionOutput(entities=[{"type": "merchant", "value": "tesco"}])
+
+        compiled = []
+        for _ in range(3):
+            assert asyncio.run(evaluator.validate(output, field_validations=field_validations)) == (True, None)
+            compiled.append(evaluator._compiled[id(field_validations)][1])
+
+        assert len(evaluator._compiled) == 1
+        assert compiled[0] is None and compiled[1] is not None and compiled[2] is compiled[1]
+
+    def test_first_use_matches_compiled_rules(self):
+        """Every registered case validates the same before and after compiling, on its own and a neighbour's output"""
+        cases = load_validation_cases()
+        for (expected, field_validations), (neighbour, _) in zip(cases, cases[1:] + cases[:1]):
+            for actual in (expected, neighbour):
+                evaluator = Evaluator()
+                first = asyncio.run(evaluator.validate(actual, field_validations=field_validations))
+                assert asyncio.run(evaluator.validate(actual, field_validations=field_validations)) == first
+
+                output = actual.model_dump()
+                for name, validator in field_validations.items():
+                    if name in output and not isinstance(validator, Criteria):
+                        assert list(check_field(name, validator, output[name])) == \
+                            list(compile_field(name, validator).check(output[name]))
+
+    def test_compiled_rules_are_bounded(self):
+        """Only the most recently used cases' rules are kept, so finished cases can be freed"""
+        evaluator = Evaluator(compiled_cache_size=2)
+        output = ProcessableEntityExtractionOutput(entities=[])
+        cases = [{"entities": Contains(values=[])} for _ in range(3)]
+
+        for field_validations in (cases[0], cases[1], cases[0], cases[2]):
+            asyncio.run(evaluator.validate(output, field_validations=field_validations))
+
+        kept = [field_validations for field_validations, _ in evaluator._compiled.values()]
+        assert len(kept) == 2 and kept[0] is cases[0] and kept[1] is cases[2]
+
+    def test_missing_fields_and_failure_order(self):
+        """Missing fields and failures are reported in field order"""
+        output = ProcessableEntityExtractionOutput(entities=[])
+
+        passed, reason = asyncio.run(Evaluator().validate(output, field_validations={
+            "missing": Exact(value=1),
+            "entities": ListMatches(items=[{"type": "merchant"}]),
+            "entities.type": Exact(value="merchant"),
+        }))
+
+        assert not passed
+        assert reason == (
+            "Field 'missing' not found in output; "
+            "Field 'entities': no item matching spec [type=merchant]; "
+            "Field 'entities.type' not found in output"
+        )
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Unit tests for EvalRunner: sliding-window scheduling, rate limiting, the response cache and re-runs
+"""
+
+import asyncio
+import json
+import time
+from typing import Optional
+
+import pytest
+
+from evals.core import EvalCase
+from evals.runner import EvalRunner
+from src.clients.llm_clients.fake_llm_client import FakeLLMClient, LatencyProfile
+from src.clients.llm_clients.rate_limiter import TokenBucket
+from src.models.base_models import QueryInput
+from src.models.entity_extraction_models import ProcessableEntityExtractionOutput
+from src.workflow_nodes.query_preprocessing.processable_entity_extraction_agent import ProcessableEntityExtractionAgent
+
+
+class TimedFakeLLMClient(FakeLLMClient):
+    """Fake client whose latency depends on the query and which records peak concurrency"""
+
+    def __init__(self, slow_ms: float = 0.0, fast_ms: float = 0.0):
+        super().__init__(latency_profile=LatencyProfile.zero())
+        self.slow_ms = slow_ms
+        self.fast_ms = fast_ms
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.fail_on: Optional[str] = None
+
+    async def generate(self, system_prompt, user_prompt, temperature=0.1, max_tokens=1000):
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            if self.fail_on and self.fail_on in user_prompt:
+                raise RuntimeError("Error code: 500 - api_error")
+            await asyncio.sleep((self.slow_ms if "slow" in user_prompt else self.fast_ms) / 1000)
+            return await super().generate(system_prompt, user_prompt, temperature, max_tokens)
+        finally:
+            self.in_flight -= 1
+
+
+def make_cases(queries):
+    return [
+        EvalCase(
+            name=f"case_{i}",
+            input_data=QueryInput(query=query),
+            expected_output=ProcessableEntityExtractionOutput()
+        )
+        for i, query in enumerate(queries)
+    ]
+
+
+def make_runner(client, **kwargs) -> EvalRunner:
+    kwargs.setdefault("save_results", False)
+    kwargs.setdefault("use_cache", False)
+    return EvalRunner(
+        agent_class=ProcessableEntityExtractionAgent,
+        llm_client=client,
+        use_judge_for_criteria=False,
+        **kwargs
+    )
+
+
+class TestRunBatchScheduling:
+    """Test the sliding-window scheduler in run_batch"""
+
+    def test_in_flight_bounded_and_order_preserved(self):
+        """No more than batch_size cases run at once and results follow the input order"""
+        client = TimedFakeLLMClient(fast_ms=5)
+        cases = make_cases([f"Tesco week {i}" for i in range(12)])
+
+        results = asyncio.run(make_runner(client).run_batch(cases, parallel=True, batch_size=3))
+
+        assert client.peak_in_flight == 3
+        assert [result.case_name for result in results] == [case.name for case in cases]
+
+    def test_streamed_cases_are_pulled_as_slots_free(self):
+        """An iterator of cases is only advanced when a slot is free"""
+        client = TimedFakeLLMClient(fast_ms=5)
+        cases = make_cases([f"Tesco week {i}" for i in range(10)])
+        runner = make_runner(client)
+
+        finished = 0
+        run_single = runner.run_single
+
+        async def counting_run_single(case):
+            nonlocal finished
+            try:
+                return await run_single(case)
+            finally:
+                finished += 1
+
+        runner.run_single = counting_run_single
+        in_flight_when_pulled = []
+
+        def stream():
+            for i, case in enumerate(cases):
+                in_flight_when_pulled.append(i - finished)
+                yield case
+
+        results = asyncio.run(runner.run_batch(stream(), parallel=True, batch_size=3))
+
+        assert [result.case_name for result in results] == [case.name for case in cases]
+        assert max(in_flight_when_pulled) == 2
+
+    def test_slow_case_does_not_hold_back_others(self):
+        """A free slot picks up the next case immediately instead of waiting for the slowest case of a batch"""
+        client = TimedFakeLLMClient(slow_ms=200, fast_ms=5)
+        # Fixed batches of two would take 4 x 200ms
+        cases = make_cases(["slow", "fast"] * 4)
+
+        start = time.perf_counter()
+        asyncio.run(make_runner(client).run_batch(cases, parallel=True, batch_size=2))
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 0.65
+
+    def test_rate_limiter_paces_calls_and_throughput_is_reported(self, tmp_path):
+        """Calls are paced by the token bucket and the summary records achieved throughput"""
+        client = TimedFakeLLMClient()
+        runner = make_runner(
+            client,
+            rate_limiter=TokenBucket(20, capacity=1),
+            save_results=True,
+            results_dir=tmp_path
+        )
+        cases = make_cases([f"Tesco week {i}" for i in range(6)])
+
+        start = time.perf_counter()
+        asyncio.run(runner.run_batch(cases, parallel=True, batch_size=6))
+        elapsed = time.perf_counter() - start
+
+        # One token up front, then 5 more at 20 per second
+        assert elapsed >= 0.24
+        with open(runner.result_writer.get_summary_path(), encoding="utf-8") as f:
+            configuration = json.load(f)["configuration"]
+        assert configuration["rate_limit_per_s"] == 20
+        assert configuration["throughput_cases_per_s"] > 0
+        assert configuration["wall_time_s"] >= 0.24
+
+
+class TestResponseCache:
+    """Test reuse of stored agent responses across runs"""
+
+    def test_second_run_reuses_responses(self, tmp_path):
+        """Unchanged requests are served from the cache at zero cost and give the same results"""
+        cases = make_cases([f"Tesco week {i}" for i in range(4)])
+        client = TimedFakeLLMClient()
+
+        first = asyncio.run(make_runner(client, use_cache=True, cache_dir=tmp_path).run_batch(cases))
+        runner = make_runner(client, use_cache=True, cache_dir=tmp_path)
+        second = asyncio.run(runner.run_batch(cases))
+
+        assert client.call_count == 4
+        assert (runner.response_cache.hits, runner.response_cache.misses) == (4, 0)
+        assert [result.actual_output for result in second] == [result.actual_output for result in first]
+        assert all(result.llm_cost == 0 for result in second)
+        assert [result.input_tokens for result in second] == [result.input_tokens for result in first]
+
+    def test_prompt_change_misses(self, tmp_path):
+        """A different system prompt is a different request"""
+        cases = make_cases(["Tesco last month"])
+        client = TimedFakeLLMClient()
+        asyncio.run(make_runner(client, use_cache=True, cache_dir=tmp_path).run_batch(cases))
+
+        runner = make_runner(client, use_cache=True, cache_dir=tmp_path)
+        runner.agent.system_prompt = runner.agent.system_prompt + "\nBe brief."
+        asyncio.run(runner.run_batch(cases))
+
+        assert client.call_count == 2
+        assert runner.response_cache.misses == 1
+
+    def test_truncated_entry_is_skipped(self, tmp_path):
+        """A partly written last line is skipped and counted; the next entry still lands on its own line"""
+        cases = make_cases(["Tesco week 1", "Tesco week 2"])
+        client = TimedFakeLLMClient()
+        asyncio.run(make_runner(client, use_cache=True, cache_dir=tmp_path).run_batch(cases[:1]))
+        path = tmp_path / "ProcessableEntityExtractionAgent.jsonl"
+        with open(path, "a", encoding="utf-8") as f:
+            f.write('{"key":"abc","text":"trunc')
+
+        runner = make_runner(client, use_cache=True, cache_dir=tmp_path)
+        asyncio.run(runner.run_batch(cases))
+
+        assert (len(runner.response_cache), runner.response_cache.skipped) == (2, 1)
+        assert runner.response_cache.hits == 1
+        reloaded = make_runner(client, use_cache=True, cache_dir=tmp_path).response_cache
+        assert (len(reloaded), reloaded.skipped) == (2, 1)
+
+
+class TestRunFailed:
+    """Test re-running only the failed cases of an earlier run"""
+
+    def test_reruns_failures_and_merges_summary(self, tmp_path):
+        """Only failed cases are run again; the new run's results and summary cover every case"""
+        cases = make_cases(["ok 1", "flaky 2", "ok 3", "flaky 4"])
+        client = TimedFakeLLMClient()
+        client.responses = {}
+        client.fail_on = "flaky"
+        first = asyncio.run(make_runner(client, save_results=True, results_dir=tmp_path).run_batch(cases))
+        assert [result.passed for result in first] == [True, False, True, False]
+
+        client.fail_on = None
+        calls_before = client.call_count
+        runner = make_runner(client, save_results=True, results_dir=tmp_path)
+        results = asyncio.run(runner.run_failed(cases))
+
+        assert client.call_count - calls_before == 2
+        assert [result.case_name for result in results] == [case.name for case in cases]
+        assert all(result.passed for result in results)
+        assert len(runner.result_writer.read_results(runner.result_writer.results_file)) == 4
+        with open(runner.result_writer.get_summary_path(), encoding="utf-8") as f:
+            summary = json.load(f)
+        assert (summary["total_cases"], summary["passed"]) == (4, 4)
+        assert summary["configuration"]["cases_rerun"] == 2
+
+    def test_no_earlier_run(self, tmp_path):
+        """There must be an earlier run to start from"""
+        runner = make_runner(TimedFakeLLMClient(), save_results=True, results_dir=tmp_path)
+
+        with pytest.raises(FileNotFoundError):
+            asyncio.run(runner.run_failed(make_cases(["ok"])))
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Unit tests for few-shot example selection and prompt cache pricing
+"""
+
+import asyncio
+
+from src.clients.llm_clients.fake_llm_client import FakeLLMClient, LatencyProfile
+from src.clients.llm_clients.pricing import ModelPricing
+from src.core_nodes.example_store import Example, ExampleStore
+from src.models.base_models import QueryInput
+from src.parsers.prompt_section_parser import parse_sections, remove_sections
+from src.prompts import processable_entity_extraction_prompt
+from src.workflow_nodes.query_preprocessing.processable_entity_extraction_agent import ProcessableEntityExtractionAgent
+from src.workflows.query_preprocessing_workflow import QueryPreprocessingWorkflow
+
+
+def make_store() -> ExampleStore:
+    return ExampleStore([
+        Example(name="tesco", query="How much did I spend at Tesco?", response="<response>tesco</response>"),
+        Example(name="tesco_month", query="Tesco spending last month", response="<response>month</response>"),
+        Example(name="rent", query="What did I pay in rent this year?", response="<response>rent</response>"),
+        Example(name="coffee", query="Coffee shops in March", response="<response>coffee</response>"),
+    ])
+
+
+class TestExampleStore:
+    """Test BM25 example selection"""
+
+    def test_selects_most_similar_examples(self):
+        """Examples sharing the query's rarer terms rank first; unrelated ones are not returned"""
+        selected = make_store().select("Tesco last month", k=3)
+
+        assert [example.name for example in selected] == ["tesco_month", "tesco"]
+
+    def test_skips_the_query_itself(self):
+        """An example with the same query (e.g. the eval case being run) is never selected"""
+        selected = make_store().select("how much did I spend at  TESCO?", k=4)
+
+        assert "tesco" not in [example.name for example in selected]
+        assert "tesco_month" in [example.name for example in selected]
+
+    def test_render_matches_prompt_examples(self):
+        """Rendered examples are an <examples> block with one <example> per selection"""
+        rendered = ExampleStore.render(make_store().select("rent and coffee", k=2))
+
+        sections = parse_sections(rendered)
+        assert [section.name for section in sections] == ["examples"]
+        assert [example.name for example in sections[0].children()] == ["example", "example"]
+        assert "<query>What did I pay in rent this year?</query>" in rendered
+        assert ExampleStore.render([]) == ""
+
+    def test_built_stores_load(self):
+        """The exported stores exist for the extraction agents and have no duplicate queries"""
+        store = ExampleStore.for_agent("ProcessableEntityExtractionAgent")
+
+        assert store is not None
+        queries = [example.query for example in store.examples]
+        assert len(queries) == len(set(queries)) > 0
+        assert ExampleStore.for_agent("NoSuchAgent") is None
+
+
+class TestAgentExampleStore:
+    """Test an agent sending selected examples instead of its static ones"""
+
+    def test_system_prompt_is_static_and_examples_follow_the_query(self):
+        """The <examples> section leaves the system prompt and selected examples precede the task"""
+        client = FakeLLMClient(latency_profile=LatencyProfile.zero())
+        captured = {}
+        generate = client.generate
+
+        async def capture(system_prompt, user_prompt, **kwargs):
+            captured["system_prompt"], captured["user_prompt"] = system_prompt, user_prompt
+            return await generate(system_prompt, user_prompt, **kwargs)
+
+        client.generate = capture
+        agent = ProcessableEntityExtractionAgent(client)
+        agent.use_example_store(make_store(), k=2)
+
+        output = asyncio.run(agent.process(QueryInput(query="Tesco spending in May")))
+
+        assert "<examples>" not in captured["system_prompt"]
+        assert captured["system_prompt"] == remove_sections(
+            processable_entity_extraction_prompt.get_instructions(), "examples"
+        )
+        assert captured["user_prompt"].startswith("<examples>\n<example>\n<query>Tesco spending last month</query>")
+        assert "Tesco spending in May" in captured["user_prompt"]
+        # The fake client still recognises the stripped prompt
+        assert output.entities
+
+    def test_workflow_few_shot(self):
+        """few_shot_k switches the first-stage agents to their stores"""
+        workflow = QueryPreprocessingWorkflow(FakeLLMClient(latency_profile=LatencyProfile.zero()), few_shot_k=3)
+
+        assert workflow.processable_agent.example_k == 3
+        assert workflow.category_agent.example_store is None
+        result = asyncio.run(workflow.process("How much did I spend at Tesco last month?"))
+        assert result.processable_entities
+
+
+class TestCachePricing:
+    """Test prompt cache token pricing"""
+
+    def test_cache_reads_and_writes_are_priced(self):
+        """Cache reads cost 10% and cache writes 125% of the input price"""
+        pricing = ModelPricing(input_cost_per_million=1.0, output_cost_per_million=5.0)
+
+        costs = pricing.calculate_cost(
+            1_000_000, 0, cache_read_tokens=1_000_000, cache_creation_tokens=1_000_000
+        )
+
+        assert costs["input_cost"] == 1.0 + 0.1 + 1.25
+        assert pricing.calculate_cost(1_000_000, 0)["input_cost"] == 1.0
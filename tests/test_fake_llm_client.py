@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Unit tests for FakeLLMClient
+
+Runs the full QueryPreprocessingWorkflow offline against canned responses.
+"""
+
+import asyncio
+import random
+
+import pytest
+
+from benchmarks.load_generator import percentile
+from src.clients.llm_clients.fake_llm_client import (
+    FakeLLMClient,
+    FakeRateLimitError,
+    FakeLLMError,
+    LatencyProfile
+)
+from src.workflows.query_preprocessing_workflow import QueryPreprocessingWorkflow
+
+
+class TestFakeLLMClient:
+    """Test canned responses, latency sampling and failure injection"""
+
+    def test_workflow_runs_end_to_end(self):
+        """Canned responses satisfy every agent's schema"""
+        llm_client = FakeLLMClient(latency_profile=LatencyProfile.zero())
+        workflow = QueryPreprocessingWorkflow(llm_client=llm_client)
+
+        result = asyncio.run(workflow.process("Show me Tesco groceries last month"))
+
+        assert result.is_secure is True
+        assert result.is_valid is True
+        assert {e.type for e in result.processable_entities} == {"merchant", "category", "temporal"}
+        assert result.normalised_categories[0].canon == "expenses:groceries.supermarkets"
+        assert llm_client.call_count == 5
+        assert result.get_total_cost() > 0
+
+    def test_latency_profile_sampling(self):
+        """Lognormal samples centre on the median and tails are amplified"""
+        rng = random.Random(0)
+        profile = LatencyProfile(median_ms=100.0, sigma=0.2)
+        samples = sorted(profile.sample_ms(rng) for _ in range(2000))
+        assert 90.0 < samples[1000] < 110.0
+
+        stalled = LatencyProfile(median_ms=100.0, sigma=0.0, tail_probability=1.0, tail_multiplier=10.0)
+        assert stalled.sample_ms(rng) == pytest.approx(1000.0)
+        assert LatencyProfile.zero().sample_ms(rng) == 0.0
+
+    def test_failure_injection(self):
+        """Injected rate limit errors look like Anthropic 429s"""
+        limited = FakeLLMClient(latency_profile=LatencyProfile.zero(), responses={}, rate_limit_probability=1.0)
+        with pytest.raises(FakeRateLimitError, match="429"):
+            asyncio.run(limited.generate("system", "user"))
+
+        failing = FakeLLMClient(latency_profile=LatencyProfile.zero(), responses={}, error_probability=1.0)
+        with pytest.raises(FakeLLMError):
+            asyncio.run(failing.generate("system", "user"))
+
+
+class TestLoadGeneratorPercentile:
+    """Test the nearest-rank percentile used in load reports"""
+
+    def test_exact_boundaries(self):
+        """A percentile landing exactly on a rank returns that rank, not the next one"""
+        ten = [float(i) for i in range(1, 11)]
+        hundred = [float(i) for i in range(1, 101)]
+
+        assert percentile(ten, 90) == 9.0
+        assert percentile(ten, 50) == 5.0
+        assert percentile(ten, 91) == 10.0
+        assert percentile(hundred, 95) == 95.0
+        assert percentile(hundred, 99) == 99.0
+        assert percentile(hundred, 7) == 7.0
+
+    def test_edges(self):
+        assert percentile([], 50) == 0.0
+        assert percentile([3.0], 99) == 3.0
+        assert percentile([1.0, 2.0], 0) == 1.0
+        assert percentile([1.0, 2.0], 100) == 2.0
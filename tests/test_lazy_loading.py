@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Unit tests for lazy loading of prompts, models and the Anthropic SDK
+"""
+
+import subprocess
+import sys
+
+import src.models
+from benchmarks.import_time import REPO_ROOT, eager_imports, profile_import
+from src.prompts.prompt_registry import get_prompt
+from src.workflow_nodes.query_preprocessing.processable_entity_extraction_agent import ProcessableEntityExtractionAgent
+
+
+class TestLazyImports:
+    """Test that entry points do not import what they may never use"""
+
+    def test_entry_points_import_no_lazy_modules(self):
+        """Importing the workflow or the Anthropic client loads neither the SDK nor any prompt module"""
+        for module in ("src.workflows.query_preprocessing_workflow", "src.clients.llm_clients.anthropic_llm_client"):
+            _, modules = profile_import(f"import {module}")
+
+            assert module in modules
+            assert eager_imports(modules) == [], module
+
+    def test_models_package_exports_resolve_on_access(self):
+        """Re-exported models are still importable from the package"""
+        from src.models import MissingRequirement, QueryInput
+
+        assert QueryInput.__module__ == "src.models.base_models"
+        assert MissingRequirement.__module__ == "src.models.query_characteristics_models"
+        assert "LLMMetrics" in dir(src.models)
+
+    def test_models_package_all_matches_lazy_exports(self):
+        """Every name in __all__ is resolvable lazily, and every lazy export is listed in __all__"""
+        assert sorted(src.models.__all__) == sorted(src.models._EXPORTS)
+        for name in src.models.__all__:
+            assert getattr(src.models, name).__module__ == src.models._EXPORTS[name]
+
+
+class StubLLMClient:
+    """Bare client: unlike FakeLLMClient, constructing it imports no prompt modules"""
+    model = "stub"
+
+    async def generate(self, system_prompt, user_prompt, temperature=0.1, max_tokens=1000):
+        raise AssertionError("not expected to be called")
+
+
+# Run in a fresh interpreter: other tests may already have imported the prompt module
+FIRST_USE_SCRIPT = """
+import sys
+from src.workflow_nodes.query_preprocessing.processable_entity_extraction_agent import ProcessableEntityExtractionAgent
+
+class StubLLMClient:
+    model = "stub"
+
+agent = ProcessableEntityExtractionAgent(StubLLMClient())
+module_path = agent.prompt.module_path
+before = module_path in sys.modules
+agent.system_prompt
+print(module_path, before, module_path in sys.modules)
+"""
+
+
+class TestLazySystemPrompt:
+    """Test that agents build their system prompt on first use"""
+
+    def test_prompt_module_imported_on_first_use(self):
+        """Constructing an agent does not import its prompt module; reading system_prompt does"""
+        completed = subprocess.run(
+            [sys.executable, "-c", FIRST_USE_SCRIPT], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        )
+
+        module_path, before, after = completed.stdout.split()
+        assert module_path.startswith("src.prompts.")
+        assert (before, after) == ("False", "True")
+
+    def test_system_prompt_loaded_on_first_use(self):
+        """Construction only resolves the registry entry; the instructions are read once, on access"""
+        agent = ProcessableEntityExtractionAgent(StubLLMClient())
+
+        assert agent._system_prompt is None
+        assert agent.system_prompt is get_prompt("processable_entity_extraction").instructions
+        assert agent.prompt_version == get_prompt("processable_entity_extraction").label
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Unit tests for ListMatches spec-to-item matching and entity list validation
+"""
+
+import asyncio
+import random
+import time
+
+from evals.evaluator import Evaluator
+from evals.field_validators import Exact, ListMatches, OneOf, Substring
+from evals import list_matching
+from evals.list_matching import match_list
+from evals.validators import EntityListValidator
+from src.models.entity_extraction_models import ProcessableEntityExtractionOutput
+
+
+def merchant(value):
+    return {"type": "merchant", "value": value}
+
+
+class TestMatchList:
+    """Test the bipartite matching of specs to items"""
+
+    def test_one_item_cannot_satisfy_two_specs(self):
+        """Two specs for the same entity need two items"""
+        spec = {"type": Exact(value="merchant"), "value": Exact(value="Tesco")}
+
+        result = match_list([merchant("Tesco")], [spec, spec])
+
+        assert result.matches == {0: 0}
+        assert result.unmatched_specs == [1]
+        assert result.contested_specs == [1]
+
+    def test_reassigns_items_greedy_matching_would_waste(self):
+        """A loose spec that took the only item of a strict spec is moved to another item"""
+        items = [merchant("Tesco"), merchant("Tesla")]
+        specs = [
+            {"value": Substring(value="tes")},
+            {"type": Exact(value="MERCHANT"), "value": Exact(value="tesco")},
+        ]
+
+        result = match_list(items, specs)
+
+        assert result.matches == {0: 1, 1: 0}
+        assert result.unmatched_specs == []
+        assert result.extras == []
+
+    def test_plain_values_oneof_and_extras(self):
+        """Plain values act as Exact; unmatched items are reported as extras"""
+        items = [merchant("ASDA"), {"type": "temporal", "value": "today"}, "not a dict"]
+        specs = [{"type": "merchant", "value": OneOf(values=["tesco", "asda"])}]
+
+        result = match_list(items, specs)
+
+        assert result.matches == {0: 0}
+        assert result.extras == [1, 2]
+
+    def test_large_list(self):
+        """Thousands of entities are matched without comparing every spec to every item"""
+        items = [merchant(f"Shop {i}") for i in range(3000)]
+        specs = [{"type": Exact(value="merchant"), "value": Exact(value=f"shop {i}")} for i in range(3000)]
+
+        start = time.perf_counter()
+        result = match_list(items, specs)
+        elapsed = time.perf_counter() - start
+
+        assert result.unmatched_specs == [] and result.extras == []
+        assert elapsed < 1.0
+
+    def test_scan_and_index_paths_agree(self, monkeypatch):
+        """Short lists matched by the direct scan give the same result as the indexed matching"""
+        rng = random.Random(0)
+        values = ["Tesco", "Tesla", "ASDA", "Aldi"]
+        spec_choices = [
+            {"type": "merchant", "value": Exact(value="tesco")},
+            {"value": Substring(value="tes")},
+            {"type": "merchant", "value": OneOf(values=["asda", "aldi"])},
+            {"type": Exact(value="temporal")},
+        ]
+        trials = []
+        for _ in range(200):
+            items = [
+                {"type": rng.choice(["merchant", "temporal"]), "value": rng.choice(values)}
+                for _ in range(rng.randint(0, 6))
+            ]
+            specs = [rng.choice(spec_choices) for _ in range(rng.randint(1, 4))]
+            trials.append((items, specs, match_list(items, specs)))
+
+        monkeypatch.setattr(list_matching, "SCAN_MAX_ITEMS", -1)
+        for items, specs, scanned in trials:
+            assert match_list(items, specs) == scanned
+
+
+class TestEvaluatorListMatches:
+    """Test ListMatches through the evaluator"""
+
+    def validate(self, entities, validator):
+        output = ProcessableEntityExtractionOutput(entities=entities)
+        return asyncio.run(Evaluator().validate(output, field_validations={"entities": validator}))
+
+    def test_extras_allowed_by_default(self):
+        """Extra items pass unless allow_extras is False"""
+        entities = [merchant("Tesco"), {"type": "temporal", "value": "today"}]
+        specs = [{"type": Exact(value="merchant"), "value": Exact(value="Tesco")}]
+
+        assert self.validate(entities, ListMatches(items=specs)) == (True, None)
+
+        passed, reason = self.validate(entities, ListMatches(items=specs, allow_extras=False))
+        assert not passed
+        assert "unexpected items" in reason and "today" in reason
+
+        assert self.validate([], ListMatches(items=[], allow_extras=False)) == (True, None)
+        assert not self.validate(entities, ListMatches(items=[], allow_extras=False))[0]
+
+    def test_duplicate_specs_are_not_double_counted(self):
+        """The failure names the spec whose matching items were all used"""
+        spec = {"type": Exact(value="merchant"), "value": Exact(value="Tesco")}
+
+        passed, reason = self.validate([merchant("Tesco")], ListMatches(items=[spec, spec]))
+
+        assert not passed
+        assert reason == (
+            "Field 'entities': no item matching spec [type=merchant, value=Tesco] "
+            "(matching items are matched by other specs)"
+        )
+
+
+class TestEntityListValidator:
+    """Test unordered entity list comparison"""
+
+    def test_repeated_entities_are_counted(self):
+        """An entity expected twice must be extracted twice"""
+        validator = EntityListValidator()
+
+        passed, reason = asyncio.run(validator.validate(
+            {"entities": [merchant("Tesco")]},
+            [merchant("Tesco"), merchant(" Tesco ")]
+        ))
+
+        assert not passed
+        assert reason == "Missing entities: merchant:Tesco"
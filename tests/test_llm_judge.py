@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the LLM judge and batched judge
+"""
+
+import asyncio
+import re
+
+from evals.evaluator import Evaluator
+from evals.field_validators import Criteria
+from evals.judge import BATCH_SYSTEM_PROMPT, SYSTEM_PROMPT, BatchedLLMJudge, LLMJudge
+from evals.verdict_cache import VerdictCache
+from src.models.llm_metrics import LLMMetrics, LLMResponse
+from src.models.scratchpad_models import SentimentAnalysisOutput
+
+
+class ScriptedJudgeClient:
+    """Judges outputs containing "good" as PASS (the criteria never say "good"); records every call"""
+
+    def __init__(self, drop_item: int = None, broken: bool = False):
+        self.drop_item = drop_item
+        self.broken = broken
+        self.calls = []
+
+    async def generate(self, system_prompt, user_prompt, temperature=0.1, max_tokens=500):
+        self.calls.append(system_prompt)
+        await asyncio.sleep(0.01)
+        if system_prompt == SYSTEM_PROMPT:
+            text = "EVALUATION: PASS" if "good" in user_prompt else "EVALUATION: FAIL\nRATIONALE: not good"
+        elif self.broken:
+            text = "I'm sorry, here are some thoughts"
+        else:
+            items = re.findall(r'<item id="(\d+)">(.*?)</item>', user_prompt, re.DOTALL)
+            text = "<verdicts>" + "".join(
+                f'<verdict id="{i}"><evaluation>{"PASS" if "good" in body else "FAIL"}</evaluation>'
+                f'<rationale>{"" if "good" in body else "not good"}</rationale></verdict>'
+                for i, body in items if int(i) != self.drop_item
+            ) + "</verdicts>"
+        metrics = LLMMetrics(
+            response_time_ms=10, input_tokens=1, output_tokens=1, total_tokens=2,
+            input_cost=0, output_cost=0, total_cost=0, model="scripted"
+        )
+        return LLMResponse(text=text, metrics=metrics)
+
+
+OUTPUTS = ["good one", "bad one", "good two", "bad two", "good three"]
+
+
+async def judge_all(judge: LLMJudge):
+    return await asyncio.gather(*(judge.evaluate(output, ["Output is acceptable"]) for output in OUTPUTS))
+
+
+class TestBatchedLLMJudge:
+    """Test micro-batching of judge calls"""
+
+    def test_concurrent_checks_share_one_call(self):
+        """Concurrent checks are judged in one call with the same verdicts as single calls"""
+        client = ScriptedJudgeClient()
+        judge = BatchedLLMJudge(client, max_batch_size=8)
+
+        batched = asyncio.run(judge_all(judge))
+        single = asyncio.run(judge_all(LLMJudge(ScriptedJudgeClient())))
+
+        assert client.calls == [BATCH_SYSTEM_PROMPT]
+        assert [result.passed for result in batched] == [result.passed for result in single]
+        assert batched[1].rationale == "not good"
+        assert (judge.llm_calls, judge.items_judged) == (1, 5)
+
+    def test_batches_are_capped(self):
+        """No call judges more than max_batch_size checks"""
+        client = ScriptedJudgeClient()
+        judge = BatchedLLMJudge(client, max_batch_size=2)
+
+        results = asyncio.run(judge_all(judge))
+
+        assert [result.passed for result in results] == [True, False, True, False, True]
+        assert client.calls == [BATCH_SYSTEM_PROMPT, BATCH_SYSTEM_PROMPT, SYSTEM_PROMPT]
+
+    def test_missing_and_unparseable_verdicts_fall_back(self):
+        """Items without a parseable verdict are re-judged with single calls"""
+        client = ScriptedJudgeClient(drop_item=2)
+        judge = BatchedLLMJudge(client)
+        results = asyncio.run(judge_all(judge))
+
+        assert [result.passed for result in results] == [True, False, True, False, True]
+        assert client.calls.count(SYSTEM_PROMPT) == 1
+        assert judge.fallback_items == 1
+
+        broken = ScriptedJudgeClient(broken=True)
+        results = asyncio.run(judge_all(BatchedLLMJudge(broken)))
+
+        assert [result.passed for result in results] == [True, False, True, False, True]
+        assert broken.calls.count(SYSTEM_PROMPT) == len(OUTPUTS)
+
+
+class TestEvaluatorCriteria:
+    """Test Criteria validation through the evaluator"""
+
+    def test_criteria_fields_of_one_case_are_batched(self):
+        """Several Criteria fields of one output are judged in one call and failures keep field order"""
+        client = ScriptedJudgeClient()
+        evaluator = Evaluator(judge_client=client, judge_batch_size=4)
+        output = SentimentAnalysisOutput(sentiment="positive", reasoning="bad reasoning")
+
+        passed, reason = asyncio.run(evaluator.validate(output, field_validations={
+            "reasoning": Criteria(criteria=["Reasoning is acceptable"]),
+            "sentiment": Criteria(criteria=["Sentiment is acceptable"]),
+        }))
+
+        assert not passed
+        assert reason.index("'reasoning'") < reason.index("'sentiment'")
+        assert client.calls == [BATCH_SYSTEM_PROMPT]
+
+
+class TestVerdictCache:
+    """Test reuse of stored judge verdicts across runs"""
+
+    def test_second_run_only_judges_new_outputs(self, tmp_path):
+        """Verdicts for unchanged checks come from the cache; changed outputs are still judged"""
+        asyncio.run(judge_all(LLMJudge(ScriptedJudgeClient(), verdict_cache=VerdictCache(tmp_path))))
+
+        client = ScriptedJudgeClient()
+        cache = VerdictCache(tmp_path)
+        judge = LLMJudge(client, verdict_cache=cache)
+        results = asyncio.run(judge_all(judge))
+        new = asyncio.run(judge.evaluate("good four", ["Output is acceptable"]))
+
+        assert [result.passed for result in results] == [True, False, True, False, True]
+        assert results[1].rationale == "not good"
+        assert new.passed
+        assert judge.llm_calls == 1
+        assert (cache.hits, cache.misses) == (5, 1)
+
+    def test_batched_judge_skips_cached_checks(self, tmp_path):
+        """Only uncached checks join a batch"""
+        asyncio.run(judge_all(BatchedLLMJudge(ScriptedJudgeClient(), verdict_cache=VerdictCache(tmp_path))))
+
+        client = ScriptedJudgeClient()
+        judge = BatchedLLMJudge(client, verdict_cache=VerdictCache(tmp_path))
+        results = asyncio.run(judge_all(judge))
+
+        assert [result.passed for result in results] == [True, False, True, False, True]
+        assert client.calls == []
+        assert (judge.llm_calls, judge.items_judged) == (0, 5)
+
+    def test_failed_calls_are_not_cached(self, tmp_path):
+        """A judge error is retried on the next run rather than stored as a FAIL"""
+        class FailingClient:
+            async def generate(self, **kwargs):
+                raise RuntimeError("Error code: 529 - overloaded")
+
+        cache = VerdictCache(tmp_path)
+        result = asyncio.run(LLMJudge(FailingClient(), verdict_cache=cache).evaluate("good", ["Output is acceptable"]))
+
+        assert not result.passed
+        assert len(cache) == 0
+        assert not cache.path.exists()
+
+    def test_unparsed_verdicts_are_not_cached(self, tmp_path):
+        """A response without an EVALUATION line counts as a FAIL but is judged again on the next run"""
+        class RamblingClient(ScriptedJudgeClient):
+            async def generate(self, system_prompt, user_prompt, temperature=0.1, max_tokens=500):
+                response = await super().generate(system_prompt, user_prompt, temperature, max_tokens)
+                return LLMResponse(text="Let me think about this output.", metrics=response.metrics)
+
+        cache = VerdictCache(tmp_path)
+        result = asyncio.run(LLMJudge(RamblingClient(), verdict_cache=cache).evaluate("good", ["Output is acceptable"]))
+        asyncio.run(LLMJudge(ScriptedJudgeClient(), verdict_cache=cache).evaluate("bad", ["Output is acceptable"]))
+
+        assert not result.passed
+        assert len(cache) == 1
+        assert len(VerdictCache(tmp_path)) == 1
+
+    def test_truncated_entry_is_skipped(self, tmp_path):
+        """A partly written last line is skipped and counted; the next verdict still lands on its own line"""
+        asyncio.run(judge_all(LLMJudge(ScriptedJudgeClient(), verdict_cache=VerdictCache(tmp_path))))
+        with open(VerdictCache(tmp_path).path, "a", encoding="utf-8") as f:
+            f.write('{"key":"abc","passed":tr')
+
+        cache = VerdictCache(tmp_path)
+        asyncio.run(LLMJudge(ScriptedJudgeClient(), verdict_cache=cache).evaluate("good four", ["Output is acceptable"]))
+
+        assert (len(cache), cache.skipped) == (len(OUTPUTS) + 1, 1)
+        reloaded = VerdictCache(tmp_path)
+        assert (len(reloaded), reloaded.skipped) == (len(OUTPUTS) + 1, 1)
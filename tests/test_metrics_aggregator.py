@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Unit tests for MetricsAggregator and LatencyHistogram
+
+Checks that streaming aggregates match exact statistics and that windowed
+views and memory stay bounded.
+"""
+
+import random
+
+import pytest
+
+from src.core_nodes.latency_histogram import LatencyHistogram
+from src.core_nodes.metrics_aggregator import AgentMetrics, MetricsAggregator
+from src.models.llm_metrics import LLMMetrics
+
+
+def make_metrics(response_time_ms: float, input_tokens: int = 100, output_tokens: int = 20) -> LLMMetrics:
+    """Build an LLMMetrics instance with simple costs"""
+    return LLMMetrics(
+        response_time_ms=response_time_ms,
+        input_tokens=input_tokens,
+        output_tokens=output_tokens,
+        total_tokens=input_tokens + output_tokens,
+        input_cost=input_tokens * 1e-6,
+        output_cost=output_tokens * 5e-6,
+        total_cost=input_tokens * 1e-6 + output_tokens * 5e-6,
+        model="test-model"
+    )
+
+
+class TestLatencyHistogram:
+    """Test percentile accuracy and merging"""
+
+    def test_percentiles_within_relative_error(self):
+        """Percentiles are within the configured relative error of exact values"""
+        rng = random.Random(42)
+        values = [rng.lognormvariate(6.5, 0.6) for _ in range(20000)]
+        histogram = LatencyHistogram(relative_error=0.01)
+        for value in values:
+            histogram.record(value)
+
+        ordered = sorted(values)
+        for q in (50, 90, 99):
+            exact = ordered[int(q / 100 * len(ordered)) - 1]
+            assert histogram.percentile(q) == pytest.approx(exact, rel=0.02)
+
+        assert histogram.min == ordered[0]
+        assert histogram.max == ordered[-1]
+        assert histogram.bucket_count() < 1000
+
+    def test_zero_values_and_merge(self):
+        """Zero latencies are counted and merging sums counts"""
+        first = LatencyHistogram()
+        second = LatencyHistogram()
+        for _ in range(10):
+            first.record(0.0)
+        for _ in range(10):
+            second.record(100.0)
+
+        first.merge(second)
+
+        assert first.count == 20
+        assert first.percentile(25) == 0.0
+        assert first.percentile(99) == pytest.approx(100.0, rel=0.01)
+
+    def test_empty_histogram(self):
+        assert LatencyHistogram().percentile(50) == 0.0
+
+
+class TestMetricsAggregator:
+    """Test streaming summaries and windowed views"""
+
+    def test_summary_matches_exact_totals(self):
+        """Counters and sums are exact; percentiles are reported"""
+        aggregator = MetricsAggregator()
+        for latency in (100.0, 200.0, 300.0):
+            aggregator.add_metrics("agent_a", make_metrics(latency))
+        aggregator.add_metrics("agent_b", make_metrics(1000.0))
+
+        summary = aggregator.get_summary()
+
+        assert summary["total_agents"] == 2
+        assert summary["total_calls"] == 4
+        assert summary["total_tokens"] == 480
+        assert summary["avg_response_time_ms"] == pytest.approx(400.0)
+        assert summary["p50_response_time_ms"] == pytest.approx(200.0, rel=0.01)
+        assert aggregator.get_total_cost() == pytest.approx(4 * (100e-6 + 100e-6))
+        assert aggregator.get_average_latency() == pytest.approx(400.0)
+
+        agent_a = aggregator.get_agent_summary("agent_a")
+        assert agent_a["min_response_time_ms"] == 100.0
+        assert agent_a["max_response_time_ms"] == 300.0
+        assert "p99" in aggregator.format_summary()
+
+    def test_windowed_summary_and_retention(self):
+        """Windowed views only include recent slices and old slices are dropped"""
+        agent = AgentMetrics("agent", slice_seconds=60.0, retention_seconds=600.0)
+        agent.add_call(make_metrics(100.0), now=0.0)
+        agent.add_call(make_metrics(200.0), now=500.0)
+        agent.add_call(make_metrics(300.0), now=900.0)
+
+        assert agent.totals.calls == 3
+        assert agent.get_stats(window_seconds=120.0, now=900.0).calls == 1
+        assert agent.get_stats(window_seconds=600.0, now=900.0).calls == 2
+        # The slice at t=0 has aged out of the 600s retention period
+        assert len(agent._slices) == 2
+
+    def test_empty_window_summary_has_all_fields(self):
+        """Agents with no calls in the window still produce a full summary"""
+        agent = AgentMetrics("agent")
+        agent.add_call(make_metrics(100.0), now=0.0)
+
+        summary = agent.get_summary(window_seconds=60.0, now=3000.0)
+
+        assert summary["total_calls"] == 0
+        assert "total_input_tokens" in summary
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Unit tests for PrometheusExporter
+
+Drives the workflow with the fake LLM client and checks the exposition output.
+"""
+
+import asyncio
+import urllib.request
+
+from src.clients.llm_clients.fake_llm_client import FakeLLMClient, LatencyProfile, QUERY_SECURITY_RESPONSE
+from src.core_nodes.prometheus_exporter import PrometheusExporter
+from src.models.llm_metrics import LLMMetrics
+from src.prompts import query_security_validation_prompt
+from src.prompts.prompt_registry import get_prompt
+from src.workflows.exceptions import InsecureQueryError
+from src.workflows.query_preprocessing_workflow import QueryPreprocessingWorkflow
+
+
+def make_metrics(response_time_ms: float, cache_read: int = 0) -> LLMMetrics:
+    """Build an LLMMetrics instance"""
+    return LLMMetrics(
+        response_time_ms=response_time_ms,
+        input_tokens=100,
+        output_tokens=10,
+        total_tokens=110,
+        input_cost=0.0001,
+        output_cost=0.00005,
+        total_cost=0.00015,
+        model="test-model",
+        cache_read_input_tokens=cache_read
+    )
+
+
+class TestPrometheusExporter:
+    """Test counters, histograms and exposition endpoints"""
+
+    def test_render_counters_and_histogram(self):
+        """Counters accumulate per (agent, model) and histogram buckets are cumulative"""
+        exporter = PrometheusExporter(latency_buckets=(0.5, 1.0))
+        exporter.add_metrics("security_validation", make_metrics(400.0))
+        exporter.add_metrics("security_validation", make_metrics(800.0, cache_read=50))
+        exporter.add_metrics("security_validation", make_metrics(2000.0))
+
+        text = exporter.render()
+        labels = 'agent="security_validation",model="test-model"'
+
+        assert f"query_preprocessing_llm_calls_total{{{labels}}} 3" in text
+        assert f"query_preprocessing_llm_input_tokens_total{{{labels}}} 300" in text
+        assert f"query_preprocessing_llm_cache_hits_total{{{labels}}} 1" in text
+        assert f'query_preprocessing_llm_latency_seconds_bucket{{{labels},le="0.5"}} 1' in text
+        assert f'query_preprocessing_llm_latency_seconds_bucket{{{labels},le="1.0"}} 2' in text
+        assert f'query_preprocessing_llm_latency_seconds_bucket{{{labels},le="+Inf"}} 3' in text
+        assert "# TYPE query_preprocessing_llm_latency_seconds histogram" in text
+
+    def test_workflow_records_outcomes(self):
+        """The workflow reports agent calls and success/insecure outcomes"""
+        exporter = PrometheusExporter()
+        llm_client = FakeLLMClient(latency_profile=LatencyProfile.zero())
+        workflow = QueryPreprocessingWorkflow(llm_client=llm_client, metrics_exporter=exporter)
+
+        asyncio.run(workflow.process("Tesco groceries last month"))
+
+        llm_client.responses[query_security_validation_prompt.get_instructions()] = QUERY_SECURITY_RESPONSE.replace(
+            "true", "false"
+        )
+        try:
+            asyncio.run(workflow.process("'; DROP TABLE users; --"))
+        except InsecureQueryError:
+            pass
+
+        text = exporter.render()
+        assert 'query_preprocessing_workflow_runs_total{outcome="success"} 1' in text
+        assert 'query_preprocessing_workflow_runs_total{outcome="insecure"} 1' in text
+        category_version = get_prompt("category_normalisation").label
+        security_version = get_prompt("query_security_validation").label
+        assert (
+            'query_preprocessing_llm_calls_total{agent="category_normalisation",model="fake-llm",'
+            f'prompt_version="{category_version}"}} 1'
+        ) in text
+        assert (
+            'query_preprocessing_llm_calls_total{agent="security_validation",model="fake-llm",'
+            f'prompt_version="{security_version}"}} 2'
+        ) in text
+        assert "query_preprocessing_workflow_duration_seconds_count 2" in text
+
+    def test_http_endpoint_and_textfile(self, tmp_path):
+        """Metrics are served over HTTP and written atomically to a textfile"""
+        exporter = PrometheusExporter()
+        exporter.record_workflow_outcome("no_entities", duration_ms=120.0)
+
+        server = exporter.start_http_server(port=0)
+        try:
+            port = server.server_address[1]
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics") as response:
+                body = response.read().decode("utf-8")
+        finally:
+            exporter.stop_http_server()
+
+        assert 'query_preprocessing_workflow_runs_total{outcome="no_entities"} 1' in body
+
+        textfile = tmp_path / "query_preprocessing.prom"
+        exporter.write_textfile(textfile)
+        assert textfile.read_text(encoding="utf-8") == exporter.render()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the prompt section parser and the prompt budget/compression tool
+"""
+
+from evals.prompt_budget import HeuristicTokenCounter, analyse_prompt, compress_prompt, load_prompts
+from src.parsers.prompt_section_parser import split_instructions
+
+
+PROMPT = """<instructions>
+<role>
+You extract entities. Mention of <response> in prose is not a section.
+</role>
+
+<purpose>
+* Preserve complete phrases from the query
+* Never invent entities
+</purpose>
+
+
+<examples>
+<example label="merchant">
+<query>Spent at Tesco last month</query>
+<response>
+<type>merchant</type>
+</response>
+</example>
+
+<example label="merchant again">
+<query>Spent at Tesco last week</query>
+<response>
+<type>merchant</type>
+</response>
+</example>
+
+<example label="gibberish">
+<query>]]}}</query>
+<response>
+<type>none</type>
+</response>
+</example>
+
+<example label="more gibberish">
+<query>%%%</query>
+<response>
+<type>none</type>
+</response>
+</example>
+</examples>
+
+<guardrails>
+* Preserve complete phrases from the query
+1. Output only XML
+</guardrails>
+</instructions>
+"""
+
+
+class TestPromptSections:
+    """Test the line-based section parser"""
+
+    def test_splits_root_children_with_offsets(self):
+        """Sections are the root's children; inline tags and prose mentions are ignored"""
+        sections = split_instructions(PROMPT)
+
+        assert [section.name for section in sections] == ["role", "purpose", "examples", "guardrails"]
+        examples = sections[2].children()
+        assert [example.label for example in examples] == ["merchant", "merchant again", "gibberish", "more gibberish"]
+        assert PROMPT[examples[1].start:examples[1].end] == examples[1].text
+
+    def test_every_prompt_is_fully_sectioned(self):
+        """Nearly all of each real prompt's tokens are attributed to a section"""
+        counter = HeuristicTokenCounter()
+        for name, prompt in load_prompts().items():
+            budget = analyse_prompt(name, prompt, counter)
+            assert budget.sections, name
+            assert budget.unsectioned_tokens < 0.02 * budget.total_tokens, name
+
+
+class TestCompression:
+    """Test the compression rules"""
+
+    def test_removes_only_redundant_content(self):
+        """Near-duplicate examples and repeated bullets go; distinct examples and structure stay"""
+        result = compress_prompt(PROMPT, similarity=0.6, min_examples=1)
+
+        assert result.removed_examples == ["merchant again"]
+        assert result.removed_duplicate_lines == 1
+        # Queries without words are never treated as similar to each other
+        assert 'label="gibberish"' in result.prompt and 'label="more gibberish"' in result.prompt
+        assert "1. Output only XML" in result.prompt
+        assert "\n\n\n" not in result.prompt
+        assert [section.name for section in split_instructions(result.prompt)] == [
+            "role", "purpose", "examples", "guardrails"
+        ]
+
+    def test_keeps_minimum_examples(self):
+        """min_examples caps how many examples can be dropped"""
+        result = compress_prompt(PROMPT, min_examples=4)
+
+        assert result.removed_examples == []
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the prompt registry and prompt version traffic splits
+"""
+
+import asyncio
+
+import pytest
+
+from src.clients.llm_clients.fake_llm_client import FakeLLMClient, LatencyProfile
+from src.core_nodes.prometheus_exporter import PrometheusExporter
+from src.models.base_models import QueryInput
+from src.prompts import processable_entity_extraction_prompt, processable_entity_extraction_prompt_V2
+from src.prompts.prompt_registry import TrafficSplit, get_prompt, list_versions
+from src.workflow_nodes.query_preprocessing.processable_entity_extraction_agent import ProcessableEntityExtractionAgent
+from src.workflows.query_preprocessing_workflow import QueryPreprocessingWorkflow
+
+QUERIES = [f"How much did I spend at Tesco in week {week}?" for week in range(1, 41)]
+
+
+def make_client() -> FakeLLMClient:
+    return FakeLLMClient(latency_profile=LatencyProfile.zero())
+
+
+class TestPromptRegistry:
+    """Test prompt resolution and version labels"""
+
+    def test_resolves_versions(self):
+        """The first registered version is the default; each version has its own module and hash"""
+        v1 = get_prompt("processable_entity_extraction")
+        v2 = get_prompt("processable_entity_extraction", "v2")
+
+        assert list_versions("processable_entity_extraction") == ["v1", "v2"]
+        assert v1.version == "v1"
+        assert v1.instructions == processable_entity_extraction_prompt.get_instructions()
+        assert v2.instructions == processable_entity_extraction_prompt_V2.get_instructions()
+        assert v1.label == f"v1@{v1.content_hash[:8]}"
+        assert v1.content_hash != v2.content_hash
+        assert get_prompt("processable_entity_extraction", "v1") is v1
+
+    def test_unknown_agent_or_version(self):
+        """Unregistered agents and versions raise KeyError"""
+        with pytest.raises(KeyError):
+            get_prompt("processable_entity_extraction", "v9")
+        with pytest.raises(KeyError):
+            get_prompt("no_such_agent")
+
+    def test_agent_tags_metrics_with_version(self):
+        """Agents use the requested version and tag each call's metrics with its label"""
+        agent = ProcessableEntityExtractionAgent(make_client(), prompt_version="v2")
+
+        _, metrics = asyncio.run(agent.process_with_metrics(QueryInput(query="Tesco last month")))
+
+        assert agent.system_prompt == processable_entity_extraction_prompt_V2.get_instructions()
+        assert metrics.prompt_version == get_prompt("processable_entity_extraction", "v2").label
+
+
+class TestTrafficSplit:
+    """Test percentage traffic splitting"""
+
+    def test_split_is_deterministic_and_proportional(self):
+        """The same key always gets the same version and shares follow the weights"""
+        split = TrafficSplit({"v1": 75, "v2": 25})
+        keys = [f"query {i}" for i in range(4000)]
+
+        choices = [split.choose(key) for key in keys]
+
+        assert choices == [split.choose(key) for key in keys]
+        assert 0.70 < choices.count("v1") / len(keys) < 0.80
+
+    def test_zero_weight_and_invalid_weights(self):
+        """Versions with zero weight never get traffic; weights must have a positive total"""
+        split = TrafficSplit({"v1": 100, "v2": 0})
+
+        assert {split.choose(query) for query in QUERIES} == {"v1"}
+        with pytest.raises(ValueError):
+            TrafficSplit({"v1": 0})
+        with pytest.raises(ValueError):
+            TrafficSplit({"v1": 120, "v2": -20})
+
+
+class TestWorkflowPromptSplit:
+    """Test A/B traffic splitting in the workflow"""
+
+    def test_queries_are_split_and_metrics_tagged(self):
+        """Each query runs one version of the split agent and the exporter keeps a series per version"""
+        exporter = PrometheusExporter()
+        workflow = QueryPreprocessingWorkflow(
+            make_client(),
+            metrics_exporter=exporter,
+            prompt_splits={"processable_entity_extraction": {"v1": 50, "v2": 50}}
+        )
+
+        async def run_all():
+            return await asyncio.gather(*(workflow.process(query) for query in QUERIES))
+
+        results = asyncio.run(run_all())
+
+        split = workflow.prompt_splits["processable_entity_extraction"]
+        labels = {version: get_prompt("processable_entity_extraction", version).label for version in ("v1", "v2")}
+        for query, result in zip(QUERIES, results):
+            assert result.metrics["processable_extraction"].prompt_version == labels[split.choose(query)]
+        assert {result.metrics["processable_extraction"].prompt_version for result in results} == set(labels.values())
+
+        text = exporter.render()
+        for label in labels.values():
+            assert f'agent="processable_extraction",model="fake-llm",prompt_version="{label}"' in text
+
+    def test_unknown_prompt_name(self):
+        """Splits must name a prompt used by the workflow"""
+        with pytest.raises(ValueError):
+            QueryPreprocessingWorkflow(make_client(), prompt_splits={"pii_extraction": {"v1": 100}})
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Unit tests for token-bucket rate limiters and the multi-process launcher
+"""
+
+import asyncio
+import multiprocessing
+import time
+
+import pytest
+
+from evals.llm_client_config import DEFAULT_LLM_RATE_LIMIT, get_llm_client, get_rate_limit
+from src.clients.llm_clients.fake_llm_client import FakeLLMClient, LatencyProfile
+from src.clients.llm_clients.rate_limiter import (
+    FileLockTokenBucket,
+    RateLimitedLLMClient,
+    SharedTokenBucket,
+    TokenBucket
+)
+from src.core_nodes.process_pool import run_in_processes
+
+
+def acquire_in_child(process_index: int, bucket, calls: int, timestamps) -> None:
+    """Child process entry point: acquire tokens and record when each was granted"""
+    async def run():
+        for _ in range(calls):
+            await bucket.acquire()
+            timestamps.append(time.monotonic())
+    asyncio.run(run())
+
+
+class TestTokenBuckets:
+    """Test rate enforcement in one loop, across processes and via a lock file"""
+
+    def test_token_bucket_rate(self):
+        """After the initial burst, tokens are granted at the configured rate"""
+        async def run():
+            bucket = TokenBucket(rate_per_s=100, capacity=5)
+            start = time.perf_counter()
+            await asyncio.gather(*(bucket.acquire() for _ in range(25)))
+            return time.perf_counter() - start
+
+        elapsed = asyncio.run(run())
+
+        # 5 burst tokens, then 20 more at 100/s
+        assert 0.18 <= elapsed < 0.5
+
+    def test_rate_limited_client(self):
+        """The wrapper acquires a token per call and passes the response through"""
+        async def run():
+            client = RateLimitedLLMClient(
+                FakeLLMClient(latency_profile=LatencyProfile.zero()),
+                TokenBucket(rate_per_s=50, capacity=1)
+            )
+            start = time.perf_counter()
+            responses = [await client.generate("system", "user") for _ in range(6)]
+            return responses, time.perf_counter() - start, client.model
+
+        responses, elapsed, model = asyncio.run(run())
+
+        assert len(responses) == 6
+        assert elapsed >= 0.09
+        assert model == "fake-llm"
+
+    def test_rate_limited_client_keeps_interface_defaults(self):
+        """Calls relying on the default temperature and max_tokens reach the wrapped client unchanged"""
+        received = []
+
+        class RecordingClient(FakeLLMClient):
+            async def generate(self, system_prompt, user_prompt, temperature=0.1, max_tokens=1000):
+                received.append((temperature, max_tokens))
+                return await super().generate(system_prompt, user_prompt, temperature, max_tokens)
+
+        client = RateLimitedLLMClient(RecordingClient(latency_profile=LatencyProfile.zero()), TokenBucket(rate_per_s=50))
+        asyncio.run(client.generate("system", "user"))
+
+        assert received == [(0.1, 1000)]
+
+    def test_shared_bucket_across_processes(self):
+        """Processes started by the launcher share one global rate"""
+        context = multiprocessing.get_context("spawn")
+        bucket = SharedTokenBucket(rate_per_s=50, capacity=1, context=context)
+        with context.Manager() as manager:
+            timestamps = manager.list()
+            exit_code = run_in_processes(acquire_in_child, 2, bucket, 10, timestamps)
+            granted = sorted(timestamps)
+
+        assert exit_code == 0
+        assert len(granted) == 20
+        # 20 tokens at 50/s with a burst of 1 need at least ~0.38s in total
+        assert granted[-1] - granted[0] >= 0.3
+
+    def test_file_lock_bucket_shared_state(self, tmp_path):
+        """Two buckets on the same file draw from the same tokens"""
+        path = tmp_path / "bucket.lock"
+        first = FileLockTokenBucket(path, rate_per_s=10, capacity=2)
+        second = FileLockTokenBucket(path, rate_per_s=10, capacity=2)
+
+        async def run():
+            return [await first.acquire(), await second.acquire(), await first.acquire()]
+
+        waits = asyncio.run(run())
+
+        assert waits[0] == 0.0
+        assert waits[1] == 0.0
+        assert waits[2] > 0.05
+
+
+class TestEvalClientRateLimit:
+    """Test the default pacing of the eval scripts' client (evals/llm_client_config.py)"""
+
+    def test_default_and_override(self, monkeypatch):
+        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+        monkeypatch.delenv("LLM_CASSETTE", raising=False)
+        monkeypatch.delenv("LLM_RATE_LIMIT", raising=False)
+
+        client = get_llm_client()
+        assert isinstance(client, RateLimitedLLMClient)
+        assert client.rate_limiter.rate_per_s == DEFAULT_LLM_RATE_LIMIT
+        assert not isinstance(get_llm_client(rate_limited=False), RateLimitedLLMClient)
+
+        monkeypatch.setenv("LLM_RATE_LIMIT", "0.8")
+        assert get_llm_client().rate_limiter.rate_per_s == 0.8
+
+    @pytest.mark.parametrize("value", ["0", "-1", "abc", "nan"])
+    def test_non_positive_rate_rejected(self, monkeypatch, value):
+        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+        monkeypatch.setenv("LLM_RATE_LIMIT", value)
+
+        with pytest.raises(ValueError, match="LLM_RATE_LIMIT must be a positive number"):
+            get_rate_limit()
+        assert get_llm_client() is None
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Unit tests for ReplayLLMClient
+
+Uses a stub client in record mode so no API calls are made.
+"""
+
+import asyncio
+
+import pytest
+
+from src.clients.llm_clients.llm_client_interface import LLMClientInterface
+from src.clients.llm_clients.replay_llm_client import ReplayLLMClient, CassetteMissError
+from src.models.llm_metrics import LLMResponse, LLMMetrics
+
+
+class StubLLMClient(LLMClientInterface):
+    """Returns a response echoing the user prompt"""
+
+    def __init__(self):
+        self.model = "stub-model"
+        self.calls = 0
+
+    async def generate(self, system_prompt, user_prompt, temperature=0.1, max_tokens=1000):
+        self.calls += 1
+        metrics = LLMMetrics(
+            response_time_ms=100.0 * self.calls,
+            input_tokens=10,
+            output_tokens=5,
+            total_tokens=15,
+            input_cost=0.00001,
+            output_cost=0.00002,
+            total_cost=0.00003,
+            model=self.model
+        )
+        return LLMResponse(text=f"<response>{user_prompt}</response>", metrics=metrics)
+
+
+class TestReplayLLMClient:
+    """Test record and replay round-trips"""
+
+    def test_record_then_replay(self, tmp_path):
+        """Recorded responses are served offline with identical text and metrics"""
+        cassette = tmp_path / "cassette.jsonl"
+        stub = StubLLMClient()
+        recorder = ReplayLLMClient(cassette, mode="record", llm_client=stub)
+
+        recorded = asyncio.run(recorder.generate("system", "hello", 0.1, 500))
+        assert stub.calls == 1
+        assert recorder.model == "stub-model"
+
+        replayer = ReplayLLMClient(cassette, mode="replay")
+        replayed = asyncio.run(replayer.generate("system", "hello", 0.1, 500))
+
+        assert replayed.text == recorded.text
+        assert replayed.metrics == recorded.metrics
+        assert replayer.model == "stub-model"
+        assert len(replayer) == 1
+
+    def test_replay_miss_raises(self, tmp_path):
+        """Requests that were never recorded raise CassetteMissError"""
+        cassette = tmp_path / "cassette.jsonl"
+        recorder = ReplayLLMClient(cassette, mode="record", llm_client=StubLLMClient())
+        asyncio.run(recorder.generate("system", "hello", 0.1, 500))
+
+        replayer = ReplayLLMClient(cassette, mode="replay")
+        with pytest.raises(CassetteMissError):
+            asyncio.run(replayer.generate("system", "hello", 0.0, 500))
+
+    def test_simulated_latency_uses_recorded_samples(self, tmp_path):
+        """Simulated latency is drawn from the recorded response times"""
+        cassette = tmp_path / "cassette.jsonl"
+        recorder = ReplayLLMClient(cassette, mode="record", llm_client=StubLLMClient())
+        asyncio.run(recorder.generate("system", "a"))
+        asyncio.run(recorder.generate("system", "b"))
+
+        replayer = ReplayLLMClient(cassette, mode="replay", simulate_latency=True, latency_scale=0.01, seed=1)
+        response = asyncio.run(replayer.generate("system", "a"))
+
+        assert response.metrics.response_time_ms in (1.0, 2.0)
+
+    def test_invalid_configuration(self, tmp_path):
+        """Record mode requires a wrapped client and replay mode requires a cassette"""
+        with pytest.raises(ValueError):
+            ReplayLLMClient(tmp_path / "cassette.jsonl", mode="record")
+        with pytest.raises(FileNotFoundError):
+            ReplayLLMClient(tmp_path / "missing.jsonl", mode="replay")
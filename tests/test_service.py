@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the preprocessing HTTP service
+
+Runs the service on a free local port against the fake LLM client.
+"""
+
+import asyncio
+import json
+from typing import Any, Optional, Tuple
+
+from src.clients.llm_clients.fake_llm_client import FakeLLMClient, LatencyProfile, QUERY_SECURITY_RESPONSE
+from src.prompts import query_security_validation_prompt
+from src.service import PreprocessingService
+from src.workflows.query_preprocessing_workflow import QueryPreprocessingWorkflow
+
+
+async def request(port: int, method: str, path: str, payload: Optional[Any] = None) -> Tuple[int, dict]:
+    """Send one HTTP request and return (status, JSON body)"""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(body)}\r\n"
+        f"Connection: close\r\n\r\n".encode("latin-1") + body
+    )
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, response_body = response.partition(b"\r\n\r\n")
+    status = int(head.split(b" ")[1])
+    return status, json.loads(response_body)
+
+
+def make_service(median_ms: float = 0.0, **kwargs) -> Tuple[PreprocessingService, FakeLLMClient]:
+    """Build a service over a fake LLM client"""
+    latency = LatencyProfile(median_ms=median_ms, sigma=0.0) if median_ms else LatencyProfile.zero()
+    llm_client = FakeLLMClient(latency_profile=latency)
+    return PreprocessingService(QueryPreprocessingWorkflow(llm_client=llm_client), **kwargs), llm_client
+
+
+class TestPreprocessingService:
+    """Test endpoints, error mapping, backpressure and draining"""
+
+    def test_preprocess_and_health(self):
+        """Successful queries return the serialised WorkflowResult"""
+        async def run():
+            service, _ = make_service()
+            server = await service.start(port=0)
+            port = server.sockets[0].getsockname()[1]
+            try:
+                health = await request(port, "GET", "/health")
+                result = await request(port, "POST", "/preprocess", {"query": "Tesco groceries last month"})
+                bad = await request(port, "POST", "/preprocess", {"q": "missing"})
+                missing = await request(port, "GET", "/nope")
+            finally:
+                await service.shutdown()
+            return health, result, bad, missing
+
+        health, (status, body), bad, missing = asyncio.run(run())
+
+        assert health[0] == 200 and health[1]["status"] == "ok"
+        assert status == 200
+        assert body["outcome"] == "success"
+        assert {"type": "merchant", "value": "Tesco"} in body["result"]["processable_entities"]
+        assert body["result"]["normalised_categories"][0]["canon"]
+        assert bad[0] == 400
+        assert missing[0] == 404
+
+    def test_malformed_content_length_rejected(self):
+        """A non-numeric or negative Content-Length is a bad request; only an oversized body gets 413"""
+        async def send(port: int, content_length: str) -> bytes:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(
+                f"POST /preprocess HTTP/1.1\r\nHost: localhost\r\nContent-Length: {content_length}\r\n\r\n"
+                .encode("latin-1")
+            )
+            await writer.drain()
+            response = await reader.read()
+            writer.close()
+            return response
+
+        async def run():
+            service, _ = make_service(max_body_bytes=100)
+            server = await service.start(port=0)
+            port = server.sockets[0].getsockname()[1]
+            try:
+                return [await send(port, value) for value in ("abc", "-5", "+5", "1000")]
+            finally:
+                await service.shutdown()
+
+        statuses = [response.split(b" ")[1] for response in asyncio.run(run())]
+
+        assert statuses == [b"400", b"400", b"400", b"413"]
+
+    def test_chunked_body_rejected(self):
+        """A chunked request gets one 411 and the connection is closed, not a JSON error per chunk"""
+        async def run():
+            service, _ = make_service()
+            server = await service.start(port=0)
+            port = server.sockets[0].getsockname()[1]
+            try:
+                reader, writer = await asyncio.open_connection("127.0.0.1", port)
+                body = json.dumps({"query": "Tesco"}).encode("utf-8")
+                writer.write(
+                    b"POST /preprocess HTTP/1.1\r\nHost: localhost\r\nTransfer-Encoding: chunked\r\n\r\n"
+                    + f"{len(body):x}\r\n".encode("latin-1") + body + b"\r\n0\r\n\r\n"
+                )
+                await writer.drain()
+                response = await reader.read()
+                writer.close()
+            finally:
+                await service.shutdown()
+            return response
+
+        response = asyncio.run(run())
+
+        assert response.startswith(b"HTTP/1.1 411 ")
+        assert response.count(b"HTTP/1.1 ") == 1
+        assert b"Connection: close" in response
+
+    def test_workflow_errors_are_structured(self):
+        """Typed workflow exceptions map to 422 with outcome and justification"""
+        async def run():
+            service, llm_client = make_service()
+            llm_client.responses[query_security_validation_prompt.get_instructions()] = (
+                QUERY_SECURITY_RESPONSE.replace("true", "false")
+            )
+            server = await service.start(port=0)
+            port = server.sockets[0].getsockname()[1]
+            try:
+                single = await request(port, "POST", "/preprocess", {"query": "DROP TABLE users"})
+                batch = await request(port, "POST", "/preprocess/batch", {"queries": ["a", "b"]})
+            finally:
+                await service.shutdown()
+            return single, batch
+
+        (status, body), (batch_status, batch_body) = asyncio.run(run())
+
+        assert status == 422
+        assert body["outcome"] == "insecure"
+        assert body["error"] == "InsecureQueryError"
+        assert "justification" in body
+        assert batch_status == 200
+        assert [item["outcome"] for item in batch_body["results"]] == ["insecure", "insecure"]
+        assert all(item["status"] == 422 for item in batch_body["results"])
+
+    def test_backpressure_and_drain(self):
+        """A full queue returns 429; shutdown finishes queued work before closing"""
+        async def run():
+            service, _ = make_service(median_ms=50.0, max_queue_size=1, concurrency=1)
+            server = await service.start(port=0)
+            port = server.sockets[0].getsockname()[1]
+
+            first = asyncio.create_task(request(port, "POST", "/preprocess", {"query": "one"}))
+            await asyncio.sleep(0.02)  # first is now being processed
+            second = asyncio.create_task(request(port, "POST", "/preprocess", {"query": "two"}))
+            await asyncio.sleep(0.02)  # second is queued
+            rejected = await request(port, "POST", "/preprocess", {"query": "three"})
+            batch_rejected = await request(port, "POST", "/preprocess/batch", {"queries": ["x"]})
+
+            await service.shutdown(drain_timeout_s=5.0)
+            return rejected, batch_rejected, await first, await second
+
+        rejected, batch_rejected, first, second = asyncio.run(run())
+
+        assert rejected[0] == 429
+        assert batch_rejected[0] == 429
+        assert first[0] == 200
+        assert second[0] == 200
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the sharded multi-process eval runner
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from evals.registry import EvalRegistry
+from evals.sharded_runner import load_case_functions, parse_arguments, run_shard, run_sharded, shard_index
+
+CASES_MODULE = "evals.cases.query_characteristics_extraction"
+
+
+class TestSharding:
+    """Test case selection and shard assignment"""
+
+    def test_shard_index_is_stable_and_partitions(self):
+        """Every case lands in exactly one shard, the same one on every call"""
+        _, functions = load_case_functions(["evals.cases.user_intent"])
+        names = list(functions)
+
+        shards = [shard_index(name, 3) for name in names]
+
+        assert shards == [shard_index(name, 3) for name in names]
+        assert set(shards) <= {0, 1, 2}
+        assert len(set(shards)) > 1
+
+    def test_cases_must_be_for_one_agent(self):
+        """Mixing case modules of different agents is rejected"""
+        with pytest.raises(ValueError):
+            load_case_functions(["evals.cases.user_intent", "evals.cases.query_security"])
+
+
+class TestShardedRun:
+    """Test running shards in separate processes"""
+
+    def test_results_are_merged(self, tmp_path):
+        """Each case runs once in some shard and the merged summary covers them all"""
+        agent_class, functions = load_case_functions([CASES_MODULE])
+        args = parse_arguments([
+            CASES_MODULE, "--shards", "2", "--fake", "--fake-median-ms", "0",
+            "--no-cache", "--rate-limit", "1000", "--results-dir", str(tmp_path)
+        ])
+
+        results = run_sharded(args)
+
+        assert [result.case_name for result in results] == list(functions)
+        summary_file = next((tmp_path / agent_class.__name__).glob("*_summary.json"))
+        with open(summary_file, encoding="utf-8") as f:
+            summary = json.load(f)
+        assert summary["total_cases"] == len(functions)
+        assert sum(summary["configuration"]["shard_sizes"]) == len(functions)
+
+    def test_shard_builds_only_its_own_cases(self, tmp_path, monkeypatch):
+        """A shard builds EvalCases for its own cases only, and none when it has no cases"""
+        _, functions = load_case_functions([CASES_MODULE])
+        built = []
+        build_case = EvalRegistry._case
+
+        def recording_case(registry, name):
+            built.append(name)
+            return build_case(registry, name)
+
+        monkeypatch.setattr(EvalRegistry, "_case", recording_case)
+        num_shards = len(functions) + 1
+        empty = next(i for i in range(num_shards) if all(shard_index(name, num_shards) != i for name in functions))
+        busy = shard_index(next(iter(functions)), num_shards)
+
+        for index in (busy, empty):
+            args = parse_arguments([
+                CASES_MODULE, "--shards", str(num_shards), "--fake", "--fake-median-ms", "0", "--no-cache"
+            ])
+            asyncio.run(run_shard(index, args, tmp_path, None))
+
+        assert built and all(shard_index(name, num_shards) == busy for name in built)
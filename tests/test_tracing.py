@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Unit tests for span tracing and critical-path analysis
+"""
+
+import asyncio
+import json
+
+from src.clients.llm_clients.fake_llm_client import FakeLLMClient, LatencyProfile
+from src.core_nodes.tracing import (
+    InMemorySpanSink,
+    OTLPJsonFileSink,
+    Span,
+    Tracer,
+    analyse_critical_path,
+    trace_span
+)
+from src.workflows.query_preprocessing_workflow import QueryPreprocessingWorkflow
+
+
+MS = 1_000_000
+
+
+def make_span(span_id: str, parent_id, start_ms: float, end_ms: float) -> Span:
+    """Build a finished span with millisecond timings"""
+    return Span(
+        name=span_id,
+        trace_id="t",
+        span_id=span_id,
+        parent_id=parent_id,
+        start_ns=int(start_ms * MS),
+        end_ns=int(end_ms * MS)
+    )
+
+
+class TestCriticalPath:
+    """Test critical path and slack computation on synthetic traces"""
+
+    def test_parallel_then_sequential(self):
+        """The slowest parallel child is critical; faster siblings get slack up to the next stage"""
+        spans = [
+            make_span("root", None, 0, 100),
+            make_span("stage1", "root", 0, 60),
+            make_span("fast", "stage1", 0, 20),
+            make_span("slow", "stage1", 0, 60),
+            make_span("stage2", "root", 60, 100),
+            make_span("llm", "fast", 5, 20),
+        ]
+
+        report = analyse_critical_path(spans)
+
+        assert [span.span_id for span in report.path] == ["root", "stage1", "slow", "stage2"]
+        assert report.slack_ms["slow"] == 0.0
+        assert report.slack_ms["fast"] == 40.0
+        # Nested spans inherit their parent's slack
+        assert report.slack_ms["llm"] == 40.0
+        assert report.self_time_ms["fast"] == 5.0
+        assert report.self_time_ms["root"] == 0.0
+
+
+class TestTracer:
+    """Test span recording, sampling and export"""
+
+    def test_workflow_spans(self):
+        """A traced workflow run records stage, agent, LLM and parse spans under one root"""
+        sink = InMemorySpanSink()
+        workflow = QueryPreprocessingWorkflow(
+            llm_client=FakeLLMClient(latency_profile=LatencyProfile.zero()),
+            tracer=Tracer(sink)
+        )
+
+        asyncio.run(workflow.process("Tesco groceries last month"))
+
+        assert len(sink.traces) == 1
+        spans = sink.traces[0]
+        by_id = {span.span_id: span for span in spans}
+        names = [span.name for span in spans]
+
+        assert names.count("agent.process") == 5
+        assert names.count("llm.generate") == 5
+        assert names.count("agent.parse") == 5
+        for span in spans:
+            if span.name == "agent.process":
+                assert by_id[span.parent_id].name in ("stage.parallel_agents", "stage.category_normalisation")
+            assert "slack_ms" in span.attributes
+        root = next(span for span in spans if span.parent_id is None)
+        assert root.name == "workflow.process"
+        assert root.attributes["critical_path"] is True
+
+    def test_sampling_and_noop(self):
+        """Unsampled traces and spans outside a trace record nothing"""
+        sink = InMemorySpanSink()
+        tracer = Tracer(sink, sample_rate=0.0)
+
+        with tracer.start_trace("root") as root:
+            with trace_span("child") as child:
+                pass
+
+        assert root is None
+        assert child is None
+        assert len(sink.traces) == 0
+
+    def test_otlp_file_sink(self, tmp_path):
+        """The file sink writes one OTLP/JSON payload per trace"""
+        path = tmp_path / "traces.jsonl"
+        tracer = Tracer(OTLPJsonFileSink(path))
+
+        with tracer.start_trace("root"):
+            with trace_span("child", agent="security"):
+                pass
+
+        payload = json.loads(path.read_text(encoding="utf-8").strip())
+        spans = payload["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        child = next(span for span in spans if span["name"] == "child")
+        root = next(span for span in spans if span["name"] == "root")
+
+        assert child["parentSpanId"] == root["spanId"]
+        assert len(root["traceId"]) == 32
+        assert {"key": "agent", "value": {"stringValue": "security"}} in child["attributes"]
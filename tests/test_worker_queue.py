@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the queue-driven worker runner and queue backends
+"""
+
+import asyncio
+import json
+import time
+
+from src.clients.llm_clients.fake_llm_client import FakeLLMClient, LatencyProfile, QUERY_SECURITY_RESPONSE
+from src.prompts import query_security_validation_prompt
+from src.workers import InMemoryQueue, InMemoryResultSink, JSONLResultSink, SQLiteQueue, WorkerRunner
+from src.workflows.query_preprocessing_workflow import QueryPreprocessingWorkflow
+
+
+def make_workflow(**kwargs) -> QueryPreprocessingWorkflow:
+    """Build a workflow over a zero-latency fake LLM client"""
+    return QueryPreprocessingWorkflow(llm_client=FakeLLMClient(latency_profile=LatencyProfile.zero(), **kwargs))
+
+
+class TestQueueBackends:
+    """Test idempotency, leasing and redelivery"""
+
+    def test_sqlite_idempotency_and_redelivery(self, tmp_path):
+        """Duplicate keys are ignored and expired leases are redelivered until max_attempts"""
+        async def run():
+            queue = SQLiteQueue(tmp_path / "queue.sqlite", max_attempts=2)
+            first = await queue.enqueue("Tesco last month", idempotency_key="q1")
+            duplicate = await queue.enqueue("Tesco last month", idempotency_key="q1")
+            added = await queue.enqueue_many([("Netflix", "q2"), ("Tesco last month", "q1")])
+
+            leased = await queue.lease(10, visibility_timeout_s=0.0)
+            redelivered = await queue.lease(10, visibility_timeout_s=60.0)
+            hidden = await queue.lease(10, visibility_timeout_s=60.0)
+            await queue.ack(redelivered[0].job_id)
+            await queue.nack(redelivered[1].job_id)
+            return first, duplicate, added, leased, redelivered, hidden, await queue.stats()
+
+        first, duplicate, added, leased, redelivered, hidden, stats = asyncio.run(run())
+
+        assert first == duplicate
+        assert added == 1
+        assert len(leased) == 2
+        assert [job.attempts for job in redelivered] == [2, 2]
+        assert hidden == []
+        # The nacked job had used up both attempts
+        assert stats == {"pending": 0, "leased": 0, "done": 1, "failed": 1}
+
+    def test_shared_sqlite_queue_delivers_each_job_once(self, tmp_path):
+        """Two queue handles on one file (as in two processes) never lease the same job"""
+        async def run():
+            path = tmp_path / "queue.sqlite"
+            producer, worker_a, worker_b = SQLiteQueue(path), SQLiteQueue(path), SQLiteQueue(path)
+            await producer.enqueue_many([(f"query {i}", str(i)) for i in range(20)])
+            leases = await asyncio.gather(*(
+                queue.lease(3, visibility_timeout_s=60.0) for queue in [worker_a, worker_b] * 4
+            ))
+            return [job.job_id for jobs in leases for job in jobs]
+
+        job_ids = asyncio.run(run())
+
+        assert len(job_ids) == 20
+        assert len(set(job_ids)) == 20
+
+
+class TestWorkerRunner:
+    """Test processing, result records and retries"""
+
+    def test_runner_writes_results_and_outcomes(self):
+        """Successes and typed workflow rejections are both written and acked"""
+        async def run():
+            workflow = make_workflow()
+            queue = InMemoryQueue()
+            sink = InMemoryResultSink()
+            await queue.enqueue("Tesco groceries last month", idempotency_key="ok")
+            await queue.enqueue("Tesco groceries last month", idempotency_key="ok")
+
+            runner = WorkerRunner(workflow, queue, sink, prefetch=4, poll_interval_s=0.01)
+            await runner.run(stop_when_empty=True)
+
+            workflow.llm_client.responses[query_security_validation_prompt.get_instructions()] = (
+                QUERY_SECURITY_RESPONSE.replace("true", "false")
+            )
+            await queue.enqueue("DROP TABLE users", idempotency_key="bad")
+            stats = await runner.run(stop_when_empty=True)
+            return sink.records, stats, await queue.stats()
+
+        records, stats, queue_stats = asyncio.run(run())
+
+        assert [record["outcome"] for record in records] == ["success", "insecure"]
+        assert records[0]["idempotency_key"] == "ok"
+        assert records[0]["result"]["processable_entities"]
+        assert records[1]["error"] == "InsecureQueryError"
+        assert stats.processed == 1
+        assert queue_stats["done"] == 2
+
+    def test_runner_retries_llm_errors(self, tmp_path):
+        """Unexpected errors are retried after a backoff, then dead-lettered with an error record"""
+        async def run():
+            workflow = make_workflow(error_probability=1.0)
+            queue = SQLiteQueue(tmp_path / "queue.sqlite", max_attempts=3, poll_interval_s=0.01)
+            sink = JSONLResultSink(tmp_path / "results.jsonl")
+            await queue.enqueue("Tesco last month")
+
+            runner = WorkerRunner(workflow, queue, sink, poll_interval_s=0.01, retry_delay_s=0.05, jitter_factor=0.0)
+            start = time.perf_counter()
+            stats = await runner.run(stop_when_empty=True)
+            elapsed = time.perf_counter() - start
+            await sink.close()
+            return stats, elapsed, await queue.stats()
+
+        stats, elapsed, queue_stats = asyncio.run(run())
+
+        assert stats.retried == 2
+        assert stats.failed == 1
+        assert stats.processed == 0
+        # Backoffs of 0.05s and 0.1s before the second and third attempts
+        assert elapsed >= 0.15
+        assert queue_stats["failed"] == 1
+        records = [json.loads(line) for line in (tmp_path / "results.jsonl").read_text(encoding="utf-8").splitlines()]
+        assert len(records) == 1
+        assert records[0]["outcome"] == "error"
+        assert records[0]["attempts"] == 3
+        assert records[0]["message"]
+
+    def test_nacked_jobs_wait_out_their_backoff(self, tmp_path):
+        """Neither backend leases a nacked job again before its delay has passed"""
+        async def run(queue):
+            await queue.enqueue("Tesco last month")
+            job = (await queue.lease(1, visibility_timeout_s=60.0))[0]
+            failed = await queue.nack(job.job_id, delay_s=0.2)
+            early = await queue.lease(1, visibility_timeout_s=60.0)
+            pending = (await queue.stats())["pending"]
+            later = await queue.lease(1, visibility_timeout_s=60.0, wait_s=1.0)
+            return failed, early, pending, later
+
+        for queue in (InMemoryQueue(), SQLiteQueue(tmp_path / "queue.sqlite", poll_interval_s=0.01)):
+            failed, early, pending, later = asyncio.run(run(queue))
+
+            assert failed is False
+            assert early == []
+            assert pending == 1
+            assert [job.attempts for job in later] == [2]